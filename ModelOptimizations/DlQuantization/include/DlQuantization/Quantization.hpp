@@ -113,6 +113,17 @@ enum RoundingMode
     ROUND_STOCHASTIC
 };
 
+/**
+ * @brief Set the number of threads used to fill the histograms of the TF enhanced encoding analyzer.
+ * @param numThreads Number of threads. 0 (the default) uses one thread per hardware thread.
+ */
+void setHistogramThreadCount(unsigned int numThreads);
+
+/**
+ * @brief Returns the number of threads used to fill the histograms of the TF enhanced encoding analyzer.
+ */
+unsigned int getHistogramThreadCount();
+
 }   // End of namespace DlQuantization.
 
 #endif   // QUANTIZATION_HPP
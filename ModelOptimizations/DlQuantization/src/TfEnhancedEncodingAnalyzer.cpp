@@ -48,6 +48,12 @@
 
 namespace DlQuantization
 {
+template <typename DTYPE>
+TfEnhancedEncodingAnalyzer<DTYPE>::TfEnhancedEncodingAnalyzer(unsigned int candidateGridDensity) :
+    _candidateGridDensity(std::max(1u, candidateGridDensity))
+{
+}
+
 template <typename DTYPE>
 void TfEnhancedEncodingAnalyzer<DTYPE>::updateStats(const DTYPE* tensor, const size_t tensorSize,
                                                     ComputationMode tensorCpuGpuMode)
@@ -88,7 +94,7 @@ TfEncoding TfEnhancedEncodingAnalyzer<DTYPE>::computeEncoding(uint8_t bw, bool u
     // Find the best candidate
     DTYPE best_delta;
     int best_offset;
-    std::tie(best_delta, best_offset) = _findBestCandidate(bw, test_candidates);
+    std::tie(best_delta, best_offset) = _findBestCandidate(bw, _computePrefixSums(), test_candidates);
 
     // Using the best delta and offset, calculate the encoding.
     encoding.delta  = best_delta;
@@ -102,7 +108,7 @@ TfEncoding TfEnhancedEncodingAnalyzer<DTYPE>::computeEncoding(uint8_t bw, bool u
 
 template <typename DTYPE>
 std::tuple<DTYPE, int>
-TfEnhancedEncodingAnalyzer<DTYPE>::_findBestCandidate(uint8_t bw,
+TfEnhancedEncodingAnalyzer<DTYPE>::_findBestCandidate(uint8_t bw, const PdfPrefixSums& sums,
                                                       const std::vector<std::tuple<DTYPE, int>>& test_candidates) const
 {
     DTYPE best_delta = -1;
@@ -120,7 +126,7 @@ TfEnhancedEncodingAnalyzer<DTYPE>::_findBestCandidate(uint8_t bw,
 
         std::tie(test_delta, test_offset) = candidate;
 
-        DTYPE cost = _quantAndSatCost(_stats, bw, test_delta, test_offset);
+        DTYPE cost = _quantAndSatCost(_stats, sums, bw, test_delta, test_offset);
 
         // Remember the best encoding.
         if (cost < best_cost)
@@ -176,15 +182,18 @@ void TfEnhancedEncodingAnalyzer<DTYPE>::_pickTestCandidatesAsymmetric(
     // 17*delta_max/16. Note we consider one delta which is larger than delta_max.
     // The reason we do this is as follows: Due to floating point rounding errors,
     // delta_max might not be able to fully cover the whole range.
-    for (DTYPE f = 1.0 / 16; f <= 1 + 1.0 / 16; f += 1.0 / 16)
+    // A denser candidate grid splits these steps further.
+    const double deltaStep = 1.0 / (16 * _candidateGridDensity);
+    const int numOffsetSteps = 20 * _candidateGridDensity;
+    for (DTYPE f = deltaStep; f <= 1 + deltaStep; f += deltaStep)
     {
         DTYPE testDelta = f * delta_max;
 
         // Compute the offsets we will test.
         // We consider 20 different offsets, equally spaced from -255 to 0.
-        for (int i = 0; i <= 20; ++i)
+        for (int i = 0; i <= numOffsetSteps; ++i)
         {
-            int testOffset = -numSteps + numSteps / 20.0 * i;
+            int testOffset = -numSteps + numSteps / (20.0 * _candidateGridDensity) * i;
 
             // Clamp test candidates to the observedMin and observedMax range.
             if (!_clampToObservedMinMax(observedMin, observedMax, numSteps, testDelta, testOffset))
@@ -228,7 +237,9 @@ void TfEnhancedEncodingAnalyzer<DTYPE>::_pickTestCandidatesSymmetric(
     // 101*delta_max/100. Note we consider one delta which is larger than delta_max.
     // The reason we do this is as follows: Due to floating point rounding errors,
     // delta_max might not be able to fully cover the whole range.
-    for (DTYPE f = 1.0 / 100; f <= 1 + 1.0 / 100; f += 1.0 / 100)
+    // A denser candidate grid splits these steps further.
+    const double deltaStep = 1.0 / (100 * _candidateGridDensity);
+    for (DTYPE f = deltaStep; f <= 1 + deltaStep; f += deltaStep)
     {
         DTYPE test_delta = f * delta_max;
         test_candidates.push_back(std::tuple<DTYPE, int>(test_delta, test_offset));
@@ -274,7 +285,49 @@ std::tuple<DTYPE, DTYPE> TfEnhancedEncodingAnalyzer<DTYPE>::_findRangeOfAggregat
 }
 
 template <typename DTYPE>
-DTYPE TfEnhancedEncodingAnalyzer<DTYPE>::_quantAndSatCost(const PDF& pdf, int bw, DTYPE delta, int offset) const
+typename TfEnhancedEncodingAnalyzer<DTYPE>::PdfPrefixSums TfEnhancedEncodingAnalyzer<DTYPE>::_computePrefixSums() const
+{
+    PdfPrefixSums sums;
+    sums.mass.resize(PDF_SIZE + 1, 0);
+    sums.firstMoment.resize(PDF_SIZE + 1, 0);
+    sums.secondMoment.resize(PDF_SIZE + 1, 0);
+
+    for (int i = 0; i < PDF_SIZE; ++i)
+    {
+        sums.mass[i + 1]         = sums.mass[i] + _stats.pdf[i];
+        sums.firstMoment[i + 1]  = sums.firstMoment[i] + _stats.pdf[i] * i;
+        sums.secondMoment[i + 1] = sums.secondMoment[i] + _stats.pdf[i] * i * i;
+    }
+
+    return sums;
+}
+
+template <typename DTYPE>
+DTYPE TfEnhancedEncodingAnalyzer<DTYPE>::_segmentCost(const PdfPrefixSums& sums, int begin, int end, DTYPE value) const
+{
+    if (begin >= end)
+    {
+        return 0;
+    }
+
+    // The midpoint of bucket i is pdf_step * i + c, so
+    // sum(p(i) * (pdf_step * i + c)^2) = pdf_step^2 * sum(p(i) * i^2) + 2 * pdf_step * c * sum(p(i) * i) + c^2 * sum(p(i))
+    const double pdf_step = _stats.x_left[1] - _stats.x_left[0];
+    const double c        = _stats.x_left[0] + pdf_step / 2 - value;
+
+    const double mass          = sums.mass[end] - sums.mass[begin];
+    const double first_moment  = sums.firstMoment[end] - sums.firstMoment[begin];
+    const double second_moment = sums.secondMoment[end] - sums.secondMoment[begin];
+
+    const double cost = pdf_step * pdf_step * second_moment + 2 * pdf_step * c * first_moment + c * c * mass;
+
+    // Guard against small negative results from rounding errors
+    return std::max(cost, 0.0);
+}
+
+template <typename DTYPE>
+DTYPE TfEnhancedEncodingAnalyzer<DTYPE>::_quantAndSatCost(const PDF& pdf, const PdfPrefixSums& sums, int bw,
+                                                          DTYPE delta, int offset) const
 {
     // Given the TensorFlow fixed point format (delta and offset), we calculate
     // the smallest and biggest floating point values we can represent.
@@ -290,46 +343,58 @@ DTYPE TfEnhancedEncodingAnalyzer<DTYPE>::_quantAndSatCost(const PDF& pdf, int bw
     maxInd          = std::min(std::max(0, maxInd), PDF_SIZE - 1);
 
     // Calculate the saturation cost of the bottom part of the PDF.
-    DTYPE sat_cost_bottom = 0;
-    // Calculate the smallest value we can represent (middle of respective
-    // bucket).
+    // All buckets which go into saturation are mapped to the smallest value we can represent (middle of respective
+    // bucket). The saturation cost is the MSE.
     DTYPE min_val_middle_of_bucket = pdf_start + (min_ind * pdf_step) + pdf_step / 2;
-    // Go through all buckets which go into saturation.
-    for (int i = 0; i < min_ind; ++i)
-    {
-        // Calculate the midpoint of this bin.
-        DTYPE mid_val = pdf_start + i * pdf_step + pdf_step / 2;
-        // The saturation cost is the MSE.
-        sat_cost_bottom += pdf.pdf[i] * pow(mid_val - min_val_middle_of_bucket, 2);
-    }
+    DTYPE sat_cost_bottom          = _segmentCost(sums, 0, min_ind, min_val_middle_of_bucket);
 
     // Calculate the saturation cost of the top part of the PDF.
-    DTYPE sat_cost_top = 0;
-    // Calculate the largest value we can represent (middle of respective
-    // bucket).
     DTYPE max_val_middle_of_bucket = pdf_start + (maxInd * pdf_step) + pdf_step / 2;
-    // Go through all buckets which go into saturation.
-    for (int i = maxInd; i < PDF_SIZE; ++i)
-    {
-        // Calculate the midpoint of this bin.
-        DTYPE mid_val = pdf_start + i * pdf_step + pdf_step / 2;
-        // The saturation cost is the MSE.
-        sat_cost_top += pdf.pdf[i] * pow(mid_val - max_val_middle_of_bucket, 2);
-    }
+    DTYPE sat_cost_top             = _segmentCost(sums, maxInd, PDF_SIZE, max_val_middle_of_bucket);
+
+    // The quantized equivalent of the floating point value in the middle of a bucket.
+    auto quantize = [&](int i) {
+        DTYPE float_val = pdf_start + i * pdf_step + pdf_step / 2;
+        return (int) round(float_val / delta - offset);
+    };
 
     // Calculate the quantization cost in the middle part of the PDF.
     DTYPE quant_cost = 0;
-    // Go through all buckets which lie in the range we can represent.
-    for (int i = min_ind; i < maxInd; ++i)
+    if (delta < 2 * pdf_step)
     {
-        // The floating point value in the middle of this bucket.
-        DTYPE float_val = pdf_start + i * pdf_step + pdf_step / 2;
-        // The quantized equivalent.
-        int quantized = (int) round(float_val / delta - offset);
-        // The de-quantized value: this is 'float_val' plus the quantization error.
+        // Buckets are about as wide as the quantization steps, go through the buckets one by one.
+        for (int i = min_ind; i < maxInd; ++i)
+        {
+            DTYPE float_val   = pdf_start + i * pdf_step + pdf_step / 2;
+            DTYPE dequantized = delta * (quantize(i) + offset);
+            quant_cost += pdf.pdf[i] * (float_val - dequantized) * (float_val - dequantized);
+        }
+        return GAMMA * (sat_cost_bottom + sat_cost_top) + quant_cost;
+    }
+
+    // Consecutive buckets which are quantized to the same value are summed up in one step.
+    int begin = min_ind;
+    while (begin < maxInd)
+    {
+        const int quantized = quantize(begin);
+
+        // Estimate the first bucket which is quantized to the next value, then correct the estimate using the exact
+        // rounding of the bucket midpoints
+        DTYPE boundary = ((quantized + (DTYPE) 0.5 + offset) * delta - pdf_start) / pdf_step - (DTYPE) 0.5;
+        int end        = (int) std::ceil(std::min(std::max(boundary, (DTYPE) (begin + 1)), (DTYPE) maxInd));
+        while (end > begin + 1 && quantize(end - 1) != quantized)
+        {
+            --end;
+        }
+        while (end < maxInd && quantize(end) == quantized)
+        {
+            ++end;
+        }
+
+        // The de-quantized value: this is the bucket midpoint plus the quantization error. The cost is the MSE.
         DTYPE dequantized = delta * (quantized + offset);
-        // The quantization cost is the MSE.
-        quant_cost += pdf.pdf[i] * pow(float_val - dequantized, 2);
+        quant_cost += _segmentCost(sums, begin, end, dequantized);
+        begin = end;
     }
 
     // Calculate the total cost as the sum of quantization and saturation cost.
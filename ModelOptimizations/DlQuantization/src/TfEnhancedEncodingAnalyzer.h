@@ -50,6 +50,12 @@ template <typename DTYPE>
 class TfEnhancedEncodingAnalyzer : public IQuantizationEncodingAnalyzer<DTYPE>
 {
 public:
+    /**
+     * @param candidateGridDensity Multiplies the number of deltas and offsets tested when computing encodings. The
+     * default of 1 tests 17x21 asymmetric and 101 symmetric candidates
+     */
+    explicit TfEnhancedEncodingAnalyzer(unsigned int candidateGridDensity = 1);
+
     /**
      * Updates internal PDF stats given a tensor.
      * Intent is to keep a histogram of all the values that we have seen over multiple instances of a tensor
@@ -83,6 +89,34 @@ private:
     // Minimum range of quantization
     static constexpr double MIN_RANGE = 0.01;
 
+    unsigned int _candidateGridDensity;
+
+    /**
+     * Cumulative sums over the PDF buckets of the probability, and of the probability times the bucket index and
+     * times its square. Entry i holds the sum over buckets [0, i). With these, the squared error of any range of
+     * buckets with respect to a single value is computed in constant time.
+     */
+    struct PdfPrefixSums
+    {
+        std::vector<double> mass;
+        std::vector<double> firstMoment;
+        std::vector<double> secondMoment;
+    };
+
+    /**
+     * Compute the prefix sums of the collected PDF
+     */
+    PdfPrefixSums _computePrefixSums() const;
+
+    /**
+     * Compute the sum over buckets [begin, end) of p(i) * (midpoint(i) - value)^2
+     * @param sums Prefix sums of the PDF
+     * @param begin First bucket
+     * @param end Bucket after the last bucket
+     * @param value Value all buckets in the range are mapped to
+     */
+    DTYPE _segmentCost(const PdfPrefixSums& sums, int begin, int end, DTYPE value) const;
+
     /**
      * @brief Given a probability density and a fixed point encoding, compute the
      * quantization and saturation error of this number distribution.
@@ -91,8 +125,11 @@ private:
      * The cost is defined as "quantization cost" + GAMMA * "saturation cost".
      * For GAMMA==1, this function computes the means square error introduced
      * by this specific fixed point encoding.
+     *
+     * Saturated buckets are summed up in constant time, and the buckets in the representable range in one step per
+     * quantized value, using the prefix sums of the PDF.
      */
-    DTYPE _quantAndSatCost(const PDF& pdf, int bw, DTYPE delta, int offset) const;
+    DTYPE _quantAndSatCost(const PDF& pdf, const PdfPrefixSums& sums, int bw, DTYPE delta, int offset) const;
 
     /**
      * Find range (min, max) of the aggregated stats
@@ -138,10 +175,11 @@ private:
     /**
      * Given a set of test candidates (delta x offsets), find the best candidate with the lowest cost
      * @param bw Bitwidth
+     * @param sums Prefix sums of the PDF
      * @param test_candidates Vector of tuples (test-delta and test-offset)
      * @return Tuple of <best delta, best offset>
      */
-    std::tuple<DTYPE, int> _findBestCandidate(uint8_t bw,
+    std::tuple<DTYPE, int> _findBestCandidate(uint8_t bw, const PdfPrefixSums& sums,
                                               const std::vector<std::tuple<DTYPE, int>>& test_candidates) const;
 };
 
@@ -37,11 +37,16 @@
 //==============================================================================
 
 
+#include <atomic>
 #include <cmath>
+#include <cstdint>
 #include <limits>
 #include <map>
+#include <numeric>
 #include <stdexcept>
 #include <stdlib.h>
+#include <thread>
+#include <utility>
 
 #include "DlQuantization/Quantization.hpp"
 #include "math_functions.hpp"
@@ -56,6 +61,34 @@ namespace DlQuantization
 {
 using namespace std;
 
+// Number of threads used to fill histograms, 0 means one per hardware thread
+static atomic<unsigned int> histogramThreadCount(0);
+
+// Each thread fills its own histogram from at least this many data points, for smaller tensors starting threads
+// costs more than it saves
+static const int MIN_HISTOGRAM_ELEMENTS_PER_THREAD = 1 << 16;
+
+// Number of data points whose bucket indices are computed together, before they are added to the histogram
+static const int HISTOGRAM_BLOCK_SIZE = 256;
+
+// The range of a PDF grows by at most a factor of 2^MAX_PDF_GROWTH_STEPS at once. Data points beyond that are dropped
+static const int MAX_PDF_GROWTH_STEPS = 32;
+
+void setHistogramThreadCount(unsigned int numThreads)
+{
+    histogramThreadCount = numThreads;
+}
+
+unsigned int getHistogramThreadCount()
+{
+    unsigned int numThreads = histogramThreadCount;
+    if (0 == numThreads)
+    {
+        numThreads = std::max(1u, thread::hardware_concurrency());
+    }
+    return numThreads;
+}
+
 template <typename DTYPE>
 DTYPE GetMax(const DTYPE* data, int cnt, ComputationMode mode_cpu_gpu)
 {
@@ -285,6 +318,139 @@ void MemoryFree_cpu(void* data)
     free(data);
 }
 
+template <typename DTYPE, bool SIGNED_VALS>
+void AccumulateHistogram_cpu(const DTYPE* data, int cnt, DTYPE bucket_size, DTYPE pdf_offset, uint64_t* histogram)
+{
+    int indices[HISTOGRAM_BLOCK_SIZE];
+    for (int start = 0; start < cnt; start += HISTOGRAM_BLOCK_SIZE)
+    {
+        const int block_cnt = std::min(HISTOGRAM_BLOCK_SIZE, cnt - start);
+        const DTYPE* block  = data + start;
+
+        // Map a block of floating point numbers to their buckets first. The iterations are independent of each other,
+        // so the compiler can vectorize this loop
+        for (int i = 0; i < block_cnt; ++i)
+        {
+            DTYPE position = SIGNED_VALS ? block[i] / bucket_size - pdf_offset : std::abs(block[i]) / bucket_size;
+            // Clamp to just outside the histogram range, so that the conversion to int is always defined
+            position   = std::min(std::max(position, (DTYPE) -1), (DTYPE) PDF_SIZE);
+            indices[i] = (int) round(position);
+        }
+
+        // Add to histogram, if inside the histogram range.
+        for (int i = 0; i < block_cnt; ++i)
+        {
+            if (indices[i] >= 0 && indices[i] < PDF_SIZE)
+            {
+                histogram[indices[i]] += 1;
+            }
+        }
+    }
+}
+
+template <typename DTYPE, bool SIGNED_VALS>
+void ComputeHistogram_cpu(const DTYPE* data, int cnt, DTYPE bucket_size, DTYPE pdf_offset, vector<uint64_t>& histogram)
+{
+    const unsigned int num_threads =
+        std::min(getHistogramThreadCount(), (unsigned int) std::max(1, cnt / MIN_HISTOGRAM_ELEMENTS_PER_THREAD));
+
+    if (num_threads <= 1)
+    {
+        AccumulateHistogram_cpu<DTYPE, SIGNED_VALS>(data, cnt, bucket_size, pdf_offset, histogram.data());
+        return;
+    }
+
+    // Every thread fills a partial histogram of its own slice of the data, the partial histograms are merged at the end
+    vector<vector<uint64_t>> partial_histograms(num_threads, vector<uint64_t>(PDF_SIZE, 0));
+    vector<thread> threads;
+    const int slice_cnt = (cnt + num_threads - 1) / num_threads;
+    for (unsigned int t = 0; t < num_threads; ++t)
+    {
+        const int start = t * slice_cnt;
+        threads.emplace_back(AccumulateHistogram_cpu<DTYPE, SIGNED_VALS>, data + start,
+                             std::min(slice_cnt, cnt - start), bucket_size, pdf_offset, partial_histograms[t].data());
+    }
+
+    for (unsigned int t = 0; t < num_threads; ++t)
+    {
+        threads[t].join();
+        for (int i = 0; i < PDF_SIZE; ++i)
+        {
+            histogram[i] += partial_histograms[t][i];
+        }
+    }
+}
+
+// Returns the min and max of the finite values of the data, so that single non-finite values do not keep the PDF
+// from growing to include the finite outliers of a batch. Both are infinite if there are no finite values.
+template <typename DTYPE>
+static std::pair<double, double> GetFiniteMinMax_cpu(const DTYPE* data, int cnt)
+{
+    double min_val = numeric_limits<double>::infinity();
+    double max_val = -numeric_limits<double>::infinity();
+    for (int i = 0; i < cnt; ++i)
+    {
+        if (std::isfinite(data[i]))
+        {
+            min_val = min(min_val, (double) data[i]);
+            max_val = max(max_val, (double) data[i]);
+        }
+    }
+    return std::make_pair(min_val, max_val);
+}
+
+bool GrowPdfRange(PDF& pdf, double min_val, double max_val)
+{
+    if (!std::isfinite(min_val) || !std::isfinite(max_val))
+    {
+        return false;
+    }
+
+    // Bucket i is centered on x_left[i]
+    const double bucket_size = pdf.x_left[1] - pdf.x_left[0];
+    const double range_start = pdf.x_left[0] - bucket_size / 2;
+    const double range_end   = range_start + PDF_SIZE * bucket_size;
+
+    // Number of buckets (of the current size) needed on either side to include min_val and max_val
+    const double grow_left  = (min_val <= range_start) ? std::floor((range_start - min_val) / bucket_size) + 1 : 0;
+    const double grow_right = (max_val >= range_end) ? std::floor((max_val - range_end) / bucket_size) + 1 : 0;
+    if (0 == grow_left && 0 == grow_right)
+    {
+        return false;
+    }
+
+    // Find the smallest power of two by which to grow the buckets. Groups of 2^k buckets get merged into one, so the
+    // start of the range can only move by multiples of 2^k buckets
+    for (int k = 1; k <= MAX_PDF_GROWTH_STEPS; ++k)
+    {
+        const double factor      = std::ldexp(1.0, k);
+        const double num_buckets = PDF_SIZE * factor;
+        const double shift       = std::ceil(grow_left / factor) * factor;
+        if (shift + PDF_SIZE + grow_right > num_buckets)
+        {
+            continue;
+        }
+
+        // Merge the buckets. The mass of the PDF is preserved, so the data seen so far need not be visited again
+        vector<double> merged_pdf(PDF_SIZE, 0);
+        for (int i = 0; i < PDF_SIZE; ++i)
+        {
+            merged_pdf[(int64_t) ((i + shift) / factor)] += pdf.pdf[i];
+        }
+        pdf.pdf = merged_pdf;
+
+        const double new_bucket_size = bucket_size * factor;
+        const double new_range_start = range_start - shift * bucket_size;
+        for (int i = 0; i < PDF_SIZE; ++i)
+        {
+            pdf.x_left[i] = new_range_start + i * new_bucket_size + new_bucket_size / 2;
+        }
+        return true;
+    }
+
+    return false;
+}
+
 template <typename DTYPE>
 void UpdatePdfSigned_cpu(const DTYPE* data, int cnt, PDF& pdf)
 {
@@ -327,28 +493,37 @@ void UpdatePdfSigned_cpu(const DTYPE* data, int cnt, PDF& pdf)
     // The histogram's range is min_val to max_val.
     DTYPE min_val     = pdf.x_left[0];
     DTYPE bucket_size = pdf.x_left[1] - pdf.x_left[0];
-    vector<DTYPE> pdf_this_iter(PDF_SIZE, 0);
     // This offset is used to help map numbers to histogram buckets.
     DTYPE pdf_offset = min_val / bucket_size;
     // Go through all data points and add them to the histogram.
-    for (int i = 0; i < cnt; ++i)
+    vector<uint64_t> histogram(PDF_SIZE, 0);
+    ComputeHistogram_cpu<DTYPE, true>(data, cnt, bucket_size, pdf_offset, histogram);
+
+    // Data points outside the range of the PDF were not added to the histogram. Grow the range of the PDF to include
+    // them and add this batch again, so that later outliers are not lost.
+    const uint64_t cnt_in_range = accumulate(histogram.begin(), histogram.end(), (uint64_t) 0);
+    bool grown                  = false;
+    if (cnt_in_range < (uint64_t) cnt)
     {
-        // Map a floating point number to the appropriate bucket.
-        int index = round(data[i] / bucket_size - pdf_offset);
-        // Add to histogram, if inside the histogram range.
-        if (index >= 0 && index < PDF_SIZE)
-        {
-            pdf_this_iter[index] += 1;
-        }
+        const std::pair<double, double> finite_min_max = GetFiniteMinMax_cpu(data, cnt);
+        grown = GrowPdfRange(pdf, finite_min_max.first, finite_min_max.second);
+    }
+    if (grown)
+    {
+        min_val     = pdf.x_left[0];
+        bucket_size = pdf.x_left[1] - pdf.x_left[0];
+        pdf_offset  = min_val / bucket_size;
+        fill(histogram.begin(), histogram.end(), 0);
+        ComputeHistogram_cpu<DTYPE, true>(data, cnt, bucket_size, pdf_offset, histogram);
     }
 
     // Average this histogram into the average of all batches.
     for (int i = 0; i < PDF_SIZE; ++i)
     {
         // Convert histogram to probability density function.
-        pdf_this_iter[i] /= cnt;
+        DTYPE pdf_this_iter = (DTYPE) histogram[i] / cnt;
         // Average this PDF into the running average.
-        pdf.pdf[i] = (pdf.pdf[i] * pdf.iterations + pdf_this_iter[i]) / (pdf.iterations + 1);
+        pdf.pdf[i] = (pdf.pdf[i] * pdf.iterations + pdf_this_iter) / (pdf.iterations + 1);
     }
     pdf.iterations++;
 }
@@ -394,26 +569,17 @@ void UpdatePdfUnsigned_cpu(const DTYPE* data, int cnt, PDF& pdf)
 
     // Create the histogram of this number distribution.
     DTYPE bucket_size = pdf.x_left[1] - pdf.x_left[0];
-    vector<DTYPE> pdf_this_iter(PDF_SIZE, 0);
     // Go through all data points and add them to the histogram.
-    for (int i = 0; i < cnt; ++i)
-    {
-        // Map a floating point number to the appropriate bucket.
-        int index = round(std::abs(data[i]) / bucket_size);
-        // Add to histogram, if inside the histogram range.
-        if (index >= 0 && index < PDF_SIZE)
-        {
-            pdf_this_iter[index] += 1;
-        }
-    }
+    vector<uint64_t> histogram(PDF_SIZE, 0);
+    ComputeHistogram_cpu<DTYPE, false>(data, cnt, bucket_size, (DTYPE) 0, histogram);
 
     // Average this histogram into the average of all batches.
     for (int i = 0; i < PDF_SIZE; ++i)
     {
         // Convert histogram to probability density function.
-        pdf_this_iter[i] /= cnt;
+        DTYPE pdf_this_iter = (DTYPE) histogram[i] / cnt;
         // Average this PDF into the running average.
-        pdf.pdf[i] = (pdf.pdf[i] * pdf.iterations + pdf_this_iter[i]) / (pdf.iterations + 1);
+        pdf.pdf[i] = (pdf.pdf[i] * pdf.iterations + pdf_this_iter) / (pdf.iterations + 1);
     }
     pdf.iterations++;
 }
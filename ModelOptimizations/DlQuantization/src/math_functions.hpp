@@ -101,6 +101,16 @@ double logBase2(double d);
 template <typename DTYPE>
 void UpdatePdf(const DTYPE* data, int cnt, ComputationMode mode_cpu_gpu, bool signed_vals, PDF& pdf);
 
+/**
+ * @brief Grow the range of a PDF so that it includes min_val and max_val.
+ *
+ * The bucket size grows by the smallest power of two for which the new range includes both values. Groups of
+ * buckets are merged into one, which preserves the probability mass seen so far.
+ * @param pdf The PDF to grow. Its range needs to have been initialized.
+ * @return True if the range of the PDF was grown.
+ */
+bool GrowPdfRange(PDF& pdf, double min_val, double max_val);
+
 /**
  * @brief Allocate memory.
  * @param modeCpuGpu Allocate memory for CPU or GPU.
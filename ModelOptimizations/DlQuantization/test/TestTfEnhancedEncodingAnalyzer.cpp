@@ -37,6 +37,7 @@
 //==============================================================================
 
 #include <gtest/gtest.h>
+#include <limits>
 #include <random>
 #include <vector>
 
@@ -292,6 +293,159 @@ TYPED_TEST(TestTfEnhancedEncodingAnalyzer, InitialZeroTensor)
     EXPECT_LT(encoding.max, mean + 6 * stddev);
 }
 
+TYPED_TEST(TestTfEnhancedEncodingAnalyzer, MultithreadedHistogramMatchesSingleThreaded)
+{
+    typedef typename TypeParam::dataType dataType;
+
+    DlQuantization::TfEnhancedEncodingAnalyzer<dataType> analyzer1;
+    DlQuantization::TfEnhancedEncodingAnalyzer<dataType> analyzer2;
+
+    std::normal_distribution<dataType> distribution(1, 3);
+    std::mt19937 generator(1);
+
+    // Large enough to be split across several threads
+    unsigned int tensorCount = 1 << 20;
+    std::vector<dataType> tensor(tensorCount);
+    for (unsigned int i = 0; i < tensorCount; i++)
+    {
+        tensor[i] = distribution(generator);
+    }
+    Blob<TypeParam> tensorBlob(tensor.data(), tensorCount);
+
+    unsigned int defaultThreadCount = DlQuantization::getHistogramThreadCount();
+
+    DlQuantization::setHistogramThreadCount(1);
+    analyzer1.updateStats(tensorBlob.getDataPtrOnDevice(), tensorCount, TypeParam::modeCpuGpu);
+    analyzer1.updateStats(tensorBlob.getDataPtrOnDevice(), tensorCount, TypeParam::modeCpuGpu);
+    DlQuantization::TfEncoding encoding1 = analyzer1.computeEncoding(8, false);
+
+    DlQuantization::setHistogramThreadCount(4);
+    EXPECT_EQ(DlQuantization::getHistogramThreadCount(), 4);
+    analyzer2.updateStats(tensorBlob.getDataPtrOnDevice(), tensorCount, TypeParam::modeCpuGpu);
+    analyzer2.updateStats(tensorBlob.getDataPtrOnDevice(), tensorCount, TypeParam::modeCpuGpu);
+    DlQuantization::TfEncoding encoding2 = analyzer2.computeEncoding(8, false);
+
+    DlQuantization::setHistogramThreadCount(0);
+    EXPECT_EQ(DlQuantization::getHistogramThreadCount(), defaultThreadCount);
+
+    // Histograms are accumulated in integer counts, so the result does not depend on the number of threads
+    EXPECT_EQ(encoding1.min, encoding2.min);
+    EXPECT_EQ(encoding1.max, encoding2.max);
+    EXPECT_EQ(encoding1.delta, encoding2.delta);
+    EXPECT_EQ(encoding1.offset, encoding2.offset);
+}
+
+TYPED_TEST(TestTfEnhancedEncodingAnalyzer, RangeGrowsWithLaterBatches)
+{
+    typedef typename TypeParam::dataType dataType;
+
+    DlQuantization::TfEnhancedEncodingAnalyzer<dataType> analyzer;
+
+    std::mt19937 generator(1);
+    unsigned int tensorCount = 6000;
+    std::vector<dataType> tensor(tensorCount);
+
+    // The first batch sets the initial range of the histogram to about [-12, 12]
+    std::normal_distribution<dataType> narrowDistribution(0, 1);
+    for (unsigned int i = 0; i < tensorCount; i++)
+    {
+        tensor[i] = narrowDistribution(generator);
+    }
+    Blob<TypeParam> tensorBlob1(tensor.data(), tensorCount);
+    analyzer.updateStats(tensorBlob1.getDataPtrOnDevice(), tensorCount, TypeParam::modeCpuGpu);
+
+    // Later batches are spread much wider
+    std::normal_distribution<dataType> wideDistribution(0, 10);
+    for (unsigned int i = 0; i < tensorCount; i++)
+    {
+        tensor[i] = wideDistribution(generator);
+    }
+    Blob<TypeParam> tensorBlob2(tensor.data(), tensorCount);
+    for (int batch = 0; batch < 3; ++batch)
+    {
+        analyzer.updateStats(tensorBlob2.getDataPtrOnDevice(), tensorCount, TypeParam::modeCpuGpu);
+    }
+
+    DlQuantization::TfEncoding encoding = analyzer.computeEncoding(8, false);
+
+    // The encoding covers the wider batches, instead of being limited to the range of the first one
+    EXPECT_LT(encoding.min, -20);
+    EXPECT_GT(encoding.max, 20);
+}
+
+TYPED_TEST(TestTfEnhancedEncodingAnalyzer, RangeGrowsWithNonFiniteValues)
+{
+    typedef typename TypeParam::dataType dataType;
+
+    DlQuantization::TfEnhancedEncodingAnalyzer<dataType> analyzer;
+
+    std::mt19937 generator(1);
+    unsigned int tensorCount = 6000;
+    std::vector<dataType> tensor(tensorCount);
+
+    std::normal_distribution<dataType> narrowDistribution(0, 1);
+    for (unsigned int i = 0; i < tensorCount; i++)
+    {
+        tensor[i] = narrowDistribution(generator);
+    }
+    Blob<TypeParam> tensorBlob1(tensor.data(), tensorCount);
+    analyzer.updateStats(tensorBlob1.getDataPtrOnDevice(), tensorCount, TypeParam::modeCpuGpu);
+
+    // A single infinite value in a wide batch does not keep the range from growing to its finite values
+    std::normal_distribution<dataType> wideDistribution(0, 10);
+    for (unsigned int i = 0; i < tensorCount; i++)
+    {
+        tensor[i] = wideDistribution(generator);
+    }
+    tensor[7] = std::numeric_limits<dataType>::infinity();
+    Blob<TypeParam> tensorBlob2(tensor.data(), tensorCount);
+    for (int batch = 0; batch < 3; ++batch)
+    {
+        analyzer.updateStats(tensorBlob2.getDataPtrOnDevice(), tensorCount, TypeParam::modeCpuGpu);
+    }
+
+    DlQuantization::TfEncoding encoding = analyzer.computeEncoding(8, false);
+
+    EXPECT_LT(encoding.min, -20);
+    EXPECT_GT(encoding.max, 20);
+}
+
+TYPED_TEST(TestTfEnhancedEncodingAnalyzer, DenserCandidateGrid)
+{
+    typedef typename TypeParam::dataType dataType;
+
+    DlQuantization::TfEnhancedEncodingAnalyzer<dataType> analyzer;
+    DlQuantization::TfEnhancedEncodingAnalyzer<dataType> denseAnalyzer(4);
+
+    float mean   = 2;
+    float stddev = 2;
+    std::normal_distribution<dataType> distribution(mean, stddev);
+    std::mt19937 generator(1);
+
+    unsigned int tensorCount = 6000;
+    std::vector<dataType> tensor(tensorCount);
+    for (unsigned int i = 0; i < tensorCount; i++)
+    {
+        tensor[i] = distribution(generator);
+    }
+    Blob<TypeParam> tensorBlob(tensor.data(), tensorCount);
+
+    analyzer.updateStats(tensorBlob.getDataPtrOnDevice(), tensorCount, TypeParam::modeCpuGpu);
+    denseAnalyzer.updateStats(tensorBlob.getDataPtrOnDevice(), tensorCount, TypeParam::modeCpuGpu);
+
+    for (bool useSymmetricEncodings: {false, true})
+    {
+        DlQuantization::TfEncoding encoding      = analyzer.computeEncoding(8, useSymmetricEncodings);
+        DlQuantization::TfEncoding denseEncoding = denseAnalyzer.computeEncoding(8, useSymmetricEncodings);
+
+        // The denser grid refines the encoding found on the default grid
+        EXPECT_NEAR(denseEncoding.min, encoding.min, 0.1 * (encoding.max - encoding.min));
+        EXPECT_NEAR(denseEncoding.max, encoding.max, 0.1 * (encoding.max - encoding.min));
+        EXPECT_GT(denseEncoding.max, mean + 2 * stddev);
+        EXPECT_LT(denseEncoding.max, mean + 6 * stddev);
+    }
+}
+
 int main(int argc, char** argv)
 {
     ::testing::InitGoogleTest(&argc, argv);
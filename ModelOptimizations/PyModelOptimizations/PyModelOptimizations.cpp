@@ -99,6 +99,8 @@ PYBIND11_MODULE(libpymo, m)
 
     py::class_<IQuantizationEncodingAnalyzer<float>>(m, "QuantizationEncodingAnalyzer");
     m.def("GetQuantizationEncodingAnalyzerInstance", &getEncodingAnalyzerInstance<float>);
+    m.def("setHistogramThreadCount", &setHistogramThreadCount);
+    m.def("getHistogramThreadCount", &getHistogramThreadCount);
 
     // Compression python bindings
     py::enum_<COMPRESS_LAYER_TYPE>(m, "COMPRESS_LAYER_TYPE")
@@ -0,0 +1,249 @@
+# /usr/bin/env python3.5
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#  
+#  Copyright (c) 2020, Qualcomm Innovation Center, Inc. All rights reserved.
+#  
+#  Redistribution and use in source and binary forms, with or without 
+#  modification, are permitted provided that the following conditions are met:
+#  
+#  1. Redistributions of source code must retain the above copyright notice, 
+#     this list of conditions and the following disclaimer.
+#  
+#  2. Redistributions in binary form must reproduce the above copyright notice, 
+#     this list of conditions and the following disclaimer in the documentation 
+#     and/or other materials provided with the distribution.
+#  
+#  3. Neither the name of the copyright holder nor the names of its contributors 
+#     may be used to endorse or promote products derived from this software 
+#     without specific prior written permission.
+#  
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" 
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE 
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE 
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE 
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR 
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF 
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS 
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN 
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) 
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#  
+#  SPDX-License-Identifier: BSD-3-Clause
+#  
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" Benchmark of the wall time and peak memory of the stages of the compression and quantization pipelines, on
+synthetic models of configurable width and depth. Runs on CPU only.
+
+Environment variables:
+    AIMET_BENCHMARK_WIDTH, AIMET_BENCHMARK_DEPTH: width (channels) and depth (conv blocks) of the synthetic model
+    AIMET_BENCHMARK_RESULTS_DIR: directory to write the results files to, ./benchmark_results by default
+    AIMET_BENCHMARK_BASELINE_DIR: directory with the results files of a baseline run to compare against
+"""
+
+import os
+# Benchmark on CPU only, this has to happen before tensorflow is imported
+os.environ['CUDA_VISIBLE_DEVICES'] = ''
+
+import tempfile
+import unittest
+from decimal import Decimal
+
+import numpy as np
+import tensorflow as tf
+
+from aimet_common.defs import CompressionScheme, CostMetric, GreedySelectionParameters
+from aimet_common.stage_benchmark import StageBenchmark
+from aimet_common.utils import AimetLogger
+from aimet_tensorflow.batch_norm_fold import fold_all_batch_norms
+from aimet_tensorflow.bias_correction import BiasCorrection, BiasCorrectionParams, QuantParams
+from aimet_tensorflow.common.connectedgraph import ConnectedGraph
+from aimet_tensorflow.compress import ModelCompressor
+from aimet_tensorflow.cross_layer_equalization import equalize_model
+from aimet_tensorflow.defs import SpatialSvdParameters, ChannelPruningParameters
+from aimet_tensorflow.quantsim import QuantizationSimModel
+
+logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.Test)
+
+WIDTH = int(os.environ.get('AIMET_BENCHMARK_WIDTH', 64))
+DEPTH = int(os.environ.get('AIMET_BENCHMARK_DEPTH', 6))
+RESULTS_DIR = os.environ.get('AIMET_BENCHMARK_RESULTS_DIR', './benchmark_results')
+BASELINE_DIR = os.environ.get('AIMET_BENCHMARK_BASELINE_DIR')
+
+IMAGE_SIZE = 32
+BATCH_SIZE = 16
+NUM_IMAGES = 128
+
+INPUT_OP_NAMES = ['input_1']
+OUTPUT_OP_NAMES = ['synthetic_output/BiasAdd']
+
+
+def create_synthetic_model(width: int, depth: int) -> tf.compat.v1.Session:
+    """
+    Create a session with Conv - BN - ReLU blocks of a given width and depth, followed by a classifier
+
+    :param width: Number of channels of the conv layers
+    :param depth: Number of conv blocks after the first one
+    :return: Session with the initialized model
+    """
+    graph = tf.Graph()
+
+    with graph.as_default():
+        inputs = tf.keras.Input(shape=(IMAGE_SIZE, IMAGE_SIZE, 3), name=INPUT_OP_NAMES[0])
+        x = inputs
+        for _ in range(depth + 1):
+            x = tf.keras.layers.Conv2D(width, (3, 3), padding='same')(x)
+            x = tf.keras.layers.BatchNormalization()(x, training=False)
+            x = tf.keras.layers.ReLU()(x)
+        x = tf.keras.layers.AvgPool2D(pool_size=(8, 8))(x)
+        x = tf.keras.layers.Flatten()(x)
+        _ = tf.keras.layers.Dense(10, name='synthetic_output')(x)
+
+        init = tf.compat.v1.global_variables_initializer()
+
+    sess = tf.compat.v1.Session(graph=graph)
+    sess.run(init)
+
+    return sess
+
+
+def run_model(sess: tf.compat.v1.Session, images: np.ndarray) -> np.ndarray:
+    """ Run the synthetic model on a batch of images """
+    return sess.run(sess.graph.get_tensor_by_name(OUTPUT_OP_NAMES[0] + ':0'),
+                    feed_dict={sess.graph.get_tensor_by_name(INPUT_OP_NAMES[0] + ':0'): images})
+
+
+class OutputSimilarityEvaluator:
+    """ Evaluates a model by how close its outputs are to the outputs of the original model """
+
+    def __init__(self, sess: tf.compat.v1.Session, images: np.ndarray, benchmark: StageBenchmark):
+        self._images = images
+        self._benchmark = benchmark
+        self._reference = run_model(sess, images)
+
+    def __call__(self, sess: tf.compat.v1.Session, iterations: int, use_cuda: bool = False) -> float:
+        # pylint: disable=unused-argument
+        with self._benchmark.stage('eval'):
+            outputs = run_model(sess, self._images)
+        error = np.mean((outputs - self._reference) ** 2) / np.mean(self._reference ** 2)
+        return max(0.0, 1.0 - float(error))
+
+
+class TestPipelineStageBenchmark(unittest.TestCase):
+    """ Benchmark the stages of the compression and quantization pipelines """
+
+    def setUp(self):
+        np.random.seed(0)
+        tf.compat.v1.set_random_seed(0)
+        self.config = {'width': WIDTH, 'depth': DEPTH, 'image_size': IMAGE_SIZE, 'batch_size': BATCH_SIZE}
+        self.input_shape = (1, IMAGE_SIZE, IMAGE_SIZE, 3)
+        self.images = np.random.rand(NUM_IMAGES, IMAGE_SIZE, IMAGE_SIZE, 3).astype(np.float32)
+
+    def _create_data_set(self) -> tf.data.Dataset:
+        """ Batched data set of the synthetic images """
+        return tf.data.Dataset.from_tensor_slices(self.images).batch(BATCH_SIZE)
+
+    def _save_and_compare(self, benchmark: StageBenchmark):
+        """ Write the results file and fail on regressions against the baseline, if there is one """
+        regressions = benchmark.save_and_compare(RESULTS_DIR, BASELINE_DIR)
+        self.assertEqual([], regressions)
+
+    def test_quantization_pipeline(self):
+        """ ConnectedGraph, quantsim construction, calibration and encodings, export """
+        benchmark = StageBenchmark('tf_quantization_pipeline', self.config)
+        sess = create_synthetic_model(WIDTH, DEPTH)
+
+        with benchmark.stage('connected_graph'):
+            ConnectedGraph(sess.graph, INPUT_OP_NAMES, OUTPUT_OP_NAMES)
+
+        with benchmark.stage('quantsim_construction'):
+            sim = QuantizationSimModel(sess, INPUT_OP_NAMES, OUTPUT_OP_NAMES, use_cuda=False)
+
+        def forward_pass(session, _):
+            with benchmark.stage('compute_encodings/calibration'):
+                for index in range(0, NUM_IMAGES, BATCH_SIZE):
+                    run_model(session, self.images[index:index + BATCH_SIZE])
+
+        with benchmark.stage('compute_encodings'):
+            sim.compute_encodings(forward_pass, None)
+
+        with tempfile.TemporaryDirectory() as export_dir, benchmark.stage('export'):
+            sim.export(export_dir, 'synthetic')
+
+        sim.session.close()
+        sess.close()
+        self._save_and_compare(benchmark)
+
+    def test_post_training_pipeline(self):
+        """ Batch norm folding, cross layer equalization and bias correction """
+        benchmark = StageBenchmark('tf_post_training_pipeline', self.config)
+
+        sess = create_synthetic_model(WIDTH, DEPTH)
+        with benchmark.stage('batch_norm_fold'):
+            sess, _ = fold_all_batch_norms(sess, INPUT_OP_NAMES, OUTPUT_OP_NAMES)
+        sess.close()
+
+        sess = create_synthetic_model(WIDTH, DEPTH)
+        with benchmark.stage('cross_layer_equalization'):
+            sess = equalize_model(sess, INPUT_OP_NAMES, OUTPUT_OP_NAMES)
+        sess.close()
+
+        sess = create_synthetic_model(WIDTH, DEPTH)
+        bias_correct_params = BiasCorrectionParams(batch_size=BATCH_SIZE, num_quant_samples=2 * BATCH_SIZE,
+                                                   num_bias_correct_samples=2 * BATCH_SIZE,
+                                                   input_op_names=INPUT_OP_NAMES, output_op_names=OUTPUT_OP_NAMES)
+        with benchmark.stage('bias_correction'):
+            sess = BiasCorrection.correct_bias(sess, bias_correct_params, QuantParams(use_cuda=False),
+                                               self._create_data_set())
+        sess.close()
+
+        self._save_and_compare(benchmark)
+
+    def test_spatial_svd_greedy(self):
+        """ Spatial SVD with greedy compression ratio selection """
+        benchmark = StageBenchmark('tf_spatial_svd_greedy', self.config)
+        sess = create_synthetic_model(WIDTH, DEPTH)
+        evaluator = OutputSimilarityEvaluator(sess, self.images[:BATCH_SIZE], benchmark)
+
+        greedy_params = GreedySelectionParameters(target_comp_ratio=Decimal(0.5), num_comp_ratio_candidates=4)
+        auto_params = SpatialSvdParameters.AutoModeParams(
+            greedy_params, modules_to_ignore=[sess.graph.get_operation_by_name('conv2d/Conv2D')])
+        params = SpatialSvdParameters(INPUT_OP_NAMES, OUTPUT_OP_NAMES, SpatialSvdParameters.Mode.auto, auto_params,
+                                      multiplicity=8)
+
+        with benchmark.stage('compress_model'):
+            compressed_sess, _ = ModelCompressor.compress_model(sess, working_dir=None, eval_callback=evaluator,
+                                                                eval_iterations=1, input_shape=self.input_shape,
+                                                                compress_scheme=CompressionScheme.spatial_svd,
+                                                                cost_metric=CostMetric.mac, parameters=params)
+
+        compressed_sess.close()
+        sess.close()
+        self._save_and_compare(benchmark)
+
+    def test_channel_pruning_greedy(self):
+        """ Channel pruning with greedy compression ratio selection """
+        benchmark = StageBenchmark('tf_channel_pruning_greedy', self.config)
+        sess = create_synthetic_model(WIDTH, DEPTH)
+        evaluator = OutputSimilarityEvaluator(sess, self.images[:BATCH_SIZE], benchmark)
+
+        greedy_params = GreedySelectionParameters(target_comp_ratio=Decimal(0.5), num_comp_ratio_candidates=4)
+        auto_params = ChannelPruningParameters.AutoModeParams(
+            greedy_params, modules_to_ignore=[sess.graph.get_operation_by_name('conv2d/Conv2D')])
+        params = ChannelPruningParameters(INPUT_OP_NAMES, OUTPUT_OP_NAMES, data_set=self._create_data_set(),
+                                          batch_size=BATCH_SIZE, num_reconstruction_samples=500,
+                                          allow_custom_downsample_ops=False,
+                                          mode=ChannelPruningParameters.Mode.auto, params=auto_params)
+
+        with benchmark.stage('compress_model'):
+            compressed_sess, _ = ModelCompressor.compress_model(sess, working_dir=None, eval_callback=evaluator,
+                                                                eval_iterations=1, input_shape=self.input_shape,
+                                                                compress_scheme=CompressionScheme.channel_pruning,
+                                                                cost_metric=CostMetric.mac, parameters=params)
+
+        compressed_sess.close()
+        sess.close()
+        self._save_and_compare(benchmark)
@@ -0,0 +1,108 @@
+# /usr/bin/env python3.5
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2020, Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice,
+#     this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its contributors
+#     may be used to endorse or promote products derived from this software
+#     without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+#  SPDX-License-Identifier: BSD-3-Clause
+#
+#  @@-COPYRIGHT-END-@@
+""" Benchmark of the JSON and compact encodings file formats on a model with ~10k quantizers """
+
+import os
+import time
+import unittest
+import torch
+import onnx
+
+from aimet_common.utils import AimetLogger
+from aimet_torch.quantsim import QuantizationSimModel
+from aimet_torch.onnx_utils import OnnxSaver
+
+logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.Test)
+
+
+def create_model_with_many_quantizers(num_blocks: int) -> torch.nn.Module:
+    """ Sequence of small linear + relu blocks. Every block adds 6 quantizers (linear: in, out, weight, bias. relu:
+    in, out) """
+    layers = []
+    for _ in range(num_blocks):
+        layers.append(torch.nn.Linear(16, 16))
+        layers.append(torch.nn.ReLU())
+    return torch.nn.Sequential(*layers)
+
+
+class TestEncodingsFormatBenchmark(unittest.TestCase):
+    """ Benchmark export and import of encodings """
+
+    def test_json_vs_compact_encodings_on_10k_quantizers(self):
+        """ Time encodings export and param encodings import for both file formats """
+        path = './data/'
+        prefix = 'encodings_benchmark'
+        input_shape = (1, 16)
+        model = create_model_with_many_quantizers(1700).eval()
+
+        sim = QuantizationSimModel(model, input_shapes=input_shape)
+        sim.compute_encodings(lambda model, _: model(torch.randn(8, 16)), None)
+
+        sim.export(path, prefix, input_shape=input_shape)
+        onnx_model = onnx.load(os.path.join(path, prefix + '.onnx'))
+        op_to_io_tensor_map, valid_param_set = OnnxSaver.get_onnx_node_to_io_tensor_names_map(onnx_model)
+
+        # pylint: disable=protected-access
+        start = time.perf_counter()
+        sim._export_encodings_to_json(path, prefix, op_to_io_tensor_map, valid_param_set)
+        json_export_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sim._export_encodings_to_compact_file(path, prefix, op_to_io_tensor_map, valid_param_set)
+        compact_export_time = time.perf_counter() - start
+
+        json_path = os.path.join(path, prefix + '.encodings')
+        compact_path = os.path.join(path, prefix + '.encodings.bin')
+
+        start = time.perf_counter()
+        sim.set_and_freeze_param_encodings(json_path)
+        json_import_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sim.set_and_freeze_param_encodings(compact_path)
+        compact_import_time = time.perf_counter() - start
+
+        json_size = os.path.getsize(json_path)
+        compact_size = os.path.getsize(compact_path)
+
+        logger.info('Encodings benchmark on %d quantizers', 6 * 1700)
+        logger.info('JSON   : export %.3fs, import %.3fs, size %d bytes', json_export_time, json_import_time,
+                    json_size)
+        logger.info('Compact: export %.3fs, import %.3fs, size %d bytes', compact_export_time, compact_import_time,
+                    compact_size)
+
+        self.assertLess(compact_size, json_size)
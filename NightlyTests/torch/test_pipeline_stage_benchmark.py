@@ -0,0 +1,214 @@
+# /usr/bin/env python3.5
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2020, Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice,
+#     this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its contributors
+#     may be used to endorse or promote products derived from this software
+#     without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+#  SPDX-License-Identifier: BSD-3-Clause
+#
+#  @@-COPYRIGHT-END-@@
+""" Benchmark of the wall time and peak memory of the stages of the compression and quantization pipelines, on
+synthetic models of configurable width and depth. Runs on CPU only.
+
+Environment variables:
+    AIMET_BENCHMARK_WIDTH, AIMET_BENCHMARK_DEPTH: width (channels) and depth (conv blocks) of the synthetic model
+    AIMET_BENCHMARK_RESULTS_DIR: directory to write the results files to, ./benchmark_results by default
+    AIMET_BENCHMARK_BASELINE_DIR: directory with the results files of a baseline run to compare against
+"""
+
+import copy
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+
+import torch
+
+from aimet_common.defs import CompressionScheme, CostMetric, GreedySelectionParameters, QuantScheme
+from aimet_common.stage_benchmark import StageBenchmark
+from aimet_common.utils import AimetLogger
+from aimet_torch.batch_norm_fold import fold_all_batch_norms
+from aimet_torch.bias_correction import correct_bias
+from aimet_torch.compress import ModelCompressor
+from aimet_torch.cross_layer_equalization import equalize_model
+from aimet_torch.defs import SpatialSvdParameters, ChannelPruningParameters
+from aimet_torch.meta.connectedgraph import ConnectedGraph
+from aimet_torch.quantsim import QuantizationSimModel, QuantParams
+
+logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.Test)
+
+WIDTH = int(os.environ.get('AIMET_BENCHMARK_WIDTH', 64))
+DEPTH = int(os.environ.get('AIMET_BENCHMARK_DEPTH', 6))
+RESULTS_DIR = os.environ.get('AIMET_BENCHMARK_RESULTS_DIR', './benchmark_results')
+BASELINE_DIR = os.environ.get('AIMET_BENCHMARK_BASELINE_DIR')
+
+IMAGE_SIZE = 32
+BATCH_SIZE = 16
+NUM_IMAGES = 128
+
+
+class SyntheticConvNet(torch.nn.Module):
+    """ Conv - BN - ReLU blocks of a given width and depth, followed by a classifier """
+
+    def __init__(self, width: int, depth: int, num_classes: int = 10):
+        super(SyntheticConvNet, self).__init__()
+
+        layers = [torch.nn.Conv2d(3, width, kernel_size=3, padding=1), torch.nn.BatchNorm2d(width), torch.nn.ReLU()]
+        for _ in range(depth):
+            layers += [torch.nn.Conv2d(width, width, kernel_size=3, padding=1, bias=False),
+                       torch.nn.BatchNorm2d(width), torch.nn.ReLU()]
+
+        self.features = torch.nn.Sequential(*layers)
+        self.pool = torch.nn.AdaptiveAvgPool2d(1)
+        self.fc = torch.nn.Linear(width, num_classes)
+
+    def forward(self, x):
+        x = self.pool(self.features(x))
+        return self.fc(x.view(x.size(0), -1))
+
+
+class OutputSimilarityEvaluator:
+    """ Evaluates a model by how close its outputs are to the outputs of the original model """
+
+    def __init__(self, model: torch.nn.Module, images: torch.Tensor, benchmark: StageBenchmark):
+        self._images = images
+        self._benchmark = benchmark
+        with torch.no_grad():
+            self._reference = model.eval()(images)
+
+    def __call__(self, model: torch.nn.Module, iterations: int, use_cuda: bool = False) -> float:
+        # pylint: disable=unused-argument
+        with self._benchmark.stage('eval'), torch.no_grad():
+            outputs = model.eval()(self._images)
+        error = torch.mean((outputs - self._reference) ** 2) / torch.mean(self._reference ** 2)
+        return max(0.0, 1.0 - float(error))
+
+
+class TestPipelineStageBenchmark(unittest.TestCase):
+    """ Benchmark the stages of the compression and quantization pipelines """
+
+    def setUp(self):
+        torch.manual_seed(0)
+        self.config = {'width': WIDTH, 'depth': DEPTH, 'image_size': IMAGE_SIZE, 'batch_size': BATCH_SIZE}
+        self.input_shape = (1, 3, IMAGE_SIZE, IMAGE_SIZE)
+        self.model = SyntheticConvNet(WIDTH, DEPTH).eval()
+
+        images = torch.rand(NUM_IMAGES, 3, IMAGE_SIZE, IMAGE_SIZE)
+        labels = torch.randint(0, 10, (NUM_IMAGES,))
+        self.data_loader = torch.utils.data.DataLoader(torch.utils.data.TensorDataset(images, labels),
+                                                       batch_size=BATCH_SIZE)
+
+    def _save_and_compare(self, benchmark: StageBenchmark):
+        """ Write the results file and fail on regressions against the baseline, if there is one """
+        regressions = benchmark.save_and_compare(RESULTS_DIR, BASELINE_DIR)
+        self.assertEqual([], regressions)
+
+    def _forward_pass(self, model: torch.nn.Module, _):
+        """ Forward pass over the synthetic data set, used for calibration """
+        with torch.no_grad():
+            for images, _ in self.data_loader:
+                model(images)
+
+    def test_quantization_pipeline(self):
+        """ ConnectedGraph, quantsim construction, calibration and encodings, export """
+        benchmark = StageBenchmark('torch_quantization_pipeline', self.config)
+
+        with benchmark.stage('connected_graph'):
+            ConnectedGraph(self.model, torch.rand(self.input_shape))
+
+        with benchmark.stage('quantsim_construction'):
+            sim = QuantizationSimModel(self.model, input_shapes=self.input_shape)
+
+        def forward_pass(model, args):
+            with benchmark.stage('compute_encodings/calibration'):
+                self._forward_pass(model, args)
+
+        with benchmark.stage('compute_encodings'):
+            sim.compute_encodings(forward_pass, None)
+
+        with tempfile.TemporaryDirectory() as export_dir, benchmark.stage('export'):
+            sim.export(export_dir, 'synthetic', self.input_shape)
+
+        self._save_and_compare(benchmark)
+
+    def test_post_training_pipeline(self):
+        """ Batch norm folding, cross layer equalization and bias correction """
+        benchmark = StageBenchmark('torch_post_training_pipeline', self.config)
+
+        with benchmark.stage('batch_norm_fold'):
+            fold_all_batch_norms(copy.deepcopy(self.model), self.input_shape)
+
+        with benchmark.stage('cross_layer_equalization'):
+            equalize_model(copy.deepcopy(self.model), self.input_shape)
+
+        quant_params = QuantParams(weight_bw=8, act_bw=8, round_mode='nearest',
+                                   quant_scheme=QuantScheme.post_training_tf_enhanced)
+        with benchmark.stage('bias_correction'):
+            correct_bias(copy.deepcopy(self.model), quant_params, num_quant_samples=2 * BATCH_SIZE,
+                         data_loader=self.data_loader, num_bias_correct_samples=2 * BATCH_SIZE)
+
+        self._save_and_compare(benchmark)
+
+    def test_spatial_svd_greedy(self):
+        """ Spatial SVD with greedy compression ratio selection """
+        benchmark = StageBenchmark('torch_spatial_svd_greedy', self.config)
+        evaluator = OutputSimilarityEvaluator(self.model, next(iter(self.data_loader))[0], benchmark)
+
+        greedy_params = GreedySelectionParameters(target_comp_ratio=Decimal(0.5), num_comp_ratio_candidates=4)
+        auto_params = SpatialSvdParameters.AutoModeParams(greedy_params, modules_to_ignore=[self.model.features[0]])
+        params = SpatialSvdParameters(SpatialSvdParameters.Mode.auto, auto_params, multiplicity=8)
+
+        with benchmark.stage('compress_model'):
+            ModelCompressor.compress_model(self.model, eval_callback=evaluator, eval_iterations=1,
+                                           input_shape=self.input_shape,
+                                           compress_scheme=CompressionScheme.spatial_svd, cost_metric=CostMetric.mac,
+                                           parameters=params)
+
+        self._save_and_compare(benchmark)
+
+    def test_channel_pruning_greedy(self):
+        """ Channel pruning with greedy compression ratio selection """
+        benchmark = StageBenchmark('torch_channel_pruning_greedy', self.config)
+        evaluator = OutputSimilarityEvaluator(self.model, next(iter(self.data_loader))[0], benchmark)
+
+        greedy_params = GreedySelectionParameters(target_comp_ratio=Decimal(0.5), num_comp_ratio_candidates=4)
+        auto_params = ChannelPruningParameters.AutoModeParams(greedy_params,
+                                                              modules_to_ignore=[self.model.features[0]])
+        params = ChannelPruningParameters(self.data_loader, num_reconstruction_samples=500,
+                                          allow_custom_downsample_ops=False,
+                                          mode=ChannelPruningParameters.Mode.auto, params=auto_params)
+
+        with benchmark.stage('compress_model'):
+            ModelCompressor.compress_model(self.model, eval_callback=evaluator, eval_iterations=1,
+                                           input_shape=self.input_shape,
+                                           compress_scheme=CompressionScheme.channel_pruning,
+                                           cost_metric=CostMetric.mac, parameters=params)
+
+        self._save_and_compare(benchmark)
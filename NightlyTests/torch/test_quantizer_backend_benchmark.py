@@ -0,0 +1,97 @@
+# /usr/bin/env python3.5
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2020, Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice,
+#     this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its contributors
+#     may be used to endorse or promote products derived from this software
+#     without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+#  SPDX-License-Identifier: BSD-3-Clause
+#
+#  @@-COPYRIGHT-END-@@
+""" Benchmark of the C++ and PyTorch quantizer backends on CPU """
+
+import time
+import unittest
+import torch
+from torchvision import models
+
+from aimet_common.utils import AimetLogger
+from aimet_torch.quantsim import QuantizationSimModel
+
+logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.Test)
+
+
+class TestQuantizerBackendBenchmark(unittest.TestCase):
+    """ Benchmark the quantizer backends against each other """
+
+    def _benchmark_backend(self, model: torch.nn.Module, quant_scheme: str, quantizer_backend: str,
+                           inputs: torch.Tensor):
+        """ Time computing encodings and a quantized forward pass with the given backend """
+        sim = QuantizationSimModel(model, dummy_input=inputs[:1], quant_scheme=quant_scheme,
+                                   quantizer_backend=quantizer_backend)
+
+        start = time.perf_counter()
+        sim.compute_encodings(lambda model, _: model(inputs), None)
+        compute_encodings_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with torch.no_grad():
+            output = sim.model(inputs)
+        forward_time = time.perf_counter() - start
+
+        logger.info('%s, %s backend: compute encodings %.3fs, forward pass %.3fs', quant_scheme, quantizer_backend,
+                    compute_encodings_time, forward_time)
+
+        # pylint: disable=protected-access
+        encodings = {name: quantizer.encoding for name, quantizer in sim._get_named_tensor_quantizers()
+                     if quantizer.enabled}
+        return encodings, output
+
+    def _compare_backends(self, quant_scheme: str):
+        """ Both backends compute the same encodings and outputs for resnet18 """
+        torch.manual_seed(0)
+        model = models.resnet18().eval()
+        inputs = torch.rand(16, 3, 224, 224)
+
+        cpp_encodings, cpp_output = self._benchmark_backend(model, quant_scheme, 'cpp', inputs)
+        torch_encodings, torch_output = self._benchmark_backend(model, quant_scheme, 'torch', inputs)
+
+        self.assertEqual(cpp_encodings.keys(), torch_encodings.keys())
+        for name, encoding in cpp_encodings.items():
+            self.assertEqual((encoding.min, encoding.max), (torch_encodings[name].min, torch_encodings[name].max),
+                             name)
+        self.assertTrue(torch.equal(cpp_output, torch_output))
+
+    def test_tf_enhanced_backends(self):
+        """ TF enhanced """
+        self._compare_backends('tf_enhanced')
+
+    def test_tf_backends(self):
+        """ TF """
+        self._compare_backends('tf')
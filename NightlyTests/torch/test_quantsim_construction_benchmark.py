@@ -0,0 +1,87 @@
+# /usr/bin/env python3.5
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2020, Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice,
+#     this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its contributors
+#     may be used to endorse or promote products derived from this software
+#     without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+#  SPDX-License-Identifier: BSD-3-Clause
+#
+#  @@-COPYRIGHT-END-@@
+""" Benchmark of QuantizationSimModel construction time on ResNet and MobileNet scale models """
+
+import time
+import unittest
+import torch
+from torchvision import models
+
+from aimet_common.utils import AimetLogger
+from aimet_torch.quantsim import QuantizationSimModel
+from aimet_torch.examples.mobilenet import MobileNetV2
+
+logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.Test)
+
+
+class TestQuantsimConstructionBenchmark(unittest.TestCase):
+    """ Benchmark QuantizationSimModel construction """
+
+    def _benchmark_construction(self, model_name: str, model: torch.nn.Module, input_shape: tuple):
+        """ Time construction of the sim model and count the quantizers which allocated native state """
+        model.eval()
+
+        start = time.perf_counter()
+        sim = QuantizationSimModel(model, input_shapes=input_shape)
+        construction_time = time.perf_counter() - start
+
+        # pylint: disable=protected-access
+        named_quantizers = sim._get_named_tensor_quantizers()
+        num_enabled = len([quantizer for _, quantizer in named_quantizers if quantizer.enabled])
+        num_allocated = len([quantizer for _, quantizer in named_quantizers if quantizer._cpp_op is not None])
+
+        logger.info('%s: quantsim construction %.3fs, %d quantizers (%d enabled, %d with native state)',
+                    model_name, construction_time, len(named_quantizers), num_enabled, num_allocated)
+
+        # Quantizers only allocate native state once they are used for stats
+        self.assertEqual(0, num_allocated)
+
+        sim.compute_encodings(lambda model, _: model(torch.rand(input_shape)), None)
+        num_allocated = len([quantizer for _, quantizer in named_quantizers if quantizer._cpp_op is not None])
+        self.assertLessEqual(num_allocated, num_enabled)
+
+    def test_resnet18_construction(self):
+        """ ResNet18 """
+        self._benchmark_construction('resnet18', models.resnet18(), (1, 3, 224, 224))
+
+    def test_resnet50_construction(self):
+        """ ResNet50 """
+        self._benchmark_construction('resnet50', models.resnet50(), (1, 3, 224, 224))
+
+    def test_mobilenet_v2_construction(self):
+        """ MobileNetV2 """
+        self._benchmark_construction('mobilenet_v2', MobileNetV2(), (1, 3, 224, 224))
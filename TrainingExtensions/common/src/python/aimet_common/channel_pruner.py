@@ -38,7 +38,13 @@
 
 """ Channel Pruning functions that are common to both PyTorch and TensorFlow """
 
+from typing import Union
 import numpy as np
+import scipy.linalg
+
+from aimet_common.utils import AimetLogger
+
+logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.ChannelPruning)
 
 
 def select_channels_to_prune(weight_data: np.array
@@ -71,3 +77,84 @@ def select_channels_to_prune(weight_data: np.array
     # get input channel indices to prune
     prune_indices = list(set(all_indices) - set(keep_indices))
     return prune_indices
+
+
+class NormalEquations:
+    """
+    Normal equations (X'X) * W = X'Y of the least squares problem Y = X * W + b, accumulated batch by batch. The
+    memory needed scales with the number of features and targets, not with the number of samples.
+    """
+
+    def __init__(self, num_features: int, num_targets: int, fit_intercept: bool):
+        """
+        :param num_features: number of features, columns of X
+        :param num_targets: number of targets, columns of Y
+        :param fit_intercept: whether to solve for the intercept b
+        """
+        self.fit_intercept = fit_intercept
+        self.num_samples = 0
+
+        # accumulated in double precision, the normal equations square the condition number of X
+        self._xtx = np.zeros((num_features, num_features), dtype=np.float64)
+        self._xty = np.zeros((num_features, num_targets), dtype=np.float64)
+        self._x_sum = np.zeros(num_features, dtype=np.float64)
+        self._y_sum = np.zeros(num_targets, dtype=np.float64)
+
+    def update(self, input_data: np.ndarray, output_data: np.ndarray):
+        """
+        Add a batch of samples to the normal equations
+
+        :param input_data: input data, in the shape of [n_samples, ...] with n_features values per sample
+        :param output_data: output data, in the shape of [n_samples, n_targets]
+        :return:
+        """
+        inp = input_data.reshape(input_data.shape[0], -1).astype(np.float64, copy=False)
+        out = output_data.astype(np.float64, copy=False)
+
+        assert len(out.shape) == 2
+        assert inp.shape[0] == out.shape[0]
+        assert inp.shape[1] == self._xtx.shape[0]
+        assert out.shape[1] == self._xty.shape[1]
+
+        self._xtx += np.matmul(inp.T, inp)
+        self._xty += np.matmul(inp.T, out)
+
+        if self.fit_intercept:
+            self._x_sum += inp.sum(axis=0)
+            self._y_sum += out.sum(axis=0)
+
+        self.num_samples += inp.shape[0]
+
+    def solve(self, ridge: float = 1e-10) -> (np.ndarray, Union[np.ndarray, None]):
+        """
+        Solve the normal equations with a Cholesky factorization. A small ridge keeps the factorization stable for
+        features that are (nearly) linearly dependent, e.g. channels which are always zero. If the factorization still
+        fails, the pseudo-inverse is used instead.
+
+        :param ridge: ridge regularization, relative to the mean of the diagonal of X'X
+        :return: (new weight [n_targets, n_features], new bias [n_targets] or None if no intercept is fit)
+        """
+        assert self.num_samples > 0, 'No samples to solve the normal equations for'
+
+        xtx, xty = self._xtx, self._xty
+
+        if self.fit_intercept:
+            # center X and Y, so that the intercept drops out of the normal equations
+            x_mean = self._x_sum / self.num_samples
+            y_mean = self._y_sum / self.num_samples
+            xtx = xtx - self.num_samples * np.outer(x_mean, x_mean)
+            xty = xty - self.num_samples * np.outer(x_mean, y_mean)
+
+        scale = np.mean(np.diag(xtx))
+        damping = ridge * (scale if scale > 0 else 1.0)
+
+        try:
+            factor = scipy.linalg.cho_factor(xtx + damping * np.eye(xtx.shape[0]))
+            weight = scipy.linalg.cho_solve(factor, xty)
+        except np.linalg.LinAlgError:
+            logger.info("Cholesky factorization failed, solving the normal equations with the pseudo-inverse")
+            weight = np.matmul(np.linalg.pinv(xtx), xty)
+
+        bias = y_mean - np.matmul(x_mean, weight) if self.fit_intercept else None
+
+        return weight.T, bias
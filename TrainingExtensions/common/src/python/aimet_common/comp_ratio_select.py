@@ -191,13 +191,14 @@ class GreedyCompRatioSelectAlgo(CompRatioSelectAlgo):
     @staticmethod
     def _fit_eval_dict_to_monotonic_function(eval_scores_dict):
 
-        for layer in eval_scores_dict:
-            layer_eval_dict = eval_scores_dict[layer]
-            # Convert dict of eval-scores and comp-ratios to lists
-            eval_scores = list(layer_eval_dict.values())
-            comp_ratios = list(layer_eval_dict.keys())
+        # Convert dicts of eval-scores and comp-ratios to lists, and fit the curves of all layers together
+        layers = list(eval_scores_dict.keys())
+        comp_ratios_list = [list(eval_scores_dict[layer].keys()) for layer in layers]
+        eval_scores_list = [list(eval_scores_dict[layer].values()) for layer in layers]
+        fit_results = MonotonicIncreasingCurveFit.fit_multiple(comp_ratios_list, eval_scores_list)
 
-            eval_scores, polynomial_coefficients = MonotonicIncreasingCurveFit.fit(comp_ratios, eval_scores)
+        for layer, comp_ratios, (eval_scores, polynomial_coefficients) in zip(layers, comp_ratios_list, fit_results):
+            layer_eval_dict = eval_scores_dict[layer]
             logger.debug("The coefficients for layer %s are %s", layer, str(polynomial_coefficients))
             # Update the layer_eval_dict
             for index, comp_ratio in enumerate(comp_ratios):
@@ -421,13 +422,14 @@ class GreedyCompRatioSelectAlgo(CompRatioSelectAlgo):
         for comp_ratio in self._comp_ratio_candidates:
             logger.info("Analyzing compression ratio: %s =====================>", comp_ratio)
 
-            # Prune layer given this comp ratio
-            pruned_layer_db = self._pruner.prune_model(self._layer_db,
-                                                       [LayerCompRatioPair(layer, comp_ratio)],
-                                                       self._cost_metric,
-                                                       trainer=None)
+            with AimetLogger.span(AimetLogger.LogAreas.CompRatioSelect, 'evaluate_comp_ratio_candidate', layer.name):
+                # Prune layer given this comp ratio
+                pruned_layer_db = self._pruner.prune_model(self._layer_db,
+                                                           [LayerCompRatioPair(layer, comp_ratio)],
+                                                           self._cost_metric,
+                                                           trainer=None)
 
-            eval_score = self._eval_func(pruned_layer_db.model, self._eval_iter, use_cuda=self._is_cuda)
+                eval_score = self._eval_func(pruned_layer_db.model, self._eval_iter, use_cuda=self._is_cuda)
             layer_wise_eval_scores_dict[comp_ratio] = eval_score
 
             # destroy the layer database
@@ -537,13 +539,14 @@ class TarRankSelectAlgo(CompRatioSelectAlgo):
             comp_ratio = self._cost_calculator.calculate_comp_ratio_given_rank(layer, rank[0], self._cost_metric)
 
             # Eval_score for this comp_ratio
-            pruned_layer_db = self._pruner.prune_model(self._layer_db,
-                                                       [LayerCompRatioPair(layer=layer,
-                                                                           comp_ratio=comp_ratio)],
-                                                       self._cost_metric,
-                                                       None)
-
-            eval_score = self._eval_func(pruned_layer_db.model, self._eval_iter, use_cuda=self._is_cuda)
+            with AimetLogger.span(AimetLogger.LogAreas.CompRatioSelect, 'evaluate_comp_ratio_candidate', layer.name):
+                pruned_layer_db = self._pruner.prune_model(self._layer_db,
+                                                           [LayerCompRatioPair(layer=layer,
+                                                                               comp_ratio=comp_ratio)],
+                                                           self._cost_metric,
+                                                           None)
+
+                eval_score = self._eval_func(pruned_layer_db.model, self._eval_iter, use_cuda=self._is_cuda)
 
             # destroy the layer database
             pruned_layer_db.destroy()
@@ -0,0 +1,270 @@
+# /usr/bin/env python3.5
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2020, Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice,
+#     this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its contributors
+#     may be used to endorse or promote products derived from this software
+#     without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+#  SPDX-License-Identifier: BSD-3-Clause
+#
+#  @@-COPYRIGHT-END-@@
+
+""" Compact binary file format for quantization encodings, written as a stream and read back lazily """
+
+import struct
+from collections.abc import Mapping
+from typing import Dict, List, Union
+
+import numpy as np
+
+# File layout
+#   header : magic (8 bytes), format version (uint32), reserved (uint32)
+#   records: one fixed-size record per encoding, in the order they were written
+#   tensors: one entry per tensor (kind, index of first record, number of records)
+#   names  : null-separated utf-8 tensor names, in the same order as the tensor entries
+#   footer : number of records, number of tensors, size of names (uint64 each), magic (8 bytes)
+COMPACT_ENCODINGS_MAGIC = b'AIMETENC'
+COMPACT_ENCODINGS_VERSION = 1
+
+_HEADER_FORMAT = '<8sII'
+_FOOTER_FORMAT = '<QQQ8s'
+_HEADER_SIZE = struct.calcsize(_HEADER_FORMAT)
+_FOOTER_SIZE = struct.calcsize(_FOOTER_FORMAT)
+
+ENCODING_RECORD_DTYPE = np.dtype([('min', '<f8'),
+                                  ('max', '<f8'),
+                                  ('scale', '<f8'),
+                                  ('offset', '<f8'),
+                                  ('bitwidth', '<i4'),
+                                  ('is_symmetric', 'u1'),
+                                  ('is_valid', 'u1')])
+
+_TENSOR_ENTRY_DTYPE = np.dtype([('kind', 'u1'),
+                                ('first_record', '<u8'),
+                                ('num_records', '<u4')])
+
+ACTIVATION_ENCODINGS = 0
+PARAM_ENCODINGS = 1
+
+
+def is_compact_encodings_file(file_path: str) -> bool:
+    """
+    Checks whether the given file is an encodings file in the compact binary format
+    :param file_path: Path to the encodings file
+    :return: True if the file starts with the compact encodings header, False otherwise
+    """
+    with open(file_path, 'rb') as encodings_file:
+        return encodings_file.read(len(COMPACT_ENCODINGS_MAGIC)) == COMPACT_ENCODINGS_MAGIC
+
+
+class _EncodingsSink:
+    """
+    Write-only, dictionary-like view of one kind of encodings in a CompactEncodingsWriter. Allows code that fills in
+    encoding dictionaries ( encodings[tensor_name] = [encoding] ) to stream to the file instead.
+    """
+
+    def __init__(self, writer: 'CompactEncodingsWriter', kind: int):
+        self._writer = writer
+        self._kind = kind
+
+    def __setitem__(self, tensor_name: str, encodings: List[Union[Dict, None]]):
+        self._writer.write_encodings(self._kind, tensor_name, encodings)
+
+
+class CompactEncodingsWriter:
+    """
+    Writes encodings to the compact binary format. Encoding records are written to the file as they are added, only
+    the (small) tensor name table is held in memory until the writer is closed.
+    """
+
+    def __init__(self, file_path: str):
+        """
+        :param file_path: Path of the encodings file to write
+        """
+        self._file = open(file_path, 'wb')
+        self._file.write(struct.pack(_HEADER_FORMAT, COMPACT_ENCODINGS_MAGIC, COMPACT_ENCODINGS_VERSION, 0))
+        self._num_records = 0
+        self._tensor_entries = []
+        self._tensor_names = []
+
+        self.activation_encodings = _EncodingsSink(self, ACTIVATION_ENCODINGS)
+        self.param_encodings = _EncodingsSink(self, PARAM_ENCODINGS)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def write_encodings(self, kind: int, tensor_name: str, encodings: List[Union[Dict, None]]):
+        """
+        Appends the encodings of a tensor to the file. If a tensor is written more than once, the last write wins.
+        :param kind: ACTIVATION_ENCODINGS or PARAM_ENCODINGS
+        :param tensor_name: Name of the tensor
+        :param encodings: List of encoding dictionaries (as exported to JSON) for the tensor. One per channel.
+        """
+        records = np.zeros(len(encodings), dtype=ENCODING_RECORD_DTYPE)
+        for record, encoding in zip(records, encodings):
+            if encoding:
+                record['min'] = encoding['min']
+                record['max'] = encoding['max']
+                record['scale'] = encoding['scale']
+                record['offset'] = encoding['offset']
+                record['bitwidth'] = encoding['bitwidth']
+                record['is_symmetric'] = str(encoding['is_symmetric']) == 'True'
+                record['is_valid'] = True
+
+        self._file.write(records.tobytes())
+        self._tensor_entries.append((kind, self._num_records, len(encodings)))
+        self._tensor_names.append(tensor_name)
+        self._num_records += len(encodings)
+
+    def close(self):
+        """
+        Writes the tensor table and footer, and closes the file
+        """
+        if self._file.closed:
+            return
+
+        tensor_entries = np.array(self._tensor_entries, dtype=_TENSOR_ENTRY_DTYPE)
+        names = '\0'.join(self._tensor_names).encode('utf-8')
+
+        self._file.write(tensor_entries.tobytes())
+        self._file.write(names)
+        self._file.write(struct.pack(_FOOTER_FORMAT, self._num_records, len(self._tensor_entries), len(names),
+                                     COMPACT_ENCODINGS_MAGIC))
+        self._file.close()
+
+
+class _EncodingsView(Mapping):
+    """
+    Read-only, dictionary-like view of one kind of encodings in a CompactEncodingsReader. Returns the same encoding
+    dictionaries as found in the JSON encodings file. Records are only decoded when looked up.
+    """
+
+    def __init__(self, reader: 'CompactEncodingsReader', kind: int):
+        self._reader = reader
+        self._kind = kind
+        self._tensor_index = None
+
+    def _get_tensor_index(self) -> Dict[str, int]:
+        """ Builds the tensor name to tensor entry lookup on first use """
+        if self._tensor_index is None:
+            # pylint: disable=protected-access
+            self._tensor_index = self._reader._build_tensor_index(self._kind)
+        return self._tensor_index
+
+    def __getitem__(self, tensor_name: str) -> List[Union[Dict, None]]:
+        # pylint: disable=protected-access
+        return self._reader._decode_tensor(self._get_tensor_index()[tensor_name])
+
+    def __contains__(self, tensor_name) -> bool:
+        return tensor_name in self._get_tensor_index()
+
+    def __iter__(self):
+        return iter(self._get_tensor_index())
+
+    def __len__(self) -> int:
+        return len(self._get_tensor_index())
+
+
+class CompactEncodingsReader:
+    """
+    Reads an encodings file in the compact binary format. Encoding records are memory-mapped, so only the encodings
+    that are looked up are read from disk.
+    """
+
+    def __init__(self, file_path: str):
+        """
+        :param file_path: Path of the encodings file to read
+        """
+        with open(file_path, 'rb') as encodings_file:
+            magic, version, _ = struct.unpack(_HEADER_FORMAT, encodings_file.read(_HEADER_SIZE))
+            if magic != COMPACT_ENCODINGS_MAGIC:
+                raise ValueError('{} is not a compact encodings file'.format(file_path))
+            if version != COMPACT_ENCODINGS_VERSION:
+                raise ValueError('Unsupported compact encodings file version {}'.format(version))
+
+            encodings_file.seek(-_FOOTER_SIZE, 2)
+            num_records, num_tensors, names_size, _ = struct.unpack(_FOOTER_FORMAT,
+                                                                    encodings_file.read(_FOOTER_SIZE))
+
+            tensor_table_offset = _HEADER_SIZE + num_records * ENCODING_RECORD_DTYPE.itemsize
+            encodings_file.seek(tensor_table_offset)
+            self._tensor_entries = np.frombuffer(encodings_file.read(num_tensors * _TENSOR_ENTRY_DTYPE.itemsize),
+                                                 dtype=_TENSOR_ENTRY_DTYPE)
+            self._names_buffer = encodings_file.read(names_size)
+
+        if num_records:
+            self._records = np.memmap(file_path, dtype=ENCODING_RECORD_DTYPE, mode='r', offset=_HEADER_SIZE,
+                                      shape=(num_records,))
+        else:
+            self._records = np.zeros(0, dtype=ENCODING_RECORD_DTYPE)
+
+        self._tensor_names = None
+
+        self.activation_encodings = _EncodingsView(self, ACTIVATION_ENCODINGS)
+        self.param_encodings = _EncodingsView(self, PARAM_ENCODINGS)
+
+    def _build_tensor_index(self, kind: int) -> Dict[str, int]:
+        """
+        Builds a lookup from tensor name to the index of its tensor entry, for the given kind of encodings
+        :param kind: ACTIVATION_ENCODINGS or PARAM_ENCODINGS
+        :return: Dictionary of tensor name to tensor entry index
+        """
+        if self._tensor_names is None:
+            self._tensor_names = self._names_buffer.decode('utf-8').split('\0') if self._tensor_entries.size else []
+
+        tensor_index = {}
+        for entry_index in np.flatnonzero(self._tensor_entries['kind'] == kind):
+            tensor_index[self._tensor_names[entry_index]] = entry_index
+        return tensor_index
+
+    def _decode_tensor(self, entry_index: int) -> List[Union[Dict, None]]:
+        """
+        Decodes the encoding records of a tensor into encoding dictionaries
+        :param entry_index: Index of the tensor entry
+        :return: List of encoding dictionaries, None for invalid encodings
+        """
+        entry = self._tensor_entries[entry_index]
+        first_record = int(entry['first_record'])
+        records = self._records[first_record:first_record + int(entry['num_records'])]
+
+        encodings = []
+        for record in records:
+            if record['is_valid']:
+                encodings.append({'min': float(record['min']),
+                                  'max': float(record['max']),
+                                  'scale': float(record['scale']),
+                                  'offset': float(record['offset']),
+                                  'bitwidth': int(record['bitwidth']),
+                                  'is_symmetric': str(bool(record['is_symmetric']))})
+            else:
+                encodings.append(None)
+        return encodings
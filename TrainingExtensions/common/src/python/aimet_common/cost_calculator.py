@@ -37,10 +37,14 @@
 # =============================================================================
 
 """Network and per layer cost calculator"""
+import math
+import weakref
 from decimal import Decimal
 from functools import reduce
 from typing import List, Tuple
 
+import numpy as np
+
 from aimet_common.defs import CostMetric, LayerCompRatioPair
 from aimet_common.layer_database import Layer, Conv2dTypeSpecificParams, LayerDatabase
 from aimet_common.utils import AimetLogger
@@ -73,6 +77,47 @@ class CostCalculator:
     """
     Utility for calculating per layer cost and network cost
     """
+
+    # Cost tables of every layer by cost calculator class, see get_cost_table()
+    _cost_tables = weakref.WeakKeyDictionary()
+
+    @classmethod
+    def get_cost_table(cls, layer: Layer) -> Cost:
+        """
+        Get the compressed costs of a layer for all ranks from 0 to the max rank. The table is computed once per layer
+        and cost calculator, layers are not changed once they are in a layer database.
+        :param layer: Layer
+        :return: Cost holding arrays of memory and mac costs indexed by rank
+        """
+        layer_cost_tables = CostCalculator._cost_tables.setdefault(layer, {})
+        if cls not in layer_cost_tables:
+            ranks = np.arange(cls.calculate_max_rank(layer) + 1, dtype=np.int64)
+
+            # Costs are computed for all ranks at once, as arrays
+            cost = cls.calculate_cost_given_rank(layer, ranks)
+            cost_table = Cost(np.broadcast_to(np.asarray(cost.memory, dtype=np.int64), ranks.shape),
+                              np.broadcast_to(np.asarray(cost.mac, dtype=np.int64), ranks.shape))
+
+            # Rank lookups rely on the costs growing with the rank
+            assert np.all(np.diff(cost_table.memory) >= 0) and np.all(np.diff(cost_table.mac) >= 0)
+            layer_cost_tables[cls] = cost_table
+
+        return layer_cost_tables[cls]
+
+    @classmethod
+    def _get_cost_given_rank(cls, layer: Layer, rank: int) -> Cost:
+        """
+        Look up the compressed cost of a layer for a rank in the cost table of the layer
+        :param layer: Layer
+        :param rank: Rank to split the layer with
+        :return: Compressed cost of the layer after splitting
+        """
+        cost_table = cls.get_cost_table(layer)
+        if 0 <= rank < len(cost_table.memory):
+            return Cost(int(cost_table.memory[rank]), int(cost_table.mac[rank]))
+
+        return cls.calculate_cost_given_rank(layer, rank)
+
     @classmethod
     def get_compressed_model_cost(cls, layer_db, layer_ratio_list, original_model_cost, cost_metric):
         """
@@ -161,10 +206,10 @@ class CostCalculator:
 
         original_cost = CostCalculator.compute_layer_cost(layer)
         if cost_metric == CostMetric.memory:
-            compressed_cost = cls.calculate_cost_given_rank(layer, rank).memory
+            compressed_cost = cls._get_cost_given_rank(layer, rank).memory
             updated_comp_ratio = Decimal(compressed_cost)/Decimal(original_cost.memory)
         else:
-            compressed_cost = cls.calculate_cost_given_rank(layer, rank).mac
+            compressed_cost = cls._get_cost_given_rank(layer, rank).mac
             updated_comp_ratio = Decimal(compressed_cost)/Decimal(original_cost.mac)
         return updated_comp_ratio
 
@@ -180,30 +225,17 @@ class CostCalculator:
         """
 
         orig_cost = CostCalculator.compute_layer_cost(layer)
+        cost_table = cls.get_cost_table(layer)
         if cost_metric == CostMetric.mac:
             target_cost = orig_cost.mac * comp_ratio
+            costs = cost_table.mac
         else:
             target_cost = orig_cost.memory * comp_ratio
+            costs = cost_table.memory
 
-        # Invoke via use of strategy pattern
-        current_rank_candidate = cls.calculate_max_rank(layer)
-
-        if cost_metric == CostMetric.memory:
-            running_cost = cls.calculate_cost_given_rank(layer, current_rank_candidate).memory
-        else:
-            running_cost = cls.calculate_cost_given_rank(layer, current_rank_candidate).mac
-
-        while (running_cost > target_cost) and (current_rank_candidate > 0):
-
-            current_rank_candidate -= 1
-
-            # Invoke via use of strategy pattern
-            cost = cls.calculate_cost_given_rank(layer, current_rank_candidate)
-
-            if cost_metric == CostMetric.memory:
-                running_cost = cost.memory
-            else:
-                running_cost = cost.mac
+        # Costs are integers growing with the rank, so the largest rank with a cost not above the target cost is
+        # found by binary search
+        current_rank_candidate = int(np.searchsorted(costs, math.floor(target_cost), side='right')) - 1
 
         if current_rank_candidate <= 0:
             current_rank_candidate = 1
@@ -222,7 +254,7 @@ class CostCalculator:
 
         # Invoke using the strategy pattern
         rank = cls.calculate_rank_given_comp_ratio(layer, comp_ratio, cost_metric)
-        cost = cls.calculate_cost_given_rank(layer, rank)
+        cost = cls._get_cost_given_rank(layer, rank)
 
         return cost
 
@@ -237,17 +269,17 @@ class CostCalculator:
         :return: Compressed cost
         """
 
-        running_cost = Cost(0, 0)
+        layer_rank_list = []
         for layer_comp_ratio_pair in layer_ratio_list:
             if layer_comp_ratio_pair.comp_ratio is not None:
-                cost = cls.calculate_per_layer_compressed_cost(layer_comp_ratio_pair.layer,
-                                                               layer_comp_ratio_pair.comp_ratio, cost_metric)
+                rank = cls.calculate_rank_given_comp_ratio(layer_comp_ratio_pair.layer,
+                                                           layer_comp_ratio_pair.comp_ratio, cost_metric)
             else:
-                cost = cls.compute_layer_cost(layer_comp_ratio_pair.layer)
+                rank = None
 
-            running_cost += cost
+            layer_rank_list.append((layer_comp_ratio_pair.layer, rank))
 
-        return running_cost
+        return cls.calculate_compressed_cost_given_ranks(_layer_db, layer_rank_list)
 
     @classmethod
     def calculate_compressed_cost_given_ranks(cls, _layer_db: LayerDatabase,
@@ -259,16 +291,19 @@ class CostCalculator:
         :return: Compressed cost
         """
 
-        running_cost = Cost(0, 0)
-        for layer, rank in layer_rank_list:
+        # Gather the cost of every layer, then sum them all at once
+        memory_costs = np.zeros(len(layer_rank_list), dtype=np.int64)
+        mac_costs = np.zeros(len(layer_rank_list), dtype=np.int64)
+        for index, (layer, rank) in enumerate(layer_rank_list):
             if rank:
-                cost = cls.calculate_cost_given_rank(layer, rank)
+                cost = cls._get_cost_given_rank(layer, rank)
             else:
                 cost = cls.compute_layer_cost(layer)
 
-            running_cost += cost
+            memory_costs[index] = cost.memory
+            mac_costs[index] = cost.mac
 
-        return running_cost
+        return Cost(int(memory_costs.sum()), int(mac_costs.sum()))
 
     @staticmethod
     def calculate_cost_given_rank(layer: Layer, rank: int) -> Cost:
@@ -38,7 +38,8 @@
 
 """ Curve-fitting code """
 
-from typing import List
+from collections import OrderedDict
+from typing import List, Tuple
 
 import osqp
 import numpy as np
@@ -61,38 +62,28 @@ class MonotonicIncreasingCurveFit:
             Solves:
             Minimize     1/2 x^T Px - q^Tx
             Subject to   Gx >= 0
-        :param p: The P term
+        :param p: The P term, as a sparse csc matrix
         :param q: The q term
-        :param g: The G term
+        :param g: The G term, as a sparse csc matrix
         :return: The qp solution
         """
         solver = osqp.OSQP()
         upper_constraint = np.inf * np.ones(g.shape[0])
         lower_constraint = np.zeros(g.shape[0])
-        solver.setup(csc_matrix(p), -q, csc_matrix(g), lower_constraint, upper_constraint, verbose=False)
+        solver.setup(p, -q, g, lower_constraint, upper_constraint, verbose=False)
         results = solver.solve()
 
         return results.x
 
-    @classmethod
-    def fit(cls, x_coordinates: Coordinates, y_coordinates: Coordinates) -> (Coordinates, List):
+    @staticmethod
+    def _get_design_matrices(x_coordinates: np.ndarray) -> (np.ndarray, np.ndarray):
         """
-        Takes a set of points in a 2-d line-graph (described using their x and y coordinates) and
-        returns the y-coordinates of a resulting line graph that is constrained to be necessarily monotonically
-        increasing
+        Constructs the phi and psi matrices for a set of x-coordinates
         :param x_coordinates: X-axis coordinates of the input points
-        :param y_coordinates: Y-axis coordinates of the input points
-        :return: Y-axis coordinates of corresponding points in the resulting monotonically increasing graph and the
-                 polynomial coefficients
+        :return: Tuple of phi (polynomial terms at the input points) and psi (derivative terms at the constraint
+                 points) matrices
         """
 
-        # Expect same number of x and y coordinates
-        assert len(x_coordinates) == len(y_coordinates)
-
-        # Convert x and y coordinates into float ndarrays
-        x_coordinates = np.array(x_coordinates, dtype=float)
-        y_coordinates = np.array(y_coordinates, dtype=float)
-
         # To understand the following code, you will need to follow the math in Section 2.1 of the
         # Greedy Compression-Ratio Selection HLD
 
@@ -113,14 +104,68 @@ class MonotonicIncreasingCurveFit:
             # following error: "RecursionError: maximum recursion depth exceeded"
             phi = np.hstack((phi, (x_coordinates ** i).reshape(-1, 1))) # pylint: disable=all
             psi = np.hstack((psi, i * (constraints_x_coordinates ** (i - 1)).reshape(-1, 1))) # pylint: disable=all
-        
-        # Next we calculate G = (phi.T) * phi and a = (phi.T) * Y
-        # where Y is the list of y-coordinate points, and * represents a dot product
 
-        G = np.dot(phi.T, phi)
-        a = np.dot(y_coordinates, phi).reshape((-1))
+        return phi, psi
+
+    @classmethod
+    def fit(cls, x_coordinates: Coordinates, y_coordinates: Coordinates) -> (Coordinates, List):
+        """
+        Takes a set of points in a 2-d line-graph (described using their x and y coordinates) and
+        returns the y-coordinates of a resulting line graph that is constrained to be necessarily monotonically
+        increasing
+        :param x_coordinates: X-axis coordinates of the input points
+        :param y_coordinates: Y-axis coordinates of the input points
+        :return: Y-axis coordinates of corresponding points in the resulting monotonically increasing graph and the
+                 polynomial coefficients
+        """
+
+        return cls.fit_multiple([x_coordinates], [y_coordinates])[0]
+
+    @classmethod
+    def fit_multiple(cls, x_coordinates_list: List[Coordinates],
+                     y_coordinates_list: List[Coordinates]) -> List[Tuple[Coordinates, np.ndarray]]:
+        """
+        Fits several line-graphs, e.g. the eval-score curves of all layers, to monotonically increasing functions.
+        Line-graphs sharing the same x-coordinates share their design matrices. Each line-graph is still solved as its
+        own quadratic program, so the results are the same as fitting it on its own
+        :param x_coordinates_list: X-axis coordinates of the input points, per line-graph
+        :param y_coordinates_list: Y-axis coordinates of the input points, per line-graph
+        :return: Per line-graph, y-axis coordinates of corresponding points in the resulting monotonically increasing
+                 graph and the polynomial coefficients
+        """
+
+        assert len(x_coordinates_list) == len(y_coordinates_list)
+
+        # Group the line-graphs by their x-coordinates
+        graphs_by_x_coordinates = OrderedDict()
+        for index, (x_coordinates, y_coordinates) in enumerate(zip(x_coordinates_list, y_coordinates_list)):
+
+            # Expect same number of x and y coordinates
+            assert len(x_coordinates) == len(y_coordinates)
+
+            x_coordinates = tuple(float(x) for x in x_coordinates)
+            graphs_by_x_coordinates.setdefault(x_coordinates, []).append(index)
+
+        results = [None] * len(x_coordinates_list)
+        for x_coordinates, indices in graphs_by_x_coordinates.items():
+
+            # Convert x and y coordinates into float ndarrays, one row of y-coordinates per line-graph
+            x_coordinates = np.array(x_coordinates, dtype=float)
+            y_coordinates = np.array([y_coordinates_list[index] for index in indices], dtype=float)
+            y_coordinates = y_coordinates.reshape(len(indices), len(x_coordinates))
+
+            phi, psi = cls._get_design_matrices(x_coordinates)
+
+            # Next we calculate G = (phi.T) * phi and a = (phi.T) * Y
+            # where Y is the list of y-coordinate points, and * represents a dot product
+            # G and the constraints only depend on the x-coordinates. The stopping criteria of the solver apply to the
+            # whole problem, so line-graphs are not stacked into one problem, which would loosen the fit of each
+            G = csc_matrix(np.dot(phi.T, phi))
+            psi = csc_matrix(psi)
 
-        polynomial_coefficients = cls._solve_qp(G, a, psi)
-        return_list = list(np.dot(phi, polynomial_coefficients))
+            for index, y in zip(indices, y_coordinates):
+                a = np.dot(phi.T, y)
+                coefficients = cls._solve_qp(G, a, psi)
+                results[index] = (list(np.dot(phi, coefficients)), coefficients)
 
-        return return_list, polynomial_coefficients
+        return results
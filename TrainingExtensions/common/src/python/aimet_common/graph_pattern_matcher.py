@@ -37,12 +37,24 @@
 # =============================================================================
 """ Main class for pattern matcher"""
 
-import sys
+from typing import Dict, FrozenSet, List, Set, Tuple
 
 from aimet_common.utils import AimetLogger
 logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.Utils)
 
 
+def _op_type_matches(op_type: str, pattern_types) -> bool:
+    """
+    Checks if an op type matches one position of a pattern
+    :param op_type: op type
+    :param pattern_types: op type or set of op types at one position of a pattern
+    :return: True if the op type matches
+    """
+    if isinstance(pattern_types, str):
+        return op_type == pattern_types
+    return op_type in pattern_types
+
+
 class PatternType:
     """
     structure to hold pattern data type
@@ -50,22 +62,45 @@ class PatternType:
     def __init__(self, pattern, action):
         """
         PatternType class holds a pattern with a corresponding actions
-        :param pattern: pattern to be searched
+        :param pattern: pattern to be searched, a list holding at each position either an op type or a set of op types
+                        any of which matches at that position
         :param action: action to be applied upon finding pattern
         """
         self.pattern = pattern
         self.action = action
 
+    def matches(self, op_types) -> bool:
+        """
+        Checks if the given sequence of op types matches the pattern
+        :param op_types: list of op types
+        :return: True if the type at every position matches the pattern at that position
+        """
+        if len(op_types) != len(self.pattern):
+            return False
+
+        for op_type, pattern_types in zip(op_types, self.pattern):
+            if not _op_type_matches(op_type, pattern_types):
+                return False
+
+        return True
+
 
 class PatternMatcher:
     """
-    A pattern matcher class that performs custom sub graph matches
+    A pattern matcher class that performs custom sub graph matches.
+
+    The patterns are compiled once into an automaton over op types, in the manner of Aho-Corasick. Each state of the
+    automaton is the set of (pattern index, number of matched positions) pairs that are still alive after the op types
+    pushed so far, so pushing one op type is a single table lookup, and every state knows which patterns end at it.
     """
 
+    # State of the automaton before any op type has been pushed
+    initial_state = 0
+
     def __init__(self, patterns_and_callbacks):
         """
         initializes params required for pattern matching
-        :param patterns_and_callbacks:
+        :param patterns_and_callbacks: list of PatternType elements, the order of elements serves as the match priority
         """
 
         # list of PatternType elements
@@ -73,6 +108,12 @@ class PatternMatcher:
         self.patterns = patterns_and_callbacks
         self.pattern_match_length = self.get_pattern_max_length()
 
+        # Transitions of every state, op types missing from a state's table lead back to the initial state
+        self._transitions = []  # type: List[Dict[str, int]]
+        # Patterns ending at every state as (pattern, match length), one pattern per length, longest first
+        self._state_matches = []  # type: List[List[Tuple[PatternType, int]]]
+        self._compile()
+
     def get_pattern_max_length(self):
         """
         computes the length of longest pattern
@@ -86,89 +127,72 @@ class PatternMatcher:
 
         return max_len
 
-    def _get_pattern_min_length(self):
+    def _compile(self):
         """
-        computes the length of shortest pattern
-        :return: min length among the pattern list provided
+        Builds the states and transitions of the automaton for all patterns, by following every op type the patterns
+        refer to from every reachable state
         """
-
-        min_len = sys.maxsize
+        op_types = set()
         for item in self.patterns:
-            if len(item.pattern) < min_len:
-                min_len = len(item.pattern)
+            for pattern_types in item.pattern:
+                op_types.update({pattern_types} if isinstance(pattern_types, str) else pattern_types)
 
-        if min_len == sys.maxsize:
-            min_len = 1
+        state_ids = {}  # type: Dict[FrozenSet[Tuple[int, int]], int]
+        state_items = []  # type: List[FrozenSet[Tuple[int, int]]]
 
-        return min_len
+        def get_state_id(items: FrozenSet[Tuple[int, int]]) -> int:
+            if items not in state_ids:
+                state_ids[items] = len(state_items)
+                state_items.append(items)
+                self._transitions.append({})
+                self._state_matches.append(self._get_state_matches(items))
+            return state_ids[items]
 
-    def _get_matched_sliced_pattern(self, s_pattern):
-        """
-        compare sliced pattern against all reference patterns
-        :param s_pattern: sliced pattern to be matched against reference pattern set
-        :return: bool, pattern_with_callback
-        """
-        pattern_with_callback = None
+        get_state_id(frozenset())
+
+        # Every pattern may start a new match at any op, so partial matches of length 0 are part of every state
+        empty_matches = [(index, 0) for index, item in enumerate(self.patterns) if item.pattern]
 
-        for pattern_with_callback in self.patterns:
-            if s_pattern == pattern_with_callback.pattern:
-                return True, pattern_with_callback
+        state = 0
+        while state < len(state_items):
+            alive_matches = [(index, length) for index, length in state_items[state]
+                             if length < len(self.patterns[index].pattern)]
+            for op_type in op_types:
+                next_items = frozenset((index, length + 1) for index, length in alive_matches + empty_matches
+                                       if _op_type_matches(op_type, self.patterns[index].pattern[length]))
+                if next_items:
+                    self._transitions[state][op_type] = get_state_id(next_items)
+            state += 1
 
-        return False, pattern_with_callback
+        logger.debug('Compiled %d patterns into %d states', len(self.patterns), len(state_items))
 
-    def _get_all_sliced_patterns_and_match(self, pattern):
+    def _get_state_matches(self, items: FrozenSet[Tuple[int, int]]) -> List[Tuple[PatternType, int]]:
         """
-        helper function that slices the pattern passed and matches it against reference set of patterns
-        :param pattern: pattern to be matched
-        :return: dictionary of matched pattern/ sliced patterns
+        Finds the patterns completely matched in a state. Where several patterns of the same length match, only the
+        first pattern in priority order is reported, as only one pattern is matched per sliced pattern.
+        :param items: (pattern index, number of matched positions) pairs of the state
+        :return: list of matched pattern and match length, longest first
         """
-        index_patterns = []
-        match_start_indices_patterns = {}
+        first_pattern_per_length = {}
+        for index, length in items:
+            if length == len(self.patterns[index].pattern):
+                first_pattern_per_length[length] = min(index, first_pattern_per_length.get(length, index))
 
-        slice_len = len(pattern)
+        return [(self.patterns[first_pattern_per_length[length]], length)
+                for length in sorted(first_pattern_per_length, reverse=True)]
 
-        # Example to describe the match algorithm implemented below.
-        # if max pattern length is 4
-        # and we receive a pattern [OP_X, BN, CONV, OP_X] to be matched
-        # we slice it into sub patterns below:
-        # [OP_X, BN, CONV, OP_X],
-        # [OP_X, BN, CONV,], [BN, CONV, OP_X],
-        # [OP_X BN], [BN, CONV],
-        # [OP_X],[BN], [Conv]
-        # We accumulate all matches and the start offsets.
-        # Suppose the "reference patterns" to be matched against were :
-        # [OP_X, BN, CONV, OP_X], [OP_X] [BN, CONV]
-        # This method returns matched patterns and corresponding list of
-        # starting offset in the pattern provided.
-        # Example output :
-        # [OP_X, BN, CONV, OP_X] pattern with offset 0,
-        # [OP_X] pattern with offset[0, 3] and
-        # [BN, CONV] with offset [1]
-        # Return type would be a dictionary with
-        # Keys of type 'PatternType', values are a list of start offset indices.
-
-        minimum_slice_length = self._get_pattern_min_length()
-        while slice_len >= minimum_slice_length:
-            for i in range(0, len(pattern)):
-                if i+slice_len <= len(pattern):
-                    sliced_pattern = pattern[slice(i, i+slice_len)]
-                    logger.debug('.. sliced pattern %s ', sliced_pattern)
-                    logger.debug('... sliced pattern start_index %s ', i)
-                    found_match, matched_pattern = self._get_matched_sliced_pattern(sliced_pattern)
-                    if found_match:
-                        if matched_pattern not in match_start_indices_patterns.keys():
-                            index_set = {i}
-                            match_start_indices_patterns[matched_pattern] = index_set
-                            index_patterns.append(matched_pattern.pattern)
-                        else:
-                            indices = match_start_indices_patterns[matched_pattern]
-                            indices.add(i)
-                            match_start_indices_patterns[matched_pattern] = indices
-            slice_len = slice_len-1
-
-        return match_start_indices_patterns
-
-    def get_matching_patterns(self, sliding_window_op_type_pattern):
+    def match_next_op_type(self, state: int, op_type: str) -> Tuple[int, List[Tuple[PatternType, int]]]:
+        """
+        Pushes one op type into the automaton
+        :param state: state reached after the preceding op types, initial_state if there are none
+        :param op_type: type of the op pushed
+        :return: state reached after the op type, and list of patterns which end at the op with their match lengths,
+                 longest first
+        """
+        next_state = self._transitions[state].get(op_type, self.initial_state)
+        return next_state, self._state_matches[next_state]
+
+    def get_matching_patterns(self, sliding_window_op_type_pattern) -> Dict[PatternType, Set[int]]:
         """
         matches the pattern and its sliced forms with reference patterns
         :param sliding_window_op_type_pattern: ops to be searched as op types sliding window (list)
@@ -176,11 +200,26 @@ class PatternMatcher:
         their start offsets in the pattern.
         """
 
-        # we slice the given sub pattern and then compare against reference pattern set
-        matched_patterns_start_indices = self._get_all_sliced_patterns_and_match(sliding_window_op_type_pattern)
-
-        if matched_patterns_start_indices:
-            return matched_patterns_start_indices
+        # Example of the matches found.
+        # Suppose the "reference patterns" to be matched against were :
+        # [OP_X, BN, CONV, OP_X], [OP_X] [BN, CONV]
+        # and we receive a pattern [OP_X, BN, CONV, OP_X] to be matched.
+        # The matches ending at every op in the pattern are read off the automaton:
+        # [OP_X, BN, CONV, OP_X] pattern with offset 0,
+        # [OP_X] pattern with offset[0, 3] and
+        # [BN, CONV] with offset [1]
+        # Return type would be a dictionary with
+        # Keys of type 'PatternType', values are a set of start offset indices, in order of match length and offset.
+        matches = []
+        state = self.initial_state
+        for end, op_type in enumerate(sliding_window_op_type_pattern):
+            state, matched_patterns = self.match_next_op_type(state, op_type)
+            for matched_pattern, length in matched_patterns:
+                matches.append((-length, end - length + 1, matched_pattern))
+
+        matched_patterns_start_indices = {}
+        for _, start, matched_pattern in sorted(matches, key=lambda match: match[:2]):
+            matched_patterns_start_indices.setdefault(matched_pattern, set()).add(start)
 
         return matched_patterns_start_indices
 
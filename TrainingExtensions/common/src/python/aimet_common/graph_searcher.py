@@ -37,129 +37,72 @@
 # =============================================================================
 """ Main class for pattern match based graph searcher"""
 
-import itertools
-from collections import deque
+from collections import namedtuple
 from aimet_common.graph_pattern_matcher import PatternMatcher
 from aimet_common.utils import AimetLogger
 
 logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.Utils)
 
-
-class SlidingWindow:
-    """
-    Sliding window class implements a sliding window deque and provides api to update it's state
-    """
-
-    def __init__(self, window_size):
-        """
-        initializes params required for pattern matching
-        :param window_size: max length of sliding window
-        """
-        # deque structure will be sized based on length provided
-        self.current_op_window = deque(maxlen=window_size)
-
-    def get_sub_graph_type_pattern_2(self) -> list:
-        """
-         sub_graph is stored as deque of ops
-         this api converts it to list of op typ strings to aid with pattern matching
-        :return: list of op types of the ops in the op_types_in_sliding_window deque.
-        """
-
-        return [op.type for op in self.current_op_window]
-
-    def get_sub_graph_type_pattern(self) -> list:
-        """
-         sub_graph is stored as deque of ops
-         this api converts it to list of op typ strings to aid with pattern matching
-        :return: list of op types of the ops in the op_types_in_sliding_window deque.
-        """
-
-        return [op.type for op in self.current_op_window]
-
-    def append_to_sliding_window(self, op) -> None:
-        """
-        appends op provided to op_types_in_sliding_window deque.
-        :param op: Connected graph op type
-        :return: None
-        """
-
-        assert op is not None, 'Error, op passed to append_to_sliding_window is None'
-        self.current_op_window.append(op)
-
-    def remove_op_from_sliding_window(self, op) -> None:
-        """
-        removes op provided from sliding_window deque.
-        :param op: Connected graph op type
-        :return: None
-        """
-
-        self.current_op_window.remove(op)
-
-    def get_op_sliding_window(self) -> deque:
-        """
-        returns op_types_in_sliding_window
-        :return: current op sliding window
-        """
-        return self.current_op_window
+# Window of a search branch: a tuple of the last ops on the branch, at most as many as the longest pattern, and the
+# pattern matcher state reached at the last of them. Windows are immutable and shared by the consumers of an op, so
+# every branch has its own window.
+_BranchWindow = namedtuple('_BranchWindow', ['ops', 'matcher_state'])
 
 
 class GraphSearcher:
     """
     Graph searcher class performs graph search on connected graph.
-    It uses SlidingWindow to maintain the search window and PatternMatcher to match sub graph patterns.
+    It walks the graph depth first from the model inputs, visiting every op once. PatternMatcher matches the op types
+    of each branch against all patterns at once as an automaton, whose state is kept per branch together with the last
+    ops of the branch, so a match never mixes ops of different branches.
     """
 
     def __init__(self, conn_graph, patterns_with_callback):
         """
         initializes params required for pattern matching
+        :param conn_graph: torch or tf connected graph to be searched
         :param patterns_with_callback: patterns with corresponding call back functions
         """
         self._connected_graph = conn_graph
         self._patterns_with_callbacks = patterns_with_callback
-        self.sliding_window = None
 
-    def _find_patterns_apply_actions(self, op,
-                                     pattern_matcher: PatternMatcher,
-                                     visited_nodes) -> None:
+    @staticmethod
+    def _find_patterns_apply_actions(op, pattern_matcher: PatternMatcher, visited_nodes) -> None:
         """
-        Finds all patterns in the graph using DFS with sliding window based pattern matcher
+        Finds all patterns in the graph reachable from the op using an iterative DFS. The pattern matcher state is kept
+        per branch, so ops of a branch which has been searched do not leak into the window of the next branch.
         :param op: starting op as connected graph op
         :param pattern_matcher: pattern matcher instance
-        :param visited_nodes: list of ops visited to avoid loops during search
+        :param visited_nodes: set of ops visited to avoid loops during search
         :return: None
         """
 
-        if op and op in visited_nodes:
-            return
-
-        # sliding window stores the op and the type
-        self.sliding_window.append_to_sliding_window(op)
-        op_types_sliding_window = self.sliding_window.get_sub_graph_type_pattern()
-
-        # we get the index in the sliding window and the matched pattern back from pattern matcher
-        matched_patterns_start_indices_dict = pattern_matcher.get_matching_patterns(op_types_sliding_window)
-
-        if matched_patterns_start_indices_dict:
-            for matched_pattern in matched_patterns_start_indices_dict.keys():
-                for i in matched_patterns_start_indices_dict[matched_pattern]:
-                    # we need to call appropriate handler here based on the matched length and the starting op type
-                    op_subset = list(itertools.islice(self.sliding_window.get_op_sliding_window(), i,
-                                                      i+len(matched_pattern.pattern)))
-                    logger.info('...... subset to store %s', op_subset)
-                    matched_pattern.action(matched_pattern, op_subset)
-
-        # mark visited node
-        visited_nodes.add(op)
-
-        # recursively call if op has children
-        # move the op_sliding_window if output ops found ; continue DFS
-        if op.output:
-            for consumer in op.output.consumers:
-                GraphSearcher._find_patterns_apply_actions(self, consumer, pattern_matcher,
-                                                           visited_nodes)
-        # Done with the op, if this op in sliding window, remove it
-        if op in self.sliding_window.current_op_window:
-            self.sliding_window.remove_op_from_sliding_window(op)
+        window_size = max(pattern_matcher.get_pattern_max_length(), 1)
+
+        # ops still to be visited, with the window of the branch leading to them
+        ops_to_visit = [(op, _BranchWindow((), PatternMatcher.initial_state))]
+
+        while ops_to_visit:
+            op, previous_window = ops_to_visit.pop()
+            if op in visited_nodes:
+                continue
+
+            # mark visited node
+            visited_nodes.add(op)
+
+            matcher_state, matched_patterns = pattern_matcher.match_next_op_type(previous_window.matcher_state, op.type)
+            window = _BranchWindow((previous_window.ops + (op,))[-window_size:], matcher_state)
+
+            for matched_pattern, match_length in matched_patterns:
+                op_subset = list(window.ops[-match_length:])
+                logger.debug('...... subset to store %s', op_subset)
+                matched_pattern.action(matched_pattern, op_subset)
+
+            # continue DFS with the children of the op, pushed in reverse so the first consumer is visited first
+            if op.output:
+                for consumer in reversed(op.output.consumers):
+                    if consumer not in visited_nodes:
+                        ops_to_visit.append((consumer, window))
 
     def find_all_patterns_in_graph_apply_actions(self):
         """
@@ -175,13 +118,11 @@ class GraphSearcher:
 
         visited_nodes = set()
 
-        # define pattern matcher for graph search and set the sliding window length
+        # define pattern matcher for graph search
         pattern_matcher = PatternMatcher(self._patterns_with_callbacks)
-        self.sliding_window = SlidingWindow(pattern_matcher.get_pattern_max_length())
 
         # find layers of interest
         for op in input_nodes:
 
-            # perform DFS with sliding window
-            GraphSearcher._find_patterns_apply_actions(self, op, pattern_matcher,
-                                                       visited_nodes)
+            # perform DFS
+            GraphSearcher._find_patterns_apply_actions(op, pattern_matcher, visited_nodes)
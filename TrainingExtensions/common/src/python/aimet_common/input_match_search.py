@@ -309,43 +309,86 @@ class InputMatchSearch:
 
         assert input_data.shape[0] == output_data.shape[0]
 
-        batch_size = output_data.shape[0]
+        heights, widths = cls.select_output_pixels(layer_attributes, output_data.shape, samples_per_image)
 
-        sampled_input = []
-        sampled_output = []
+        sampled_input = cls.subsample_input_data(layer_attributes, input_data, heights, widths)
+        sampled_output = cls.subsample_output_data(output_data, heights, widths)
+
+        return sampled_input, sampled_output
 
+    @classmethod
+    def select_output_pixels(cls, layer_attributes: tuple, out_shape: tuple, samples_per_image: int) \
+            -> (np.ndarray, np.ndarray):
+        """
+        Function randomly picks the output pixels to sub sample for every image of a batch
+
+        :param layer_attributes: (kernel_size, stride, padding)
+        :param out_shape: shape of the output data (Ns, Noc, act_h, act_w)
+        :param samples_per_image: number of samples per image
+        :return: heights and widths of the picked output pixels, both of shape (Ns, samples_per_image)
+        """
         height_range, width_range = cls._determine_output_pixel_height_width_range_for_random_selection(
-            layer_attributes=layer_attributes, out_shape=output_data.shape)
+            layer_attributes=layer_attributes, out_shape=out_shape)
+
+        heights = []
+        widths = []
 
-        # TODO: The PyLint RecursionError that needs to be investigated occurs from this code onwards
         # iterate over all images in one batch
-        for image_index in range(batch_size):
+        for _ in range(out_shape[0]):
 
             # randomly pick samples per image for height and width dimension
-            heights = np.random.choice(range(*height_range), size=[samples_per_image], replace=True)
-            widths = np.random.choice(range(*width_range), size=[samples_per_image], replace=True)
+            heights.append(np.random.choice(range(*height_range), size=[samples_per_image], replace=True))
+            widths.append(np.random.choice(range(*width_range), size=[samples_per_image], replace=True))
 
-            # iterate over all samples
-            for sample in range(samples_per_image):
+        return np.array(heights).reshape(out_shape[0], samples_per_image), \
+            np.array(widths).reshape(out_shape[0], samples_per_image)
 
-                # output pixel
-                output_pixel = (heights[sample], widths[sample])
+    @classmethod
+    def subsample_input_data(cls, layer_attributes: tuple, input_data: np.ndarray, heights: np.ndarray,
+                             widths: np.ndarray) -> np.ndarray:
+        """
+        Function collects the input matches of the given output pixels
+
+        :param layer_attributes: (kernel_size, stride, padding)
+        :param input_data: input data (Ns, Nic, act_h, act_w)
+        :param heights: heights of output pixels (Ns, samples per image)
+        :param widths: widths of output pixels (Ns, samples per image)
+        :return: sampled input (Ns * samples per image, Nic, kh, kw)
+        """
+        sampled_input = []
+
+        # TODO: The PyLint RecursionError that needs to be investigated occurs from this code onwards
+        # iterate over all images in one batch
+        for image_index in range(heights.shape[0]):
+
+            # iterate over all samples
+            for height, width in zip(heights[image_index], widths[image_index]):
 
                 # find input match for given output pixel
                 input_match = cls._find_input_match_for_output_pixel(input_data[image_index], layer_attributes,
-                                                                     output_pixel)
-                # find output match for given output pixel
-                output_match = output_data[image_index, :, heights[sample], widths[sample]]
-
+                                                                     (height, width))
                 sampled_input.append(input_match)
-                sampled_output.append(output_match)
 
         sampled_input = np.array(sampled_input)
-        sampled_output = np.vstack(sampled_output)
 
         # shape of sampled input should be [Nb * Ns, Nic, kh, kw]
         assert len(sampled_input.shape) == 4
-        # shape of sampled output should be [Nb * Ns, Noc]
-        assert len(sampled_output.shape) == 2
 
-        return sampled_input, sampled_output
+        return sampled_input
+
+    @staticmethod
+    def subsample_output_data(output_data: np.ndarray, heights: np.ndarray, widths: np.ndarray) -> np.ndarray:
+        """
+        Function collects the output data at the given output pixels
+
+        :param output_data: output data (Ns, Noc, act_h, act_w)
+        :param heights: heights of output pixels (Ns, samples per image)
+        :param widths: widths of output pixels (Ns, samples per image)
+        :return: sampled output (Ns * samples per image, Noc)
+        """
+        image_indices = np.arange(heights.shape[0])[:, np.newaxis]
+
+        # advanced indexing of the batch, height and width axes puts the channel axis last
+        sampled_output = output_data[image_indices, :, heights, widths]
+
+        return sampled_output.reshape(-1, output_data.shape[1])
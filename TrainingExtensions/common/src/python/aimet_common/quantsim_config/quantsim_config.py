@@ -39,7 +39,7 @@
 
 from abc import ABC, abstractmethod
 import os
-from typing import List
+from typing import List, Set
 from aimet_common.connected_graph.operation import Op
 from aimet_common.graph_pattern_matcher import PatternType
 from aimet_common.quantsim_config.json_config_importer import JsonConfigImporter, ConfigDictKeys, DefaultsType, \
@@ -140,11 +140,8 @@ class QuantSimConfigurator(ABC):
         :return: List of PatternTypes holding supergroup ops and callback for when the supergroup is found
         """
         op_list = supergroup_config[ConfigDictKeys.OP_LIST]
-        list_of_permutations = _build_list_of_permutations(op_list, onnx_conn_graph_type_mapper)
-        list_of_patterns = []
-        for permutation in list_of_permutations:
-            list_of_patterns.append(PatternType(pattern=permutation, action=callback))
-        return list_of_patterns
+        pattern = _build_pattern_of_type_sets(op_list, onnx_conn_graph_type_mapper)
+        return [PatternType(pattern=pattern, action=callback)]
 
     @abstractmethod
     def _set_supergroup_configs(self, supergroups_configs: List[SupergroupType]):
@@ -168,35 +165,22 @@ class QuantSimConfigurator(ABC):
         """
 
 
-def _build_list_of_permutations(op_list: List[str], onnx_conn_graph_type_mapper: OnnxConnectedGraphTypeMapper) \
-        -> List[List[str]]:
+def _build_pattern_of_type_sets(op_list: List[str], onnx_conn_graph_type_mapper: OnnxConnectedGraphTypeMapper) \
+        -> List[Set[str]]:
     """
     Given a list of onnx op types, where each onnx op type could potentially map to multiple connected graph types,
-    create a list of all permutations of lists of connected graph types that would satisfy the same ordering as the
-    original onnx op type list.
+    create a pattern holding at each position the set of connected graph types that the onnx op type at that position
+    maps to. A sequence of connected graph ops matches the pattern if the type of each op is in the set at its
+    position, so one pattern covers all orderings of connected graph types satisfying the onnx op type list.
     For example, for an onnx op type "o1" that maps to two connected graph types "c1_1" and
-    "c1_2", and an onnx op type "o2" that maps to two connected graph types "c2_1" and "c2_2", all permutations of
-    ["o1", "o2"] would lead to ["c1_1", "c2_1"], ["c1_1", "c2_2"], ["c1_2", "c2_1"], and ["c1_2", "c2_2"].
+    "c1_2", and an onnx op type "o2" that maps to two connected graph types "c2_1" and "c2_2", ["o1", "o2"] would lead
+    to [{"c1_1", "c1_2"}, {"c2_1", "c2_2"}], matching ["c1_1", "c2_1"], ["c1_1", "c2_2"], ["c1_2", "c2_1"], and
+    ["c1_2", "c2_2"].
     :param op_list: List of onnx op types
     :param onnx_conn_graph_type_mapper: Class that provides utilities for mapping onnx op types to connected graph types
-    :return: List of permutations of connected graph op types satisfying the ordering specified by op_list onnx types
+    :return: List of sets of connected graph op types, one per onnx op type in op_list
     """
-    # base case, return list of lists of connected graph ops corresponding to the only op in the list
-    if len(op_list) == 1:
-        permutations_of_op_list = []
-        conn_graph_types_of_current_op = onnx_conn_graph_type_mapper.get_conn_graph_type_from_onnx_type(op_list[0])
-        for op in conn_graph_types_of_current_op:
-            permutations_of_op_list.append([op])
-        return permutations_of_op_list
-
-    permutations_of_op_list = []
-    permutations_of_succeeding_ops = _build_list_of_permutations(op_list[1:], onnx_conn_graph_type_mapper)
-    conn_graph_types_of_current_op = onnx_conn_graph_type_mapper.get_conn_graph_type_from_onnx_type(op_list[0])
-    for op in conn_graph_types_of_current_op:
-        for permutation in permutations_of_succeeding_ops:
-            new_permutation = [op] + permutation
-            permutations_of_op_list.append(new_permutation)
-    return permutations_of_op_list
+    return [frozenset(onnx_conn_graph_type_mapper.get_conn_graph_type_from_onnx_type(op)) for op in op_list]
 
 
 def get_setting_type(setting_name: str) -> str:
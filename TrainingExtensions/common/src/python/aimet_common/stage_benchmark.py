@@ -0,0 +1,182 @@
+# /usr/bin/env python3.5
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2020, Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice,
+#     this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its contributors
+#     may be used to endorse or promote products derived from this software
+#     without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+#  SPDX-License-Identifier: BSD-3-Clause
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+
+""" Records wall time and peak memory of the stages of compression and quantization pipelines for benchmarking """
+
+import contextlib
+import json
+import os
+import platform
+import time
+from typing import Dict, List
+
+from aimet_common.utils import AimetLogger, PeakRssSampler
+
+logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.Utils)
+
+_BYTES_PER_MB = 1024 * 1024
+
+
+class StageBenchmark:
+    """
+    Records the wall time and peak resident memory of named stages of a pipeline, writes them to a JSON results file
+    and compares them against the results file of a baseline run
+    """
+
+    def __init__(self, name: str, config: Dict = None, sampling_interval: float = 0.005):
+        """
+        :param name: Name of the benchmark, also used as the name of its results file
+        :param config: Configuration of the benchmark (e.g. model width and depth), stored with the results
+        :param sampling_interval: Interval in seconds at which the resident memory is sampled during a stage
+        """
+        self.name = name
+        self.config = dict(config) if config else {}
+        self.stages = {}
+        self._sampling_interval = sampling_interval
+
+    @contextlib.contextmanager
+    def stage(self, stage_name: str):
+        """
+        Context manager recording the wall time and peak resident memory of the code it wraps. Stages may be nested.
+        A stage that is entered several times accumulates its wall time and keeps the highest peak memory.
+
+        :param stage_name: Name of the stage
+        """
+        with PeakRssSampler(self._sampling_interval) as sampler:
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                wall_time = time.perf_counter() - start
+
+        record = self.stages.setdefault(stage_name, {'wall_time_s': 0.0, 'peak_rss_mb': 0.0, 'calls': 0})
+        record['wall_time_s'] += wall_time
+        record['peak_rss_mb'] = max(record['peak_rss_mb'], sampler.peak / _BYTES_PER_MB)
+        record['calls'] += 1
+
+        logger.info('Benchmark %s, stage %s: %.3fs, peak RSS %.1f MB', self.name, stage_name, wall_time,
+                    sampler.peak / _BYTES_PER_MB)
+
+    def to_dict(self) -> Dict:
+        """
+        :return: Results of the benchmark, as written to the results file
+        """
+        return {'benchmark': self.name,
+                'config': self.config,
+                'environment': {'python': platform.python_version(),
+                                'platform': platform.platform(),
+                                'cpu_count': os.cpu_count()},
+                'stages': self.stages}
+
+    def save(self, results_dir: str) -> str:
+        """
+        Write the results of the benchmark to <results_dir>/<name>.json
+
+        :param results_dir: Directory to write the results file to
+        :return: Path of the results file
+        """
+        os.makedirs(results_dir, exist_ok=True)
+        path = os.path.join(results_dir, self.name + '.json')
+
+        with open(path, 'w') as results_file:
+            json.dump(self.to_dict(), results_file, indent=4)
+
+        return path
+
+    def compare_to_baseline(self, baseline: Dict, time_tolerance: float = 0.25, rss_tolerance: float = 0.25,
+                            min_time_difference: float = 0.05) -> List[str]:
+        """
+        Compare the stages of this benchmark with the stages of a baseline run. Stages that are missing in either run
+        are not compared.
+
+        :param baseline: Results of the baseline run, as read from its results file
+        :param time_tolerance: Allowed relative increase of the wall time of a stage
+        :param rss_tolerance: Allowed relative increase of the peak resident memory of a stage
+        :param min_time_difference: Increases of the wall time of a stage below this many seconds are not reported,
+               to ignore noise on short stages
+        :return: Descriptions of the stages that regressed, empty if none did
+        """
+        if baseline.get('config') != self.config:
+            logger.warning('Benchmark %s: baseline was recorded with config %s, this run uses %s', self.name,
+                           baseline.get('config'), self.config)
+
+        regressions = []
+
+        for stage_name, record in self.stages.items():
+            baseline_record = baseline.get('stages', {}).get(stage_name)
+            if baseline_record is None:
+                continue
+
+            baseline_time, current_time = baseline_record['wall_time_s'], record['wall_time_s']
+            if current_time > baseline_time * (1 + time_tolerance) and \
+                    current_time - baseline_time > min_time_difference:
+                regressions.append('{}: wall time {:.3f}s, baseline {:.3f}s'.format(stage_name, current_time,
+                                                                                     baseline_time))
+
+            baseline_rss, current_rss = baseline_record['peak_rss_mb'], record['peak_rss_mb']
+            if current_rss > baseline_rss * (1 + rss_tolerance):
+                regressions.append('{}: peak RSS {:.1f} MB, baseline {:.1f} MB'.format(stage_name, current_rss,
+                                                                                       baseline_rss))
+
+        for regression in regressions:
+            logger.warning('Benchmark %s regressed, %s', self.name, regression)
+
+        return regressions
+
+    def save_and_compare(self, results_dir: str, baseline_dir: str = None, **tolerances) -> List[str]:
+        """
+        Write the results file and compare against the baseline results file of the same name in baseline_dir, if
+        there is one
+
+        :param results_dir: Directory to write the results file to
+        :param baseline_dir: Directory with the results files of the baseline run, None to skip the comparison
+        :param tolerances: Tolerances passed on to compare_to_baseline()
+        :return: Descriptions of the stages that regressed, empty if none did or if there is no baseline
+        """
+        path = self.save(results_dir)
+        logger.info('Benchmark %s: results written to %s', self.name, path)
+
+        baseline_path = os.path.join(baseline_dir, self.name + '.json') if baseline_dir else None
+        if baseline_path is None or not os.path.isfile(baseline_path):
+            logger.info('Benchmark %s: no baseline to compare against', self.name)
+            return []
+
+        with open(baseline_path) as baseline_file:
+            baseline = json.load(baseline_file)
+
+        return self.compare_to_baseline(baseline, **tolerances)
@@ -38,17 +38,23 @@
 """ Utility classes and functions that are used by NightlyTests files as well as
     common to both PyTorch and TensorFlow. """
 
+import abc
+import atexit
+import contextlib
 import math
 import os
 import logging
 import logging.config
 import logging.handlers
 import json
+import resource
 import signal
 import socket
 import subprocess
+import threading
 import time
 from enum import Enum
+from typing import Dict
 
 try:
     # The build system updates Product, Version and Feature set information in the package_info file.
@@ -90,10 +96,197 @@ class SingletonType(type):
         return cls._instances[cls]
 
 
+def get_current_rss() -> int:
+    """
+    Get the resident set size of this process
+
+    :return: Resident set size in bytes, or the peak resident set size so far if the current one is not available
+    """
+    try:
+        with open('/proc/self/statm') as statm_file:
+            return int(statm_file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, IndexError, ValueError):
+        # ru_maxrss is in kilobytes on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class PeakRssSampler:
+    """
+    Samples the resident set size of this process in a background thread and keeps the peak
+    """
+
+    def __init__(self, interval: float):
+        """
+        :param interval: Sampling interval in seconds
+        """
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+        self.peak = 0
+
+    def _sample(self):
+        while not self._stop.wait(self._interval):
+            self.peak = max(self.peak, get_current_rss())
+
+    def __enter__(self):
+        self.peak = get_current_rss()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, get_current_rss())
+
+
+# Interval in seconds at which the resident memory is sampled during a span
+_SPAN_RSS_SAMPLING_INTERVAL = 0.005
+
+
+class MetricSink(abc.ABC):
+    """
+    Base class of the sinks that receive the timing spans recorded with AimetLogger.span()
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def emit(self, span: Dict):
+        """
+        Record one finished span. May be called from several threads.
+
+        :param span: Dictionary with the area, stage, layer, start time, wall time, CPU time and peak memory of the span
+        """
+        with self._lock:
+            self._write(span)
+
+    @abc.abstractmethod
+    def _write(self, span: Dict):
+        """ Write one span, called with the lock of the sink held """
+
+    def close(self):
+        """ Flush and release the resources of the sink """
+
+
+class JsonLinesMetricSink(MetricSink):
+    """
+    Writes each span as one JSON object per line
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Path of the file to write, overwritten if it exists
+        """
+        super().__init__()
+        self._file = open(path, 'w')
+
+    def _write(self, span: Dict):
+        self._file.write(json.dumps(span) + '\n')
+        self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class ChromeTraceMetricSink(MetricSink):
+    """
+    Writes the spans as complete events of the Chrome trace event format, viewable in chrome://tracing or Perfetto.
+    The file is a valid JSON array once the sink is closed. The trace viewers also load the unterminated array of a run
+    that did not close the sink.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Path of the file to write, overwritten if it exists
+        """
+        super().__init__()
+        self._file = open(path, 'w')
+        self._file.write('[')
+        self._separator = '\n'
+
+    def _write(self, span: Dict):
+        name = span['stage'] if span['layer'] is None else '{} ({})'.format(span['stage'], span['layer'])
+        event = {'name': name,
+                 'cat': span['area'],
+                 'ph': 'X',
+                 'ts': span['start_s'] * 1e6,
+                 'dur': span['wall_time_s'] * 1e6,
+                 'pid': span['pid'],
+                 'tid': span['tid'],
+                 'args': {'layer': span['layer'],
+                          'cpu_time_s': span['cpu_time_s'],
+                          'peak_rss_mb': span['peak_rss_mb']}}
+        self._file.write(self._separator + json.dumps(event))
+        self._file.flush()
+        self._separator = ',\n'
+
+    def close(self):
+        with self._lock:
+            self._file.write('\n]\n')
+            self._file.close()
+
+
+class _Span(contextlib.ContextDecorator):
+    """
+    Times the code it wraps and emits the result to the metric sinks of AimetLogger. Does nothing if no sink is
+    registered when it is entered.
+    """
+
+    def __init__(self, area, stage: str, layer: str = None):
+        self._area = area
+        self._stage = stage
+        self._layer = layer
+        self._starts = threading.local()
+
+    def __enter__(self):
+        # A span used as a decorator is reentrant and may be entered from several threads
+        if not hasattr(self._starts, 'stack'):
+            self._starts.stack = []
+        if AimetLogger.metric_sinks:
+            sampler = PeakRssSampler(_SPAN_RSS_SAMPLING_INTERVAL).__enter__()
+            self._starts.stack.append((time.time(), time.perf_counter(), time.process_time(), sampler))
+        else:
+            self._starts.stack.append(None)
+        return self
+
+    def __exit__(self, *_):
+        start = self._starts.stack.pop()
+        if start is None:
+            return False
+
+        start, wall_start, cpu_start, sampler = start
+        wall_time = time.perf_counter() - wall_start
+        cpu_time = time.process_time() - cpu_start
+        sampler.__exit__()
+        if not AimetLogger.metric_sinks:
+            return False
+
+        span = {'area': self._area.value,
+                'stage': self._stage,
+                'layer': self._layer,
+                'start_s': start,
+                'wall_time_s': wall_time,
+                'cpu_time_s': cpu_time,
+                'peak_rss_mb': sampler.peak / (1024 * 1024),
+                'pid': os.getpid(),
+                'tid': threading.get_ident()}
+
+        for sink in list(AimetLogger.metric_sinks):
+            sink.emit(span)
+        return False
+
+
 class AimetLogger(metaclass=SingletonType):
     """ The aimet Logger class. Multiple Area Loggers have been defined.
-    Each Area Logger could be set at a different logging level. """
+    Each Area Logger could be set at a different logging level.
+
+    Stages of the pipelines are also timed with spans that are emitted to the registered metric sinks. Without a sink,
+    spans do nothing. Setting the environment variable AIMET_METRICS_FILE registers a sink on first use of the logger,
+    writing a Chrome trace if the file name ends in .json and JSON lines otherwise. """
     _logger = None
+    metric_sinks = []
 
     class LogAreas(Enum):
         """ Defines the LogAreas used in aimet. """
@@ -142,6 +335,15 @@ class AimetLogger(metaclass=SingletonType):
 
         log_package_info()
 
+        metrics_file = os.environ.get('AIMET_METRICS_FILE')
+        if metrics_file:
+            if metrics_file.endswith('.json'):
+                sink = ChromeTraceMetricSink(metrics_file)
+            else:
+                sink = JsonLinesMetricSink(metrics_file)
+            AimetLogger.add_metric_sink(sink)
+            atexit.register(AimetLogger.remove_metric_sink, sink)
+
     @staticmethod
     def get_area_logger(area):
         """ Returns a specific Area logger. """
@@ -161,6 +363,30 @@ class AimetLogger(metaclass=SingletonType):
         for area in AimetLogger.LogAreas:
             AimetLogger.set_area_logger_level(area, level)
 
+    @staticmethod
+    def add_metric_sink(sink: MetricSink):
+        """ Registers a sink to receive the timing spans of all areas. """
+        AimetLogger.metric_sinks.append(sink)
+
+    @staticmethod
+    def remove_metric_sink(sink: MetricSink):
+        """ Unregisters a sink and closes it. """
+        AimetLogger.metric_sinks.remove(sink)
+        sink.close()
+
+    @staticmethod
+    def span(area, stage: str, layer: str = None) -> _Span:
+        """
+        Returns a span timing the wall time and CPU time of a stage, and sampling the peak resident memory of the
+        process during the stage. Use it as a context manager or as a function decorator. Does nothing if no metric
+        sink is registered.
+
+        :param area: LogArea of the stage
+        :param stage: Name of the stage
+        :param layer: Name of the layer the stage works on, if any
+        """
+        return _Span(area, stage, layer)
+
 
 def round_up_to_multiplicity(multiplicity: int, num: int, max_allowable_num: int):
     """
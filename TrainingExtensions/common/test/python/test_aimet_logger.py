@@ -0,0 +1,174 @@
+# /usr/bin/env python3.5
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2020, Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice,
+#     this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its contributors
+#     may be used to endorse or promote products derived from this software
+#     without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+#  SPDX-License-Identifier: BSD-3-Clause
+#
+#  @@-COPYRIGHT-END-@@
+""" This file contains unit tests for the timing spans and metric sinks of AimetLogger. """
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from aimet_common.utils import AimetLogger, ChromeTraceMetricSink, JsonLinesMetricSink, MetricSink
+
+
+class _ListMetricSink(MetricSink):
+    """ Metric sink keeping the spans in a list """
+
+    def __init__(self):
+        super().__init__()
+        self.spans = []
+
+    def _write(self, span):
+        self.spans.append(span)
+
+
+class TestAimetLoggerSpans(unittest.TestCase):
+    """ Tests for the timing spans and metric sinks of AimetLogger """
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        for sink in list(AimetLogger.metric_sinks):
+            AimetLogger.remove_metric_sink(sink)
+        shutil.rmtree(self._dir)
+
+    def test_span_without_sink(self):
+        """ Test that spans do nothing when no sink is registered """
+
+        @AimetLogger.span(AimetLogger.LogAreas.Test, 'stage')
+        def add(a, b):
+            return a + b
+
+        self.assertEqual(3, add(1, 2))
+
+        sink = _ListMetricSink()
+        with AimetLogger.span(AimetLogger.LogAreas.Test, 'stage'):
+            # a sink registered within a span does not receive it
+            AimetLogger.add_metric_sink(sink)
+        self.assertEqual([], sink.spans)
+
+    def test_nested_and_decorated_spans(self):
+        """ Test the records of nested, recursive and multithreaded spans """
+        sink = _ListMetricSink()
+        AimetLogger.add_metric_sink(sink)
+
+        @AimetLogger.span(AimetLogger.LogAreas.Test, 'countdown')
+        def countdown(count):
+            time.sleep(0.01)
+            if count:
+                countdown(count - 1)
+
+        with AimetLogger.span(AimetLogger.LogAreas.Test, 'outer', 'conv1'):
+            countdown(2)
+
+        self.assertEqual(['countdown'] * 3 + ['outer'], [span['stage'] for span in sink.spans])
+        self.assertEqual([None] * 3 + ['conv1'], [span['layer'] for span in sink.spans])
+        self.assertTrue(all(span['area'] == 'Test' for span in sink.spans))
+
+        wall_times = [span['wall_time_s'] for span in sink.spans]
+        self.assertEqual(sorted(wall_times), wall_times)
+        self.assertGreaterEqual(wall_times[0], 0.01)
+        self.assertGreaterEqual(wall_times[2], 0.03)
+        self.assertTrue(all(span['cpu_time_s'] >= 0 and span['peak_rss_mb'] > 0 for span in sink.spans))
+
+        sink.spans.clear()
+        threads = [threading.Thread(target=countdown, args=(0,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(4, len(sink.spans))
+        self.assertEqual(4, len({span['tid'] for span in sink.spans}))
+        self.assertTrue(all(span['wall_time_s'] >= 0.01 for span in sink.spans))
+
+        # the peak memory is sampled during each span, so it does not carry over into later spans
+        sink.spans.clear()
+        with AimetLogger.span(AimetLogger.LogAreas.Test, 'allocate'):
+            # allocate and touch 64 MB
+            data = np.ones(64 * 1024 * 1024 // 8)
+            time.sleep(0.02)
+            del data
+        with AimetLogger.span(AimetLogger.LogAreas.Test, 'after'):
+            time.sleep(0.01)
+        self.assertGreater(sink.spans[0]['peak_rss_mb'], sink.spans[1]['peak_rss_mb'] + 32)
+
+        # exceptions propagate through spans, which are still recorded
+        sink.spans.clear()
+        with self.assertRaises(ValueError):
+            with AimetLogger.span(AimetLogger.LogAreas.Test, 'failing'):
+                raise ValueError
+        self.assertEqual(['failing'], [span['stage'] for span in sink.spans])
+
+    def test_file_sinks(self):
+        """ Test the JSON lines and Chrome trace sinks """
+        json_lines_path = os.path.join(self._dir, 'metrics.jsonl')
+        chrome_trace_path = os.path.join(self._dir, 'trace.json')
+        json_lines_sink = JsonLinesMetricSink(json_lines_path)
+        chrome_trace_sink = ChromeTraceMetricSink(chrome_trace_path)
+        AimetLogger.add_metric_sink(json_lines_sink)
+        AimetLogger.add_metric_sink(chrome_trace_sink)
+
+        with AimetLogger.span(AimetLogger.LogAreas.Quant, 'compute_encodings'):
+            with AimetLogger.span(AimetLogger.LogAreas.Quant, 'calibrate', 'conv1'):
+                pass
+
+        # the JSON lines file is readable before the sink is closed
+        with open(json_lines_path) as json_lines_file:
+            spans = [json.loads(line) for line in json_lines_file]
+        self.assertEqual(['calibrate', 'compute_encodings'], [span['stage'] for span in spans])
+        self.assertEqual('conv1', spans[0]['layer'])
+
+        AimetLogger.remove_metric_sink(json_lines_sink)
+        AimetLogger.remove_metric_sink(chrome_trace_sink)
+        self.assertEqual([], AimetLogger.metric_sinks)
+
+        with open(chrome_trace_path) as chrome_trace_file:
+            events = json.load(chrome_trace_file)
+        self.assertEqual(['calibrate (conv1)', 'compute_encodings'], [event['name'] for event in events])
+        self.assertTrue(all(event['ph'] == 'X' and event['cat'] == 'Quant' for event in events))
+
+        # the outer event encloses the inner one on the same thread
+        inner, outer = events
+        self.assertEqual(inner['tid'], outer['tid'])
+        self.assertLessEqual(outer['ts'], inner['ts'])
+        self.assertAlmostEqual(spans[1]['wall_time_s'] * 1e6, outer['dur'])
@@ -0,0 +1,75 @@
+# /usr/bin/env python3.5
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2019, Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice,
+#     this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its contributors
+#     may be used to endorse or promote products derived from this software
+#     without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+#  SPDX-License-Identifier: BSD-3-Clause
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" This file contains unit tests for testing the channel pruning functions common to PyTorch and TensorFlow """
+
+import unittest
+import numpy as np
+
+from aimet_common.channel_pruner import NormalEquations
+
+
+class TestNormalEquations(unittest.TestCase):
+    """ Test the NormalEquations used to reconstruct the weights of channel pruned layers """
+
+    def test_normal_equations_accumulated_over_batches(self):
+        """
+        Test that least squares from normal equations accumulated over batches recovers weight and bias
+        """
+        np.random.seed(0)
+        input_data = np.random.rand(500, 5, 3, 3)
+        weight = np.random.rand(5 * 3 * 3, 10)
+        bias = np.random.rand(10)
+        output_data = np.matmul(input_data.reshape(500, -1), weight) + bias
+
+        normal_equations = NormalEquations(num_features=5 * 3 * 3, num_targets=10, fit_intercept=True)
+        for inp_batch, out_batch in zip(np.split(input_data, 5), np.split(output_data, 5)):
+            normal_equations.update(inp_batch, out_batch)
+
+        self.assertEqual(500, normal_equations.num_samples)
+
+        new_weight, new_bias = normal_equations.solve()
+        self.assertTrue(np.allclose(new_weight.T, weight))
+        self.assertTrue(np.allclose(new_bias, bias))
+
+        # all zero input data can only be explained by the bias
+        normal_equations = NormalEquations(num_features=4, num_targets=2, fit_intercept=True)
+        normal_equations.update(np.zeros((10, 4)), np.ones((10, 2)))
+
+        new_weight, new_bias = normal_equations.solve()
+        self.assertTrue(np.array_equal(np.zeros((2, 4)), new_weight))
+        self.assertTrue(np.allclose(np.ones(2), new_bias))
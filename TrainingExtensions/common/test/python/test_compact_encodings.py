@@ -0,0 +1,99 @@
+# /usr/bin/env python3.5
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2020, Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice,
+#     this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its contributors
+#     may be used to endorse or promote products derived from this software
+#     without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+#  SPDX-License-Identifier: BSD-3-Clause
+#
+#  @@-COPYRIGHT-END-@@
+""" This file contains unit tests for the compact encodings file format. """
+
+import json
+import os
+import tempfile
+import unittest
+
+from aimet_common.compact_encodings import CompactEncodingsWriter, CompactEncodingsReader, is_compact_encodings_file
+
+
+class TestCompactEncodings(unittest.TestCase):
+    """ Test compact_encodings module """
+
+    def test_write_and_read_encodings(self):
+        """ Encodings read back from a compact encodings file match the ones written """
+
+        encoding = {'min': -0.5, 'max': 1.25, 'scale': 0.0068, 'offset': -73.0, 'bitwidth': 8,
+                    'is_symmetric': 'False'}
+        symmetric_encoding = {'min': -1.0, 'max': 1.0, 'scale': 0.125, 'offset': -8.0, 'bitwidth': 4,
+                              'is_symmetric': 'True'}
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'model.encodings.bin')
+            with CompactEncodingsWriter(file_path) as writer:
+                writer.activation_encodings['12'] = [encoding]
+                writer.param_encodings['conv1.weight'] = [symmetric_encoding, encoding]
+                writer.activation_encodings['13'] = [None]
+                # Last write wins, as for a dictionary
+                writer.activation_encodings['12'] = [symmetric_encoding]
+
+            self.assertTrue(is_compact_encodings_file(file_path))
+            reader = CompactEncodingsReader(file_path)
+
+            self.assertEqual(2, len(reader.activation_encodings))
+            self.assertEqual(1, len(reader.param_encodings))
+            self.assertEqual([symmetric_encoding], reader.activation_encodings['12'])
+            self.assertEqual([None], reader.activation_encodings['13'])
+            self.assertEqual([symmetric_encoding, encoding], reader.param_encodings['conv1.weight'])
+            self.assertNotIn('conv1.weight', reader.activation_encodings)
+            self.assertNotIn('12', reader.param_encodings)
+
+    def test_empty_encodings_file(self):
+        """ A compact encodings file with no encodings can be read back """
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'model.encodings.bin')
+            CompactEncodingsWriter(file_path).close()
+
+            reader = CompactEncodingsReader(file_path)
+            self.assertEqual(0, len(reader.activation_encodings))
+            self.assertEqual(0, len(reader.param_encodings))
+
+    def test_json_file_is_not_compact_encodings_file(self):
+        """ JSON encodings files are not detected as compact encodings files """
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_path = os.path.join(tmp_dir, 'model.encodings')
+            with open(file_path, 'w') as encoding_fp:
+                json.dump({'activation_encodings': {}, 'param_encodings': {}}, encoding_fp)
+
+            self.assertFalse(is_compact_encodings_file(file_path))
+            with self.assertRaises(ValueError):
+                CompactEncodingsReader(file_path)
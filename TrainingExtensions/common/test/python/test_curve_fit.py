@@ -37,6 +37,7 @@
 # =============================================================================
 
 import unittest
+import numpy as np
 from matplotlib import pyplot as plt
 from aimet_common.curve_fit import MonotonicIncreasingCurveFit
 
@@ -58,3 +59,39 @@ class TestCommonCurveFit(unittest.TestCase):
         #
         # plt.legend()
         # plt.show()
+
+    def test_curve_fit_multiple(self):
+        x = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
+        y_list = [[0.1, 0.12, 0.18, 0.22, 0.4, 0.8, 0.7, 0.87, 0.7, 0.92],
+                  [0.05, 0.1, 0.3, 0.35, 0.3, 0.5, 0.65, 0.6, 0.9, 0.95],
+                  [0.1, 0.3, 0.5, 0.9]]
+        x_list = [x, x, [0.25, 0.5, 0.75, 1.0]]
+
+        results = MonotonicIncreasingCurveFit.fit_multiple(x_list, y_list)
+        self.assertEqual(3, len(results))
+
+        for x_coordinates, y_coordinates, (new_y, coefficients) in zip(x_list, y_list, results):
+            self.assertEqual(len(x_coordinates), len(new_y))
+            self.assertEqual(8, len(coefficients))
+
+            # Check is results are truly monotonically increasing
+            for index in range(1, len(new_y) - 1):
+                self.assertTrue(new_y[index] >= new_y[index - 1])
+
+            # Results match fitting each curve on its own
+            single_y, _ = MonotonicIncreasingCurveFit.fit(x_coordinates, y_coordinates)
+            self.assertEqual(single_y, new_y)
+
+    def test_curve_fit_multiple_many_layers(self):
+        np.random.seed(0)
+        x = [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
+        y_list = [list(np.sort(np.random.uniform(0, 1, len(x))) + np.random.normal(0, 0.1, len(x)))
+                  for _ in range(200)]
+
+        results = MonotonicIncreasingCurveFit.fit_multiple([x] * len(y_list), y_list)
+
+        # The fit of each curve does not depend on how many curves are fitted together
+        for y_coordinates, (new_y, coefficients) in zip(y_list, results):
+            single_y, single_coefficients = MonotonicIncreasingCurveFit.fit(x, y_coordinates)
+            np.testing.assert_allclose(single_y, new_y, rtol=0, atol=1e-9)
+            np.testing.assert_allclose(single_coefficients, coefficients, rtol=0, atol=1e-9)
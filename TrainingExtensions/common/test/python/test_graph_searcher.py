@@ -0,0 +1,184 @@
+# /usr/bin/env python3.5
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2020, Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice,
+#     this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its contributors
+#     may be used to endorse or promote products derived from this software
+#     without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+#  SPDX-License-Identifier: BSD-3-Clause
+#
+#  @@-COPYRIGHT-END-@@
+""" This file contains unit tests for the graph pattern matcher and graph searcher. """
+
+import itertools
+import random
+import sys
+import unittest
+
+from aimet_common.graph_pattern_matcher import PatternMatcher, PatternType
+from aimet_common.graph_searcher import GraphSearcher
+
+
+class _Op:
+    """ Minimal connected graph op """
+    def __init__(self, name, op_type, is_model_input=False):
+        self.name = name
+        self.type = op_type
+        self.output = None
+        self.inputs = [type('Product', (), {'is_model_input': is_model_input})()]
+
+    def add_consumer(self, op):
+        """ Adds an op consuming the output of this op """
+        if self.output is None:
+            self.output = type('Product', (), {'consumers': []})()
+        self.output.consumers.append(op)
+
+
+class _ConnectedGraph:
+    """ Minimal connected graph holding a list of ops """
+    def __init__(self, ops):
+        self._ops = ops
+
+    def get_all_ops(self):
+        """ Returns dictionary of all ops by name """
+        return {op.name: op for op in self._ops}
+
+
+def _match_by_slicing(patterns, op_types):
+    """ Matches every slice of the op types against the patterns, keeping the first matching pattern per slice """
+    matches = {}
+    for start, end in itertools.combinations(range(len(op_types) + 1), 2):
+        for pattern in patterns:
+            if pattern.matches(op_types[start:end]):
+                matches.setdefault(pattern, set()).add(start)
+                break
+    return matches
+
+
+class TestGraphSearcher(unittest.TestCase):
+    """ Tests for the graph pattern matcher and graph searcher """
+
+    def test_matching_patterns_equal_slice_matches(self):
+        """ Test that the compiled pattern matcher finds the same patterns as matching every slice of the window """
+        random.seed(0)
+        op_types = ['Conv', 'BatchNorm', 'Relu', 'Add']
+        for _ in range(200):
+            patterns = []
+            for _ in range(random.randint(1, 5)):
+                pattern = [random.choice(op_types) if random.random() < 0.5 else set(random.sample(op_types, 2))
+                           for _ in range(random.randint(1, 4))]
+                patterns.append(PatternType(pattern=pattern, action=None))
+            pattern_matcher = PatternMatcher(patterns)
+
+            window = [random.choice(op_types + ['Other']) for _ in range(random.randint(0, 8))]
+            self.assertEqual(_match_by_slicing(patterns, window), pattern_matcher.get_matching_patterns(window))
+
+    def test_pattern_priority(self):
+        """ Test that only the first pattern in priority order is matched where several patterns match an op """
+        conv_bn = PatternType(pattern=['Conv', 'BatchNorm'], action=None)
+        any_bn = PatternType(pattern=[{'Conv', 'Relu'}, 'BatchNorm'], action=None)
+        bn = PatternType(pattern=['BatchNorm'], action=None)
+        pattern_matcher = PatternMatcher([conv_bn, any_bn, bn])
+
+        matches = pattern_matcher.get_matching_patterns(['Conv', 'BatchNorm', 'Relu', 'BatchNorm'])
+        self.assertEqual({conv_bn: {0}, any_bn: {2}, bn: {1, 3}}, matches)
+
+        state = pattern_matcher.initial_state
+        state, matched_patterns = pattern_matcher.match_next_op_type(state, 'Conv')
+        self.assertEqual([], matched_patterns)
+        state, matched_patterns = pattern_matcher.match_next_op_type(state, 'BatchNorm')
+        self.assertEqual([(conv_bn, 2), (bn, 1)], matched_patterns)
+        _, matched_patterns = pattern_matcher.match_next_op_type(state, 'Other')
+        self.assertEqual([], matched_patterns)
+
+    def test_graph_searcher_applies_actions(self):
+        """ Test that the graph searcher calls the action of a matched pattern once per matched op sequence """
+        # conv1 -> bn1 -> relu1 -> conv2 -> bn2
+        #                       -> conv3 -> relu3
+        ops = [_Op('conv1', 'Conv', is_model_input=True), _Op('bn1', 'BatchNorm'), _Op('relu1', 'Relu'),
+               _Op('conv2', 'Conv'), _Op('bn2', 'BatchNorm'), _Op('conv3', 'Conv'), _Op('relu3', 'Relu')]
+        ops[0].add_consumer(ops[1])
+        ops[1].add_consumer(ops[2])
+        ops[2].add_consumer(ops[3])
+        ops[3].add_consumer(ops[4])
+        ops[2].add_consumer(ops[5])
+        ops[5].add_consumer(ops[6])
+
+        matched_op_names = []
+
+        def action(_pattern, op_subset):
+            matched_op_names.append([op.name for op in op_subset])
+
+        patterns = [PatternType(pattern=['Conv', 'BatchNorm', 'Relu'], action=action),
+                    PatternType(pattern=['Conv', 'BatchNorm'], action=action),
+                    PatternType(pattern=['Relu', 'Conv'], action=action)]
+        GraphSearcher(_ConnectedGraph(ops), patterns).find_all_patterns_in_graph_apply_actions()
+
+        self.assertEqual([['conv1', 'bn1'], ['conv1', 'bn1', 'relu1'], ['relu1', 'conv2'], ['conv2', 'bn2'],
+                          ['relu1', 'conv3']], matched_op_names)
+
+    def test_graph_searcher_keeps_window_per_branch(self):
+        """ Test that the ops searched on one branch do not remove the preceding ops from the window of another """
+        # conv1 -> bn1 -> relu1 -> add1
+        #       -> relu2
+        ops = [_Op('conv1', 'Conv', is_model_input=True), _Op('bn1', 'BatchNorm'), _Op('relu1', 'Relu'),
+               _Op('add1', 'Add'), _Op('relu2', 'Relu')]
+        ops[0].add_consumer(ops[1])
+        ops[1].add_consumer(ops[2])
+        ops[2].add_consumer(ops[3])
+        ops[0].add_consumer(ops[4])
+
+        matched_op_names = []
+
+        def action(_pattern, op_subset):
+            matched_op_names.append([op.name for op in op_subset])
+
+        patterns = [PatternType(pattern=['Conv', 'Relu'], action=action),
+                    PatternType(pattern=['Relu', 'Add'], action=action)]
+        GraphSearcher(_ConnectedGraph(ops), patterns).find_all_patterns_in_graph_apply_actions()
+
+        self.assertEqual([['relu1', 'add1'], ['conv1', 'relu2']], matched_op_names)
+
+    def test_graph_searcher_on_deep_graph(self):
+        """ Test that graphs deeper than the recursion limit are searched """
+        num_layers = sys.getrecursionlimit()
+        ops = [_Op('input', 'Input', is_model_input=True)]
+        for layer in range(num_layers):
+            ops.append(_Op('conv%d' % layer, 'Conv'))
+            ops.append(_Op('bn%d' % layer, 'BatchNorm'))
+        for producer, consumer in zip(ops[:-1], ops[1:]):
+            producer.add_consumer(consumer)
+
+        matched_ops = []
+        patterns = [PatternType(pattern=['Conv', 'BatchNorm'],
+                                action=lambda _pattern, op_subset: matched_ops.append(op_subset))]
+        GraphSearcher(_ConnectedGraph(ops), patterns).find_all_patterns_in_graph_apply_actions()
+
+        self.assertEqual(num_layers, len(matched_ops))
+        self.assertEqual([ops[-2], ops[-1]], matched_ops[-1])
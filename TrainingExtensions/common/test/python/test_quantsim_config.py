@@ -37,10 +37,12 @@
 # =============================================================================
 """ Module for testing quantsim config feature """
 
+import itertools
 import unittest
 import jsonschema
 from aimet_common.quantsim_config.json_config_importer import _validate_syntax, _validate_semantics, JsonConfigImporter
-from aimet_common.quantsim_config.quantsim_config import _build_list_of_permutations, OnnxConnectedGraphTypeMapper
+from aimet_common.graph_pattern_matcher import PatternMatcher, PatternType
+from aimet_common.quantsim_config.quantsim_config import _build_pattern_of_type_sets, OnnxConnectedGraphTypeMapper
 
 
 class TestJsonConfigImporter(unittest.TestCase):
@@ -244,8 +246,8 @@ class TestJsonConfigImporter(unittest.TestCase):
 
 class TestQuantSimConfig(unittest.TestCase):
     """ Class containing unit tests for quantsim config feature """
-    def test_build_list_of_permutations(self):
-        """ Test that asserts are raised if config file does not exist or is not parsable by json """
+    def test_build_pattern_of_type_sets(self):
+        """ Test that one pattern of type sets matches all permutations of connected graph types of a supergroup """
         onnx_conn_graph_type_pairs = [
             [["onnx1"], ["conn1_1", "conn1_2", "conn1_3"]],
             [["onnx2"], ["conn2_1", "conn2_2"]],
@@ -253,13 +255,16 @@ class TestQuantSimConfig(unittest.TestCase):
         ]
         onnx_conn_graph_mapper = OnnxConnectedGraphTypeMapper(onnx_conn_graph_type_pairs)
         op_list = ["onnx1", "onnx2", "onnx3"]
-        all_permutations = _build_list_of_permutations(op_list, onnx_conn_graph_mapper)
-        self.assertEqual(24, len(all_permutations))
-        for permutation in all_permutations:
-            self.assertEqual(3, len(permutation))
+        pattern = _build_pattern_of_type_sets(op_list, onnx_conn_graph_mapper)
+        self.assertEqual([{"conn1_1", "conn1_2", "conn1_3"}, {"conn2_1", "conn2_2"},
+                          {"conn3_1", "conn3_2", "conn3_3", "conn_3_4"}], pattern)
+
+        pattern_matcher = PatternMatcher([PatternType(pattern=pattern, action=None)])
+        self.assertEqual(3, pattern_matcher.get_pattern_max_length())
+        for op_types in itertools.product(*pattern):
+            self.assertEqual({0}, list(pattern_matcher.get_matching_patterns(list(op_types)).values())[0])
 
-        # check that all permutations are different
-        permutation_sets = [set(permutation) for permutation in all_permutations]
-        for index, elem in enumerate(permutation_sets):
-            for _, elem_2 in enumerate(permutation_sets[index+1:]):
-                self.assertNotEqual(elem, elem_2)
+        # Matches are found anywhere in the sliding window, and only in the order of the supergroup
+        matches = pattern_matcher.get_matching_patterns(["conn2_1", "conn1_2", "conn2_2", "conn_3_4"])
+        self.assertEqual({1}, list(matches.values())[0])
+        self.assertFalse(pattern_matcher.get_matching_patterns(["conn2_1", "conn1_2", "conn3_1"]))
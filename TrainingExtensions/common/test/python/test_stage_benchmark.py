@@ -0,0 +1,114 @@
+# /usr/bin/env python3.5
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2020, Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice,
+#     this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its contributors
+#     may be used to endorse or promote products derived from this software
+#     without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+#  SPDX-License-Identifier: BSD-3-Clause
+#
+#  @@-COPYRIGHT-END-@@
+""" This file contains unit tests for the pipeline stage benchmark. """
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+import numpy as np
+
+from aimet_common.stage_benchmark import StageBenchmark
+from aimet_common.utils import get_current_rss
+
+
+class TestStageBenchmark(unittest.TestCase):
+    """ Tests for the pipeline stage benchmark """
+
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+    def test_stage_records(self):
+        """ Test recording of wall time, peak memory and calls of nested and repeated stages """
+        benchmark = StageBenchmark('test', config={'width': 4})
+
+        with benchmark.stage('outer'):
+            for _ in range(2):
+                with benchmark.stage('inner'):
+                    time.sleep(0.01)
+
+            # allocate and touch 64 MB
+            data = np.ones(64 * 1024 * 1024 // 8)
+            time.sleep(0.02)
+            del data
+
+        self.assertEqual(['inner', 'outer'], sorted(benchmark.stages))
+        self.assertEqual(2, benchmark.stages['inner']['calls'])
+        self.assertEqual(1, benchmark.stages['outer']['calls'])
+        self.assertGreaterEqual(benchmark.stages['inner']['wall_time_s'], 0.02)
+        self.assertGreaterEqual(benchmark.stages['outer']['wall_time_s'], benchmark.stages['inner']['wall_time_s'])
+
+        # the allocation shows in the peak of the outer stage, even though it was freed within the stage
+        self.assertGreater(get_current_rss(), 0)
+        self.assertGreater(benchmark.stages['outer']['peak_rss_mb'], benchmark.stages['inner']['peak_rss_mb'] + 32)
+
+    def test_save_and_compare(self):
+        """ Test writing the results file and comparing against a baseline """
+        benchmark = StageBenchmark('test', config={'width': 4})
+        with benchmark.stage('fast'):
+            pass
+        benchmark.stages['slow'] = {'wall_time_s': 2.0, 'peak_rss_mb': 100.0, 'calls': 1}
+
+        # no baseline
+        results_dir = os.path.join(self._dir, 'results')
+        self.assertEqual([], benchmark.save_and_compare(results_dir, os.path.join(self._dir, 'baseline')))
+
+        with open(os.path.join(results_dir, 'test.json')) as results_file:
+            results = json.load(results_file)
+        self.assertEqual('test', results['benchmark'])
+        self.assertEqual({'width': 4}, results['config'])
+        self.assertEqual(benchmark.stages, results['stages'])
+
+        # comparing against its own results finds no regressions
+        self.assertEqual([], benchmark.save_and_compare(results_dir, results_dir))
+
+        # the slow stage regressed in time and memory, tiny differences of the fast stage are ignored
+        baseline = benchmark.to_dict()
+        baseline['stages'] = {'fast': {'wall_time_s': 0.0, 'peak_rss_mb': 1e6, 'calls': 1},
+                              'slow': {'wall_time_s': 1.0, 'peak_rss_mb': 50.0, 'calls': 1},
+                              'removed': {'wall_time_s': 1.0, 'peak_rss_mb': 50.0, 'calls': 1}}
+        regressions = benchmark.compare_to_baseline(baseline)
+        self.assertEqual(2, len(regressions))
+        self.assertTrue(all(regression.startswith('slow: ') for regression in regressions))
+
+        self.assertEqual([], benchmark.compare_to_baseline(baseline, time_tolerance=1.5, rss_tolerance=1.5))
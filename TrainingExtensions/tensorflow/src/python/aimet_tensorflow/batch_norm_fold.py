@@ -45,10 +45,11 @@ import libpymo
 
 from aimet_tensorflow.common.connectedgraph import ConnectedGraph
 from aimet_tensorflow.common.operation import OpWithMetaInfoType
-from aimet_tensorflow.utils.op.conv import WeightTensorUtils, BiasUtils
+from aimet_tensorflow.utils.op.conv import BiasUtils
 from aimet_tensorflow.utils.op.fusedbatchnorm import BNUtils
 from aimet_tensorflow.utils.graph_saver import save_and_load_graph
-from aimet_tensorflow.utils.op.conv import get_weight_tensor_with_shape
+from aimet_tensorflow.utils.op.conv import transpose_weight_tensor_with_shape, get_params_as_numpy_data, \
+    update_params_for_ops
 from aimet_tensorflow.utils.common import get_ordered_conv_linears
 from aimet_common.graph_searcher import GraphSearcher
 from aimet_common.bias_correction import ConvBnPatternHandler
@@ -171,40 +172,39 @@ def find_all_batch_norms_to_fold(sess: tf.compat.v1.Session, start_op_names: Uni
     return bn_conv_linear_pairs
 
 
-def _get_bias_tensor(sess: tf.compat.v1.Session, conv: tf.Operation) -> libpymo.TensorParams():
+def _get_bias_tensor(conv: tf.Operation, bias: Union[np.ndarray, None]) -> libpymo.TensorParams():
     """
     Get bias tensor in given conv op.
     Packs bias in the format required for BN fold
     (libpymo.TensorParams()).
-    :param sess: current session
     :param conv: conv op
+    :param bias: bias of the conv op as numpy array, None if the conv op has no bias
     :return: return bias param in libpymo.TensorParams() format.
     """
 
     # Bias tensor
     bias_tensor = libpymo.TensorParams()
-    with sess.graph.as_default():
-        if not BiasUtils.is_bias_none(conv):
-            bias_tensor.shape = BiasUtils.get_shape(conv)
-            bias_tensor.data = BiasUtils.get_bias_as_numpy_data(sess, conv)
+    if bias is not None:
+        bias_tensor.shape = BiasUtils.get_shape(conv)
+        bias_tensor.data = bias
 
     return bias_tensor
 
 
-def _get_weight_tensor_transpose_reshape(sess: tf.compat.v1.Session, conv: tf.Operation) -> libpymo.TensorParams():
+def _get_weight_tensor_transpose_reshape(conv: tf.Operation, weight: np.ndarray) -> libpymo.TensorParams():
     """
     Get weight tensor from conv op
     Converts to right format - performs transpose and reshape.
     Packs it to the format required for BN fold (libpymo.TensorParams()).
-    :param sess: current session
     :param conv: conv op
+    :param weight: weight of the conv op as numpy array, in TensorFlow format
     :return: return weight tensor in libpymo.TensorParams() format.
     """
 
     # Weight tensor libpymo format
     weight_tensor = libpymo.TensorParams()
 
-    wt_tensor, shape = get_weight_tensor_with_shape(sess, conv)
+    wt_tensor, shape = transpose_weight_tensor_with_shape(conv, weight)
 
     # linear array to be sent for bn fold
     weight_tensor.data = wt_tensor.reshape(-1)
@@ -249,6 +249,10 @@ def _fold_given_auto_selected_batch_norms(sess: tf.compat.v1.Session, layer_pair
 
     with sess.graph.as_default():
 
+        # read the weights and biases of all layers at once. They are updated in these dictionaries as the batch norms
+        # get folded, and written back at once at the end
+        weights, biases = get_params_as_numpy_data(sess, list({pair[0]: None for pair in layer_pairs}))
+
         for pair in layer_pairs:
 
             conv_linear, batchnorm, is_batch_norm_second = pair
@@ -256,14 +260,11 @@ def _fold_given_auto_selected_batch_norms(sess: tf.compat.v1.Session, layer_pair
             assert conv_linear.type in ['Conv2D', 'DepthwiseConv2dNative', 'MatMul']
 
             #  check flag
-            is_bias_valid = False
-
-            if not BiasUtils.is_bias_none(conv_linear):
-                is_bias_valid = True
+            is_bias_valid = conv_linear in biases
 
             bn_params = _get_bn_params(sess, batchnorm.op)
-            weight_tensor = _get_weight_tensor_transpose_reshape(sess, conv_linear)
-            bias_tensor = _get_bias_tensor(sess, conv_linear)
+            weight_tensor = _get_weight_tensor_transpose_reshape(conv_linear, weights[conv_linear])
+            bias_tensor = _get_bias_tensor(conv_linear, biases.get(conv_linear))
 
             bias = libpymo.fold(bn_params, weight_tensor, bias_tensor, is_bias_valid, is_batch_norm_second)
 
@@ -281,15 +282,16 @@ def _fold_given_auto_selected_batch_norms(sess: tf.compat.v1.Session, layer_pair
                 # we sent in format [Noc, Nic, kh, kw]
                 numpy_weight_reshaped = np.reshape(weight_tensor.data, weight_tensor.shape).transpose((2, 3, 1, 0))
 
-            WeightTensorUtils.update_tensor_for_op(sess, conv_linear, numpy_weight_reshaped)
+            weights[conv_linear] = numpy_weight_reshaped
 
             # remove bn op
             BNUtils.skip_bn_op(sess, batchnorm.op, batchnorm.in_tensor, batchnorm.out_tensor)
 
             # update bias tensor, even in case there was no existing bias add op in given conv2D op.
             bias_tensor_shape = [weight_tensor.shape[0]]
-            numpy_bias_reshaped = np.reshape(bias, bias_tensor_shape)
-            BiasUtils.update_bias_for_op(sess, conv_linear, numpy_bias_reshaped)
+            biases[conv_linear] = np.reshape(bias, bias_tensor_shape)
+
+        update_params_for_ops(sess, weights, biases)
 
         # we edited the graph, so we should load and save for the metagraph associated with the session to be updated
         after_bn_fold_sess = save_and_load_graph('./temp_bn_fold', sess)
@@ -343,6 +345,7 @@ def fold_given_batch_norms(sess: tf.compat.v1.Session, input_op_names: Union[str
     return after_fold_sess
 
 
+@AimetLogger.span(AimetLogger.LogAreas.CrosslayerEqualization, 'fold_all_batch_norms')
 def fold_all_batch_norms(sess: tf.compat.v1.Session, input_op_names: Union[str, List[str]],
                          output_op_names: Union[str, List[str]])\
         -> (tf.compat.v1.Session, List[Tuple[tf.Operation, tf.Operation]]):
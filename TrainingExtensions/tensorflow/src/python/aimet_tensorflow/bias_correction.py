@@ -55,7 +55,7 @@ from aimet_tensorflow import quantizer as q
 from aimet_tensorflow.utils.graph_saver import save_model_to_meta, save_and_load_graph
 from aimet_tensorflow.utils.common import create_input_feed_dict, iter_first_x, get_ordered_conv_linears
 from aimet_tensorflow.utils.op.fusedbatchnorm import BNUtils
-from aimet_tensorflow.utils.op.conv import get_weight_tensor_with_shape, BiasUtils
+from aimet_tensorflow.utils.op.conv import transpose_weight_tensor_with_shape, get_params_as_numpy_data, BiasUtils
 from aimet_tensorflow.common.connectedgraph import ConnectedGraph
 
 
@@ -337,16 +337,19 @@ class BiasCorrection:
 
         bias_tensor = libpymo.TensorParamBiasCorrection()
 
+        # get bias tensor, at this point we have initialized model layers to have bias add param.
+        assert not BiasUtils.is_bias_none(layer_to_be_corrected)
+
+        # read weight and bias in a single session run
+        weights, biases = get_params_as_numpy_data(model, [layer_to_be_corrected])
+
         # get weight tensor
-        weight_tensor, _ = get_weight_tensor_with_shape(model, layer_to_be_corrected)
+        weight_tensor, _ = transpose_weight_tensor_with_shape(layer_to_be_corrected, weights[layer_to_be_corrected])
 
         if weight_tensor is None:
             logger.error('Weight tensor extraction failed for layer {%s}', layer_to_be_corrected.name)
 
-        # get bias tensor, at this point we have initialized model layers to have bias add param.
-        assert not BiasUtils.is_bias_none(layer_to_be_corrected)
-
-        bias_tensor.data = BiasUtils.get_bias_as_numpy_data(model, layer_to_be_corrected)
+        bias_tensor.data = biases[layer_to_be_corrected]
         bias_tensor.shape = BiasUtils.get_shape(layer_to_be_corrected)
 
         return bias_tensor, weight_tensor
@@ -502,6 +505,7 @@ class BiasCorrection:
         return conv_linears_with_bn_dict
 
     @staticmethod
+    @AimetLogger.span(AimetLogger.LogAreas.Quant, 'correct_bias')
     def correct_bias(reference_model: tf.compat.v1.Session, bias_correct_params: BiasCorrectionParams,
                      quant_params: QuantParams, data_set: tf.data.Dataset,
                      conv_bn_dict: Union[Dict[tf.Operation, ConvBnInfoType], None] = None,
@@ -116,7 +116,8 @@ class InputChannelPruner(Pruner):
         return prune_indices
 
     def _data_subsample_and_reconstruction(self, orig_layer: Layer, pruned_layer: Layer, output_mask: List[int],
-                                           orig_layer_db: LayerDatabase, comp_layer_db: LayerDatabase):
+                                           orig_layer_db: LayerDatabase, comp_layer_db: LayerDatabase,
+                                           data_sub_sampler: DataSubSampler = None):
         """
         Collect and sub sampled output data from original layer and input data from pruned layer and set
         reconstructed weight and bias to pruned layer in compressed model database
@@ -126,19 +127,27 @@ class InputChannelPruner(Pruner):
         :param output_mask  : output mask that specifies certain output channels to remove
         :param orig_layer_db: original Layer database without any compression
         :param comp_layer_db: compressed Layer database
+        :param data_sub_sampler: data sub sampler created for the layers being reconstructed, if None one is created
+         for the given layer
         :return:
         """
+        # pylint: disable=too-many-arguments
 
-        sub_sampled_inp, sub_sampled_out = DataSubSampler.get_sub_sampled_data(orig_layer, pruned_layer,
-                                                                               self._input_op_names, orig_layer_db,
-                                                                               comp_layer_db, self._data_set,
-                                                                               self._batch_size,
-                                                                               self._num_reconstruction_samples)
+        if data_sub_sampler is None:
+            data_sub_sampler = DataSubSampler([orig_layer], self._input_op_names, orig_layer_db, self._data_set,
+                                              self._batch_size, self._num_reconstruction_samples)
 
-        logger.debug("Input Data size: %s, Output data size: %s", len(sub_sampled_inp), len(sub_sampled_out))
+        # sub sampled batches are accumulated into the normal equations right away
+        normal_equations = WeightReconstructor.get_normal_equations_for_conv2d(pruned_layer, output_mask)
+
+        data_sub_sampler.for_each_sub_sampled_batch_of_layer(orig_layer, pruned_layer, comp_layer_db,
+                                                             normal_equations.update)
+
+        logger.debug("Number of sub sampled data points: %s", normal_equations.num_samples)
 
         # update the weight and bias (if any) using sub sampled input and output data
-        WeightReconstructor.reconstruct_params_for_conv2d(pruned_layer, sub_sampled_inp, sub_sampled_out, output_mask)
+        WeightReconstructor.reconstruct_params_for_conv2d_from_normal_equations(pruned_layer, normal_equations,
+                                                                                output_mask)
 
     def _sort_on_occurrence(self, sess: tf.compat.v1.Session, layer_comp_ratio_list: List[LayerCompRatioPair]) -> \
             List[LayerCompRatioPair]:
@@ -341,6 +350,13 @@ class InputChannelPruner(Pruner):
         :param layer_db: Original layer database
         :param comp_layer_db: Compressed layer database
         """
+        if not layers_to_reconstruct:
+            return
+
+        # The dataset is read and the original model is run once for all the layers
+        data_sub_sampler = DataSubSampler(layers_to_reconstruct, self._input_op_names, layer_db, self._data_set,
+                                          self._batch_size, self._num_reconstruction_samples)
+
         for layer in layers_to_reconstruct:
             # Get output mask of layer, that contains information about all channels winnowed since the start
             pruned_layer_name, output_mask = \
@@ -348,7 +364,8 @@ class InputChannelPruner(Pruner):
             assert pruned_layer_name is not None
 
             pruned_layer = comp_layer_db.find_layer_by_name(pruned_layer_name)
-            self._data_subsample_and_reconstruction(layer, pruned_layer, output_mask, layer_db, comp_layer_db)
+            self._data_subsample_and_reconstruction(layer, pruned_layer, output_mask, layer_db, comp_layer_db,
+                                                    data_sub_sampler)
 
 
 class ChannelPruningCostCalculator(CostCalculator):
@@ -38,7 +38,7 @@
 
 """ Sub-sample data for weight reconstruction for channel pruning feature """
 
-from typing import List
+from typing import List, Callable
 import math
 import numpy as np
 import tensorflow as tf
@@ -58,38 +58,80 @@ class DataSubSampler:
 
     """
     Utilities to sub-sample data for weight reconstruction
+
+    An instance holds the batches of the dataset and the sub sampled output data of the original model for all layers
+    to be reconstructed in a channel pruning run. The dataset is iterated once, and the original model is run once per
+    batch to fetch the outputs of all the layers together.
     """
 
-    @classmethod
-    def get_sub_sampled_data(cls, orig_layer: Layer, pruned_layer: Layer, inp_op_names: List,
-                             orig_layer_db: LayerDatabase, comp_layer_db: LayerDatabase, data_set: tf.data.Dataset,
-                             batch_size: int, num_reconstruction_samples: int) -> (np.ndarray, np.ndarray):
+    # hard coded value
+    samples_per_image = 10
+
+    def __init__(self, orig_layers: List[Layer], inp_op_names: List, orig_layer_db: LayerDatabase,
+                 data_set: tf.data.Dataset, batch_size: int, num_reconstruction_samples: int):
 
         # pylint: disable=too-many-arguments
-        # pylint: disable=too-many-locals
 
         """
-        Get all the input data from pruned model and output data from original model
-
-        :param orig_layer: layer in original model database
-        :param pruned_layer: layer in pruned model database
+        :param orig_layers: layers in original model database to be reconstructed
         :param inp_op_names : input Op names, should be same in both models
         :param orig_layer_db: original model database, un-pruned, used to provide the actual outputs
-        :param comp_layer_db: comp. model database, this is potentially already pruned in the upstreams layers of given
-         layer name
         :param data_set: tf.data.Dataset object
         :param batch_size : batch size
         :param num_reconstruction_samples: The number of reconstruction samples
-        :return: input_data, output_data
         """
+        self._inp_op_names = inp_op_names
+        self._batches = self._get_batches(data_set, batch_size, num_reconstruction_samples)
+
+        # layer attributes, and the output pixels and sub sampled output data of every batch, by original layer name
+        self._layer_attributes = {}
+        self._output_pixels = {}
+        self._sub_sampled_out_data = {}
+
+        for layer in orig_layers:
+            # get the layer attributes (kernel_size, stride, padding)
+            self._layer_attributes[layer.name] = aimet_tensorflow.utils.op.conv.get_layer_attributes(
+                sess=orig_layer_db.model, op=layer.module, input_op_names=orig_layer_db.starting_ops,
+                input_shape=orig_layer_db.input_shape)
+            self._output_pixels[layer.name] = []
+            self._sub_sampled_out_data[layer.name] = []
+
+        output_tensors = [layer.module.outputs[0] for layer in orig_layers]
+
+        for batch_data in self._batches:
+
+            # output data of all layers from original model
+            feed_dict = aimet_tensorflow.utils.common.create_input_feed_dict(orig_layer_db.model.graph,
+                                                                             inp_op_names, batch_data)
+            all_output_data = orig_layer_db.model.run(output_tensors, feed_dict=feed_dict)
+
+            for layer, output_data in zip(orig_layers, all_output_data):
+
+                # channels_last (NHWC) to channels_first data format (NCHW - Common format)
+                output_data = np.transpose(output_data, (0, 3, 1, 2))
+
+                # pick the output pixels to sub sample, the input data at these pixels is sub sampled later
+                heights, widths = InputMatchSearch.select_output_pixels(self._layer_attributes[layer.name],
+                                                                        output_data.shape, self.samples_per_image)
+                self._output_pixels[layer.name].append((heights, widths))
+                self._sub_sampled_out_data[layer.name].append(InputMatchSearch.subsample_output_data(output_data,
+                                                                                                     heights, widths))
+
+    @classmethod
+    def _get_batches(cls, data_set: tf.data.Dataset, batch_size: int, num_reconstruction_samples: int) -> List:
+        """
+        Get the batches of the dataset needed for the number of reconstruction samples
 
+        :param data_set: tf.data.Dataset object
+        :param batch_size : batch size
+        :param num_reconstruction_samples: The number of reconstruction samples
+        :return: list of batches
+        """
         # Grow GPU memory as needed at the cost of fragmentation.
         config = tf.compat.v1.ConfigProto()
         config.gpu_options.allow_growth = True  # pylint: disable=no-member
 
         # create an iterator and iterator.get_next() Op in the same graph as dataset
-        # TODO: currently dataset (user provided) and iterator are in the same graph, and the iterator is
-        #  being created every time this function is called. Use re-initialize iterator
         sess = tf.compat.v1.Session(graph=data_set._graph, config=config)  # pylint: disable=protected-access
 
         with sess.graph.as_default():
@@ -97,61 +139,119 @@ class DataSubSampler:
             iterator = data_set.make_one_shot_iterator()
             next_element = iterator.get_next()
 
-        # hard coded value
-        samples_per_image = 10
-
-        total_num_of_images = int(num_reconstruction_samples / samples_per_image)
+        total_num_of_images = int(num_reconstruction_samples / cls.samples_per_image)
 
         # number of possible batches - round up
         num_of_batches = math.ceil(total_num_of_images / batch_size)
 
-        all_sub_sampled_inp_data = list()
-        all_sub_sampled_out_data = list()
+        batches = []
+        try:
+            for _ in range(num_of_batches):
+                # get the data
+                batches.append(sess.run(next_element))
 
-        for _ in range(num_of_batches):
+        except tf.errors.OutOfRangeError:
 
-            try:
-                # get the data
-                batch_data = sess.run(next_element)
-
-                # output data from original model
-                feed_dict = aimet_tensorflow.utils.common.create_input_feed_dict(orig_layer_db.model.graph,
-                                                                                 inp_op_names, batch_data)
-                output_data = orig_layer_db.model.run(orig_layer.module.outputs[0], feed_dict=feed_dict)
-
-                # input data from compressed model
-                feed_dict = aimet_tensorflow.utils.common.create_input_feed_dict(comp_layer_db.model.graph,
-                                                                                 inp_op_names, batch_data)
-                input_data = comp_layer_db.model.run(pruned_layer.module.inputs[0], feed_dict=feed_dict)
-
-                # get the layer attributes (kernel_size, stride, padding)
-                layer_attributes = aimet_tensorflow.utils.op.conv.get_layer_attributes(sess=orig_layer_db.model,
-                                                                                       op=orig_layer.module,
-                                                                                       input_op_names=
-                                                                                       orig_layer_db.starting_ops,
-                                                                                       input_shape=
-                                                                                       orig_layer_db.input_shape)
+            raise StopIteration("There are insufficient batches of data in the provided dataset for the purpose of"
+                                " weight reconstruction! Either reduce number of reconstruction samples or increase"
+                                " data in dataset")
 
-                # channels_last (NHWC) to channels_first data format (NCHW - Common format)
-                input_data = np.transpose(input_data, (0, 3, 1, 2))
-                output_data = np.transpose(output_data, (0, 3, 1, 2))
+        finally:
+            # close the session
+            sess.close()
+
+        return batches
+
+    def for_each_sub_sampled_batch_of_layer(self, orig_layer: Layer, pruned_layer: Layer,
+                                            comp_layer_db: LayerDatabase,
+                                            batch_callback: Callable[[np.ndarray, np.ndarray], None]):
+        """
+        Sub sample the input data of a layer from pruned model one batch at a time, and hand it to the given callback
+        along with the sub sampled output data of the layer from original model. The pruned model is run for every
+        layer, since its input data changes as the layers before it get reconstructed.
+
+        :param orig_layer: layer in original model database, one of the layers the sub sampler was created for
+        :param pruned_layer: layer in pruned model database
+        :param comp_layer_db: comp. model database, this is potentially already pruned in the upstreams layers of given
+         layer name
+        :param batch_callback: called with (sub sampled input data, sub sampled output data) of every batch
+        """
+        layer_attributes = self._layer_attributes[orig_layer.name]
+
+        for batch_data, (heights, widths), sub_sampled_out_data in zip(self._batches,
+                                                                       self._output_pixels[orig_layer.name],
+                                                                       self._sub_sampled_out_data[orig_layer.name]):
+
+            # input data from compressed model
+            feed_dict = aimet_tensorflow.utils.common.create_input_feed_dict(comp_layer_db.model.graph,
+                                                                             self._inp_op_names, batch_data)
+            input_data = comp_layer_db.model.run(pruned_layer.module.inputs[0], feed_dict=feed_dict)
+
+            # channels_last (NHWC) to channels_first data format (NCHW - Common format)
+            input_data = np.transpose(input_data, (0, 3, 1, 2))
+
+            # get the sub sampled input data at the output pixels picked for the batch
+            sub_sampled_inp_data = InputMatchSearch.subsample_input_data(layer_attributes, input_data, heights, widths)
+            batch_callback(sub_sampled_inp_data, sub_sampled_out_data)
+
+    @classmethod
+    def get_sub_sampled_data(cls, orig_layer: Layer, pruned_layer: Layer, inp_op_names: List,
+                             orig_layer_db: LayerDatabase, comp_layer_db: LayerDatabase, data_set: tf.data.Dataset,
+                             batch_size: int, num_reconstruction_samples: int) -> (np.ndarray, np.ndarray):
+
+        # pylint: disable=too-many-arguments
 
-                # get the sub sampled input and output data
-                sub_sampled_inp_data, sub_sampled_out_data = InputMatchSearch.subsample_data(layer_attributes,
-                                                                                             input_data,
-                                                                                             output_data,
-                                                                                             samples_per_image)
-                all_sub_sampled_inp_data.append(sub_sampled_inp_data)
-                all_sub_sampled_out_data.append(sub_sampled_out_data)
+        """
+        Get all the input data from pruned model and output data from original model
 
-            except tf.errors.OutOfRangeError:
+        :param orig_layer: layer in original model database
+        :param pruned_layer: layer in pruned model database
+        :param inp_op_names : input Op names, should be same in both models
+        :param orig_layer_db: original model database, un-pruned, used to provide the actual outputs
+        :param comp_layer_db: comp. model database, this is potentially already pruned in the upstreams layers of given
+         layer name
+        :param data_set: tf.data.Dataset object
+        :param batch_size : batch size
+        :param num_reconstruction_samples: The number of reconstruction samples
+        :return: input_data, output_data
+        """
+        all_sub_sampled_inp_data = list()
+        all_sub_sampled_out_data = list()
 
-                raise StopIteration("There are insufficient batches of data in the provided dataset for the purpose of"
-                                    " weight reconstruction! Either reduce number of reconstruction samples or increase"
-                                    " data in dataset")
+        def _collect_sub_sampled_data(sub_sampled_inp_data, sub_sampled_out_data):
+            all_sub_sampled_inp_data.append(sub_sampled_inp_data)
+            all_sub_sampled_out_data.append(sub_sampled_out_data)
 
-        # close the session
-        sess.close()
+        cls.for_each_sub_sampled_batch(orig_layer, pruned_layer, inp_op_names, orig_layer_db, comp_layer_db, data_set,
+                                       batch_size, num_reconstruction_samples, _collect_sub_sampled_data)
 
         # accumulate total sub sampled input and output data
         return np.vstack(all_sub_sampled_inp_data), np.vstack(all_sub_sampled_out_data)
+
+    @classmethod
+    def for_each_sub_sampled_batch(cls, orig_layer: Layer, pruned_layer: Layer, inp_op_names: List,
+                                   orig_layer_db: LayerDatabase, comp_layer_db: LayerDatabase,
+                                   data_set: tf.data.Dataset, batch_size: int, num_reconstruction_samples: int,
+                                   batch_callback: Callable[[np.ndarray, np.ndarray], None]):
+
+        # pylint: disable=too-many-arguments
+
+        """
+        Sub sample the input data from pruned model and output data from original model one batch at a time, and
+        hand each sub sampled batch to the given callback instead of keeping all of them around
+
+        :param orig_layer: layer in original model database
+        :param pruned_layer: layer in pruned model database
+        :param inp_op_names : input Op names, should be same in both models
+        :param orig_layer_db: original model database, un-pruned, used to provide the actual outputs
+        :param comp_layer_db: comp. model database, this is potentially already pruned in the upstreams layers of given
+         layer name
+        :param data_set: tf.data.Dataset object
+        :param batch_size : batch size
+        :param num_reconstruction_samples: The number of reconstruction samples
+        :param batch_callback: called with (sub sampled input data, sub sampled output data) of every batch
+        :return:
+        """
+        data_sub_sampler = cls([orig_layer], inp_op_names, orig_layer_db, data_set, batch_size,
+                               num_reconstruction_samples)
+        data_sub_sampler.for_each_sub_sampled_batch_of_layer(orig_layer, pruned_layer, comp_layer_db, batch_callback)
@@ -40,13 +40,13 @@
 
 from typing import Union, List
 import numpy as np
-from sklearn import linear_model
 
 # Import aimet specific modules
 from aimet_tensorflow.layer_database import Layer
 import aimet_tensorflow.utils.common
 from aimet_tensorflow.utils.op.conv import WeightTensorUtils, BiasUtils
 from aimet_common.utils import AimetLogger
+from aimet_common.channel_pruner import NormalEquations
 from aimet_common.winnow.winnow_utils import get_zero_positions_in_binary_mask
 
 logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.ChannelPruning)
@@ -70,7 +70,7 @@ class WeightReconstructor:
         :param output_data: output_data, in the shape of [n_samples, n_targets]
         :param bias: whether to calculate the intercept for this model.
 
-        :return: (new weight [n_samples, n_features], new bias [n_samples])
+        :return: (new weight [n_targets, n_features], new bias [n_targets])
         """
 
         assert len(input_data.shape) == 2
@@ -79,19 +79,13 @@ class WeightReconstructor:
 
         assert input_data.shape[0] == output_data.shape[0]
 
-        # least squares Linear Regression
-        # copy_X : If True, X (input_data) will be copied; else, it may be overwritten
-        regressor = linear_model.LinearRegression(copy_X=True, fit_intercept=bias)
+        normal_equations = NormalEquations(input_data.shape[1], output_data.shape[1], fit_intercept=bias)
+        normal_equations.update(input_data, output_data)
 
-        regressor.fit(X=input_data, y=output_data)
+        new_weight, new_bias = normal_equations.solve()
 
         logger.info("finished linear regression fit ")
 
-        # after regression, the coefficients attrib in the regressor form the new conv weights
-        new_weight = regressor.coef_
-
-        new_bias = regressor.intercept_ if bias is True else None
-
         return new_weight, new_bias
 
     @staticmethod
@@ -116,40 +110,41 @@ class WeightReconstructor:
                 # update existing bias tensor with new_bias in place
                 BiasUtils.update_bias_for_op(layer.model, op=layer.module, bias_as_numpy_array=new_bias)
 
-    @classmethod
-    def reconstruct_params_for_conv2d(cls, layer: Layer, input_data: np.ndarray, output_data: np.ndarray,
-                                      output_mask: List[int]):
+    @staticmethod
+    def get_normal_equations_for_conv2d(layer: Layer, output_mask: List[int]) -> NormalEquations:
         """
-        Reconstruction of conv2d params (weights and biases) is performed using linear regression from sckit -learn.
-
-        :param layer        : The layer to prune
-        :param input_data   : input_data to the current layer, in the shape of (Ns * Nb, Nic, k_h, k_w)
-        :param output_data  : output_data that match with the provided input_data should be of shape [Ns * Nb, Noc]
-        :param output_mask  : output mask that specifies certain output channels to remove
-        :return: new weight
+        Create empty normal equations to reconstruct the params of the given conv2d layer. Update them with input data
+        of shape (Ns * Nb, Nic, k_h, k_w) and output data of shape [Ns * Nb, Noc], where Noc is the number of output
+        channels before the output mask is applied
 
-        Ns = number of samples in image
-        Nb = total number of images (batch size * number of batches)
-        Nic, Noc = input and output channels of given layer
-        k_h, k_w = kernel dimensions of given layer (height, width)
+        :param layer: The layer to prune
+        :param output_mask: output mask that specifies certain output channels to remove
+        :return: normal equations
         """
-
         assert layer.module.type == 'Conv2D'
-        assert len(input_data.shape) == 4
-        assert len(output_data.shape) == 2
 
-        assert input_data.shape[0] == output_data.shape[0]
-        input_data = input_data.reshape(input_data.shape[0], -1)
+        _, n_ic, kh, kw = layer.weight_shape
+        calculate_bias = bool(aimet_tensorflow.utils.common.get_succeeding_bias_op(op=layer.module))
 
-        assert len(input_data.shape) == 2
+        return NormalEquations(n_ic * kh * kw, len(output_mask), fit_intercept=calculate_bias)
+
+    @classmethod
+    def reconstruct_params_for_conv2d_from_normal_equations(cls, layer: Layer, normal_equations: NormalEquations,
+                                                            output_mask: List[int]):
+        """
+        Reconstruction of conv2d params (weights and biases) by solving normal equations accumulated from the input and
+        output data of the layer
+
+        :param layer: The layer to prune
+        :param normal_equations: normal equations, created by get_normal_equations_for_conv2d()
+        :param output_mask: output mask that specifies certain output channels to remove
+        :return:
+        """
         # Check that the output shape is same as number of ones in output mask
         assert layer.weight_shape[0] == sum(output_mask)
 
-        calculate_bias = bool(aimet_tensorflow.utils.common.get_succeeding_bias_op(op=layer.module))
-
         # reconstruct newer weight and bias
-        new_weight, new_bias = cls._linear_regression(input_data=input_data, output_data=output_data,
-                                                      bias=calculate_bias)
+        new_weight, new_bias = normal_equations.solve()
 
         # reshape the new weights to common shape [Noc, Nic, kh, kw]
         _, n_ic, kh, kw = layer.weight_shape
@@ -164,3 +159,32 @@ class WeightReconstructor:
 
         #TODO: PyLint crashes here with the error: "RecursionError: maximum recursion depth exceeded"
         cls._update_layer_params(layer=layer, new_weight=new_weight, new_bias=new_bias) # pylint: disable=all
+
+    @classmethod
+    def reconstruct_params_for_conv2d(cls, layer: Layer, input_data: np.ndarray, output_data: np.ndarray,
+                                      output_mask: List[int]):
+        """
+        Reconstruction of conv2d params (weights and biases) is performed using least squares linear regression.
+
+        :param layer        : The layer to prune
+        :param input_data   : input_data to the current layer, in the shape of (Ns * Nb, Nic, k_h, k_w)
+        :param output_data  : output_data that match with the provided input_data should be of shape [Ns * Nb, Noc]
+        :param output_mask  : output mask that specifies certain output channels to remove
+        :return: new weight
+
+        Ns = number of samples in image
+        Nb = total number of images (batch size * number of batches)
+        Nic, Noc = input and output channels of given layer
+        k_h, k_w = kernel dimensions of given layer (height, width)
+        """
+
+        assert layer.module.type == 'Conv2D'
+        assert len(input_data.shape) == 4
+        assert len(output_data.shape) == 2
+
+        assert input_data.shape[0] == output_data.shape[0]
+
+        normal_equations = cls.get_normal_equations_for_conv2d(layer, output_mask)
+        normal_equations.update(input_data, output_data)
+
+        cls.reconstruct_params_for_conv2d_from_normal_equations(layer, normal_equations, output_mask)
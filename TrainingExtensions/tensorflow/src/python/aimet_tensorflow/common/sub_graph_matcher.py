@@ -42,21 +42,25 @@
 # pylint: disable=no-member
 # Including above pylint disables since pylint complains about certain module members not found, when they actually
 # are there.
+import hashlib
+import json
+import os
 import re
-from typing import List, Dict, Set, Union
+import threading
+from typing import List, Dict, Set, Tuple, Union
 from collections import OrderedDict
 import tensorflow as tf
 from tensorflow_core.contrib import slim # pylint: disable=unused-import
 from tensorflow_core.contrib.quantize.python import graph_matcher
 from aimet_tensorflow.utils.common import get_valid_ops
 from aimet_tensorflow.common.sub_graph_matcher_op_templates import op_type_templates
-from aimet_common.utils import AimetLogger
+from aimet_common.utils import AimetLogger, Version_Info
 
 logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.ConnectedGraph)
 
 
 # ------------------------------------------------------------------------------------------ #
-# Code below is for import time generation of OpTypePattern and sub-graphs corresponding
+# Code below is for first use generation of OpTypePattern corresponding
 # to reference_op_templates.
 # These are used by SubGraphMatcher to perform module detection that helps generate an
 # intermediate representation of TF graph.
@@ -79,13 +83,26 @@ def store_op_type_pattern_info(subgraph: tf.Graph, additional_starting_ops: List
     """
 
     patterns = create_op_type_patterns_from_subgraph(subgraph, additional_starting_ops)
-    reference_op_pattern_info_dict[pattern_op_type] = {'pattern': patterns[-1], 'subgraph': subgraph,
-                                                       'length': len(patterns),
-                                                       'op_type': info_dict['op_type'],
-                                                       'module_regex': info_dict['module_regex'],
-                                                       'associated_op_regex': info_dict['associated_op_regex']}
+    _store_op_type_patterns(patterns, pattern_op_type, info_dict, reference_op_pattern_info_dict, pattern_to_op_type)
+
+
+def _store_op_type_patterns(patterns: List[graph_matcher.OpTypePattern], pattern_op_type: str, info_dict: Dict,
+                            op_pattern_info_dict: Dict, pattern_to_op_type_dict: Dict):
+    """
+    Stores the op type patterns of an op template in the pattern info and pattern to op type dictionaries
+    :param patterns: op type patterns of the subgraph of the op template, the last one being for the op
+    :param pattern_op_type: string name for op pattern represented by the patterns
+    :param info_dict: op template the patterns were created from
+    :param op_pattern_info_dict: dictionary of pattern info by pattern op type to update
+    :param pattern_to_op_type_dict: dictionary of pattern op type by pattern to update
+    """
+    op_pattern_info_dict[pattern_op_type] = {'pattern': patterns[-1],
+                                             'length': len(patterns),
+                                             'op_type': info_dict['op_type'],
+                                             'module_regex': info_dict['module_regex'],
+                                             'associated_op_regex': info_dict['associated_op_regex']}
     for pattern in patterns:
-        pattern_to_op_type[pattern] = pattern_op_type
+        pattern_to_op_type_dict[pattern] = pattern_op_type
 
 
 def create_patterns_for_ops():
@@ -112,6 +129,147 @@ def create_patterns_for_ops():
             store_op_type_pattern_info(subgraph_placeholder, additional_starting_ops, pattern_op_type, info_dict)
 
 
+def _get_template_name(pattern_op_type: str) -> str:
+    """
+    Get the name of the op template a pattern op type was created from
+    :param pattern_op_type: string name for op pattern
+    :return: key of the op template in op_type_templates
+    """
+    if pattern_op_type not in op_type_templates and pattern_op_type.endswith('_placeholder'):
+        return pattern_op_type[:-len('_placeholder')]
+    return pattern_op_type
+
+
+def _serialize_op_type_patterns(patterns: List[graph_matcher.OpTypePattern]) -> List[Dict]:
+    """
+    Converts a list of op type patterns into a json serializable list. Inputs of a pattern are stored as the index of
+    the input pattern in the list, or as '*' for inputs matching any op.
+    :param patterns: op type patterns, inputs of a pattern are either '*' or patterns preceding it in the list
+    :return: list of dictionaries of op type, name and inputs of every pattern
+    """
+    # pylint: disable=protected-access
+    pattern_indices = {id(pattern): index for index, pattern in enumerate(patterns)}
+    serialized_patterns = []
+    for pattern in patterns:
+        inputs = []
+        for input_pattern in pattern._inputs:
+            if id(input_pattern) in pattern_indices:
+                inputs.append(pattern_indices[id(input_pattern)])
+            else:
+                assert input_pattern._op_type == '*' and not input_pattern._inputs
+                inputs.append('*')
+        serialized_patterns.append({'op_type': pattern._op_type, 'name': pattern._name, 'inputs': inputs})
+
+    return serialized_patterns
+
+
+def _deserialize_op_type_patterns(serialized_patterns: List[Dict]) -> List[graph_matcher.OpTypePattern]:
+    """
+    Creates the list of op type patterns stored by _serialize_op_type_patterns()
+    :param serialized_patterns: list of dictionaries of op type, name and inputs of every pattern
+    :return: List of OpTypePattern()
+    """
+    patterns = []
+    for serialized_pattern in serialized_patterns:
+        inputs = [patterns[inp] if isinstance(inp, int) else inp for inp in serialized_pattern['inputs']]
+        patterns.append(graph_matcher.OpTypePattern(serialized_pattern['op_type'], name=serialized_pattern['name'],
+                                                    inputs=inputs))
+
+    return patterns
+
+
+def get_pattern_cache_path() -> str:
+    """
+    Get the path of the on-disk cache of op type patterns. The cache lives in the directory given by the
+    AIMET_CACHE_DIR environment variable, or in aimet under the user cache directory. The file name is keyed by the
+    cache format, the AIMET and TensorFlow versions, the source of this module which derives the patterns and the op
+    templates, so any change to these uses a new cache file. The source is part of the key, as development builds of
+    AIMET do not have a version.
+    :return: path of the pattern cache file
+    """
+    cache_dir = os.environ.get('AIMET_CACHE_DIR')
+    if not cache_dir:
+        user_cache_dir = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        cache_dir = os.path.join(user_cache_dir, 'aimet')
+
+    with open(__file__, 'rb') as source_file:
+        source_hash = hashlib.sha1(source_file.read()).hexdigest()
+
+    cache_key = json.dumps([_PATTERN_CACHE_FORMAT_VERSION, Version_Info, tf.__version__, source_hash,
+                            op_type_templates], sort_keys=True)
+    return os.path.join(cache_dir, 'tf_op_type_patterns_%s.json' % hashlib.sha1(cache_key.encode()).hexdigest())
+
+
+def save_patterns_to_cache(cache_path: str, op_pattern_info_dict: Dict, pattern_to_op_type_dict: Dict):
+    """
+    Saves op type patterns to a cache file. The file is written next to the cache file and then renamed, so that
+    processes loading the cache never see a partially written file.
+    :param cache_path: path of the cache file
+    :param op_pattern_info_dict: dictionary of pattern info by pattern op type
+    :param pattern_to_op_type_dict: dictionary of pattern op type by pattern
+    """
+    patterns_per_op_type = OrderedDict((pattern_op_type, []) for pattern_op_type in op_pattern_info_dict)
+    for pattern, pattern_op_type in pattern_to_op_type_dict.items():
+        patterns_per_op_type[pattern_op_type].append(pattern)
+
+    cache = [{'pattern_op_type': pattern_op_type, 'patterns': _serialize_op_type_patterns(patterns)}
+             for pattern_op_type, patterns in patterns_per_op_type.items()]
+
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    temp_path = '%s.%d.tmp' % (cache_path, os.getpid())
+    with open(temp_path, 'w') as cache_file:
+        json.dump(cache, cache_file)
+    os.replace(temp_path, cache_path)
+
+
+def load_patterns_from_cache(cache_path: str) -> Tuple[Dict, Dict]:
+    """
+    Loads op type patterns saved by save_patterns_to_cache()
+    :param cache_path: path of the cache file
+    :return: dictionary of pattern info by pattern op type, and dictionary of pattern op type by pattern
+    """
+    with open(cache_path) as cache_file:
+        cache = json.load(cache_file)
+
+    op_pattern_info_dict = OrderedDict()
+    pattern_to_op_type_dict = {}
+    for entry in cache:
+        patterns = _deserialize_op_type_patterns(entry['patterns'])
+        info_dict = op_type_templates[_get_template_name(entry['pattern_op_type'])]
+        _store_op_type_patterns(patterns, entry['pattern_op_type'], info_dict, op_pattern_info_dict,
+                                pattern_to_op_type_dict)
+
+    return op_pattern_info_dict, pattern_to_op_type_dict
+
+
+def load_patterns_for_ops():
+    """
+    Fill reference_op_pattern_info_dict and pattern_to_op_type on first use. Patterns are loaded from the on-disk
+    cache when available, otherwise they are created for all the op templates and saved to the cache.
+    """
+    with _pattern_lock:
+        if reference_op_pattern_info_dict:
+            return
+
+        cache_path = get_pattern_cache_path()
+        if os.path.isfile(cache_path):
+            try:
+                op_pattern_info_dict, pattern_to_op_type_dict = load_patterns_from_cache(cache_path)
+                reference_op_pattern_info_dict.update(op_pattern_info_dict)
+                pattern_to_op_type.update(pattern_to_op_type_dict)
+                logger.debug('Loaded op type patterns from %s', cache_path)
+                return
+            except (OSError, ValueError, KeyError, IndexError, TypeError) as e:
+                logger.warning('Ignoring invalid op type pattern cache %s: %s', cache_path, e)
+
+        create_patterns_for_ops()
+
+        try:
+            save_patterns_to_cache(cache_path, reference_op_pattern_info_dict, pattern_to_op_type)
+        except OSError as e:
+            logger.warning('Unable to save op type pattern cache %s: %s', cache_path, e)
+
+
 def get_module_name(module_regex_list: List[str], ops_list: List[tf.Operation]) -> str:
     """
     Extract module name for the matched ops by matching with a given regex pattern.
@@ -462,19 +620,23 @@ def fill_batch_norm_pattern1_info(op_info: ModuleIdentifierOpInfo, op_sub_graph:
 # 'Conv-2D', 'Dense" 'BN-1' and 'BN-2'. 'BN-1', 'BN-2' represent two of the multiple different variations of
 # the BatchNormalization Op.
 # The values are key-value pairs of info related to pattern like required by module identifier:
-# 'pattern', 'subgraph', 'op_type', 'module_regex' so on.
-# 'pattern' is OpTypePattern and 'subgraph' is the linear sequence of Op for each Op Type.
+# 'pattern', 'length', 'op_type', 'module_regex' so on.
+# 'pattern' is OpTypePattern for the Op and 'length' is the number of OpTypePattern in the sub-graph of the Op Type.
+# The dictionary is filled on first use by load_patterns_for_ops().
 reference_op_pattern_info_dict = OrderedDict()
 
 # Dictionary below is used to optimize reverse look-up on matched pattern during module detection
 # maps pattern to it's op type
 pattern_to_op_type = {}
 
-# create patterns / sub-graphs for module detection corresponding to op templates types
-create_patterns_for_ops()
+# Serializes filling the dictionaries above
+_pattern_lock = threading.Lock()
+
+# Version of the format of the op type pattern cache, to be incremented whenever the format changes
+_PATTERN_CACHE_FORMAT_VERSION = 1
 
 # ---------------------------------------------------------------------------------------------------------- #
-# import time generation of TF OpTypePattern and sub-graphs used for module identification
+# first use generation of TF OpTypePattern used for module identification
 # -- End --
 # ---------------------------------------------------------------------------------------------------------- #
 
@@ -509,76 +671,65 @@ class SubGraphMatcher:
         Use the OpTypePattern objects to detect Ops in a
         specific Session Graph. Keep the detected Ops and their associated internal Ops.
 
+        The patterns are indexed by the type of the op they end with, so the graph is swept once and every op is only
+        matched against the patterns ending with its type. Where matches overlap, the match of the longest pattern is
+        kept.
+
         :param op_to_module_dict: Dictionary mapping op to module op info, to be filled in by SubGraphMatcher
         """
 
-        all_op_patterns_list = [op_dict['pattern'] for op_dict in list(reference_op_pattern_info_dict.values())]
-        for pattern in all_op_patterns_list:
-            layer_matcher = graph_matcher.GraphMatcher(pattern)
-
-            # Graph Match
-            for match_result in layer_matcher.match_graph(self._graph):
-                matched_patterns = list(match_result._pattern_to_op_tensor.keys())
-                op = match_result.get_op(matched_patterns[0])
-                # For ops like FusedBatchNorm, there are multiple output ops of the model which may be matched (Merge,
-                # Merge_1, Merge_2. In these cases, Merge is the one that should be matched because if either of the
-                # other two are matched, Merge will not make it into the op_to_module_dict.
-                if op not in self._valid_ops:
+        load_patterns_for_ops()
+
+        # Matchers of all patterns by the op type of the pattern for the op, '*' matching ops of any type
+        matchers_by_op_type = {}
+        for pattern_index, (pattern_op_type, op_dict) in enumerate(reference_op_pattern_info_dict.items()):
+            matcher = graph_matcher.GraphMatcher(op_dict['pattern'])
+            for op_type in op_dict['pattern']._op_type.split('|'):
+                matchers_by_op_type.setdefault(op_type, []).append((pattern_index, pattern_op_type, matcher))
+        wildcard_matchers = matchers_by_op_type.pop('*', [])
+
+        # Graph Match
+        matches = []
+        for op_index, op in enumerate(self._graph.get_operations()):
+            # For ops like FusedBatchNorm, there are multiple output ops of the model which may be matched (Merge,
+            # Merge_1, Merge_2. In these cases, Merge is the one that should be matched because if either of the
+            # other two are matched, Merge will not make it into the op_to_module_dict.
+            if op not in self._valid_ops:
+                continue
+
+            for pattern_index, template_pattern_type, matcher in \
+                    matchers_by_op_type.get(op.type, []) + wildcard_matchers:
+                match_result = matcher.match_op(op)
+                if match_result is None:
                     continue
-                template_pattern_type = pattern_to_op_type[matched_patterns[0]]
-                if op in op_to_module_dict:
-                    # op was already matched with a different pattern previously. Compare lengths of the previous
-                    # pattern with current pattern, and replace the previous op type with the current op type if more
-                    # ops were matched.
-                    # This can happen if one pattern is a subset of another (Conv2D without bias vs Conv2D with bias for
-                    # example. If the same op is matched with both patterns, we will pick Conv2D with bias to be the one
-                    # to use.
-                    op_info = op_to_module_dict[op]
-                    if reference_op_pattern_info_dict[op_info.pattern_type]['length'] >= \
-                            reference_op_pattern_info_dict[template_pattern_type]['length']:
-                        # op was already matched with a larger pattern set
-                        continue
-
-                ops_list = [op for op in get_internal_ops_for_pattern(match_result) if op in self._valid_ops]
-                # ops_list should not be empty since there was an earlier check that the current match_result has ops
-                # in self._valid_ops.
+
+                ops_list = [internal_op for internal_op in get_internal_ops_for_pattern(match_result)
+                            if internal_op in self._valid_ops]
+                # ops_list should not be empty since the op the match started from is in self._valid_ops.
                 if not ops_list:
                     logger.error('Valid matched ops list should not be empty')
                     raise AssertionError
-                # Check if any ops in ops_list were already matched with a larger pattern. If so, no need to change
-                # existing entries in op_to_module_dict.
-                if not SubGraphMatcher._is_subset_of_already_matched_op(template_pattern_type, ops_list,
-                                                                        op_to_module_dict):
-                    op_type = reference_op_pattern_info_dict[template_pattern_type]['op_type']
-                    module_name = get_module_name(reference_op_pattern_info_dict[template_pattern_type]['module_regex'],
-                                                  ops_list)
-                    associated_op = get_associated_op(reference_op_pattern_info_dict[template_pattern_type]
-                                                      ['associated_op_regex'], ops_list)
-                    op_info = ModuleIdentifierOpInfo(module_name, op_type, associated_op,
-                                                     pattern_type=template_pattern_type,
-                                                     internal_ops=ops_list)
-                    for op in ops_list:
-                        op_to_module_dict[op] = op_info
-
-    @staticmethod
-    def _is_subset_of_already_matched_op(current_pattern: str, ops_list: List[tf.Operation],
-                                         op_to_module_dict: Dict[tf.Operation, ModuleIdentifierOpInfo]):
-        """
-        For each op in ops_list, check if it has already been associated with a module. If so, check if the length
-        of the pattern for the module is longer or shorter than the pattern for the currently matched type.
-        :param current_pattern: Currently matched pattern
-        :param ops_list: List of ops that are currently matched together
-        :param op_to_module_dict: Dictionary mapping previously matched ops to ModuleIdentifierOpInfo objects
-        :return: True if the currently matched ops are a subset of a previously matched set of ops.
-        """
-        for op in ops_list:
-            if op in op_to_module_dict:
-                op_info = op_to_module_dict[op]
-                if reference_op_pattern_info_dict[op_info.pattern_type]['length'] > \
-                        reference_op_pattern_info_dict[current_pattern]['length']:
-                    # op was already matched with a larger pattern set
-                    # Below assertion is to make sure that all ops in ops_list are op_to_module_dict already
-                    for an_op in ops_list:
-                        assert an_op in op_to_module_dict
-                    return True
-        return False
+                length = reference_op_pattern_info_dict[template_pattern_type]['length']
+                matches.append((-length, pattern_index, op_index, template_pattern_type, ops_list))
+
+        # Keep the longest matches. One pattern can be a subset of another (Conv2D without bias vs Conv2D with bias for
+        # example). If the same ops are matched with both patterns, we will pick Conv2D with bias. Matches of equal
+        # length are taken in order of the patterns, then of the ops in the graph.
+        matches.sort(key=lambda match: match[:3])
+        for _, _, _, template_pattern_type, ops_list in matches:
+            if any(op in op_to_module_dict for op in ops_list):
+                # ops were already matched with a larger pattern set
+                continue
+
+            op_type = reference_op_pattern_info_dict[template_pattern_type]['op_type']
+            module_name = get_module_name(reference_op_pattern_info_dict[template_pattern_type]['module_regex'],
+                                          ops_list)
+            associated_op = get_associated_op(reference_op_pattern_info_dict[template_pattern_type]
+                                              ['associated_op_regex'], ops_list)
+            op_info = ModuleIdentifierOpInfo(module_name, op_type, associated_op,
+                                             pattern_type=template_pattern_type,
+                                             internal_ops=ops_list)
+            for op in ops_list:
+                op_to_module_dict[op] = op_info
+
+        logger.debug('Detected %d modules from %d pattern matches', len(set(op_to_module_dict.values())), len(matches))
@@ -47,7 +47,8 @@ from aimet_tensorflow.common.connectedgraph import ConnectedGraph
 from aimet_tensorflow.common.operation import Op
 from aimet_tensorflow.batch_norm_fold import fold_all_batch_norms
 from aimet_tensorflow.utils.graph_saver import save_and_load_graph
-from aimet_tensorflow.utils.op.conv import WeightTensorUtils, BiasUtils
+from aimet_tensorflow.utils.op.conv import WeightTensorUtils, BiasUtils, get_params_as_numpy_data, \
+    update_params_for_ops
 import aimet_tensorflow.utils.op.relu as ReluUtils
 from aimet_tensorflow.utils.op.fusedbatchnorm import BNUtils
 from aimet_common.utils import AimetLogger
@@ -357,39 +358,38 @@ class CrossLayerScaling:
             prev_layer_params = libpymo.EqualizationParams()
             curr_layer_params = libpymo.EqualizationParams()
 
+            # read the weights and biases of the layers in a single session run
+            weights, biases = get_params_as_numpy_data(model, cls_set)
+
             # send as [Noc, Nic, kh, kw],  TF format is [kh, kw, Nic, Noc]
-            prev_layer_params.weight = WeightTensorUtils.get_tensor_as_numpy_data(model, cls_set[0]). \
-                transpose((3, 2, 0, 1)).reshape(-1)
+            prev_layer_params.weight = weights[cls_set[0]].transpose((3, 2, 0, 1)).reshape(-1)
             weight_shape = WeightTensorUtils.get_tensor_shape(cls_set[0])
             prev_layer_params.weightShape = [weight_shape[3], weight_shape[2], weight_shape[0], weight_shape[1]]
-            prev_layer_params.isBiasNone = BiasUtils.is_bias_none(cls_set[0])
+            prev_layer_params.isBiasNone = cls_set[0] not in biases
 
             # send as [Noc, Nic, kh, kw],  TF format is [kh, kw, Nic, Noc]
-            curr_layer_params.weight = WeightTensorUtils.get_tensor_as_numpy_data(model, cls_set[1]). \
-                transpose((3, 2, 0, 1)).reshape(-1)
+            curr_layer_params.weight = weights[cls_set[1]].transpose((3, 2, 0, 1)).reshape(-1)
             weight_shape = WeightTensorUtils.get_tensor_shape(cls_set[1])
             curr_layer_params.weightShape = [weight_shape[3], weight_shape[2], weight_shape[0], weight_shape[1]]
 
-            if not BiasUtils.is_bias_none(cls_set[0]):
-                prev_layer_params.bias = BiasUtils.get_bias_as_numpy_data(model, cls_set[0]).reshape(-1)
-            else:
-                prev_layer_params.isBiasNone = True
+            if cls_set[0] in biases:
+                prev_layer_params.bias = biases[cls_set[0]].reshape(-1)
 
             scaling_factor = libpymo.scaleLayerParams(prev_layer_params, curr_layer_params)
 
             # convert received formats back to TF
             # TF format is [kh, kw, Nic, Noc]
-            numpy_weight_reshaped = np.reshape(prev_layer_params.weight, prev_layer_params.weightShape). \
-                transpose((2, 3, 1, 0))
-            WeightTensorUtils.update_tensor_for_op(model, cls_set[0], numpy_weight_reshaped)
+            new_weights = {
+                cls_set[0]: np.reshape(prev_layer_params.weight, prev_layer_params.weightShape).transpose((2, 3, 1, 0)),
+                cls_set[1]: np.reshape(curr_layer_params.weight, curr_layer_params.weightShape).transpose((2, 3, 1, 0))
+            }
 
-            numpy_weight_reshaped = np.reshape(curr_layer_params.weight, curr_layer_params.weightShape). \
-                transpose((2, 3, 1, 0))
-            WeightTensorUtils.update_tensor_for_op(model, cls_set[1], numpy_weight_reshaped)
+            new_biases = {}
+            if cls_set[0] in biases:
+                new_biases[cls_set[0]] = np.reshape(prev_layer_params.bias, BiasUtils.get_shape(cls_set[0]))
 
-            if not BiasUtils.is_bias_none(cls_set[0]):
-                numpy_bias_reshaped = np.reshape(prev_layer_params.bias, BiasUtils.get_shape(cls_set[0]))
-                BiasUtils.update_bias_for_op(model, cls_set[0], numpy_bias_reshaped)
+            # write the weights and biases back in a single session run
+            update_params_for_ops(model, new_weights, new_biases)
 
         return scaling_factor
 
@@ -417,65 +417,57 @@ class CrossLayerScaling:
             curr_layer_params = libpymo.EqualizationParams()
             next_layer_params = libpymo.EqualizationParams()
 
+            # read the weights and biases of the layers in a single session run
+            weights, biases = get_params_as_numpy_data(model, cls_set)
+
             # send as [Noc, Nic, kh, kw],  TF format is [kh, kw, Nic, Noc]
-            prev_layer_params.weight = WeightTensorUtils.get_tensor_as_numpy_data(model, cls_set[0]). \
-                transpose((3, 2, 0, 1)).reshape(-1)
+            prev_layer_params.weight = weights[cls_set[0]].transpose((3, 2, 0, 1)).reshape(-1)
             weight_shape = WeightTensorUtils.get_tensor_shape(cls_set[0])
             prev_layer_params.weightShape = [weight_shape[3], weight_shape[2], weight_shape[0], weight_shape[1]]
-            prev_layer_params.isBiasNone = BiasUtils.is_bias_none(cls_set[0])
+            prev_layer_params.isBiasNone = cls_set[0] not in biases
 
             # depthwise layer outputs is set to 1 in TF
             # send as [Nic, Noc, kh, kw],  TF format is [kh, kw, Nic, Noc]
-            curr_layer_params.weight = WeightTensorUtils.get_tensor_as_numpy_data(model, cls_set[1]). \
-                transpose((2, 3, 0, 1)).reshape(-1)
+            curr_layer_params.weight = weights[cls_set[1]].transpose((2, 3, 0, 1)).reshape(-1)
             weight_shape = WeightTensorUtils.get_tensor_shape(cls_set[1])
 
             # depthwise layer outputs is set to 1 in TF
             # send as [Nic, Noc, kh, kw],  TF format is [kh, kw, Nic, Noc]
             curr_layer_params.weightShape = [weight_shape[2], weight_shape[3], weight_shape[0], weight_shape[1]]
-            curr_layer_params.isBiasNone = BiasUtils.is_bias_none(cls_set[1])
+            curr_layer_params.isBiasNone = cls_set[1] not in biases
 
             # send as [Noc, Nic, kh, kw] , TF format is [kh, kw, Nic, Noc]
-            next_layer_params.weight = WeightTensorUtils.get_tensor_as_numpy_data(model, cls_set[2]). \
-                transpose((3, 2, 0, 1)).reshape(-1)
+            next_layer_params.weight = weights[cls_set[2]].transpose((3, 2, 0, 1)).reshape(-1)
             weight_shape = WeightTensorUtils.get_tensor_shape(cls_set[2])
             next_layer_params.weightShape = [weight_shape[3], weight_shape[2], weight_shape[0], weight_shape[1]]
 
-            if not BiasUtils.is_bias_none(cls_set[0]):
-                prev_layer_params.bias = BiasUtils.get_bias_as_numpy_data(model, cls_set[0]).reshape(-1)
-            else:
-                prev_layer_params.isBiasNone = True
+            if cls_set[0] in biases:
+                prev_layer_params.bias = biases[cls_set[0]].reshape(-1)
 
-            if not BiasUtils.is_bias_none(cls_set[1]):
-                curr_layer_params.bias = BiasUtils.get_bias_as_numpy_data(model, cls_set[1]).reshape(-1)
-            else:
-                curr_layer_params.isBiasNone = True
+            if cls_set[1] in biases:
+                curr_layer_params.bias = biases[cls_set[1]].reshape(-1)
 
             scaling_params = libpymo.scaleDepthWiseSeparableLayer(prev_layer_params, curr_layer_params,
                                                                   next_layer_params)
 
             # convert received formats back to TF
             # TF format is [kh, kw, Nic, Noc]
-            numpy_weight_reshaped_0 = np.reshape(prev_layer_params.weight, prev_layer_params.weightShape). \
-                transpose((2, 3, 1, 0))
-            WeightTensorUtils.update_tensor_for_op(model, cls_set[0], numpy_weight_reshaped_0)
-
-            # depthwise layer
-            numpy_weight_reshaped_1 = np.reshape(curr_layer_params.weight, curr_layer_params.weightShape). \
-                transpose((2, 3, 0, 1))
-            WeightTensorUtils.update_tensor_for_op(model, cls_set[1], numpy_weight_reshaped_1)
+            new_weights = {
+                cls_set[0]: np.reshape(prev_layer_params.weight, prev_layer_params.weightShape).transpose((2, 3, 1, 0)),
+                # depthwise layer
+                cls_set[1]: np.reshape(curr_layer_params.weight, curr_layer_params.weightShape).transpose((2, 3, 0, 1)),
+                cls_set[2]: np.reshape(next_layer_params.weight, next_layer_params.weightShape).transpose((2, 3, 1, 0))
+            }
 
-            numpy_weight_reshaped_2 = np.reshape(next_layer_params.weight, next_layer_params.weightShape). \
-                transpose((2, 3, 1, 0))
-            WeightTensorUtils.update_tensor_for_op(model, cls_set[2], numpy_weight_reshaped_2)
+            new_biases = {}
+            if cls_set[0] in biases:
+                new_biases[cls_set[0]] = np.reshape(prev_layer_params.bias, BiasUtils.get_shape(cls_set[0]))
 
-            if not BiasUtils.is_bias_none(cls_set[0]):
-                numpy_bias_reshaped = np.reshape(prev_layer_params.bias, BiasUtils.get_shape(cls_set[0]))
-                BiasUtils.update_bias_for_op(model, cls_set[0], numpy_bias_reshaped)
+            if cls_set[1] in biases:
+                new_biases[cls_set[1]] = np.reshape(curr_layer_params.bias, BiasUtils.get_shape(cls_set[1]))
 
-            if not BiasUtils.is_bias_none(cls_set[1]):
-                numpy_bias_reshaped = np.reshape(curr_layer_params.bias, BiasUtils.get_shape(cls_set[1]))
-                BiasUtils.update_bias_for_op(model, cls_set[1], numpy_bias_reshaped)
+            # write the weights and biases back in a single session run
+            update_params_for_ops(model, new_weights, new_biases)
 
         return scaling_params.scalingMatrix12, scaling_params.scalingMatrix23
 
@@ -639,6 +631,16 @@ class HighBiasFold:
                 logger.error('High Bias folding is not supported for models without BatchNorm Layers')
                 return sess
 
+            # read the weights and biases of all layers at once. Biases are updated in this dictionary as they get
+            # folded, so that later layer pairs see the updates, and are written back at once at the end
+            layers = {}
+            for cls_set_info in cls_set_info_list:
+                for cls_pair_info in cls_set_info.cls_pair_info_list:
+                    layers[cls_pair_info.layer1] = None
+                    layers[cls_pair_info.layer2] = None
+            weights, biases = get_params_as_numpy_data(sess, list(layers))
+            updated_biases = {}
+
             for cls_set_info in cls_set_info_list:
 
                 for cls_pair_info in cls_set_info.cls_pair_info_list:
@@ -647,7 +649,7 @@ class HighBiasFold:
                     if cls_pair_info.layer1.name in bn_layers.keys():
 
                         # check if bias present in given conv2D(s)
-                        if BiasUtils.is_bias_none(cls_pair_info.layer1) or BiasUtils.is_bias_none(cls_pair_info.layer2):
+                        if cls_pair_info.layer1 not in biases or cls_pair_info.layer2 not in biases:
                             continue
 
                         prev_layer_params = libpymo.LayerParams()
@@ -661,16 +663,14 @@ class HighBiasFold:
                                                                      scaling_parameter)
 
                         prev_layer_params.activationIsRelu = cls_pair_info.relu_activation_between_layers
-                        prev_layer_params.bias =\
-                            BiasUtils.get_bias_as_numpy_data(sess, cls_pair_info.layer1).reshape(-1)
+                        prev_layer_params.bias = biases[cls_pair_info.layer1].reshape(-1)
                         prev_bias_shape = BiasUtils.get_shape(cls_pair_info.layer1)
 
                         weight_shape = WeightTensorUtils.get_tensor_shape(cls_pair_info.layer1)
                         prev_layer_params.weightShape = [weight_shape[3], weight_shape[2], weight_shape[0],
                                                          weight_shape[1]]
 
-                        curr_layer_params.bias =\
-                            BiasUtils.get_bias_as_numpy_data(sess, cls_pair_info.layer2).reshape(-1)
+                        curr_layer_params.bias = biases[cls_pair_info.layer2].reshape(-1)
                         curr_bias_shape = BiasUtils.get_shape(cls_pair_info.layer2)
 
                         weight_shape = WeightTensorUtils.get_tensor_shape(cls_pair_info.layer2)
@@ -679,36 +679,36 @@ class HighBiasFold:
                         # for a depthwise layer num outputs is set to 1 in TF
                         # send as [Nic, Noc, kh, kw],  TF format is [kh, kw, Nic, Noc]
                         if cls_pair_info.layer2.type in ['DepthwiseConv2dNative']:
-                            c_wt = WeightTensorUtils.get_tensor_as_numpy_data(
-                                sess, cls_pair_info.layer2).transpose((2, 3, 0, 1))
+                            c_wt = weights[cls_pair_info.layer2].transpose((2, 3, 0, 1))
                             curr_layer_params.weight = c_wt.reshape(-1)
                             curr_layer_params.weightShape = [weight_shape[2], weight_shape[3], weight_shape[0],
                                                              weight_shape[1]]
 
                         else:
                             # send as [Noc, Nic, kh, kw],  TF format is [kh, kw, Nic, Noc]
-                            c_wt = WeightTensorUtils.get_tensor_as_numpy_data(
-                                sess, cls_pair_info.layer2).transpose((3, 2, 0, 1))
+                            c_wt = weights[cls_pair_info.layer2].transpose((3, 2, 0, 1))
                             curr_layer_params.weight = c_wt.reshape(-1)
                             curr_layer_params.weightShape = [weight_shape[3], weight_shape[2], weight_shape[0],
                                                              weight_shape[1]]
 
                         libpymo.updateBias(prev_layer_params, curr_layer_params, prev_layer_bn_params)
 
-                        BiasUtils.update_bias_for_op(sess, cls_pair_info.layer1, np.reshape(prev_layer_params.bias,
-                                                                                            prev_bias_shape))
-
-                        BiasUtils.update_bias_for_op(sess, cls_pair_info.layer2, np.reshape(curr_layer_params.bias,
-                                                                                            curr_bias_shape))
+                        biases[cls_pair_info.layer1] = np.reshape(prev_layer_params.bias, prev_bias_shape)
+                        biases[cls_pair_info.layer2] = np.reshape(curr_layer_params.bias, curr_bias_shape)
+                        updated_biases[cls_pair_info.layer1] = biases[cls_pair_info.layer1]
+                        updated_biases[cls_pair_info.layer2] = biases[cls_pair_info.layer2]
                     else:
                         logger.info("skipping layer: {%s}", cls_pair_info.layer1.name)
 
+            update_params_for_ops(sess, {}, updated_biases)
+
         # save and load the updated graph after high bias fold update
         aftr_hbf_sess = save_and_load_graph('./temp_hbf', sess)
 
         return aftr_hbf_sess
 
 
+@AimetLogger.span(AimetLogger.LogAreas.CrosslayerEqualization, 'equalize_model')
 def equalize_model(sess: tf.compat.v1.Session, start_op_names: Union[str, List[str]],
                    output_op_names: Union[str, List[str]]) -> tf.compat.v1.Session:
     """
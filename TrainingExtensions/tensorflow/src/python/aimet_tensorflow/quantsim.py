@@ -512,6 +512,7 @@ class QuantizationSimModel:
                                                            activation_op_names)
         QuantSimConfigurator(self.session, conn_graph, op_to_quant_ops_dict, config_file)
 
+    @AimetLogger.span(AimetLogger.LogAreas.Quant, 'compute_encodings')
     def compute_encodings(self, forward_pass_callback: Callable[[tf.compat.v1.Session, Any], None],
                           forward_pass_callback_args):
         """
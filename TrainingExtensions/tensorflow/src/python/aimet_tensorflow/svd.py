@@ -549,37 +549,17 @@ class Svd:
 
         return objective_score
 
-    def _split_conv_layer(self, sess, svd_ranks, attr, op_name, bias_op_name=None):
+    def _get_split_conv_layer_weights(self, op_name, w_shape, svd_ranks, attr, has_bias):
         """
-        Split a given conv layer given a rank
-        :param sess: tf.compat.v1.Session
+        Split the weights and biases of a given conv layer given a rank
+        :param op_name: Name of the op to split
+        :param w_shape: Shape of the weights of the op, in TF order [H,W,I,O]
         :param svd_ranks: Rank to split the layer with (two ranks in case of SSVD)
         :param attr: Reference to the corresponding layer attribute
-        :param op_name: Name of the op to split
-        :param bias_op_name: Name of the corresponding bias op (if any)
-        :return: None
+        :param has_bias: True if the op has a corresponding bias op
+        :return: Weights of the split layers in TF order [H,W,I,O], and biases of the split layers
         """
-        # pylint: disable=too-many-statements,too-many-branches,too-many-locals
-
-        logger.info('Splitting conv op: %s', op_name)
-
-        # Retrieve the op(s) from the current graph
-        op = sess.graph.get_operation_by_name(op_name)
-
-        bias_op = None
-        if bias_op_name:
-            bias_op = sess.graph.get_operation_by_name(bias_op_name)
-
-        # Create new 'conv_a' layer
-        pad_mode = op.get_attr('padding')
-        data_format = op.get_attr('data_format').decode('utf-8')
-        strides = op.get_attr('strides')
-
-        # Print current conv weight shape
-        query = core.OpQuery(sess.graph)
-        w_shape = query.get_weights_for_op(op).get_shape().as_list()
-        logger.debug('Original %s weight shape: %s', op.name, str(w_shape))
-        split_weights, weight_sizes = [], []
+        split_weights, weight_sizes, split_weight_shapes = [], [], []
         split_biases, bias_sizes = [], []
 
         # TF weights are in [H,W,I,O] order. We must reshape the split weights to SVD format [O,I,H,W]
@@ -589,7 +569,8 @@ class Svd:
         conv_a_weights = np.zeros(split_conv_a_w_shape)     # transpose(2,3,1,0)
         split_weights.append(conv_a_weights.flatten().tolist())
         weight_sizes.append(conv_a_weights.size)
-        if bias_op:
+        split_weight_shapes.append(split_conv_a_w_shape)
+        if has_bias:
             conv_a_bias = np.zeros(svd_ranks[0])
             split_biases.append(conv_a_bias.flatten().tolist())
             bias_sizes.append(conv_a_bias.size)
@@ -605,7 +586,8 @@ class Svd:
         conv_b_bias = np.zeros(num_filters)
         split_weights.append(conv_b_weights.flatten().tolist())
         weight_sizes.append(conv_b_weights.size)
-        if bias_op:
+        split_weight_shapes.append(split_conv_b_w_shape)
+        if has_bias:
             split_biases.append(conv_b_bias.flatten().tolist())
             bias_sizes.append(conv_b_bias.size)
 
@@ -617,16 +599,57 @@ class Svd:
             conv_c_bias = np.zeros(w_shape[3])
             split_weights.append(conv_c_weights.flatten().tolist())
             weight_sizes.append(conv_c_weights.size)
-            if bias_op:
+            split_weight_shapes.append(split_conv_c_w_shape)
+            if has_bias:
                 split_biases.append(conv_c_bias.flatten().tolist())
                 bias_sizes.append(conv_c_bias.size)
 
         # Split the weights and biases according to the number of layers and ranks
-        split_weights = self._svd.SplitLayerWeights(op.name, split_weights, weight_sizes, svd_ranks)
-        split_biases = self._svd.SplitLayerBiases(op.name, split_biases, bias_sizes, svd_ranks)
+        split_weights = self._svd.SplitLayerWeights(op_name, split_weights, weight_sizes, svd_ranks)
+        split_biases = self._svd.SplitLayerBiases(op_name, split_biases, bias_sizes, svd_ranks)
+
+        # Transpose the split weights from SVD format [O,I,H,W] back to TF format [H,W,I,O]
+        split_weights = [np.array(weights).reshape(shape).transpose(2, 3, 1, 0)
+                         for weights, shape in zip(split_weights, split_weight_shapes)]
+
+        return split_weights, split_biases
+
+    def _split_conv_layer(self, sess, svd_ranks, attr, op_name, bias_op_name=None):
+        """
+        Split a given conv layer given a rank
+        :param sess: tf.compat.v1.Session
+        :param svd_ranks: Rank to split the layer with (two ranks in case of SSVD)
+        :param attr: Reference to the corresponding layer attribute
+        :param op_name: Name of the op to split
+        :param bias_op_name: Name of the corresponding bias op (if any)
+        :return: None
+        """
+        # pylint: disable=too-many-statements,too-many-branches,too-many-locals
+
+        logger.info('Splitting conv op: %s', op_name)
+
+        # Retrieve the op(s) from the current graph
+        op = sess.graph.get_operation_by_name(op_name)
+
+        bias_op = None
+        if bias_op_name:
+            bias_op = sess.graph.get_operation_by_name(bias_op_name)
+
+        # Create new 'conv_a' layer
+        pad_mode = op.get_attr('padding')
+        data_format = op.get_attr('data_format').decode('utf-8')
+        strides = op.get_attr('strides')
+
+        # Print current conv weight shape
+        query = core.OpQuery(sess.graph)
+        w_shape = query.get_weights_for_op(op).get_shape().as_list()
+        logger.debug('Original %s weight shape: %s', op.name, str(w_shape))
+
+        split_weights, split_biases = self._get_split_conv_layer_weights(op.name, w_shape, svd_ranks, attr,
+                                                                         bias_op is not None)
         if split_weights:
             conv_a_name = op.name+'_a'
-            conv_a_weights = np.array(split_weights[0]).reshape(split_conv_a_w_shape).transpose(2, 3, 1, 0)
+            conv_a_weights = split_weights[0]
             conv_a_w = tf.Variable(initial_value=conv_a_weights, name=conv_a_name+'_w', dtype=tf.float32)
             logger.debug('%s weight shape: %s', conv_a_name, str(conv_a_weights.shape))
 
@@ -641,7 +664,7 @@ class Svd:
         if len(split_weights) > 1:
             # Create conv_b
             conv_b_name = op.name+'_b'
-            conv_b_weights = np.array(split_weights[1]).reshape(split_conv_b_w_shape).transpose(2, 3, 1, 0)
+            conv_b_weights = split_weights[1]
             conv_b_w = tf.Variable(initial_value=conv_b_weights, name=conv_b_name+'_w', dtype=tf.float32)
             logger.debug('%s weight shape: %s', conv_b_name, str(conv_b_weights.shape))
 
@@ -655,7 +678,7 @@ class Svd:
         if len(split_weights) > 2 and len(svd_ranks) >= 2 and attr.mode == pymo.TYPE_SUCCESSIVE:
             # Create conv_c, using default strides (1,1)
             conv_c_name = op.name+'_c'
-            conv_c_weights = np.array(split_weights[2]).reshape(split_conv_c_w_shape).transpose(2, 3, 1, 0)
+            conv_c_weights = split_weights[2]
             conv_c_w = tf.Variable(initial_value=conv_c_weights, name=conv_c_name+'_w', dtype=tf.float32)
             logger.debug('%s weight shape: %s', conv_c_name, str(conv_c_weights.shape))
 
@@ -675,29 +698,15 @@ class Svd:
 
         return ratio
 
-    def _split_fc_layer(self, sess, svd_ranks, op_name, bias_op_name=None):
+    def _get_split_fc_layer_weights(self, op_name, w_shape, svd_ranks, has_bias):
         """
-        Split a given conv layer given a rank
-        :param sess: tf.compat.v1.Session
-        :param svd_ranks: Rank to split the layer with (two ranks in case of SSVD)
+        Split the weights and biases of a given fully connected layer given a rank
         :param op_name: Name of the op to split
-        :param bias_op_name: Name of the corresponding bias op (if any)
-        :return: None
+        :param w_shape: Shape of the weights of the op, in TF order [I,O]
+        :param svd_ranks: Rank to split the layer with (two ranks in case of SSVD)
+        :param has_bias: True if the op has a corresponding bias op
+        :return: Weights of the split layers in TF order [I,O], and biases of the split layers
         """
-        # pylint: disable=too-many-statements, too-many-locals
-
-        logger.info('Splitting fully connected op: %s', op_name)
-
-        # Retrieve the op(s) from the current graph
-        op = sess.graph.get_operation_by_name(op_name)
-        bias_op = None
-        if bias_op_name:
-            bias_op = sess.graph.get_operation_by_name(bias_op_name)
-
-        # Print current conv weight shape
-        query = core.OpQuery(sess.graph)
-        w_shape = query.get_weights_for_op(op).get_shape().as_list()
-        logger.debug('Original %s weight shape: %s', op.name, str(w_shape))
         split_weights, weight_sizes = [], []
         split_biases, bias_sizes = [], []
 
@@ -708,7 +717,7 @@ class Svd:
         fc_a_bias = np.zeros(svd_ranks[0])
         split_weights.append(fc_a_weights.flatten().tolist())
         weight_sizes.append(fc_a_weights.size)
-        if bias_op:
+        if has_bias:
             split_biases.append(fc_a_bias.flatten().tolist())
             bias_sizes.append(fc_a_bias.size)
 
@@ -718,18 +727,50 @@ class Svd:
         fc_b_weights = np.zeros(split_fc_b_w_shape)
         split_weights.append(fc_b_weights.flatten().tolist())
         weight_sizes.append(fc_b_weights.size)
-        if bias_op:
+        if has_bias:
             fc_b_bias = np.zeros(w_shape[1])
             split_biases.append(fc_b_bias.flatten().tolist())
             bias_sizes.append(fc_b_bias.size)
 
         # Split the weights and biases according to the number of layers and ranks
-        split_weights = self._svd.SplitLayerWeights(op.name, split_weights, weight_sizes, svd_ranks)
-        split_biases = self._svd.SplitLayerBiases(op.name, split_biases, bias_sizes, svd_ranks)
+        split_weights = self._svd.SplitLayerWeights(op_name, split_weights, weight_sizes, svd_ranks)
+        split_biases = self._svd.SplitLayerBiases(op_name, split_biases, bias_sizes, svd_ranks)
+
+        # Transpose the split weights from SVD format [O,I] back to TF format [I,O]
+        split_weights = [np.array(weights).reshape(shape).transpose(1, 0)
+                         for weights, shape in zip(split_weights, [split_fc_a_w_shape, split_fc_b_w_shape])]
+
+        return split_weights, split_biases
+
+    def _split_fc_layer(self, sess, svd_ranks, op_name, bias_op_name=None):
+        """
+        Split a given conv layer given a rank
+        :param sess: tf.compat.v1.Session
+        :param svd_ranks: Rank to split the layer with (two ranks in case of SSVD)
+        :param op_name: Name of the op to split
+        :param bias_op_name: Name of the corresponding bias op (if any)
+        :return: None
+        """
+        # pylint: disable=too-many-statements, too-many-locals
+
+        logger.info('Splitting fully connected op: %s', op_name)
+
+        # Retrieve the op(s) from the current graph
+        op = sess.graph.get_operation_by_name(op_name)
+        bias_op = None
+        if bias_op_name:
+            bias_op = sess.graph.get_operation_by_name(bias_op_name)
 
+        # Print current conv weight shape
+        query = core.OpQuery(sess.graph)
+        w_shape = query.get_weights_for_op(op).get_shape().as_list()
+        logger.debug('Original %s weight shape: %s', op.name, str(w_shape))
+
+        split_weights, split_biases = self._get_split_fc_layer_weights(op.name, w_shape, svd_ranks,
+                                                                       bias_op is not None)
         if split_weights:
             fc_a_name = op.name+'_a'
-            fc_a_weights = np.array(split_weights[0]).reshape(split_fc_a_w_shape).transpose(1, 0)
+            fc_a_weights = split_weights[0]
             fc_a_w = tf.Variable(initial_value=fc_a_weights, name=fc_a_name+'_w', dtype=tf.float32)
             logger.debug('%s weight shape: %s', fc_a_name, str(fc_a_weights.shape))
 
@@ -742,7 +783,7 @@ class Svd:
         if len(split_weights) > 1:
             # Create fc_b
             fc_b_name = op.name+'_b'
-            fc_b_weights = np.array(split_weights[1]).reshape(split_fc_b_w_shape).transpose(1, 0)
+            fc_b_weights = split_weights[1]
             fc_b_w = tf.Variable(initial_value=fc_b_weights, name=fc_b_name+'_w', dtype=tf.float32)
             logger.debug('%s weight shape: %s', fc_b_name, str(fc_b_weights.shape))
             fc_acts = tf.matmul(fc_acts, fc_b_w, name=fc_b_name)
@@ -758,15 +799,13 @@ class Svd:
         _ = ge.reroute_ts(fc_acts, rerouted_inputs, can_modify=consumers)
         return ratio
 
-    def _split_layers(self, sess, rank_index, use_best_ranks):
+    def _get_layers_to_split(self):
         """
-        Split all the selected layers given a rank index
-        :param sess: tf.compat.v1.Session
-        :param rank_index: Rank index to use for finding the ranks
-        :param use_best_ranks: Use the best rank index (for final compressed network)
-        :return: None
+        Get the selected layers to split
+        :return: List of tuples of the op of each selected layer, its stored attributes and the name of its
+                 corresponding bias op (if any)
         """
-        layer_stats = list()
+        layers_to_split = list()
         for i, op in enumerate(self._compressible_ops):
 
             # If op is not a selected layer, skip
@@ -782,15 +821,34 @@ class Svd:
             if not attr:
                 raise RuntimeError("Layer attributes not available for layer"+op.name)
 
-            if use_best_ranks:
+            bias_op = None
+            if i+1 < len(self._compressible_ops):
+                bias_op = self._compressible_ops[i+1]
+                bias_op = bias_op.name if bias_op.type in ['Add', 'BiasAdd'] else None
+
+            layers_to_split.append((op, attr, bias_op))
+
+        return layers_to_split
+
+    def _split_layers(self, sess, rank_index, use_best_ranks, layer_ranks=None):
+        """
+        Split all the selected layers given a rank index
+        :param sess: tf.compat.v1.Session
+        :param rank_index: Rank index to use for finding the ranks
+        :param use_best_ranks: Use the best rank index (for final compressed network)
+        :param layer_ranks: Ranks to split the layers with by op name, instead of the ranks of a rank index
+        :return: None
+        """
+        layer_stats = list()
+        for op, attr, bias_op in self._get_layers_to_split():
+
+            if layer_ranks:
+                svd_ranks = layer_ranks[op.name]
+            elif use_best_ranks:
                 svd_ranks = attr.bestRanks
             else:
                 svd_ranks = self._svd.GetCandidateRanks(op.name, rank_index)
             if svd_ranks:
-                bias_op = None
-                if i+1 < len(self._compressible_ops):
-                    bias_op = self._compressible_ops[i+1]
-                    bias_op = bias_op.name if bias_op.type in ['Add', 'BiasAdd'] else None
                 if op.type in ['Conv2D']:
                     ratio = self._split_conv_layer(sess, svd_ranks, attr, op.name, bias_op)
                 elif op.type in ['MatMul']:
@@ -799,6 +857,136 @@ class Svd:
             layer_stats.append(per_layer_stats)
         return layer_stats
 
+    def _get_max_candidate_ranks(self):
+        """
+        Get the max candidate ranks of every selected layer over all rank indices
+        :return: Max candidate ranks by op name, or None if some layer is not split at some rank index
+        """
+        max_ranks = dict()
+        for op, _, _ in self._get_layers_to_split():
+            candidate_ranks = [self._svd.GetCandidateRanks(op.name, rank_index)
+                               for rank_index in range(self._num_ranks)]
+            if not all(candidate_ranks):
+                return None
+
+            max_ranks[op.name] = [max(svd_ranks) for svd_ranks in zip(*candidate_ranks)]
+
+        return max_ranks
+
+    def _create_rank_sweep_network(self, max_ranks):
+        """
+        Create a network with all selected layers split with their max candidate ranks. Every rank index is then
+        evaluated by loading its split weights into this network, instead of creating a network for it
+        :param max_ranks: Max candidate ranks by op name
+        :return: Session with the created network loaded
+        """
+        g = tf.Graph()
+        with g.as_default():
+            sess, saver = self._load_graph(g, self._default_meta_graph, self._default_checkpoint)
+            self._split_layers(sess, 0, False, layer_ranks=max_ranks)
+
+            output_file = os.path.join(self._output_dir, 'svd_rank_sweep')
+            self._save_graph(sess, saver, output_file)
+
+        # Reset the session and start a new graph for loading the split model
+        self._reset_session(sess)
+
+        g = tf.Graph()
+        with g.as_default():
+
+            # In TF after making changes to the graph you must save and reload, then evaluate
+            sess, _ = self._load_graph(g, output_file+'.meta', output_file)
+
+        return sess
+
+    @staticmethod
+    def _load_zero_padded(sess, variable, value):
+        """
+        Load a value into a variable with a larger or equal shape, padding the value with zeros
+        :param sess: tf.compat.v1.Session
+        :param variable: Variable to load the value into
+        :param value: Value to load
+        :return: None
+        """
+        value = np.asarray(value)
+        padding = [(0, int(dim) - size) for dim, size in zip(variable.shape, value.shape)]
+        variable.load(np.pad(value, padding, 'constant'), sess)
+
+    def _load_rank_index(self, sess, rank_index):
+        """
+        Load the split weights of all selected layers for a given rank index into the network created by
+        _create_rank_sweep_network. Split weights smaller than the max candidate ranks are zero-padded, the padded
+        channels do not contribute to the outputs of the split layers
+        :param sess: tf.compat.v1.Session with the rank sweep network
+        :param rank_index: Rank index to use for finding the ranks
+        :return: Per layer stats, and weight shapes of the split layers by split op name
+        """
+        variables = {variable.op.name: variable
+                     for variable in sess.graph.get_collection(tf.compat.v1.GraphKeys.GLOBAL_VARIABLES)}
+        query = core.OpQuery(sess.graph)
+
+        layer_stats = list()
+        split_layers = dict()
+        for op, attr, bias_op in self._get_layers_to_split():
+
+            svd_ranks = self._svd.GetCandidateRanks(op.name, rank_index)
+            graph_op = sess.graph.get_operation_by_name(op.name)
+            w_shape = query.get_weights_for_op(graph_op).get_shape().as_list()
+
+            if op.type == 'Conv2D':
+                split_weights, split_biases = self._get_split_conv_layer_weights(op.name, w_shape, svd_ranks, attr,
+                                                                                 bias_op is not None)
+            else:
+                split_weights, split_biases = self._get_split_fc_layer_weights(op.name, w_shape, svd_ranks,
+                                                                               bias_op is not None)
+
+            split_op_names = [op.name + suffix for suffix in ['_a', '_b', '_c']]
+            for split_op_name, weights in zip(split_op_names, split_weights):
+                self._load_zero_padded(sess, variables[split_op_name+'_w'], weights)
+                split_layers[split_op_name] = weights.shape
+            if bias_op:
+                for split_op_name, bias in zip(split_op_names, split_biases):
+                    self._load_zero_padded(sess, variables[split_op_name+'_bias'], bias)
+
+            ratio = self._compute_per_layer_compression_ratio([tf.TensorShape(weights.shape)
+                                                               for weights in split_weights[:2]],
+                                                              graph_op.outputs[0].shape, w_shape, op.type)
+            layer_stats.append(stats_u.SvdStatistics.PerSelectedLayer(op.name, svd_ranks, ratio))
+
+        return layer_stats, split_layers
+
+    def _compute_compression_ratio_given_split_layers(self, sess, split_layers, cost_metric):
+        """
+        Compute compression ratio of the network created by _create_rank_sweep_network
+        :param sess: tf.compat.v1.Session with the rank sweep network
+        :param split_layers: Weight shapes of the split layers by split op name
+        :param cost_metric: Metric to use for evaluating the cost
+        :return: Computed compression ratio
+        """
+        mem_cost, mac_cost = self._networkCost
+        for layer in self._selected_layers:
+            mem_cost -= layer.cost[0]
+            mac_cost -= layer.cost[1]
+
+        # The split layers in the network have the shapes of the max candidate ranks, so their costs are computed
+        # from the shapes of the loaded split weights instead
+        for split_op_name, weight_shape in split_layers.items():
+            split_op = sess.graph.get_operation_by_name(split_op_name)
+            split_mem_cost, split_mac_cost = Svd._compute_layer_cost(weight_shape, split_op.outputs[0].shape,
+                                                                     split_op.type)
+            mem_cost += split_mem_cost
+            mac_cost += split_mac_cost
+
+        if cost_metric is CostMetric.memory:
+            savings = self._networkCost[0] - mem_cost
+            ratio = savings/self._networkCost[0]
+
+        else:
+            savings = self._networkCost[1] - mac_cost
+            ratio = savings/self._networkCost[1]
+
+        return ratio
+
     def _create_compressed_network(self, sess, rank_index, use_best_ranks):
         """
         Create a compressed network for a given rank index
@@ -811,12 +999,47 @@ class Svd:
         per_layer_stats = self._split_layers(sess, rank_index, use_best_ranks)
         return per_layer_stats
 
+    def _create_and_evaluate_compressed_network(self, rank_index):
+        """
+        Create a compressed network for a given rank index, and evaluate it
+        :param rank_index: Rank index to use for finding the ranks
+        :return: Session with the compressed network loaded, file the network is saved to, per layer stats,
+                 model performance and compression ratio
+        """
+        g = tf.Graph()
+        with g.as_default():
+            # Create a new network for each rank_index
+            self._svd.PrintCandidateRanks(rank_index, False)
+
+            # Load the default graph so we are operating on a fresh copy of the original graph
+            sess, saver = self._load_graph(g, self._default_meta_graph, self._default_checkpoint)
+            per_layer_stats = self._create_compressed_network(sess, rank_index, False)
+
+            # Save the temp model
+            output_file = os.path.join(self._output_dir, 'svd_rank_index_' + str(rank_index))
+            self._save_graph(sess, saver, output_file)
+
+        # Reset the session and start a new graph for loading the compressed model
+        self._reset_session(sess)
+
+        g = tf.Graph()
+        with g.as_default():
+
+            # In TF after making changes to the graph you must save and reload, then evaluate
+            sess, saver = self._load_graph(g, output_file+'.meta', output_file)
+            model_perf = self._run_graph(sess, self._generator, self._eval_names, self._eval_func, self._iterations)
+
+            # Estimate relative compression score for this rank_index
+            compression_score = self._compute_compression_ratio(sess, self._metric)
+
+        return sess, output_file, per_layer_stats, model_perf, compression_score
+
     def _perform_rank_selection(self):
         """
         Perform rank selection procedure
         :return: None
         """
-        # pylint: disable=too-many-locals
+        # pylint: disable=too-many-locals,too-many-statements
         stats_per_rank_index = list()
         self._svd.ComputeNetworkCost()
         self._num_ranks = self._svd.SetCandidateRanks(self._num_ranks)
@@ -828,65 +1051,69 @@ class Svd:
         best_index = -1
         optimal_score = 0.0
 
+        # When every selected layer is split at every rank index, the split network is created only once
+        max_ranks = self._get_max_candidate_ranks()
+        rank_sweep_sess = self._create_rank_sweep_network(max_ranks) if max_ranks else None
+        split_layers = None
+
         for rank_index in range(self._num_ranks):
-            g = tf.Graph()
-            with g.as_default():
-                # Create a new network for each rank_index
-                self._svd.PrintCandidateRanks(rank_index, False)
 
-                # Load the default graph so we are operating on a fresh copy of the original graph
-                sess, saver = self._load_graph(g, self._default_meta_graph, self._default_checkpoint)
-                per_layer_stats = self._create_compressed_network(sess, rank_index, False)
+            if rank_sweep_sess:
+                sess = rank_sweep_sess
+                with sess.graph.as_default():
+                    self._svd.PrintCandidateRanks(rank_index, False)
+
+                    # Load the split weights for this rank_index into the split network
+                    per_layer_stats, split_layers = self._load_rank_index(sess, rank_index)
+                    output_file = os.path.join(self._output_dir, 'svd_rank_sweep')
+                    model_perf = self._run_graph(sess, self._generator, self._eval_names, self._eval_func,
+                                                 self._iterations)
+                    compression_score = self._compute_compression_ratio_given_split_layers(sess, split_layers,
+                                                                                           self._metric)
+            else:
+                sess, output_file, per_layer_stats, model_perf, compression_score = \
+                    self._create_and_evaluate_compressed_network(rank_index)
 
-                # Save the temp model
-                output_file = os.path.join(self._output_dir, 'svd_rank_index_' + str(rank_index))
-                self._save_graph(sess, saver, output_file)
+            logger.info('%s performance: %s', output_file, str(model_perf))
+            self._model_performance_candidate_ranks.append(model_perf * 100)
 
-            # Reset the session and start a new graph for loading the compressed model
-            self._reset_session(sess)
+            objective_score = self._compute_objective_score(model_perf, compression_score)
+            rank_data = stats_u.SvdStatistics.PerRankIndex(rank_index=rank_index, model_accuracy=model_perf,
+                                                           model_compression_ratio=compression_score,
+                                                           layer_stats_list=per_layer_stats)
+            stats_per_rank_index.append(rank_data)
 
-            g = tf.Graph()
-            with g.as_default():
-
-                # In TF after making changes to the graph you must save and reload, then evaluate
-                sess, saver = self._load_graph(g, output_file+'.meta', output_file)
-                model_perf = self._run_graph(sess, self._generator, self._eval_names, self._eval_func, self._iterations)
-                logger.info('%s performance: %s', output_file, str(model_perf))
-                self._model_performance_candidate_ranks.append(model_perf * 100)
-
-                # Estimate relative compression score for this rank_index
-                compression_score = self._compute_compression_ratio(sess, self._metric)
-                objective_score = self._compute_objective_score(model_perf, compression_score)
-                rank_data = stats_u.SvdStatistics.PerRankIndex(rank_index=rank_index, model_accuracy=model_perf,
-                                                               model_compression_ratio=compression_score,
-                                                               layer_stats_list=per_layer_stats)
-                stats_per_rank_index.append(rank_data)
-
-                logger.info('Compressed network with rank_index %i/%i: accuracy = %f percent '
-                            'with %f percent compression (%r option) and an objective score of %f',
-                            rank_index, self._num_ranks, model_perf * 100, compression_score * 100,
-                            self._metric, objective_score)
-
-                if rank_index == 0:
-                    optimal_score = objective_score
-                    logger.info('Initializing objective score to %f at rank index %i', optimal_score, rank_index)
+            logger.info('Compressed network with rank_index %i/%i: accuracy = %f percent '
+                        'with %f percent compression (%r option) and an objective score of %f',
+                        rank_index, self._num_ranks, model_perf * 100, compression_score * 100,
+                        self._metric, objective_score)
+
+            if rank_index == 0:
+                optimal_score = objective_score
+                logger.info('Initializing objective score to %f at rank index %i', optimal_score, rank_index)
 
-                if model_perf + self._error_margin/100 < self._baseline_perf:
-                    logger.info('Model performance %f falls below %f percent of baseline performance %f'
-                                ' Ending rank selection', model_perf, self._error_margin, self._baseline_perf)
-                    break
+            if model_perf + self._error_margin/100 < self._baseline_perf:
+                logger.info('Model performance %f falls below %f percent of baseline performance %f'
+                            ' Ending rank selection', model_perf, self._error_margin, self._baseline_perf)
+                break
 
-                else:
-                    if objective_score <= optimal_score:
-                        optimal_score = objective_score
-                        logger.info('Found a better value for the objective score %f at rank_index %i',
-                                    optimal_score, rank_index)
-                        best_index = rank_index
+            else:
+                if objective_score <= optimal_score:
+                    optimal_score = objective_score
+                    logger.info('Found a better value for the objective score %f at rank_index %i',
+                                optimal_score, rank_index)
+                    best_index = rank_index
 
         if best_index != -1:
             self._svd.StoreBestRanks(best_index)
-            memory_compression_ratio = self._compute_compression_ratio(sess, CostMetric.memory)
-            mac_compression_ratio = self._compute_compression_ratio(sess, CostMetric.mac)
+            if rank_sweep_sess:
+                memory_compression_ratio = self._compute_compression_ratio_given_split_layers(sess, split_layers,
+                                                                                              CostMetric.memory)
+                mac_compression_ratio = self._compute_compression_ratio_given_split_layers(sess, split_layers,
+                                                                                           CostMetric.mac)
+            else:
+                memory_compression_ratio = self._compute_compression_ratio(sess, CostMetric.memory)
+                mac_compression_ratio = self._compute_compression_ratio(sess, CostMetric.mac)
             stats = stats_u.SvdStatistics(self._baseline_perf, model_perf, self._metric, best_index,
                                           mem_comp_ratio=memory_compression_ratio, mac_comp_ratio=mac_compression_ratio,
                                           rank_stats_list=stats_per_rank_index)
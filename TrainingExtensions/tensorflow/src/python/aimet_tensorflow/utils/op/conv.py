@@ -37,7 +37,7 @@
 # =============================================================================
 """ utilities for conv op """
 
-from typing import Tuple, List, Union
+from typing import Dict, Tuple, List, Union
 import numpy as np
 
 import tensorflow as tf
@@ -152,6 +152,28 @@ class WeightTensorUtils:
             wt_as_var = [var for var in tf.compat.v1.global_variables() if var.name == wt_tensor.name][0]
             wt_as_var.load(tensor_as_numpy_array, sess)
 
+    @staticmethod
+    def get_tensors_as_numpy_data(sess: tf.compat.v1.Session, ops: List[tf.Operation]) -> Dict[tf.Operation, np.array]:
+        """
+        return weight kernels of the given ops as numpy data, read in a single session run
+        :param sess: TensorFlow session
+        :param ops: tf operations to extract weight tensors from
+        :return : dictionary mapping each op to its weight tensor as numpy array type
+        """
+
+        return get_params_as_numpy_data(sess, ops, read_bias=False)[0]
+
+    @staticmethod
+    def update_tensors_for_ops(sess: tf.compat.v1.Session, op_to_tensor_dict: Dict[tf.Operation, np.array]):
+        """
+        update existing weight tensor variables of the given ops with new values, in a single session run
+        :param sess: active tf.compat.v1.Session
+        :param op_to_tensor_dict: dictionary mapping ops to their new weight tensors as numpy arrays
+        :return: None
+        """
+
+        update_params_for_ops(sess, op_to_tensor_dict, {})
+
 
 class BiasUtils:
     """ util for operating on TF bias tensor"""
@@ -401,6 +423,112 @@ class BiasUtils:
                 new_bias_var = tf.Variable(initial_value=bias_as_numpy_array, name=bias_name, dtype=tf.float32)
                 BiasUtils._create_bias_add_op_and_insert(sess, op, new_bias_var, bias_name)
 
+    @staticmethod
+    def get_biases_as_numpy_data(sess: tf.compat.v1.Session, ops: List[tf.Operation]) -> Dict[tf.Operation, np.array]:
+        """
+        return biases of the given ops as numpy data, read in a single session run
+        :param sess: TensorFlow session
+        :param ops: tf operations to extract biases from
+        :return : dictionary mapping each op with a bias to its bias as numpy array type. Ops without bias are left out
+        """
+
+        return get_params_as_numpy_data(sess, ops, read_weight=False)[1]
+
+    @staticmethod
+    def update_biases_for_ops(sess: tf.compat.v1.Session, op_to_bias_dict: Dict[tf.Operation, np.array],
+                              bias_name="bias_value"):
+        """
+        update existing biases of the given ops with new values, in a single session run.
+        creates and adds new biases for ops without bias, one op at a time.
+        Note :
+        Caller needs to perform a load and save of the graph
+        if this api is invoked for an op without existing bias.
+        :param sess: TensorFlow session
+        :param op_to_bias_dict: dictionary mapping ops to their new biases as numpy arrays
+        :param bias_name: optional name can be specified by user
+        :return: None
+        """
+
+        update_params_for_ops(sess, {}, op_to_bias_dict, bias_name)
+
+
+def get_params_as_numpy_data(sess: tf.compat.v1.Session, ops: List[tf.Operation], read_weight: bool = True,
+                             read_bias: bool = True) -> (Dict[tf.Operation, np.array], Dict[tf.Operation, np.array]):
+    """
+    Reads weights and biases of the given conv/linear ops in a single session run
+    :param sess: TensorFlow session
+    :param ops: conv/linear ops to read parameters of
+    :param read_weight: True to read the weights of the ops
+    :param read_bias: True to read the biases of the ops
+    :return: dictionaries mapping ops to their weights, and ops with a bias to their biases, as numpy arrays
+    """
+
+    tensors = {}
+    for op in ops:
+        if read_weight:
+            tensors[('weight', op)] = WeightTensorUtils.get_wt_as_read_var_tensor(op)
+        if read_bias and not BiasUtils.is_bias_none(op):
+            tensors[('bias', op)] = BiasUtils.get_bias_tensor(op)
+
+    numpy_data = sess.run(tensors) if tensors else {}
+
+    weights = {op: numpy_data[(param, op)] for param, op in tensors if param == 'weight'}
+    biases = {op: numpy_data[(param, op)] for param, op in tensors if param == 'bias'}
+    return weights, biases
+
+
+def update_params_for_ops(sess: tf.compat.v1.Session, op_to_weight_dict: Dict[tf.Operation, np.array],
+                          op_to_bias_dict: Dict[tf.Operation, np.array], bias_name="bias_value"):
+    """
+    Updates weights and existing biases of conv/linear ops with new values in a single session run.
+    Biases are created and added for ops without bias, one op at a time.
+    Note :
+    Caller needs to perform a load and save of the graph
+    if biases are added to ops without existing bias.
+    :param sess: TensorFlow session
+    :param op_to_weight_dict: dictionary mapping ops to their new weight tensors as numpy arrays
+    :param op_to_bias_dict: dictionary mapping ops to their new biases as numpy arrays
+    :param bias_name: optional name for newly created biases
+    :return: None
+    """
+
+    var_name_to_value = {}
+    ops_without_bias = []
+
+    with sess.graph.as_default():
+        for op, weight in op_to_weight_dict.items():
+            # validate the shapes are same
+            assert WeightTensorUtils.get_tensor_shape(op) == weight.shape
+            wt_tensor = WeightTensorUtils.get_wt_tensor(op)
+            assert wt_tensor is not None, ('Error, no weight tensor found for this op', op.name)
+            var_name_to_value[wt_tensor.name] = weight
+
+        for op, bias in op_to_bias_dict.items():
+            if BiasUtils.is_bias_none(op):
+                ops_without_bias.append(op)
+                continue
+            bias_tensor_as_read_var_op_input = BiasUtils.get_bias_tensor(op)
+            assert len(bias_tensor_as_read_var_op_input.op.inputs) == 1
+            bias_tensor = bias_tensor_as_read_var_op_input.op.inputs[constants.OP_BIAS_INDICES[op.type]]
+            assert BiasUtils.get_shape(op)[0] == bias.size
+            assert bias_tensor is not None, ('Error, bias tensor lookup failed for op ', op.name)
+            var_name_to_value[bias_tensor.name] = bias
+
+        if var_name_to_value:
+            # Load all values the way tf.Variable.load() loads a single one: by running the variables' initializers
+            # with the new values fed in place of their initial values. No ops are added to the graph
+            var_name_to_var = {var.name: var for var in tf.compat.v1.global_variables()}
+            initializers = []
+            feed_dict = {}
+            for var_name, value in var_name_to_value.items():
+                var = var_name_to_var[var_name]
+                initializers.append(var.initializer)
+                feed_dict[var.initializer.inputs[1]] = value
+            sess.run(initializers, feed_dict=feed_dict)
+
+    for op in ops_without_bias:
+        BiasUtils.update_bias_for_op(sess, op, op_to_bias_dict[op], bias_name)
+
 
 def get_conv2d_op_params(op: tf.Operation) -> (Tuple, Tuple, Tuple):
     """
@@ -635,31 +763,41 @@ def get_weight_tensor_with_shape(model: tf.compat.v1.Session, input_op: tf.Opera
     """
 
     with model.graph.as_default():
-
         weight_tensor = WeightTensorUtils.get_tensor_as_numpy_data(model, input_op)
 
-        # Conv2d weight shape in TensorFlow  [kh, kw, Nic, Noc]
-        # re order in the common shape  [Noc, Nic, kh, kw]
-        shape = WeightTensorUtils.get_tensor_shape(input_op)
-        wt_tensor = None
-
-        if input_op.type == 'DepthwiseConv2dNative':
-            # Depthwise conv layers in TF have outputs(Noc) set to 1.
-            # we will use format [Nic, Noc, kh, kw] -
-            # to be compatible with cpp backend.
-            wt_tensor = np.transpose(weight_tensor, (2, 3, 0, 1))
-            # [Nic, Noc, kh, kw]
-            shape = np.array([shape[2], shape[3], shape[0], shape[1]])
-        elif input_op.type == 'MatMul':
-            shape = np.concatenate((np.array([1, 1]), shape))
-            wt_tensor = np.transpose(weight_tensor, (1, 0))
-            # [Noc, Nic, kh, kw]
-            shape = np.array([shape[3], shape[2], shape[0], shape[1]])
-        elif input_op.type == 'Conv2D':
-            wt_tensor = np.transpose(weight_tensor, (3, 2, 0, 1))
-            # [Noc, Nic, kh, kw]
-            shape = np.array([shape[3], shape[2], shape[0], shape[1]])
-        else:
-            logger.error("_get_weight_tensor_transpose_reshape(): Operation type unsupported")
+    return transpose_weight_tensor_with_shape(input_op, weight_tensor)
+
+
+def transpose_weight_tensor_with_shape(input_op: tf.Operation, weight_tensor: np.array):
+    """
+     generic function to transpose a weight tensor read from a given conv/linear op to the common format
+    :param input_op: input op as tf.Operation type
+    :param weight_tensor: weight tensor of the op in TensorFlow format, as numpy array
+    :return: weight and shape of tensor in common format
+    """
+
+    # Conv2d weight shape in TensorFlow  [kh, kw, Nic, Noc]
+    # re order in the common shape  [Noc, Nic, kh, kw]
+    shape = WeightTensorUtils.get_tensor_shape(input_op)
+    wt_tensor = None
+
+    if input_op.type == 'DepthwiseConv2dNative':
+        # Depthwise conv layers in TF have outputs(Noc) set to 1.
+        # we will use format [Nic, Noc, kh, kw] -
+        # to be compatible with cpp backend.
+        wt_tensor = np.transpose(weight_tensor, (2, 3, 0, 1))
+        # [Nic, Noc, kh, kw]
+        shape = np.array([shape[2], shape[3], shape[0], shape[1]])
+    elif input_op.type == 'MatMul':
+        shape = np.concatenate((np.array([1, 1]), shape))
+        wt_tensor = np.transpose(weight_tensor, (1, 0))
+        # [Noc, Nic, kh, kw]
+        shape = np.array([shape[3], shape[2], shape[0], shape[1]])
+    elif input_op.type == 'Conv2D':
+        wt_tensor = np.transpose(weight_tensor, (3, 2, 0, 1))
+        # [Noc, Nic, kh, kw]
+        shape = np.array([shape[3], shape[2], shape[0], shape[1]])
+    else:
+        logger.error("_get_weight_tensor_transpose_reshape(): Operation type unsupported")
 
     return wt_tensor, shape
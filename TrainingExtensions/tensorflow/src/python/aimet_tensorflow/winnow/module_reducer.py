@@ -40,7 +40,9 @@
 
 """ Contains functionality related to reducing TensorFlow modules.  """
 
+from collections import OrderedDict
 from typing import List, Tuple, Dict
+import numpy as np
 import tensorflow as tf
 from tensorflow.contrib import graph_editor
 
@@ -49,8 +51,7 @@ from aimet_common.connected_graph.connectedgraph import get_ordered_ops
 import aimet_common.winnow.winnow_utils
 from aimet_common.winnow.mask import Mask
 from aimet_common.utils import AimetLogger, ModelApi
-from aimet_common.winnow.winnow_utils import OpConnectivity, ConnectivityType,\
-    get_indices_among_ones_of_overlapping_ones
+from aimet_common.winnow.winnow_utils import OpConnectivity, ConnectivityType
 from aimet_tensorflow.common.connectedgraph import ConnectedGraph
 from aimet_tensorflow.common.operation import Op
 from aimet_tensorflow.utils.op.fusedbatchnorm import BNUtils
@@ -89,6 +90,10 @@ class ModuleReducer(aimet_common.winnow.module_reducer.ModuleReducer):
         self._reduced_modules = {}
         self._reduced_op_info = {}
 
+        # Graph surgery is planned while creating the reduced ops, and applied once all of them have been created
+        self._tf_ops_to_detach = []
+        self._tensors_to_reroute = []
+
     def reduce_modules(self, _=None) -> (tf.compat.v1.Session, Dict[str, Tuple[tf.Operation, Mask]]):
         """
         For the Ops in the list,  reduce the corresponding modules.
@@ -124,6 +129,8 @@ class ModuleReducer(aimet_common.winnow.module_reducer.ModuleReducer):
                     new_op_tensors = self._create_reduced_module(op, needs_detach)
                     needs_detach = self._reroute_if_necessary(op, new_op_tensors)
 
+            self._detach_and_reroute()
+
         return self._sess, self._reduced_modules
 
     def _create_reduced_module(self, op: Op, needs_detach: bool) -> List[tf.Tensor]:
@@ -191,10 +198,9 @@ class ModuleReducer(aimet_common.winnow.module_reducer.ModuleReducer):
 
     def _detach_op_from_inputs(self, op: Op):
         """
-        Detach op from its parent operations.
+        Plan to detach op from its parent operations.  The op is detached by _detach_and_reroute().
         :param op: Op to detach
         """
-        tf_ops_to_detach = []
         input_products = op.get_input_products()
         for product in input_products:
             tensor = product.tensor_dict.get(op, None)
@@ -202,8 +208,28 @@ class ModuleReducer(aimet_common.winnow.module_reducer.ModuleReducer):
                 for consumer in tensor.consumers():
                     corresponding_op = self._conn_graph.get_op_from_module_name(consumer.name)
                     if corresponding_op == op:
-                        tf_ops_to_detach.append(consumer)
-        graph_editor.detach_inputs(tf_ops_to_detach)
+                        self._tf_ops_to_detach.append(consumer)
+
+    def _detach_and_reroute(self):
+        """
+        Apply the planned graph surgery with one graph editor call each for detaching the original ops from their
+        inputs, and for connecting the reduced ops back to the main graph.
+        """
+        if self._tf_ops_to_detach:
+            # Same as graph_editor.detach_inputs() on each op: every input of the ops is replaced with a placeholder.
+            # Rerouting only within the ops to detach also detaches inputs coming from another op to detach.
+            tf_ops_to_detach = list(OrderedDict.fromkeys(self._tf_ops_to_detach))
+            input_tensors = list(OrderedDict.fromkeys(tensor for tf_op in tf_ops_to_detach
+                                                      for tensor in tf_op.inputs))
+            placeholders = [graph_editor.make_placeholder_from_tensor(tensor) for tensor in input_tensors]
+            graph_editor.reroute_ts(placeholders, input_tensors, can_modify=tf_ops_to_detach)
+
+        if self._tensors_to_reroute:
+            new_tensors, old_tensors = zip(*self._tensors_to_reroute)
+            graph_editor.reroute_ts(ts0=list(new_tensors), ts1=list(old_tensors))
+
+        self._tf_ops_to_detach = []
+        self._tensors_to_reroute = []
 
     def _reroute_if_necessary(self, op: Op, new_op_tensors: List[tf.Tensor]) -> bool:
         """
@@ -247,7 +273,7 @@ class ModuleReducer(aimet_common.winnow.module_reducer.ModuleReducer):
         # We have hit the end of a string of ops to reduce, and will now connect the newly reduced ops back to the
         # main graph.  This also detaches the old op's output from its old child op
         old_tensor = child_op.get_input_products()[prod_index].tensor_dict[child_op]
-        graph_editor.reroute_ts(ts0=new_op_tensor, ts1=old_tensor)
+        self._tensors_to_reroute.append((new_op_tensor, old_tensor))
         return True
 
     def _get_input_tensors_for_winnowed_op(self, op: Op) -> List[tf.Tensor]:
@@ -341,6 +367,26 @@ def _insert_downsample_or_upsample_ops_if_needed(input_tensor: tf.Tensor,
     return input_tensor
 
 
+def _get_source_channel_indices(parent_mask: List, child_mask: List) -> np.ndarray:
+    """
+    Get for each channel kept by child_mask, the index of the same channel among the channels kept by parent_mask
+    :param parent_mask: Output mask of the parent op of a tensor
+    :param child_mask: Input mask of the child op of the tensor
+    :return: Integer array with an index among the ones of parent_mask for every one in child_mask, or -1 where
+    parent_mask has a zero
+    Example:
+    parent_mask: 1, 0, 0, 1, 1, 0, 1
+     child_mask: 1, 0, 1, 0, 1, 0, 1
+    Returns [0, -1, 2, 3]
+    """
+    parent_mask = np.asarray(parent_mask, dtype=bool)
+    child_mask = np.asarray(child_mask, dtype=bool)
+
+    # Index of every channel of parent_mask among its ones, or -1 for its zeros
+    parent_indices = np.where(parent_mask, np.cumsum(parent_mask) - 1, -1)
+    return parent_indices[child_mask].astype(np.int32)
+
+
 def _insert_downsample_op(input_tensor: tf.Tensor, parent_mask: List, child_mask: List) -> tf.Tensor:
     """
     Append gather operation to input_tensor, and return the output tensor of the gather operation
@@ -351,10 +397,10 @@ def _insert_downsample_op(input_tensor: tf.Tensor, parent_mask: List, child_mask
     """
 
     # Ensure that for all indices where child_mask has a 1, parent_mask also has a 1
-    assert list(map(lambda x, y: x & y, parent_mask, child_mask)) == child_mask
+    gather_indices = _get_source_channel_indices(parent_mask, child_mask)
+    assert np.all(gather_indices >= 0)
 
-    gather_list = get_indices_among_ones_of_overlapping_ones(parent_mask, child_mask)
-    gather_tensor = module_reducers.create_downsample_op('downsample', input_tensor, gather_list)
+    gather_tensor = module_reducers.create_downsample_op('downsample', input_tensor, gather_indices)
     return gather_tensor
 
 
@@ -370,34 +416,13 @@ def _insert_upsample_op(input_tensor: tf.Tensor, parent_mask: List, child_mask:
     # Ensure that for all indices where parent_mask has a 1, child_mask also has a 1
     assert list(map(lambda x, y: x & y, parent_mask, child_mask)) == parent_mask
 
-    # Get list of indices for which each channel in the current tensor should map to after upsampling
-    index_list = get_indices_among_ones_of_overlapping_ones(child_mask, parent_mask)
+    # Get the channel in the current tensor each channel maps from after upsampling, or -1 for channels of zeros
+    source_indices = _get_source_channel_indices(parent_mask, child_mask)
 
     # Channels index is the last index in the tensor
     with tf.name_scope("upsample"):
         unstacked = tf.unstack(input_tensor, axis=-1)
         zeros = tf.zeros_like(unstacked[0])
-        current_index = 0
-
-        # loop for inserting zeros at the correct index points
-        for index in index_list:
-            while current_index < index:
-                unstacked.insert(current_index, zeros)
-                current_index += 1
-            current_index += 1
-
-        # If child mask has additional ones after the last index where parent mask also had a 1, we need to also add
-        # rows for these as well, since the additional ones would not be represented in index_list
-        # Ex:
-        # parent_mask: 1, 1, 1, 0
-        #  child_mask: 1, 1, 1, 1
-        # index_list would only read [0, 1, 2], but we also need to add a row of zeros for the last one in child mask
-
-        # Simply slice child mask starting at the location after the last entry in index_list (the last matching ones
-        # index between parent mask and child).  The sum of the remaining entries will give the number of zeros rows to
-        # add.
-        for _ in range(sum(child_mask[index_list[-1] + 1:])):
-            unstacked.append(zeros)
-        stack = tf.stack(unstacked, axis=-1)
+        stack = tf.stack([unstacked[index] if index >= 0 else zeros for index in source_indices], axis=-1)
 
     return stack
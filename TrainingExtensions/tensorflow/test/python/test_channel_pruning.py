@@ -613,6 +613,35 @@ class TestTrainingExtensionsChannelPruning(unittest.TestCase):
         self.assertEqual(sub_sample_output.shape, (2, 10))
         self.assertTrue(np.array_equal(sub_sample_output, output_data[:, :, output_pixel[0], output_pixel[1]]))
 
+    def test_subsample_data_at_selected_output_pixels(self):
+        """
+        Test that input and output data sub sampled separately at picked output pixels match each other
+        """
+        # input_data and output_data are in channels_first format, 3x3 kernel with stride 2 and padding 1
+        layer_attributes = ((3, 3), (2, 2), (1, 1))
+        input_data = np.random.rand(3, 4, 8, 8)
+        output_data = np.random.rand(3, 6, 4, 4)
+
+        heights, widths = InputMatchSearch.select_output_pixels(layer_attributes, output_data.shape,
+                                                                samples_per_image=5)
+        self.assertEqual((3, 5), heights.shape)
+        self.assertEqual((3, 5), widths.shape)
+
+        sub_sample_input = InputMatchSearch.subsample_input_data(layer_attributes, input_data, heights, widths)
+        sub_sample_output = InputMatchSearch.subsample_output_data(output_data, heights, widths)
+        self.assertEqual((15, 4, 3, 3), sub_sample_input.shape)
+        self.assertEqual((15, 6), sub_sample_output.shape)
+
+        padded_input_data = np.pad(input_data, ((0, 0), (0, 0), (1, 1), (1, 1)), mode='constant')
+        for image_index in range(3):
+            for sample in range(5):
+                height, width = heights[image_index, sample], widths[image_index, sample]
+                index = image_index * 5 + sample
+                self.assertTrue(np.array_equal(output_data[image_index, :, height, width], sub_sample_output[index]))
+                self.assertTrue(np.array_equal(padded_input_data[image_index, :, 2 * height:2 * height + 3,
+                                                                 2 * width:2 * width + 3],
+                                               sub_sample_input[index]))
+
     def test_select_inp_channels(self):
 
         data_set = unittest.mock.MagicMock()
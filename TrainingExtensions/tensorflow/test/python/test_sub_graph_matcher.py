@@ -37,13 +37,18 @@
 # =============================================================================
 """ This file contains unit tests for testing  Sub Graph  functions. """
 import os
+import shutil
+import tempfile
 import unittest
+import unittest.mock
 import logging
+from collections import OrderedDict
 import tensorflow as tf
 from tensorflow_core.contrib.quantize.python import graph_matcher
 
 from aimet_common.utils import AimetLogger
 from aimet_tensorflow.common.sub_graph_matcher_op_templates import op_type_templates
+from aimet_tensorflow.common import sub_graph_matcher
 from aimet_tensorflow.common.sub_graph_matcher import create_subgraph_for_op_default,\
     create_op_type_patterns_from_subgraph
 from aimet_tensorflow.examples.test_models import keras_model_functional
@@ -244,3 +249,106 @@ class TestSubGraph(unittest.TestCase):
                     matched_op_set.add(dense_op)
 
         logger.debug(len(matched_op_set))
+
+    def test_op_type_pattern_cache(self):
+        """ Test that op type patterns loaded from the pattern cache have the same structure as the created ones """
+
+        sub_graph_matcher.load_patterns_for_ops()
+        reference_info_dict = sub_graph_matcher.reference_op_pattern_info_dict
+        self.assertTrue(reference_info_dict)
+        self.assertTrue(sub_graph_matcher.get_pattern_cache_path().endswith('.json'))
+
+        # a new AIMET version uses a new cache file
+        cache_path = sub_graph_matcher.get_pattern_cache_path()
+        with unittest.mock.patch.object(sub_graph_matcher, 'Version_Info', cache_path):
+            self.assertNotEqual(cache_path, sub_graph_matcher.get_pattern_cache_path())
+
+        cache_dir = tempfile.mkdtemp()
+        try:
+            cache_path = os.path.join(cache_dir, 'patterns.json')
+            sub_graph_matcher.save_patterns_to_cache(cache_path, reference_info_dict,
+                                                     sub_graph_matcher.pattern_to_op_type)
+            info_dict, pattern_to_op_type = sub_graph_matcher.load_patterns_from_cache(cache_path)
+        finally:
+            shutil.rmtree(cache_dir)
+
+        self.assertEqual(list(reference_info_dict.keys()), list(info_dict.keys()))
+        self.assertEqual(len(sub_graph_matcher.pattern_to_op_type), len(pattern_to_op_type))
+        for pattern_op_type, reference_info in reference_info_dict.items():
+            info = info_dict[pattern_op_type]
+            for key in ['length', 'op_type', 'module_regex', 'associated_op_regex']:
+                self.assertEqual(reference_info[key], info[key])
+            self.assertEqual(pattern_op_type, pattern_to_op_type[info['pattern']])
+
+            # Compare the patterns by walking both from the pattern for the op
+            patterns_to_compare = [(reference_info['pattern'], info['pattern'])]
+            while patterns_to_compare:
+                reference_pattern, pattern = patterns_to_compare.pop()
+                self.assertEqual(reference_pattern._op_type, pattern._op_type)
+                self.assertEqual(reference_pattern._name, pattern._name)
+                self.assertEqual(len(reference_pattern._inputs), len(pattern._inputs))
+                patterns_to_compare.extend(zip(reference_pattern._inputs, pattern._inputs))
+
+    @staticmethod
+    def _detect_ops_with_patterns(patterns):
+        """
+        Detect the ops of the graph relu(add(inp, 1)) with the given patterns only
+
+        :param patterns: List of (pattern type, OpTypePattern, length), in pattern order
+        :return: Pattern type of the detected module by op name
+        """
+        tf.compat.v1.reset_default_graph()
+        inp = tf.compat.v1.placeholder(tf.float32, [1, 4], 'inp')
+        relu = tf.nn.relu(tf.add(inp, 1.0), name='relu')
+        valid_ops = {relu.op, relu.op.inputs[0].op}
+
+        pattern_info_dict = OrderedDict()
+        for pattern_type, pattern, length in patterns:
+            pattern_info_dict[pattern_type] = {'pattern': pattern, 'length': length, 'op_type': pattern_type,
+                                               'module_regex': ['(.+)'], 'associated_op_regex': ['relu']}
+
+        op_to_module_dict = {}
+        with unittest.mock.patch.object(sub_graph_matcher, 'reference_op_pattern_info_dict', pattern_info_dict), \
+                unittest.mock.patch.object(sub_graph_matcher, 'load_patterns_for_ops'):
+            sub_graph_matcher.SubGraphMatcher(tf.compat.v1.get_default_graph(), op_to_module_dict, valid_ops)
+
+        return {op.name: op_info.pattern_type for op, op_info in op_to_module_dict.items()}
+
+    def test_detect_ops_longest_match_wins(self):
+        """ Test that of overlapping matches, the match of the longest pattern is kept """
+
+        # the input ops of a pattern are not part of the matched ops
+        relu_pattern = graph_matcher.OpTypePattern('Relu', inputs=[graph_matcher.OpTypePattern('*')])
+        add_relu_pattern = graph_matcher.OpTypePattern('Relu', inputs=[
+            graph_matcher.OpTypePattern('Add|AddV2', inputs=[graph_matcher.OpTypePattern('*'),
+                                                             graph_matcher.OpTypePattern('*')])])
+
+        detected_ops = self._detect_ops_with_patterns([('Relu', relu_pattern, 1),
+                                                       ('AddRelu', add_relu_pattern, 2)])
+        self.assertEqual({'Add': 'AddRelu', 'relu': 'AddRelu'}, detected_ops)
+
+    def test_detect_ops_equal_length_matches_in_pattern_order(self):
+        """ Test that of overlapping matches of equal length, the match of the first pattern is kept """
+
+        relu_pattern = graph_matcher.OpTypePattern('Relu', inputs=[graph_matcher.OpTypePattern('*')])
+        other_relu_pattern = graph_matcher.OpTypePattern('Relu|Relu6', inputs=[graph_matcher.OpTypePattern('*')])
+
+        detected_ops = self._detect_ops_with_patterns([('Relu', relu_pattern, 1),
+                                                       ('OtherRelu', other_relu_pattern, 1)])
+        self.assertEqual({'relu': 'Relu'}, detected_ops)
+
+        detected_ops = self._detect_ops_with_patterns([('OtherRelu', other_relu_pattern, 1),
+                                                       ('Relu', relu_pattern, 1)])
+        self.assertEqual({'relu': 'OtherRelu'}, detected_ops)
+
+    def test_detect_ops_wildcard_pattern(self):
+        """ Test that patterns for an op of any type are matched against ops of every type """
+
+        relu_pattern = graph_matcher.OpTypePattern('Relu', inputs=[graph_matcher.OpTypePattern('*')])
+        after_add_pattern = graph_matcher.OpTypePattern('*', inputs=[
+            graph_matcher.OpTypePattern('Add|AddV2', inputs=[graph_matcher.OpTypePattern('*'),
+                                                             graph_matcher.OpTypePattern('*')])])
+
+        detected_ops = self._detect_ops_with_patterns([('Relu', relu_pattern, 1),
+                                                       ('AfterAdd', after_add_pattern, 2)])
+        self.assertEqual({'Add': 'AfterAdd', 'relu': 'AfterAdd'}, detected_ops)
@@ -40,6 +40,9 @@ import unittest
 from unittest.mock import create_autospec
 
 import os
+import shutil
+import tempfile
+import numpy as np
 import tensorflow as tf
 tf.compat.v1.logging.set_verbosity(tf.logging.WARN)
 os.environ["TF_CPP_MIN_LOG_LEVEL"] = "3"
@@ -132,6 +135,95 @@ class TestSvdTrainingExtensions(unittest.TestCase):
             self.assertEqual(mem_cost, 3211264)
             self.assertEqual(mac_cost, 3211264)
 
+    def test_get_max_candidate_ranks(self):
+        tf.compat.v1.reset_default_graph()
+        svd = s.Svd(None, None, s.CostMetric.memory, layers=['Conv2D_1', 'MatMul'], num_ranks=3)
+        svd._svd = create_autospec(pymo.Svd, instance=True)
+
+        x = tf.compat.v1.placeholder(tf.float32, [None, 784], 'data')
+        y_hat = model(x)
+        sess = tf.compat.v1.Session()
+        sess.run(tf.compat.v1.global_variables_initializer())
+
+        svd._svd.GetCompressionType.return_value = pymo.SVD_COMPRESS_TYPE.TYPE_SINGLE
+        svd._store_net_stats(sess)
+
+        candidate_ranks = {'Conv2D_1': [[40], [30], [20]], 'MatMul': [[400], [500], [100]]}
+        svd._svd.GetCandidateRanks.side_effect = lambda op_name, rank_index: candidate_ranks[op_name][rank_index]
+        self.assertEqual({'Conv2D_1': [40], 'MatMul': [500]}, svd._get_max_candidate_ranks())
+
+        # A layer not split at some rank index needs its own network for that rank index
+        candidate_ranks['MatMul'][2] = []
+        self.assertIsNone(svd._get_max_candidate_ranks())
+
+    def test_load_zero_padded(self):
+        tf.compat.v1.reset_default_graph()
+        with tf.compat.v1.Session() as sess:
+            variable = tf.Variable(initial_value=np.ones((3, 4)), dtype=tf.float32)
+            sess.run(tf.compat.v1.global_variables_initializer())
+
+            s.Svd._load_zero_padded(sess, variable, np.full((2, 3), 2.0))
+            expected_value = np.zeros((3, 4))
+            expected_value[:2, :3] = 2.0
+            self.assertTrue(np.array_equal(expected_value, sess.run(variable)))
+
+    def _test_rank_sweep_network(self, svd_type):
+        """ Compare the rank sweep network at a rank index with the compressed network of that rank index """
+        tf.compat.v1.reset_default_graph()
+        output_dir = tempfile.mkdtemp()
+        try:
+            x = tf.compat.v1.placeholder(tf.float32, [None, 784], 'data')
+            y_hat = model(x)
+            sess = tf.compat.v1.Session()
+            sess.run(tf.compat.v1.global_variables_initializer())
+
+            checkpoint = os.path.join(output_dir, 'model')
+            tf.compat.v1.train.Saver().save(sess, checkpoint)
+
+            svd = s.Svd(checkpoint + '.meta', checkpoint, s.CostMetric.memory,
+                        output_file=os.path.join(output_dir, 'svd_graph'), svd_type=svd_type,
+                        layers=['Conv2D_1', 'MatMul'], num_ranks=4)
+            svd._store_net_stats(sess)
+            svd._svd.ComputeNetworkCost()
+            svd._num_ranks = svd._svd.SetCandidateRanks(svd._num_ranks)
+            self.assertGreater(svd._num_ranks, 1)
+            sess.close()
+
+            max_ranks = svd._get_max_candidate_ranks()
+            self.assertIsNotNone(max_ranks)
+
+            rank_index = 1
+            input_data = np.random.RandomState(0).rand(2, 784)
+            svd._run_graph = lambda sess, *_: sess.run(y_hat.name, feed_dict={x.name: input_data})
+
+            rank_sweep_sess = svd._create_rank_sweep_network(max_ranks)
+            with rank_sweep_sess.graph.as_default():
+                _, split_layers = svd._load_rank_index(rank_sweep_sess, rank_index)
+                rank_sweep_output = svd._run_graph(rank_sweep_sess)
+                rank_sweep_ratios = [svd._compute_compression_ratio_given_split_layers(rank_sweep_sess, split_layers,
+                                                                                       metric)
+                                     for metric in s.CostMetric]
+
+            compressed_sess, _, _, compressed_output, _ = svd._create_and_evaluate_compressed_network(rank_index)
+            with compressed_sess.graph.as_default():
+                compressed_ratios = [svd._compute_compression_ratio(compressed_sess, metric)
+                                     for metric in s.CostMetric]
+
+            self.assertTrue(np.allclose(compressed_output, rank_sweep_output, atol=1e-5))
+            for compressed_ratio, rank_sweep_ratio in zip(compressed_ratios, rank_sweep_ratios):
+                self.assertAlmostEqual(compressed_ratio, rank_sweep_ratio)
+
+            rank_sweep_sess.close()
+            compressed_sess.close()
+        finally:
+            shutil.rmtree(output_dir)
+
+    def test_rank_sweep_network_svd(self):
+        self._test_rank_sweep_network('svd')
+
+    def test_rank_sweep_network_ssvd(self):
+        self._test_rank_sweep_network('ssvd')
+
     def test_create_layer_attributes_list(self):
 
         tf.compat.v1.reset_default_graph()
@@ -56,7 +56,8 @@ from aimet_tensorflow.utils.common import get_ordered_ops, create_input_feed_dic
 from aimet_tensorflow.utils.graph_saver import wrapper_func
 from aimet_tensorflow.examples.test_models import single_residual, multiple_input_model, \
     model_with_multiple_training_tensors, keras_model_functional, keras_model_functional_with_non_fused_batchnorms
-from aimet_tensorflow.utils.op.conv import WeightTensorUtils, BiasUtils, get_output_activation_shape
+from aimet_tensorflow.utils.op.conv import WeightTensorUtils, BiasUtils, get_output_activation_shape, \
+    get_params_as_numpy_data, update_params_for_ops
 from aimet_tensorflow.utils.op.fusedbatchnorm import BNUtils
 
 from aimet_tensorflow.utils.graph_saver import save_and_load_graph
@@ -401,6 +402,53 @@ class TestTrainingExtensionsTfUtils(unittest.TestCase):
         self.assertTrue(np.allclose(numpy_data, updated_bias))
         sess.close()
 
+    def test_bulk_param_read_and_update(self):
+        """
+        tests reading and updating weights and biases of several ops at once
+        :return:
+        """
+
+        tf.compat.v1.reset_default_graph()
+        inputs = tf.keras.Input(shape=(32, 32, 3,))
+        x = tf.keras.layers.Conv2D(16, (3, 3))(inputs)
+        x = tf.keras.layers.Conv2D(8, (3, 3), use_bias=False)(x)
+        x = tf.keras.layers.Flatten()(x)
+        _ = tf.keras.layers.Dense(4)(x)
+
+        init = tf.compat.v1.global_variables_initializer()
+        sess = tf.compat.v1.Session()
+        sess.run(init)
+
+        ops = [sess.graph.get_operation_by_name(name) for name in ['conv2d/Conv2D', 'conv2d_1/Conv2D', 'dense/MatMul']]
+        weights, biases = get_params_as_numpy_data(sess, ops)
+
+        # the conv without bias is left out of the biases
+        self.assertEqual(set(ops), set(weights.keys()))
+        self.assertEqual({ops[0], ops[2]}, set(biases.keys()))
+        for op in ops:
+            self.assertTrue(np.array_equal(WeightTensorUtils.get_tensor_as_numpy_data(sess, op), weights[op]))
+        self.assertTrue(np.array_equal(BiasUtils.get_bias_as_numpy_data(sess, ops[2]), biases[ops[2]]))
+
+        np.random.seed(0)
+        new_weights = {op: np.random.rand(*weights[op].shape) for op in ops}
+        new_biases = {op: np.random.rand(*biases[op].shape) for op in biases}
+        update_params_for_ops(sess, new_weights, new_biases)
+
+        updated_weights = WeightTensorUtils.get_tensors_as_numpy_data(sess, ops)
+        updated_biases = BiasUtils.get_biases_as_numpy_data(sess, ops)
+        for op in ops:
+            self.assertTrue(np.allclose(new_weights[op], updated_weights[op]))
+        for op in biases:
+            self.assertTrue(np.allclose(new_biases[op], updated_biases[op]))
+
+        # updating the params adds no ops to the graph
+        num_ops = len(sess.graph.get_operations())
+        WeightTensorUtils.update_tensors_for_ops(sess, weights)
+        BiasUtils.update_biases_for_ops(sess, biases)
+        self.assertEqual(num_ops, len(sess.graph.get_operations()))
+        self.assertTrue(np.allclose(weights[ops[1]], WeightTensorUtils.get_tensor_as_numpy_data(sess, ops[1])))
+        sess.close()
+
     def test_bias_add_with_conv(self):
         """
         Test bias add on conv op
@@ -59,6 +59,7 @@ from aimet_tensorflow.examples.test_models import keras_model, single_residual,
     model_with_leaky_relu, keras_model_functional_with_non_fused_batchnorms, model_to_test_downstream_masks
 from aimet_tensorflow.winnow.mask_propagation_winnower import MaskPropagationWinnower
 import aimet_tensorflow.winnow.winnow as winnow
+from aimet_tensorflow.winnow import module_reducer
 from aimet_tensorflow.utils.graph_saver import save_and_load_graph
 
 logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.Test)
@@ -925,6 +926,25 @@ class TestTfModuleReducer(unittest.TestCase):
         sess.close()
         new_sess.close()
 
+    def test_insert_downsample_and_upsample_ops(self):
+        """ Test channels selected by inserted downsample and upsample ops """
+        tf.compat.v1.reset_default_graph()
+        with tf.compat.v1.Session() as sess:
+            parent_mask = [1, 0, 1, 1, 0, 1]
+            child_mask = [1, 0, 0, 1, 0, 1]
+            inp = tf.constant(np.arange(8, dtype=np.float32).reshape(2, 4) + 1)
+
+            # Downsample keeps channels 0, 2 and 3 out of the 4 channels kept by parent_mask
+            downsample = module_reducer._insert_downsample_op(inp, parent_mask, child_mask)
+            self.assertTrue(np.array_equal([[1, 3, 4], [5, 7, 8]], sess.run(downsample)))
+
+            # Upsample places the 3 channels kept by child_mask at their positions among the ones of parent_mask
+            upsample = module_reducer._insert_upsample_op(downsample, child_mask, parent_mask)
+            self.assertTrue(np.array_equal([[1, 0, 3, 4], [5, 0, 7, 8]], sess.run(upsample)))
+
+            upsample = module_reducer._insert_upsample_op(downsample, child_mask, [1, 1, 1, 1, 1, 1])
+            self.assertTrue(np.array_equal([[1, 0, 0, 3, 0, 4], [5, 0, 0, 7, 0, 8]], sess.run(upsample)))
+
 
 class TestTfWinnower(unittest.TestCase):
     """ Class for testing winnower module on tensorflow graphs """
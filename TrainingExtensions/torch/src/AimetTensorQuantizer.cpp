@@ -42,6 +42,7 @@
 #include <DlQuantization/Quantization.hpp>
 #include <DlQuantization/QuantizerFactory.hpp>
 
+#include <cmath>
 #include <iostream>
 #include <string>
 #include <torch/extension.h>
@@ -54,8 +55,8 @@ public:
         _isEncodingValid(false),
         _quantizationScheme(quantizationScheme)
     {
-        _encodingAnalyzer      = DlQuantization::getEncodingAnalyzerInstance<float>(quantizationScheme);
-        _tensorQuantizationSim = DlQuantization::getTensorQuantizationSim<float>();
+        // The encoding analyzer and quantization sim are created on first use, so that quantizers which never collect
+        // stats or quantize anything do not pay for them
     }
 
     void resetEncodingStats()
@@ -63,12 +64,16 @@ public:
         _isEncodingValid = false;
 
         // This is syntactic sugar provided by unique_ptr to call reset() - delete the underlying object
+        // A new encoding analyzer gets created when stats are updated again
         _encodingAnalyzer = nullptr;
-        _encodingAnalyzer = DlQuantization::getEncodingAnalyzerInstance<float>(_quantizationScheme);
+        _perChannelEncodingAnalyzers.clear();
     }
 
     void updateStats(at::Tensor input, bool use_cuda)
     {
+        if (!_encodingAnalyzer)
+            _encodingAnalyzer = DlQuantization::getEncodingAnalyzerInstance<float>(_quantizationScheme);
+
         // Set encoding as valid
         _isEncodingValid = true;
 
@@ -89,6 +94,9 @@ public:
     at::Tensor quantizeDequantize(at::Tensor input, DlQuantization::TfEncoding& encoding,
                                   DlQuantization::RoundingMode roundingMode, bool use_cuda)
     {
+        if (!_tensorQuantizationSim)
+            _tensorQuantizationSim = DlQuantization::getTensorQuantizationSim<float>();
+
         // Allocate an output tensor as the same shape as the input
         at::Tensor output = input;
 
@@ -115,10 +123,93 @@ public:
         return std::make_tuple(out_encoding, _isEncodingValid);
     }
 
+    void updateStatsPerChannel(at::Tensor input, int64_t axis, bool use_cuda)
+    {
+        // Move the channel axis to the front, so that each channel is one contiguous block of data. This is the only
+        // copy of the tensor made, the stats of all channels are then collected from it in a single pass
+        at::Tensor channels = input.transpose(0, axis).contiguous();
+
+        const size_t numChannels = channels.size(0);
+        const size_t channelSize = numChannels ? channels.numel() / numChannels : 0;
+
+        if (_perChannelEncodingAnalyzers.empty())
+        {
+            for (size_t channel = 0; channel < numChannels; ++channel)
+                _perChannelEncodingAnalyzers.push_back(
+                    DlQuantization::getEncodingAnalyzerInstance<float>(_quantizationScheme));
+        }
+        else if (_perChannelEncodingAnalyzers.size() != numChannels)
+        {
+            throw std::runtime_error("Number of channels does not match the number of channels seen before");
+        }
+
+        // Set encoding as valid
+        _isEncodingValid = true;
+
+        float* channelDataPtr = channels.data<float>();
+
+        DlQuantization::ComputationMode cpu_gpu_mode =
+            use_cuda ? DlQuantization::ComputationMode::COMP_MODE_GPU : DlQuantization::ComputationMode::COMP_MODE_CPU;
+        for (size_t channel = 0; channel < numChannels; ++channel)
+        {
+            _perChannelEncodingAnalyzers[channel]->updateStats(channelDataPtr + channel * channelSize, channelSize,
+                                                               cpu_gpu_mode);
+        }
+    }
+
+    std::tuple<std::vector<DlQuantization::TfEncoding>, bool> getEncodingPerChannel(unsigned int bitwidth,
+                                                                                    bool useSymmetricEncodings)
+    {
+        std::vector<DlQuantization::TfEncoding> out_encodings;
+
+        if (_isEncodingValid)
+        {
+            for (auto& encodingAnalyzer: _perChannelEncodingAnalyzers)
+                out_encodings.push_back(encodingAnalyzer->computeEncoding(bitwidth, useSymmetricEncodings));
+        }
+
+        return std::make_tuple(out_encodings, _isEncodingValid && !out_encodings.empty());
+    }
+
+    at::Tensor quantizeDequantizePerChannel(at::Tensor input, at::Tensor encodingMin, at::Tensor encodingMax,
+                                            unsigned int bitwidth, int64_t axis,
+                                            DlQuantization::RoundingMode roundingMode)
+    {
+        // Per-channel encodings are applied as vectors broadcast along the channel axis, so the whole tensor is
+        // quantized in one vectorized pass on either CPU or GPU. The math follows TensorQuantizationSim, rounding half
+        // away from zero, but in the precision of the input instead of double. Stochastic rounding adds the random
+        // offset to the unrounded value, so that it rounds up with a probability of the fractional part
+        std::vector<int64_t> shape(input.dim(), 1);
+        shape[axis] = input.size(axis);
+
+        // Retain zero in the range and make sure min and max differ
+        at::Tensor minimum = encodingMin.to(input.options()).clamp_max(0.0).view(shape);
+        at::Tensor maximum = at::max(encodingMax.to(input.options()).clamp_min(0.0).view(shape), minimum + 1e-5);
+
+        at::Tensor delta  = (maximum - minimum) / (std::pow(2.0, bitwidth) - 1);
+        at::Tensor offset = roundHalfAwayFromZero(minimum / delta);
+
+        at::Tensor scaled = at::min(at::max(input, minimum), maximum) / delta;
+        at::Tensor output;
+        if (roundingMode == DlQuantization::RoundingMode::ROUND_STOCHASTIC)
+            output = at::floor(scaled + at::rand_like(scaled)) - offset;
+        else
+            output = roundHalfAwayFromZero(scaled) - offset;
+
+        return delta * (output + offset);
+    }
+
 private:
+    static at::Tensor roundHalfAwayFromZero(const at::Tensor& tensor)
+    {
+        // Rounds like std::round(), at::round() rounds half to even
+        return at::sign(tensor) * at::floor(at::abs(tensor) + 0.5);
+    }
+
     bool _isEncodingValid;
     DlQuantization::QuantizationMode _quantizationScheme;
     std::unique_ptr<DlQuantization::IQuantizationEncodingAnalyzer<float>> _encodingAnalyzer;
+    std::vector<std::unique_ptr<DlQuantization::IQuantizationEncodingAnalyzer<float>>> _perChannelEncodingAnalyzers;
     std::unique_ptr<DlQuantization::ITensorQuantizationSim<float>> _tensorQuantizationSim;
 };
 
@@ -130,5 +221,8 @@ PYBIND11_MODULE(TORCH_EXTENSION_NAME, m)
         .def("updateStats", &AimetTensorQuantizer::updateStats)
         .def("quantizeDequantize", &AimetTensorQuantizer::quantizeDequantize)
         .def("getEncoding", &AimetTensorQuantizer::getEncoding)
+        .def("updateStatsPerChannel", &AimetTensorQuantizer::updateStatsPerChannel)
+        .def("getEncodingPerChannel", &AimetTensorQuantizer::getEncodingPerChannel)
+        .def("quantizeDequantizePerChannel", &AimetTensorQuantizer::quantizeDequantizePerChannel)
         .def("resetEncodingStats", &AimetTensorQuantizer::resetEncodingStats);
 }
\ No newline at end of file
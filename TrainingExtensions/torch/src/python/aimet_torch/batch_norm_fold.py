@@ -48,6 +48,7 @@ import libpymo
 from aimet_common.bias_correction import ConvBnPatternHandler
 from aimet_common.graph_pattern_matcher import PatternType
 from aimet_common.graph_searcher import GraphSearcher
+from aimet_common.utils import AimetLogger
 
 from aimet_torch.defs import PassThroughOp
 from aimet_torch import utils
@@ -190,6 +191,7 @@ def find_all_batch_norms_to_fold(model: torch.nn.Module, input_shapes: Union[Tup
     return bn_conv_linear_pairs
 
 
+@AimetLogger.span(AimetLogger.LogAreas.CrosslayerEqualization, 'fold_all_batch_norms')
 def fold_all_batch_norms(model: torch.nn.Module, input_shapes: Union[Tuple, List[Tuple]]) -> \
         List[Tuple[torch.nn.Module, torch.nn.BatchNorm2d]]:
     """
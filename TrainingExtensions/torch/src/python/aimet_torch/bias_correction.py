@@ -96,10 +96,12 @@ def get_quantized_dequantized_weight(layer: torch.nn.Module, use_cuda: bool) ->
     """
     weight_tensor = layer._modules['_module_to_wrap'].weight
 
-    encodings = layer.param_quantizers['weight'].encoding
-    round_mode = layer.param_quantizers['weight'].round_mode
-    quant_dequant_weights = layer.param_quantizers['weight']._cppOp.quantizeDequantize(weight_tensor, encodings,
-                                                                                       round_mode, use_cuda)
+    weight_quantizer = layer.param_quantizers['weight']
+    if weight_quantizer.channel_axis is not None:
+        return weight_quantizer._quantize_dequantize_tensor(weight_tensor, weight_quantizer.round_mode)
+
+    quant_dequant_weights = weight_quantizer._cppOp.quantizeDequantize(weight_tensor, weight_quantizer.encoding,
+                                                                       weight_quantizer.round_mode, use_cuda)
     return quant_dequant_weights
 
 
@@ -217,6 +219,7 @@ def call_analytical_mo_correct_bias(layer: torch.nn.Module, bn: Union[torch.nn.B
     layer._module_to_wrap.bias.data = bias.to(device=device)
 
 
+@AimetLogger.span(AimetLogger.LogAreas.Quant, 'correct_bias')
 def correct_bias(model: torch.nn.Module, quant_params: qsim.QuantParams,
                  num_quant_samples: int, data_loader, num_bias_correct_samples: int,
                  conv_bn_dict: Union[Dict[torch.nn.Module, ConvBnInfoType], None] = None,
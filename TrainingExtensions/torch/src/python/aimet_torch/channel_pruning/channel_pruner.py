@@ -113,10 +113,13 @@ class InputChannelPruner(Pruner):
         :param comp_model: compressed model
         :return: Nothing
         """
-        inp_data, out_data = DataSubSampler.get_sub_sampled_data(orig_layer, pruned_layer, orig_model, comp_model,
-                                                                 self._data_loader, self._num_reconstruction_samples)
+        # sub sampled batches are accumulated into the normal equations right away
+        normal_equations = WeightReconstructor.get_normal_equations_for_conv2d(pruned_layer)
 
-        WeightReconstructor.reconstruct_params_for_conv2d(pruned_layer, inp_data, out_data)
+        DataSubSampler.for_each_sub_sampled_batch(orig_layer, pruned_layer, orig_model, comp_model, self._data_loader,
+                                                  self._num_reconstruction_samples, normal_equations.update)
+
+        WeightReconstructor.reconstruct_params_for_conv2d_from_normal_equations(pruned_layer, normal_equations)
 
     def _sort_on_occurrence(self, model: torch.nn.Module, layer_comp_ratio_list: List[LayerCompRatioPair]) -> \
             List[LayerCompRatioPair]:
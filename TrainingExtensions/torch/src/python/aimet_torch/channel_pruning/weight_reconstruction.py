@@ -38,14 +38,15 @@
 
 """ This module contains code to reconstruct weights post winnowing for the channel pruning feature """
 
+from typing import Union
 import numpy as np
-from sklearn import linear_model
 import torch
 import torch.utils.data
 import torch.nn
 
 # Import AIMET specific modules
 from aimet_common.utils import AimetLogger
+from aimet_common.channel_pruner import NormalEquations
 
 logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.ChannelPruning)
 
@@ -68,7 +69,7 @@ class WeightReconstructor:
         :param output_data: output_data, in the shape of [n_samples, n_targets]
         :param bias: whether to calculate the intercept for this model.
 
-        :return: (new weight [n_samples, n_features], new bias [n_samples])
+        :return: (new weight [n_targets, n_features], new bias [n_targets])
         """
 
         assert len(input_data.shape) == 2
@@ -77,23 +78,18 @@ class WeightReconstructor:
 
         assert input_data.shape[0] == output_data.shape[0]
 
-        # least squares Linear Regression
-        # copy_X : If True, X (input_data) will be copied; else, it may be overwritten
-        regressor = linear_model.LinearRegression(copy_X=True, fit_intercept=bias)
+        normal_equations = NormalEquations(input_data.shape[1], output_data.shape[1], fit_intercept=bias)
+        normal_equations.update(input_data, output_data)
 
-        regressor.fit(X=input_data, y=output_data)
+        new_weight, new_bias = normal_equations.solve()
 
         logger.info("finished linear regression fit ")
 
-        # after regression, the coefficients attrib in the regressor form the new conv weights
-        new_weight = regressor.coef_
-
-        new_bias = regressor.intercept_ if bias is True else None
-
         return new_weight, new_bias
 
     @staticmethod
-    def _update_layer_params(layer: torch.nn.Conv2d, new_weight: np.ndarray, new_bias: np.ndarray):
+    def _update_layer_params(layer: torch.nn.Conv2d, new_weight: Union[np.ndarray, torch.Tensor],
+                             new_bias: Union[np.ndarray, torch.Tensor, None]):
         """
         update parameters (weights and bias) for given layer
 
@@ -110,28 +106,56 @@ class WeightReconstructor:
         assert new_weight.shape[2] == layer.kernel_size[0]
         assert new_weight.shape[3] == layer.kernel_size[1]
 
-        new_weight = torch.FloatTensor(new_weight)
-
-        if layer.weight.is_cuda:
-            new_weight = new_weight.cuda()
-
-        layer.weight.data = new_weight
+        layer.weight.data = torch.as_tensor(new_weight).to(device=layer.weight.device, dtype=layer.weight.dtype)
 
         if new_bias is not None:
             assert len(new_bias.shape) == 1
             assert new_bias.shape[0] == layer.out_channels
-            new_bias = torch.FloatTensor(new_bias)
 
-            if layer.bias.is_cuda:
-                new_bias = new_bias.cuda()
+            layer.bias.data = torch.as_tensor(new_bias).to(device=layer.bias.device, dtype=layer.bias.dtype)
+
+    @staticmethod
+    def get_normal_equations_for_conv2d(layer: torch.nn.Conv2d) -> NormalEquations:
+        """
+        Create empty normal equations to reconstruct the params of the given conv2d layer. Update them with input data
+        of shape (Ns * Nb, Nic, k_h, k_w) and output data of shape [Ns * Nb, Noc]
+
+        :param layer: layer
+        :return: normal equations
+        """
+        assert isinstance(layer, torch.nn.Conv2d)
+
+        num_features = int(np.prod(layer.weight.shape[1:4]))
+        calculate_bias = bool(layer.bias is not None)
+
+        return NormalEquations(num_features, layer.out_channels, fit_intercept=calculate_bias)
+
+    @classmethod
+    def reconstruct_params_for_conv2d_from_normal_equations(cls, layer: torch.nn.Conv2d,
+                                                            normal_equations: NormalEquations):
+        """
+        Reconstruction of conv2d params (weights and biases) by solving normal equations accumulated from the input and
+        output data of the layer
+
+        :param layer: layer
+        :param normal_equations: normal equations, created by get_normal_equations_for_conv2d()
+        :return: Nothing
+        """
+        # reconstruct newer weight and bias
+        new_weight, new_bias = normal_equations.solve()
+
+        # reshape the new weights
+        new_weight = new_weight.reshape([layer.out_channels, layer.in_channels, *layer.kernel_size])
 
-            layer.bias.data = new_bias
+        # update layer with newer weights and bias (if exist)
+        #TODO: PyLint crashes here with the error: "RecursionError: maximum recursion depth exceeded"
+        cls._update_layer_params(layer=layer, new_weight=new_weight, new_bias=new_bias) # pylint: disable=all
 
     @classmethod
     def reconstruct_params_for_conv2d(cls, layer: torch.nn.Module, input_data: np.ndarray,
                                       output_data: np.ndarray) -> (np.ndarray, np.ndarray):
         """
-        Reconstruction of conv2d params (weights and biases) is performed using linear regression from sckit -learn.
+        Reconstruction of conv2d params (weights and biases) is performed using least squares linear regression.
 
         :param layer        : layer
         :param input_data   : input_data to the current layer, in the shape of (Ns * Nb, Nic, k_h, k_w)
@@ -152,19 +176,7 @@ class WeightReconstructor:
         assert np.prod(input_data.shape[1:4]) == np.prod(layer.weight.shape[1:4])
         assert output_data.shape[1] == layer.out_channels
 
-        input_data = input_data.reshape(input_data.shape[0], -1)
+        normal_equations = cls.get_normal_equations_for_conv2d(layer)
+        normal_equations.update(input_data, output_data)
 
-        assert len(input_data.shape) == 2
-
-        calculate_bias = bool(layer.bias is not None)
-
-        # reconstruct newer weight and bias
-        new_weight, new_bias = cls._linear_regression(input_data=input_data, output_data=output_data,
-                                                      bias=calculate_bias)
-
-        # reshape the new weights
-        new_weight = new_weight.reshape([layer.out_channels, layer.in_channels, *layer.kernel_size])
-
-        # update layer with newer weights and bias (if exist)
-        #TODO: PyLint crashes here with the error: "RecursionError: maximum recursion depth exceeded"
-        cls._update_layer_params(layer=layer, new_weight=new_weight, new_bias=new_bias) # pylint: disable=all
+        cls.reconstruct_params_for_conv2d_from_normal_equations(layer, normal_equations)
@@ -605,6 +605,7 @@ class HighBiasFold:
                 cls_pair_info.layer2.bias.data = cls_pair_info.layer2.bias.data.type(torch.FloatTensor)
 
 
+@AimetLogger.span(AimetLogger.LogAreas.CrosslayerEqualization, 'equalize_model')
 def equalize_model(model: torch.nn.Module, input_shapes: Union[Tuple, List[Tuple]]):
     """
     High-level API to perform Cross-Layer Equalization (CLE) on the given model. The model is equalized in place.
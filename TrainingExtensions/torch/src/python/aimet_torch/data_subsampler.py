@@ -200,7 +200,6 @@ class DataSubSampler:
                              pruned_layer: Union[torch.nn.Conv2d, torch.nn.Linear],
                              orig_model: torch.nn.Module, comp_model: torch.nn.Module, data_loader: Iterator,
                              num_reconstruction_samples: int) -> (np.ndarray, np.ndarray):
-        # pylint: disable=too-many-locals
         """
         Get all the input data from pruned model and output data from original model
 
@@ -212,6 +211,39 @@ class DataSubSampler:
         :param num_reconstruction_samples: The number of reconstruction samples
         :return: input_data, output_data
         """
+        all_sub_sampled_inp_data = list()
+        all_sub_sampled_out_data = list()
+
+        def _collect_sub_sampled_data(sub_sampled_inp_data, sub_sampled_out_data):
+            all_sub_sampled_inp_data.append(sub_sampled_inp_data)
+            all_sub_sampled_out_data.append(sub_sampled_out_data)
+
+        cls.for_each_sub_sampled_batch(orig_layer, pruned_layer, orig_model, comp_model, data_loader,
+                                       num_reconstruction_samples, _collect_sub_sampled_data)
+
+        # accumulate total sub sampled input and output data
+        return np.vstack(all_sub_sampled_inp_data), np.vstack(all_sub_sampled_out_data)
+
+    @classmethod
+    def for_each_sub_sampled_batch(cls, orig_layer: Union[torch.nn.Conv2d, torch.nn.Linear],
+                                   pruned_layer: Union[torch.nn.Conv2d, torch.nn.Linear],
+                                   orig_model: torch.nn.Module, comp_model: torch.nn.Module, data_loader: Iterator,
+                                   num_reconstruction_samples: int,
+                                   batch_callback: Callable[[np.ndarray, np.ndarray], None]):
+        # pylint: disable=too-many-locals, too-many-arguments
+        """
+        Sub sample the input data from pruned model and output data from original model one batch at a time, and
+        hand each sub sampled batch to the given callback instead of keeping all of them around
+
+        :param orig_layer: original layer
+        :param pruned_layer: pruned layer
+        :param orig_model: original model, un-pruned, used to provide the actual outputs
+        :param comp_model: comp. model, this is potentially already pruned in the upstreams layers of given layer name
+        :param data_loader: data loader
+        :param num_reconstruction_samples: The number of reconstruction samples
+        :param batch_callback: called with (sub sampled input data, sub sampled output data) of every batch
+        :return: Nothing
+        """
 
         def _hook_to_collect_input_data(module, inp_data, _):
             """
@@ -258,9 +290,6 @@ class DataSubSampler:
         orig_layer_out_data = list()
         pruned_layer_inp_data = list()
 
-        all_sub_sampled_inp_data = list()
-        all_sub_sampled_out_data = list()
-
         # register forward hooks
         hook_handles.append(cls._register_fwd_hook_for_layer(orig_layer, _hook_to_collect_output_data))
 
@@ -289,8 +318,7 @@ class DataSubSampler:
                                                                                           output_data,
                                                                                           samples_per_image)
 
-            all_sub_sampled_inp_data.append(sub_sampled_inp_data)
-            all_sub_sampled_out_data.append(sub_sampled_out_data)
+            batch_callback(sub_sampled_inp_data, sub_sampled_out_data)
 
             if batch_index == num_of_batches - 1:
                 logger.debug("batch index : %s reached number of batches: %s", batch_index + 1, num_of_batches)
@@ -299,7 +327,3 @@ class DataSubSampler:
         # remove hook handles
         for hook_handle in hook_handles:
             hook_handle.remove()
-
-        # accumulate total sub sampled input and output data
-
-        return np.vstack(all_sub_sampled_inp_data), np.vstack(all_sub_sampled_out_data)
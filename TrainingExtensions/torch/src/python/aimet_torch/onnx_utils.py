@@ -38,6 +38,7 @@
 
 """ Utilities to load and save onnx models """
 
+import io
 from typing import Union, List, Tuple, Dict
 
 import torch
@@ -119,6 +120,23 @@ class OnnxSaver:
         # Load the model
         onnx_model = onnx.load(onnx_model_path)
 
+        cls.set_node_names_in_onnx_model(onnx_model, pytorch_model, dummy_input)
+
+        # Save back the onnx model file
+        onnx.save(onnx_model, onnx_model_path)
+
+    @classmethod
+    def set_node_names_in_onnx_model(cls, onnx_model: onnx.ModelProto, pytorch_model: torch.nn.Module,
+                                     dummy_input: Union[torch.Tensor, Tuple]):
+        """
+        Sets the names of all the nodes (ops) of an in-memory onnx model to equivalent pytorch module names given the
+        corresponding pytorch model. The onnx model is modified in place.
+        :param onnx_model: ONNX model object
+        :param pytorch_model: Equivalent PyTorch model instance
+        :param dummy_input: Dummy input to the model. Used to parse model graph.
+        :return: None
+        """
+
         # Parse the ONNX model and create mapping from input and output tensors to corresponding nodes
         map_output_tensor_to_node, _ = cls.create_map_of_tensor_to_node(onnx_model)
 
@@ -128,8 +146,40 @@ class OnnxSaver:
         # and set the name of the ONNX nodes to the names of the corresponding PyTorch modules
         cls.map_onnx_nodes_to_pytorch(pytorch_model, dummy_input, ordered_list_of_nodes)
 
-        # Save back the onnx model file
-        onnx.save(onnx_model, onnx_model_path)
+    @staticmethod
+    def create_onnx_model(pytorch_model: torch.nn.Module, dummy_input: Union[torch.Tensor, Tuple]) \
+            -> onnx.ModelProto:
+        """
+        Exports the given pytorch model to an in-memory onnx model, without writing anything to disk
+        :param pytorch_model: PyTorch model instance to export
+        :param dummy_input: Dummy input to the model. Used to trace the model graph.
+        :return: ONNX model object
+        """
+        with io.BytesIO() as onnx_model_buffer:
+            with AimetLogger.span(AimetLogger.LogAreas.Utils, 'onnx_export'):
+                torch.onnx.export(pytorch_model, dummy_input, onnx_model_buffer)
+            onnx_model = onnx.load_model_from_string(onnx_model_buffer.getvalue())
+
+        return onnx_model
+
+    @classmethod
+    def create_onnx_model_with_external_data(cls, pytorch_model: torch.nn.Module,
+                                             dummy_input: Union[torch.Tensor, Tuple],
+                                             onnx_model_path: str) -> onnx.ModelProto:
+        """
+        Exports the given pytorch model to onnx, storing the weights as external data next to the model file. This is
+        needed for models whose serialized size exceeds the 2GB protobuf limit and hence can not be held in memory as a
+        single message. Only the graph structure is loaded back, the weights stay on disk.
+        :param pytorch_model: PyTorch model instance to export
+        :param dummy_input: Dummy input to the model. Used to trace the model graph.
+        :param onnx_model_path: Path to the ONNX model file
+        :return: ONNX model object, without external tensor data loaded
+        """
+        with AimetLogger.span(AimetLogger.LogAreas.Utils, 'onnx_export'):
+            torch.onnx.export(pytorch_model, dummy_input, onnx_model_path, use_external_data_format=True)
+        onnx_model = onnx.load(onnx_model_path, load_external_data=False)
+
+        return onnx_model
 
     @staticmethod
     def create_map_of_tensor_to_node(onnx_model: onnx.ModelProto) -> Tuple[Dict[str, List[onnx.NodeProto]],
@@ -81,6 +81,17 @@ def module_has_weights(module):
     return False
 
 
+def get_output_channel_axis(module: torch.nn.Module) -> int:
+    """
+    Returns the axis of the output channels in the weight of the given module
+    :param module: Module
+    :return: 1 for transposed convolutions, which store the weight as (in, out, ...), 0 otherwise
+    """
+    if isinstance(module, (nn.ConvTranspose1d, nn.ConvTranspose2d, nn.ConvTranspose3d)):
+        return 1
+    return 0
+
+
 def tensor_quantizer_factory(bitwidth: int, round_mode: str, quant_scheme: Union[QuantScheme, libpymo.QuantizationMode],
                              use_symmetric_encodings: bool, enabled_by_default: bool):
     """
@@ -435,8 +446,14 @@ class QcPostTrainingWrapper(QcQuantizeWrapper):
         for orig_param_name, param_quantizer in self.param_quantizers.items():
             param_name = module_name + '.' + orig_param_name
             if param_name in param_encodings:
-                encoding_dict = param_encodings[param_name][0]
-                encoding, is_symmetric = utils.create_encoding_from_dict(encoding_dict)
+                encoding_dicts = param_encodings[param_name]
+                encodings = [utils.create_encoding_from_dict(encoding_dict) for encoding_dict in encoding_dicts]
+                encoding, is_symmetric = encodings[0]
+                # More than one encoding means the parameter was quantized per channel
+                if len(encodings) > 1:
+                    if param_quantizer.channel_axis is None:
+                        param_quantizer.enable_per_channel_quantization(get_output_channel_axis(self._module_to_wrap))
+                    encoding = [channel_encoding for channel_encoding, _ in encodings]
                 param_quantizer.set_encoding(encoding)
                 param_quantizer.use_symmetric_encodings = is_symmetric
                 param_quantizer.freeze_encoding()
@@ -494,6 +511,6 @@ class SteGatingFuncForParameters(torch.autograd.Function):
         for name, param in quant_wrapper_ref._module_to_wrap.named_parameters():
             if quant_wrapper_ref.param_quantizers[name].enabled and param.grad is not None:
                 param_quantizer = quant_wrapper_ref.param_quantizers[name]
-                param.grad = ste.compute_dloss_by_dx(param, param.grad, param_quantizer.encoding.min,
-                                                     param_quantizer.encoding.max)
+                encoding_min, encoding_max = param_quantizer.get_encoding_min_max(param)
+                param.grad = ste.compute_dloss_by_dx(param, param.grad, encoding_min, encoding_max)
         return (None, *output_grad)
@@ -41,16 +41,20 @@ import os
 import io
 import copy
 import pickle
+import collections
+import concurrent.futures
 from typing import Tuple, List, Union, Dict
 import json
 import torch
 import onnx
 
+import libpymo
 from aimet_common.utils import AimetLogger
 from aimet_common.defs import QuantScheme
+from aimet_common import compact_encodings
 from aimet_torch.quantsim_config.quantsim_config import QuantSimConfigurator
 from aimet_torch.qc_quantize_op import QcQuantizeStandAloneBase, QcQuantizeWrapper, QcQuantizeOpMode, \
-    QcPostTrainingWrapper
+    QcPostTrainingWrapper, get_output_channel_axis
 from aimet_torch import torchscript_utils
 from aimet_torch.batch_norm_fold import PassThroughOp
 from aimet_torch import utils
@@ -58,6 +62,7 @@ from aimet_torch import onnx_utils
 from aimet_torch.meta.connectedgraph_utils import create_connected_graph_with_input_shapes
 from aimet_torch.meta.connectedgraph import ConnectedGraph
 from aimet_torch.qc_quantize_recurrent import QcQuantizeRecurrent
+from aimet_torch.tensor_quantizer import PostTrainingTensorQuantizer, QUANTIZER_BACKENDS
 
 logger = AimetLogger.get_area_logger(AimetLogger.LogAreas.Quant)
 
@@ -114,7 +119,7 @@ class QuantizationSimModel:
                  quant_scheme: Union[str, QuantScheme] = QuantScheme.post_training_tf_enhanced,
                  rounding_mode: str = 'nearest', default_output_bw: int = 8, default_param_bw: int = 8,
                  in_place: bool = False, config_file: str = None,
-                 dummy_input: Union[torch.Tensor, Tuple] = None):
+                 dummy_input: Union[torch.Tensor, Tuple] = None, quantizer_backend: str = 'cpp'):
         """
         Constructor
 
@@ -130,9 +135,12 @@ class QuantizationSimModel:
         :param config_file: Path to Configuration file for model quantizers
         :param dummy_input: Dummy input to the model. Used to parse model graph. If the model has more than one input,
                             pass a tuple. User is expected to place the tensors on the appropriate device.
+        :param quantizer_backend: Backend implementing the quantizers. Supported options are 'cpp' for the C++ op or
+                                  'torch' for PyTorch tensor ops, which give the same results
         """
         # Perform sanity checks on inputs
-        QuantizationSimModel._validate_quantsim_inputs(quant_scheme, rounding_mode, default_output_bw, default_param_bw)
+        QuantizationSimModel._validate_quantsim_inputs(quant_scheme, rounding_mode, default_output_bw, default_param_bw,
+                                                       quantizer_backend)
         # save some parameters
         if in_place:
             self.model = model
@@ -166,8 +174,18 @@ class QuantizationSimModel:
         # Disable bias quantization
         self.exclude_param_from_quantization("bias")
 
+        # Keep the connected graph around, so a new configuration can be applied later without tracing the model again
+        self._connected_graph = connected_graph
         self.configure_quantization_ops(connected_graph, config_file)
 
+        self.set_quantizer_backend(quantizer_backend)
+
+    def __getstate__(self):
+        # The connected graph is not needed to run the sim model, and is not saved with it
+        state = self.__dict__.copy()
+        state['_connected_graph'] = None
+        return state
+
     def __str__(self):
         """
         Pretty-printed output indicating where in the model, quantizers have been activated
@@ -210,6 +228,7 @@ class QuantizationSimModel:
 
         return stream.getvalue()
 
+    @AimetLogger.span(AimetLogger.LogAreas.Quant, 'compute_encodings')
     def compute_encodings(self, forward_pass_callback, forward_pass_callback_args):
         """
         Computes encodings for all quantization sim nodes in the model. It is also used to find initial encodings for
@@ -240,11 +259,24 @@ class QuantizationSimModel:
         with torch.no_grad():
             _ = forward_pass_callback(self.model, forward_pass_callback_args)
 
-        layers_with_invalid_encodings = []
-        # Get the computed per-layer encodings and log them
-        for name, layer in quantized_layers:
+        # Get the computed per-layer encodings
+        for _, layer in quantized_layers:
             layer.compute_encoding()
 
+        self._set_mode_for_layers_after_computing_encodings(quantized_layers)
+
+        self._replace_wrappers_for_quantize_dequantize()
+
+    def _set_mode_for_layers_after_computing_encodings(self, quantized_layers: List[Tuple[str, torch.nn.Module]]):
+        """
+        Sets the quantized layers to active mode, or to passthrough mode if their enabled activation quantizers do not
+        have valid encodings, and logs the layers with invalid encodings
+
+        :param quantized_layers: List of (name, layer) tuples of the quantized layers
+        :return: List of names of the layers with invalid encodings
+        """
+        layers_with_invalid_encodings = []
+        for name, layer in quantized_layers:
             # Before we return we set the mode to active - meaning ready for quantize/de-quantize
             # for layers with valid_encoding, otherwise we set to pass through
             if isinstance(layer, QcQuantizeRecurrent):
@@ -273,7 +305,67 @@ class QuantizationSimModel:
                         'If this is not desired, amend the forward pass to evaluate these modules, and recompute '
                         'encodings.')
 
-        self._replace_wrappers_for_quantize_dequantize()
+        return layers_with_invalid_encodings
+
+    def reconfigure(self, config_file: str = None, default_output_bw: int = None, default_param_bw: int = None,
+                    quantizer_bitwidths: Dict[str, int] = None) -> bool:
+        """
+        Applies a new quantization configuration and/or new bitwidths to the sim model in place, without creating a
+        new QuantizationSimModel. Encodings are re-derived from the statistics collected by the last call to
+        compute_encodings(), so no forward pass is needed if only bitwidths or symmetry change. Quantizers which are
+        newly enabled by the new configuration have no statistics yet; in that case compute_encodings() needs to be
+        called again.
+
+        :param config_file: Path to a new configuration file for model quantizers. If None, the enabled state and
+               symmetry of the quantizers are left unchanged
+        :param default_output_bw: New bitwidth (4-32) for all layer inputs and outputs. If None, left unchanged
+        :param default_param_bw: New bitwidth (4-32) for all layer parameters. If None, left unchanged
+        :param quantizer_bitwidths: Bitwidths for individual quantizers, applied after the defaults above. Quantizers
+               are named <layer name>.input, <layer name>.output.<index> and <layer name>.param.<param name>
+               (recurrent layers use <layer name>.input.<tensor name> and <layer name>.output.<tensor name>)
+        :return: True if valid encodings could be derived for all enabled quantizers, False if compute_encodings()
+                 needs to be called again
+        """
+        for bitwidth in (default_output_bw, default_param_bw):
+            if bitwidth is not None and (bitwidth < 4 or bitwidth > 32):
+                raise ValueError('Bitwidth must be between 4 and 32, not ' + str(bitwidth))
+
+        if config_file is not None:
+            self.exclude_param_from_quantization("bias")
+            self.configure_quantization_ops(getattr(self, '_connected_graph', None), config_file)
+
+        named_quantizers = self._get_named_tensor_quantizers()
+        for name, quantizer in named_quantizers:
+            if default_param_bw is not None and '.param.' in name:
+                quantizer.bitwidth = default_param_bw
+            elif default_output_bw is not None and '.param.' not in name:
+                quantizer.bitwidth = default_output_bw
+
+        if quantizer_bitwidths:
+            named_quantizers_dict = dict(named_quantizers)
+            for name, bitwidth in quantizer_bitwidths.items():
+                if name not in named_quantizers_dict:
+                    raise ValueError('Quantizer {} not found in the sim model'.format(name))
+                named_quantizers_dict[name].bitwidth = bitwidth
+
+        # Re-derive encodings from the statistics the quantizers kept from the last compute_encodings()
+        for _, quantizer in named_quantizers:
+            quantizer.compute_encoding()
+
+        quantized_layers = self._get_qc_quantized_layers(self.model)
+        layers_with_invalid_encodings = self._set_mode_for_layers_after_computing_encodings(quantized_layers)
+
+        return not layers_with_invalid_encodings
+
+    def set_quantizer_backend(self, quantizer_backend: str):
+        """
+        Sets the backend implementing all quantizers of the sim model. Encodings are kept, statistics collected so far
+        are reset
+
+        :param quantizer_backend: 'cpp' for the C++ op or 'torch' for PyTorch tensor ops
+        """
+        for _, quantizer in self._get_named_tensor_quantizers():
+            quantizer.backend = quantizer_backend
 
     @classmethod
     def set_mode_for_recurrent_module(cls, layer: QcQuantizeRecurrent, name: str):
@@ -314,9 +406,11 @@ class QuantizationSimModel:
             layer.set_mode(QcQuantizeOpMode.ACTIVE)
         return has_invalid_encoding
 
+    # pylint: disable=too-many-arguments
     def export(self, path: str, filename_prefix: str, input_shape: Union[Tuple, List[Tuple]],
                set_onnx_layer_names: bool = True, dummy_input: Union[torch.Tensor, Tuple] = None,
-               use_torch_script_graph: bool = False, ):
+               use_torch_script_graph: bool = False, use_external_data_format: bool = False,
+               use_compact_encodings_format: bool = False):
         """
         This method exports out the quant-sim model so it is ready to be run on-target.
 
@@ -324,7 +418,8 @@ class QuantizationSimModel:
 
         1. The sim-model is exported to a regular PyTorch model without any simulation ops
         2. The quantization encodings are exported to a separate JSON-formatted file that can
-           then be imported by the on-target runtime (if desired)
+           then be imported by the on-target runtime (if desired). Optionally, the encodings are exported to a compact
+           binary file instead, see aimet_common.compact_encodings
         3. Optionally, An equivalent model in ONNX format is exported. In addition, nodes in the ONNX model are named
            the same as the corresponding PyTorch module names. This helps with matching ONNX node to their quant
            encoding from #2.
@@ -336,6 +431,10 @@ class QuantizationSimModel:
         :param set_onnx_layer_names: If ONNX layer names should be set while exporting the model. Default is True
         :param dummy_input: Dummy input to the model. Used to parse model graph.
         :param use_torch_script_graph: if exporting of encoding should use torch script tensor names. Default is False
+        :param use_external_data_format: If True, the ONNX model weights are stored as external data next to the ONNX
+               model file. Needed for models larger than 2GB. Default is False
+        :param use_compact_encodings_format: If True, encodings are exported to a compact binary file
+               (<filename_prefix>.encodings.bin) instead of JSON. Default is False
         :return: None
 
         """
@@ -343,10 +442,8 @@ class QuantizationSimModel:
         model_filename = filename_prefix + '.pth'
         model_path = os.path.join(path, model_filename)
 
-        # Create a version of the model without any quantization ops
-        model_to_export = copy.deepcopy(self.model)
-        all_modules_in_model_to_export = [module for module in model_to_export.modules()]
-        self._remove_quantization_wrappers(model_to_export, all_modules_in_model_to_export)
+        # Create a version of the model without any quantization ops. Parameters are shared with the sim model
+        model_to_export = self._get_model_without_quantization_wrappers(self.model)
         torch.save(model_to_export, model_path)
 
         if not dummy_input:
@@ -355,13 +452,16 @@ class QuantizationSimModel:
             dummy_input = tuple(utils.create_rand_tensors_given_shapes(input_shape,
                                                                        device=utils.get_device(model_to_export)))
         if use_torch_script_graph:
-            self.export_torch_script_model_and_encodings(path, filename_prefix, model_to_export, dummy_input)
+            self.export_torch_script_model_and_encodings(path, filename_prefix, model_to_export, dummy_input,
+                                                         use_compact_encodings_format)
         else:
             self.export_onnx_model_and_encodings(path, filename_prefix, model_to_export,
-                                                 dummy_input, set_onnx_layer_names)
+                                                 dummy_input, set_onnx_layer_names, use_external_data_format,
+                                                 use_compact_encodings_format)
 
     def export_torch_script_model_and_encodings(self, path: str, filename_prefix: str, model: torch.nn.Module,
-                                                dummy_input: Union[torch.Tensor, Tuple]):
+                                                dummy_input: Union[torch.Tensor, Tuple],
+                                                use_compact_encodings_format: bool = False):
         """
         This method exports  a onnx mode and the corrsponding encodings
 
@@ -369,6 +469,7 @@ class QuantizationSimModel:
         :param filename_prefix: Prefix to use for filenames of the model pth and encodings files
         :param model: model without the quantsim ops
         :param dummy_input: Dummy input to the model. Used to parse model graph.
+        :param use_compact_encodings_format: If True, encodings are exported to a compact binary file instead of JSON
         :return: None
         """
         with torch.no_grad():
@@ -382,10 +483,14 @@ class QuantizationSimModel:
                 torchscript_utils.get_node_to_io_tensor_names_map(model, trace, dummy_input)
 
         # Export encodings
-        self._export_encodings_to_json(path, filename_prefix, torch_script_node_io_tensor_map, valid_param_set)
+        self._export_encodings(path, filename_prefix, torch_script_node_io_tensor_map, valid_param_set,
+                               use_compact_encodings_format)
 
+    # pylint: disable=too-many-arguments
     def export_onnx_model_and_encodings(self, path: str, filename_prefix: str, model: torch.nn.Module,
-                                        dummy_input: Union[torch.Tensor, Tuple], set_onnx_layer_names):
+                                        dummy_input: Union[torch.Tensor, Tuple], set_onnx_layer_names: bool,
+                                        use_external_data_format: bool = False,
+                                        use_compact_encodings_format: bool = False):
         """
         This method exports a onnx model and the corresponding encodings
 
@@ -394,21 +499,32 @@ class QuantizationSimModel:
         :param model: model without the quantsim ops
         :param dummy_input: Dummy input to the model. Used to parse model graph.
         :param set_onnx_layer_names: If ONNX layer names should be set while exporting the model
+        :param use_external_data_format: If True, the ONNX model weights are stored as external data
+        :param use_compact_encodings_format: If True, encodings are exported to a compact binary file instead of JSON
         :return: None
 
         """
-        # Save model to onnx
         onnx_path = os.path.join(path, filename_prefix + '.onnx')
-        torch.onnx.export(model, dummy_input, onnx_path)
+
+        # Export the model to onnx in memory, so the model file only needs to be written once. With external data
+        # the weights are written by the exporter and only the graph is held in memory
+        if use_external_data_format:
+            onnx_model = onnx_utils.OnnxSaver.create_onnx_model_with_external_data(model, dummy_input, onnx_path)
+        else:
+            onnx_model = onnx_utils.OnnxSaver.create_onnx_model(model, dummy_input)
+
         #  Set the onnx layer names
         if set_onnx_layer_names:
-            onnx_utils.OnnxSaver.set_node_names(onnx_path, model, dummy_input)
-        onnx_model = onnx.load(onnx_path)
+            onnx_utils.OnnxSaver.set_node_names_in_onnx_model(onnx_model, model, dummy_input)
         onnx_node_to_io_tensor_map, valid_param_set = \
             onnx_utils.OnnxSaver.get_onnx_node_to_io_tensor_names_map(onnx_model)
 
+        # Save model to onnx
+        onnx.save(onnx_model, onnx_path)
+
         # Export encodings
-        self._export_encodings_to_json(path, filename_prefix, onnx_node_to_io_tensor_map, valid_param_set)
+        self._export_encodings(path, filename_prefix, onnx_node_to_io_tensor_map, valid_param_set,
+                               use_compact_encodings_format)
 
     def exclude_layers_from_quantization(self, layers_to_exclude: List[torch.nn.Module]):
         """
@@ -429,12 +545,25 @@ class QuantizationSimModel:
                 if param_name_to_exclude in module.param_quantizers:
                     module.param_quantizers[param_name_to_exclude].enabled = False
 
+    def enable_per_channel_quantization(self):
+        """
+        Quantizes the weights of all layers per output channel, with one encoding per channel, instead of with a
+        single encoding per weight tensor. Encodings of the weights are reset and recomputed on the next forward pass
+        :return: None
+        """
+        for module in self.model.modules():
+            if isinstance(module, QcQuantizeWrapper) and 'weight' in module.param_quantizers:
+                # pylint: disable=protected-access
+                if module._module_to_wrap.weight.dim() > 1:
+                    axis = get_output_channel_axis(module._module_to_wrap)
+                    module.param_quantizers['weight'].enable_per_channel_quantization(axis)
+
     def _replace_wrappers_for_quantize_dequantize(self):
         pass
 
     @staticmethod
     def _validate_quantsim_inputs(quant_scheme: Union[str, QuantScheme], rounding_mode: str, default_output_bw: int,
-                                  default_param_bw: int):
+                                  default_param_bw: int, quantizer_backend: str = 'cpp'):
         """
         Perform sanity checks on inputs to QuantSim
         :param quant_scheme: Quantization scheme. Supported options are 'tf_enhanced' or 'tf' or using Quant Scheme Enum
@@ -442,6 +571,7 @@ class QuantizationSimModel:
         :param rounding_mode: Rounding mode. Supported options are 'nearest' or 'stochastic'
         :param default_output_bw: Default bitwidth (4-31) to use for quantizing layer inputs and outputs
         :param default_param_bw: Default bitwidth (4-31) to use for quantizing layer parameters
+        :param quantizer_backend: Backend implementing the quantizers, 'cpp' or 'torch'
         """
         # sanity checks
         if quant_scheme not in ('tf_enhanced', 'tf') and not isinstance(quant_scheme, QuantScheme):
@@ -458,6 +588,9 @@ class QuantizationSimModel:
         if default_output_bw < 4 or default_output_bw > 32:
             raise ValueError('Activation bitwidth must be between 4 and 32, not '+str(default_output_bw))
 
+        if quantizer_backend not in QUANTIZER_BACKENDS:
+            raise ValueError('Parameter quantizer backend is not a valid selection. Valid selections are cpp or torch')
+
     @staticmethod
     def _find_next_downstream_modules(op):
         downstream_modules = []
@@ -470,6 +603,56 @@ class QuantizationSimModel:
 
         return downstream_modules
 
+    # pylint: disable=too-many-arguments
+    def _export_encodings(self, path: str, filename_prefix: str, op_to_io_tensor_map: Dict, valid_param_set: set,
+                          use_compact_encodings_format: bool):
+        """
+        Save the quantized model encodings, either in JSON or in the compact binary format
+
+        :param path: path where to store model pth and encodings
+        :param filename_prefix: filename to store exported encodings in
+        :param op_to_io_tensor_map: Dictionary of layer to I/O tensor mapping from onnx or torch script model
+        :param valid_param_set: a set of valid param input names in model
+        :param use_compact_encodings_format: If True, encodings are exported to a compact binary file instead of JSON
+        """
+        if use_compact_encodings_format:
+            self._export_encodings_to_compact_file(path, filename_prefix, op_to_io_tensor_map, valid_param_set)
+        else:
+            self._export_encodings_to_json(path, filename_prefix, op_to_io_tensor_map, valid_param_set)
+
+    def _update_encodings_for_all_layers(self, activation_encodings: Dict, param_encodings: Dict,
+                                         op_to_io_tensor_map: Dict, valid_param_set: set):
+        """
+        Add param and activation encodings of all quantized layers to the respective dictionaries
+
+        :param activation_encodings: dictionary of activation encodings
+        :param param_encodings: dictionary of param encodings
+        :param op_to_io_tensor_map: Dictionary of layer to I/O tensor mapping from onnx or torch script model
+        :param valid_param_set: a set of valid param input names in model
+        """
+        quantized_layers = self._get_qc_quantized_layers(self.model)
+
+        for layer_name, layer in quantized_layers:
+            self._update_encoding_dicts_for_layer(layer, layer_name, activation_encodings,
+                                                  param_encodings, op_to_io_tensor_map,
+                                                  valid_param_set)
+
+    def _export_encodings_to_compact_file(self, path: str, filename_prefix: str, op_to_io_tensor_map: Dict,
+                                          valid_param_set: set):
+        """
+        Save the quantized model encodings in the compact binary format. Encodings are streamed to the file as they
+        are collected instead of being gathered in a dictionary first
+
+        :param path: path where to store model pth and encodings
+        :param filename_prefix: filename to store exported encodings in compact binary format
+        :param op_to_io_tensor_map: Dictionary of layer to I/O tensor mapping from onnx or torch script model
+        :param valid_param_set: a set of valid param input names in model
+        """
+        encoding_file_path = os.path.join(path, filename_prefix + '.encodings.bin')
+        with compact_encodings.CompactEncodingsWriter(encoding_file_path) as writer:
+            self._update_encodings_for_all_layers(writer.activation_encodings, writer.param_encodings,
+                                                  op_to_io_tensor_map, valid_param_set)
+
     def _export_encodings_to_json(self, path: str, filename_prefix: str, op_to_io_tensor_map: Dict,
                                   valid_param_set: set):
         """
@@ -484,12 +667,8 @@ class QuantizationSimModel:
         # Create a dictionary to export to JSON
         activation_encodings = {}
         param_encodings = {}
-        quantized_layers = self._get_qc_quantized_layers(self.model)
-
-        for layer_name, layer in quantized_layers:
-            self._update_encoding_dicts_for_layer(layer, layer_name, activation_encodings,
-                                                  param_encodings, op_to_io_tensor_map,
-                                                  valid_param_set)
+        self._update_encodings_for_all_layers(activation_encodings, param_encodings, op_to_io_tensor_map,
+                                              valid_param_set)
 
         encodings_dict = {'activation_encodings': activation_encodings,
                           'param_encodings': param_encodings}
@@ -514,9 +693,12 @@ class QuantizationSimModel:
             param_name = layer_name + '.' + orig_param_name
             if param_quantizer.enabled:
                 if param_name in valid_param_set:
-                    encoding = utils.create_encoding_dict(param_quantizer.encoding,
-                                                          param_quantizer.use_symmetric_encodings)
-                    param_encodings[param_name] = [encoding]
+                    # Per-channel quantized params have one encoding per channel
+                    encodings = param_quantizer.encoding if isinstance(param_quantizer.encoding, list) else \
+                        [param_quantizer.encoding]
+                    param_encodings[param_name] = [utils.create_encoding_dict(encoding,
+                                                                              param_quantizer.use_symmetric_encodings)
+                                                   for encoding in encodings]
                 else:
                     logger.error('Param tensor {%s} not found in valid param set', param_name)
             else:
@@ -588,6 +770,26 @@ class QuantizationSimModel:
                     encoding = utils.create_encoding_dict(quantizer.encoding, quantizer.use_symmetric_encodings)
                     param_encodings[tensor] = [encoding]
 
+    def _get_named_tensor_quantizers(self) -> List[Tuple[str, PostTrainingTensorQuantizer]]:
+        """
+        Returns all tensor quantizers in the sim model, named after the layer they belong to
+        :return: List of (quantizer name, tensor quantizer) tuples
+        """
+        named_quantizers = []
+        for layer_name, layer in self._get_qc_quantized_layers(self.model):
+            if isinstance(layer, QcQuantizeRecurrent):
+                named_quantizers += [(layer_name + '.input.' + name, quantizer)
+                                     for name, quantizer in layer.input_quantizers.items()]
+                named_quantizers += [(layer_name + '.output.' + name, quantizer)
+                                     for name, quantizer in layer.output_quantizers.items()]
+            else:
+                named_quantizers.append((layer_name + '.input', layer.input_quantizer))
+                named_quantizers += [(layer_name + '.output.' + str(index), quantizer)
+                                     for index, quantizer in enumerate(layer.output_quantizers)]
+            named_quantizers += [(layer_name + '.param.' + name, quantizer)
+                                 for name, quantizer in layer.param_quantizers.items()]
+        return named_quantizers
+
     @staticmethod
     def _get_qc_quantized_layers(model) -> List[Tuple[str, QcQuantizeWrapper]]:
         quantized_layers = []
@@ -684,6 +886,48 @@ class QuantizationSimModel:
             if not cls._is_leaf_module(module_ref):
                 cls._remove_quantization_wrappers(module_ref, list_of_modules_to_exclude)
 
+    @classmethod
+    def _get_model_without_quantization_wrappers(cls, module: torch.nn.Module, memo: Dict = None) -> torch.nn.Module:
+        """
+        Returns a version of the given module with all quantization wrappers removed, without modifying the given
+        module. Only container modules are (shallow) copied, the wrapped modules and their parameters are shared with
+        the given module. This avoids having to deepcopy the whole model just to remove the wrappers.
+        :param module: Module to remove quantization wrappers from
+        :param memo: Dictionary of already processed modules, to preserve modules that are reused in the model
+        :return: Module without quantization wrappers
+        """
+        if memo is None:
+            memo = {}
+
+        if id(module) in memo:
+            return memo[id(module)]
+
+        if isinstance(module, QcQuantizeWrapper):
+            # pylint: disable=protected-access
+            module_to_export = module._module_to_wrap
+
+        elif isinstance(module, QcQuantizeStandAloneBase):
+            module_to_export = PassThroughOp()
+
+        elif isinstance(module, QcQuantizeRecurrent):
+            module.update_params()
+            module_to_export = module.module_to_quantize
+
+        elif cls._is_leaf_module(module):
+            module_to_export = module
+
+        else:
+            module_to_export = copy.copy(module)
+            # Give the copy its own dictionary of children so that swapping them does not affect the given module
+            # pylint: disable=protected-access
+            module_to_export._modules = copy.copy(module._modules)
+            for module_name, module_ref in module.named_children():
+                module_to_export._modules[module_name] = cls._get_model_without_quantization_wrappers(module_ref,
+                                                                                                      memo)
+
+        memo[id(module)] = module_to_export
+        return module_to_export
+
     def configure_quantization_ops(self, connected_graph: Union[None, ConnectedGraph], config_file: str):
         """
         Configure inserted quantize ops using config file
@@ -700,12 +944,17 @@ class QuantizationSimModel:
 
     def set_and_freeze_param_encodings(self, encoding_path: str):
         """
-        Set and freeze parameter encodings from encodings JSON file
+        Set and freeze parameter encodings from encodings JSON file or compact encodings file
         :param encoding_path: path from where to load parameter encodings file
         """
-        # Load parameter encodings file
-        with open(encoding_path) as json_file:
-            param_encodings = json.load(json_file)
+        # Load parameter encodings file. Compact encodings are only read for the parameters that are looked up
+        if compact_encodings.is_compact_encodings_file(encoding_path):
+            param_encodings = compact_encodings.CompactEncodingsReader(encoding_path).param_encodings
+        else:
+            with open(encoding_path) as json_file:
+                param_encodings = json.load(json_file)
+            # Encodings files exported by QuantizationSimModel hold param encodings under their own key
+            param_encodings = param_encodings.get('param_encodings', param_encodings)
 
         for name, quant_module in self.model.named_modules():
             if isinstance(quant_module, QcPostTrainingWrapper):
@@ -736,3 +985,158 @@ def load_checkpoint(file_path: str) -> QuantizationSimModel:
     with open(file_path, 'rb') as file:
         sim = pickle.load(file)
         return sim
+
+
+# Single background writer, so that checkpoints saved in the background are written in the order they were requested
+_checkpoint_writer = None
+
+
+def _get_checkpoint_writer() -> concurrent.futures.ThreadPoolExecutor:
+    """ Returns the executor used to write checkpoints in the background, creating it on first use """
+    global _checkpoint_writer  # pylint: disable=global-statement
+    if _checkpoint_writer is None:
+        _checkpoint_writer = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    return _checkpoint_writer
+
+
+def _get_quantizer_state_table(quant_sim_model: QuantizationSimModel) -> Dict:
+    """
+    Collects the state of all tensor quantizers and quantization wrappers of the sim model into a compact table of
+    names and per-field tensors
+    :param quant_sim_model: QuantizationSimModel to collect quantizer state for
+    :return: Dictionary holding the quantizer state table
+    """
+    named_quantizers = quant_sim_model._get_named_tensor_quantizers()  # pylint: disable=protected-access
+    quantizers = [quantizer for _, quantizer in named_quantizers]
+    # Per-channel encodings are stored separately, in the order of the quantizers
+    encodings = [None if isinstance(quantizer.encoding, list) else quantizer.encoding for quantizer in quantizers]
+    channel_encodings = [encoding for quantizer in quantizers if isinstance(quantizer.encoding, list)
+                         for encoding in quantizer.encoding]
+
+    # Quantizer modes are stored per wrapper
+    # pylint: disable=protected-access
+    quantized_layers = quant_sim_model._get_qc_quantized_layers(quant_sim_model.model)
+
+    return {
+        'quantizer_names': [name for name, _ in named_quantizers],
+        'enabled': torch.tensor([quantizer.enabled for quantizer in quantizers], dtype=torch.bool),
+        'bitwidth': torch.tensor([quantizer.bitwidth for quantizer in quantizers], dtype=torch.int32),
+        'use_symmetric_encodings': torch.tensor([quantizer.use_symmetric_encodings for quantizer in quantizers],
+                                                dtype=torch.bool),
+        'is_encoding_frozen': torch.tensor([quantizer.is_encoding_frozen for quantizer in quantizers],
+                                           dtype=torch.bool),
+        'has_encoding': torch.tensor([quantizer.encoding is not None for quantizer in quantizers], dtype=torch.bool),
+        'encoding': torch.tensor([[encoding.min, encoding.max, encoding.delta, encoding.offset, encoding.bw]
+                                  if encoding is not None else [0.0] * 5 for encoding in encodings],
+                                 dtype=torch.float64).reshape(-1, 5),
+        'channel_axis': torch.tensor([-1 if quantizer.channel_axis is None else quantizer.channel_axis
+                                      for quantizer in quantizers], dtype=torch.int32),
+        'num_channel_encodings': torch.tensor([len(quantizer.encoding) if isinstance(quantizer.encoding, list) else 0
+                                               for quantizer in quantizers], dtype=torch.int32),
+        'channel_encodings': torch.tensor([[encoding.min, encoding.max, encoding.delta, encoding.offset, encoding.bw]
+                                           for encoding in channel_encodings], dtype=torch.float64).reshape(-1, 5),
+        'layer_names': [name for name, _ in quantized_layers],
+        'layer_modes': torch.tensor([layer._mode.value for _, layer in quantized_layers], dtype=torch.int8),
+    }
+
+
+def _create_encoding_from_row(row: List[float]) -> libpymo.TfEncoding:
+    """
+    Creates an encoding from a row of the quantizer state table
+    :param row: min, max, delta, offset and bitwidth of the encoding
+    :return: Encoding object
+    """
+    encoding = libpymo.TfEncoding()
+    encoding.min, encoding.max, encoding.delta, encoding.offset, encoding_bw = row
+    encoding.bw = int(encoding_bw)
+    return encoding
+
+
+def _write_checkpoint(checkpoint: Dict, file_path: str):
+    """
+    Writes the checkpoint to a temporary file first and then moves it in place, so that an interrupted write never
+    leaves a partially written checkpoint behind
+    :param checkpoint: Checkpoint dictionary
+    :param file_path: Path to the checkpoint file
+    """
+    temp_file_path = file_path + '.tmp'
+    torch.save(checkpoint, temp_file_path)
+    os.replace(temp_file_path, file_path)
+
+
+def save_state_checkpoint(quant_sim_model: QuantizationSimModel, file_path: str, in_background: bool = False) \
+        -> Union[concurrent.futures.Future, None]:
+    """
+    Saves a checkpoint of the quantized model consisting of the model state_dict and a table of the quantizer
+    states. Unlike save_checkpoint(), the model and quantizer objects are not pickled, so saving costs about the same
+    as saving the state_dict. The checkpoint can only be restored into an existing QuantizationSimModel of the same
+    model, using load_state_checkpoint()
+
+    :param quant_sim_model: QuantizationSimModel to save checkpoint for
+    :param file_path: Path to the file where you want to save the checkpoint
+    :param in_background: If True, the checkpoint is written by a background thread, so that e.g. training can
+           continue while it is written. Model parameters are copied before returning.
+    :return: If in_background, a Future that completes when the checkpoint has been written. None otherwise
+    """
+    state_dict = quant_sim_model.model.state_dict()
+    if in_background:
+        # Take a snapshot, the model keeps changing while the checkpoint is written
+        state_dict = collections.OrderedDict((name, tensor.detach().to('cpu', copy=True))
+                                             for name, tensor in state_dict.items())
+
+    checkpoint = {'state_dict': state_dict,
+                  'quantizer_states': _get_quantizer_state_table(quant_sim_model)}
+
+    if in_background:
+        return _get_checkpoint_writer().submit(_write_checkpoint, checkpoint, file_path)
+
+    _write_checkpoint(checkpoint, file_path)
+    return None
+
+
+def load_state_checkpoint(quant_sim_model: QuantizationSimModel, file_path: str):
+    """
+    Restores a checkpoint saved using save_state_checkpoint() into the given QuantizationSimModel. The sim model needs
+    to have been created for the same model and configuration as the one the checkpoint was saved from
+
+    :param quant_sim_model: QuantizationSimModel to restore the checkpoint into
+    :param file_path: Path to the checkpoint file
+    :return: None
+    """
+    checkpoint = torch.load(file_path, map_location='cpu')
+    quant_sim_model.model.load_state_dict(checkpoint['state_dict'])
+
+    quantizer_states = checkpoint['quantizer_states']
+    named_quantizers = dict(quant_sim_model._get_named_tensor_quantizers())  # pylint: disable=protected-access
+
+    encodings = quantizer_states['encoding'].tolist()
+    num_quantizers = len(quantizer_states['quantizer_names'])
+    # Checkpoints saved before per-channel quantization was supported only hold per-tensor encodings
+    channel_axes = quantizer_states.get('channel_axis', torch.full((num_quantizers,), -1)).tolist()
+    num_channel_encodings = quantizer_states.get('num_channel_encodings', torch.zeros(num_quantizers)).tolist()
+    channel_encodings = iter(quantizer_states.get('channel_encodings', torch.zeros(0, 5)).tolist())
+
+    for index, name in enumerate(quantizer_states['quantizer_names']):
+        if name not in named_quantizers:
+            logger.error('Quantizer %s in checkpoint not found in the quantsim model', name)
+            raise AssertionError
+
+        quantizer = named_quantizers[name]
+        quantizer.enabled = bool(quantizer_states['enabled'][index])
+        quantizer.bitwidth = int(quantizer_states['bitwidth'][index])
+        quantizer.use_symmetric_encodings = bool(quantizer_states['use_symmetric_encodings'][index])
+        quantizer.is_encoding_frozen = bool(quantizer_states['is_encoding_frozen'][index])
+        quantizer.channel_axis = None if channel_axes[index] < 0 else int(channel_axes[index])
+
+        if num_channel_encodings[index]:
+            quantizer.encoding = [_create_encoding_from_row(next(channel_encodings))
+                                  for _ in range(int(num_channel_encodings[index]))]
+        elif quantizer_states['has_encoding'][index]:
+            quantizer.encoding = _create_encoding_from_row(encodings[index])
+        else:
+            quantizer.encoding = None
+
+    # pylint: disable=protected-access
+    quantized_layers = dict(quant_sim_model._get_qc_quantized_layers(quant_sim_model.model))
+    for name, mode in zip(quantizer_states['layer_names'], quantizer_states['layer_modes'].tolist()):
+        quantized_layers[name].set_mode(QcQuantizeOpMode(mode))
@@ -55,8 +55,26 @@ def compute_dloss_by_dx(x, grad, encoding_min, encoding_max):
                              torch.ones_like(x),  # execute if true
                              torch.zeros_like(x))  # execute if false
 
-    dloss_by_dx = (torch.where(torch.le(torch.Tensor([encoding_min]).to(device), x),  # condition to check per value
+    # Per-channel encodings are passed as tensors which broadcast against x
+    if not isinstance(encoding_min, torch.Tensor):
+        encoding_min = torch.Tensor([encoding_min]).to(device)
+
+    dloss_by_dx = (torch.where(torch.le(encoding_min, x),  # condition to check per value
                                inner_cond,  # execute if true
                                torch.zeros_like(x))) * grad
 
     return dloss_by_dx
+
+
+def straight_through_quantize_dequantize(x, quantized_x, encoding_min, encoding_max):
+    """
+    Returns the quantized-dequantized tensor in the forward pass, with the same gradient w.r.t. the input as
+    compute_dloss_by_dx in the backward pass, expressed in tensor ops which autograd differentiates
+    :param x: Input tensor
+    :param quantized_x: Quantized-dequantized input tensor, computed without tracking gradients
+    :param encoding_min: encoding min grid param used on forward pass
+    :param encoding_max: encoding max grid param used on forward pass
+    :return: Quantized-dequantized tensor, differentiable w.r.t. x
+    """
+    mask = ((quantized_x >= encoding_min) & (quantized_x <= encoding_max)).to(x.dtype)
+    return quantized_x + (x - x.detach()) * mask
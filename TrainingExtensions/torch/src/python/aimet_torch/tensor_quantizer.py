@@ -38,15 +38,19 @@
 """ Custom Tensor Quantizers for PyTorch Op for quantizing weights and activations """
 
 import io
-from typing import Union
+from typing import List, Tuple, Union
 
 import torch
 
 from aimet_common.defs import QuantScheme
 import aimet_torch.quantsim_straight_through_grad as ste
+from aimet_torch.torch_quantizer_backend import TorchTensorQuantizerOp, _create_encoding
 import libpymo
 import AimetTensorQuantizer
 
+# Backends implementing the quantizer op: the AimetTensorQuantizer C++ op, or PyTorch tensor ops
+QUANTIZER_BACKENDS = ('cpp', 'torch')
+
 
 class TensorQuantizer:
     """
@@ -79,7 +83,9 @@ class PickableState:
     def __init__(self, builtin_dict, encoding):
         self.dict = builtin_dict
 
-        if encoding:
+        if isinstance(encoding, list):
+            self.per_channel_encodings = [(enc.min, enc.max, enc.delta, enc.offset, enc.bw) for enc in encoding]
+        elif encoding:
             self.min = encoding.min
             self.max = encoding.max
             self.delta = encoding.delta
@@ -104,10 +110,50 @@ class PostTrainingTensorQuantizer(TensorQuantizer):
         """
         super(PostTrainingTensorQuantizer, self).__init__(bitwidth, round_mode, quant_scheme, use_symmetric_encodings,
                                                           enabled_by_default)
-        self._cppOp = AimetTensorQuantizer.AimetTensorQuantizer(quant_scheme)
+        # The C++ op holds the encoding analyzer state and is only created when it is first used. Many quantizers are
+        # never enabled (e.g. input and bias quantizers), so they never need one
+        self._cpp_op = None
         self.encoding = None
         self.is_encoding_frozen = False
 
+        # Axis of the tensor holding the channels, if the tensor is quantized per channel. In that case encoding is a
+        # list holding one encoding per channel
+        self.channel_axis = None
+
+        # Backend implementing the op, one of QUANTIZER_BACKENDS
+        self._backend = 'cpp'
+
+    @property
+    def _cppOp(self) -> Union[AimetTensorQuantizer.AimetTensorQuantizer,   # pylint: disable=invalid-name
+                              TorchTensorQuantizerOp]:
+        """
+        Returns the op for this quantizer, creating it on first use. This is the C++ op, or its PyTorch equivalent if
+        the quantizer uses the 'torch' backend
+        """
+        if self._cpp_op is None:
+            if self._backend == 'torch':
+                self._cpp_op = TorchTensorQuantizerOp(self.quant_scheme)
+            else:
+                self._cpp_op = AimetTensorQuantizer.AimetTensorQuantizer(self.quant_scheme)
+        return self._cpp_op
+
+    @property
+    def backend(self) -> str:
+        """ Returns the backend implementing the op of this quantizer, 'cpp' or 'torch' """
+        return self._backend
+
+    @backend.setter
+    def backend(self, backend: str):
+        """
+        Sets the backend implementing the op of this quantizer. Stats collected so far are reset, the encoding is kept
+        :param backend: 'cpp' for the AimetTensorQuantizer C++ op, 'torch' for PyTorch tensor ops
+        """
+        if backend not in QUANTIZER_BACKENDS:
+            raise ValueError('Unknown quantizer backend {}, expected one of {}'.format(backend, QUANTIZER_BACKENDS))
+        if backend != self._backend:
+            self._backend = backend
+            self._cpp_op = None
+
     def __str__(self):
         stream = io.StringIO(newline='\n')
         stream.write('Post Training TensorQuantizer:\n')
@@ -115,7 +161,13 @@ class PostTrainingTensorQuantizer(TensorQuantizer):
                                                                                           self.round_mode,
                                                                                           self.bitwidth,
                                                                                           self.enabled))
-        if self.encoding:
+        if self.channel_axis is not None:
+            stream.write('  per-channel along axis {}\n'.format(self.channel_axis))
+        if isinstance(self.encoding, list):
+            stream.write('  {} channel encodings, min:{}, max={}\n'.format(len(self.encoding),
+                                                                            min(enc.min for enc in self.encoding),
+                                                                            max(enc.max for enc in self.encoding)))
+        elif self.encoding:
             stream.write('  min:{}, max={}, delta={}, offset={}\n'.format(self.encoding.min, self.encoding.max,
                                                                           self.encoding.delta, self.encoding.offset))
         else:
@@ -131,7 +183,7 @@ class PostTrainingTensorQuantizer(TensorQuantizer):
         state = PickableState(self.__dict__.copy(), self.encoding)
 
         # Remove the unpicklable entries.
-        del state.dict['_cppOp']
+        del state.dict['_cpp_op']
         del state.dict['encoding']
 
         return state
@@ -140,34 +192,67 @@ class PostTrainingTensorQuantizer(TensorQuantizer):
         # Restore instance attributes
         self.__dict__.update(state.dict)
 
-        # Create the c++ op
-        self._cppOp = AimetTensorQuantizer.AimetTensorQuantizer(self.quant_scheme)
+        # The c++ op gets created on first use
+        self._cpp_op = None
+
+        # Quantizers pickled before per-channel quantization was supported are per tensor
+        self.__dict__.setdefault('channel_axis', None)
+        self.__dict__.setdefault('_backend', 'cpp')
 
         # Create the encoding object
-        if hasattr(state, 'min'):
-            self.encoding = libpymo.TfEncoding()
-            self.encoding.bw = state.bw
-            self.encoding.max = state.max
-            self.encoding.min = state.min
-            self.encoding.delta = state.delta
-            self.encoding.offset = state.offset
+        if hasattr(state, 'per_channel_encodings'):
+            self.encoding = [_create_encoding(*values) for values in state.per_channel_encodings]
+        elif hasattr(state, 'min'):
+            self.encoding = _create_encoding(state.min, state.max, state.delta, state.offset, state.bw)
         else:
             self.encoding = None
 
+    def enable_per_channel_quantization(self, channel_axis: int = 0):
+        """
+        Quantize the tensor per channel, with one encoding for every channel along the given axis. Any existing
+        encoding and stats are reset
+        :param channel_axis: Axis of the tensor holding the channels, e.g. 0 for the output channels of Conv2d weights
+        """
+        self.channel_axis = channel_axis
+        self._reset_encoding_and_stats()
+
+    def disable_per_channel_quantization(self):
+        """
+        Quantize the tensor with a single encoding. Any existing encoding and stats are reset
+        """
+        self.channel_axis = None
+        self._reset_encoding_and_stats()
+
+    def _reset_encoding_and_stats(self):
+        """
+        Resets the encoding and stats, even if the encoding is frozen
+        """
+        if self._cpp_op is not None:
+            self._cpp_op.resetEncodingStats()
+        self.encoding = None
+
     def update_encoding_stats(self, tensor):
         """
         Update the stats for computing encoding
         :param tensor: Tensor to use for updating the encodings stats
         """
         if self.enabled and not self.is_encoding_frozen:
-            self._cppOp.updateStats(tensor, tensor.is_cuda)
+            if self.channel_axis is not None:
+                self._cppOp.updateStatsPerChannel(tensor, self.channel_axis, tensor.is_cuda)
+            else:
+                self._cppOp.updateStats(tensor, tensor.is_cuda)
 
     def compute_encoding(self):
         """
         Compute the quantization encoding for this tensor
         """
-        if self.enabled and not self.is_encoding_frozen:
-            encoding, is_encoding_valid = self._cppOp.getEncoding(self.bitwidth, self.use_symmetric_encodings)
+        # Without a c++ op no stats have been collected, so there is no valid encoding to compute
+        if self.enabled and not self.is_encoding_frozen and self._cpp_op is not None:
+            if self.channel_axis is not None:
+                encoding, is_encoding_valid = self._cppOp.getEncodingPerChannel(self.bitwidth,
+                                                                                self.use_symmetric_encodings)
+            else:
+                encoding, is_encoding_valid = self._cppOp.getEncoding(self.bitwidth, self.use_symmetric_encodings)
 
             if is_encoding_valid:
                 self.encoding = encoding
@@ -179,15 +264,64 @@ class PostTrainingTensorQuantizer(TensorQuantizer):
         :param round_mode: Rounding mode
         :return: Resulting tensor
         """
+        if self._backend == 'torch':
+            # Expressed in tensor ops only, so autograd computes the straight-through gradient
+            if not self.enabled:
+                return tensor
+            with torch.no_grad():
+                quantized_tensor = self._quantize_dequantize_tensor(tensor, round_mode)
+            encoding_min, encoding_max = self.get_encoding_min_max(quantized_tensor)
+            return ste.straight_through_quantize_dequantize(tensor, quantized_tensor, encoding_min, encoding_max)
+
         output = QuantizeDequantize.apply(tensor, self, round_mode)
         return output
 
+    def _quantize_dequantize_tensor(self, tensor: torch.Tensor, round_mode) -> torch.Tensor:
+        """
+        Quantize-dequantize the tensor using the saved encoding, without tracking gradients
+        :param tensor: Tensor to quantize-dequantize
+        :param round_mode: Rounding mode
+        :return: Resulting tensor
+        """
+        if isinstance(self.encoding, list):
+            encoding_min, encoding_max = self._get_per_channel_min_max(tensor)
+            return self._cppOp.quantizeDequantizePerChannel(tensor, encoding_min.flatten(), encoding_max.flatten(),
+                                                            self.bitwidth, self.channel_axis, round_mode)
+
+        return self._cppOp.quantizeDequantize(tensor, self.encoding, round_mode, tensor.is_cuda)
+
+    def _get_per_channel_min_max(self, tensor: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Returns the per-channel encoding min and max as tensors which broadcast against the given tensor
+        :param tensor: Tensor quantized with the per-channel encodings
+        :return: Tuple of encoding min and encoding max tensors
+        """
+        shape = [1] * tensor.dim()
+        shape[self.channel_axis] = len(self.encoding)
+        encoding_min = torch.tensor([enc.min for enc in self.encoding], dtype=tensor.dtype, device=tensor.device)
+        encoding_max = torch.tensor([enc.max for enc in self.encoding], dtype=tensor.dtype, device=tensor.device)
+        return encoding_min.view(shape), encoding_max.view(shape)
+
+    def get_encoding_min_max(self, tensor: torch.Tensor) -> Tuple[Union[float, torch.Tensor],
+                                                                  Union[float, torch.Tensor]]:
+        """
+        Returns the encoding min and max to clip the given tensor with: floats for a per-tensor encoding, or tensors
+        which broadcast against the given tensor for per-channel encodings
+        :param tensor: Tensor quantized with the encoding
+        :return: Tuple of encoding min and encoding max
+        """
+        if isinstance(self.encoding, list):
+            return self._get_per_channel_min_max(tensor)
+        return self.encoding.min, self.encoding.max
+
     def reset_encoding_stats(self):
         """
         Resets the encodings stats and set encoding to None
         """
         if not self.is_encoding_frozen:
-            self._cppOp.resetEncodingStats()
+            # Nothing to reset if the c++ op was never created
+            if self._cpp_op is not None:
+                self._cpp_op.resetEncodingStats()
             self.encoding = None
 
     def freeze_encoding(self):
@@ -196,10 +330,10 @@ class PostTrainingTensorQuantizer(TensorQuantizer):
         """
         self.is_encoding_frozen = True
 
-    def set_encoding(self, encoding: libpymo.TfEncoding):
+    def set_encoding(self, encoding: Union[libpymo.TfEncoding, List[libpymo.TfEncoding]]):
         """
         Set the encoding
-        :param encoding: Encoding to be set
+        :param encoding: Encoding to be set, or list of encodings, one per channel, for per-channel quantization
         """
         self.encoding = encoding
 
@@ -220,8 +354,7 @@ class QuantizeDequantize(torch.autograd.Function):
         """
         if tensor_quantizer.enabled:
             # pylint:disable = protected-access
-            quantized_tensor = tensor_quantizer._cppOp.quantizeDequantize(tensor, tensor_quantizer.encoding,
-                                                                          round_mode, tensor.is_cuda)
+            quantized_tensor = tensor_quantizer._quantize_dequantize_tensor(tensor, round_mode)
         else:
             quantized_tensor = tensor
 
@@ -235,8 +368,8 @@ class QuantizeDequantize(torch.autograd.Function):
         tensor = ctx.saved_tensors
         tensor_quantizer = ctx.tensor_quantizer
         if tensor_quantizer.enabled:
-            grad = ste.compute_dloss_by_dx(tensor[0], output_grad, tensor_quantizer.encoding.min,
-                                           tensor_quantizer.encoding.max)
+            encoding_min, encoding_max = tensor_quantizer.get_encoding_min_max(tensor[0])
+            grad = ste.compute_dloss_by_dx(tensor[0], output_grad, encoding_min, encoding_max)
         else:
             grad = output_grad
 
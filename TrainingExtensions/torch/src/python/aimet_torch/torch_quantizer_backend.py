@@ -0,0 +1,516 @@
+# /usr/bin/env python3.5
+# -*- mode: python -*-
+# =============================================================================
+#  @@-COPYRIGHT-START-@@
+#
+#  Copyright (c) 2020, Qualcomm Innovation Center, Inc. All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright notice,
+#     this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright notice,
+#     this list of conditions and the following disclaimer in the documentation
+#     and/or other materials provided with the distribution.
+#
+#  3. Neither the name of the copyright holder nor the names of its contributors
+#     may be used to endorse or promote products derived from this software
+#     without specific prior written permission.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+#  SPDX-License-Identifier: BSD-3-Clause
+#
+#  @@-COPYRIGHT-END-@@
+# =============================================================================
+""" Quantizer backend implemented in PyTorch tensor ops, as an alternative to the AimetTensorQuantizer C++ op """
+
+import math
+from typing import List, Tuple
+
+import numpy as np
+import torch
+
+import libpymo
+
+# Number of buckets of the histograms used by the TF enhanced encoding analyzer
+PDF_SIZE = 512
+
+# Fudge factor which trades-off quantization and saturation error of TF enhanced encodings
+GAMMA = 3.0
+
+# Minimum range of quantization
+MIN_RANGE = 0.01
+
+# The range of a histogram grows by at most a factor of 2^MAX_PDF_GROWTH_STEPS at once
+MAX_PDF_GROWTH_STEPS = 32
+
+
+def round_half_away_from_zero(tensor: torch.Tensor) -> torch.Tensor:
+    """
+    Rounds like C's round(), unlike torch.round() which rounds half to even
+    :param tensor: Tensor to round
+    :return: Rounded tensor
+    """
+    return torch.sign(tensor) * torch.floor(torch.abs(tensor) + 0.5)
+
+
+def _c_round(value: float) -> float:
+    """ Rounds a scalar like C's round() """
+    return math.copysign(math.floor(abs(value) + 0.5), value)
+
+
+def _create_encoding(encoding_min: float, encoding_max: float, delta: float, offset: float,
+                     bw: int) -> libpymo.TfEncoding:
+    """
+    Creates an encoding object from its fields
+    """
+    encoding = libpymo.TfEncoding()
+    encoding.bw = bw
+    encoding.max = encoding_max
+    encoding.min = encoding_min
+    encoding.delta = delta
+    encoding.offset = offset
+    return encoding
+
+
+class TfEncodingAnalyzer:
+    """
+    Computes TF encodings from the min and max of all tensors seen, like the TfEncodingAnalyzer C++ class. The min and
+    max are kept on the device of the tensors, so they are only copied to the host when the encoding is computed.
+    """
+
+    def __init__(self):
+        self._min = None
+        self._max = None
+
+    def update_stats(self, tensor: torch.Tensor):
+        """
+        Updates the min and max with the given tensor
+        :param tensor: Tensor
+        """
+        tensor = tensor.detach()
+        if self._min is None:
+            self._min = tensor.min()
+            self._max = tensor.max()
+        else:
+            self._min = torch.min(self._min, tensor.min())
+            self._max = torch.max(self._max, tensor.max())
+
+    def compute_encoding(self, bitwidth: int, use_symmetric_encodings: bool) -> libpymo.TfEncoding:
+        """
+        Computes the encoding for the stats collected so far
+        :param bitwidth: Bitwidth
+        :param use_symmetric_encodings: True for a symmetric encoding
+        :return: Encoding
+        """
+        num_steps = 2 ** bitwidth - 1
+
+        # Make sure zero value is within the range
+        new_min = min(0.0, self._min.item()) if self._min is not None else 0.0
+        new_max = max(0.0, self._max.item()) if self._max is not None else 0.0
+        new_max = max(new_max, new_min + MIN_RANGE)
+
+        # If all values are positive or 0, symmetric encodings are treated as unsigned
+        if use_symmetric_encodings and new_min < 0.0:
+            new_max = max(abs(new_max), abs(new_min))
+            num_positive_steps = 2 ** (bitwidth - 1) - 1
+            delta = new_max / num_positive_steps
+            offset = -float(num_positive_steps + 1)
+            return _create_encoding(offset * delta, delta * num_positive_steps, delta, offset, bitwidth)
+
+        delta = (new_max - new_min) / num_steps
+        if new_min < 0 < new_max:
+            # Make sure 0-value is exactly quantizable
+            b_zero = _c_round(-new_min / delta)
+            b_zero = min(num_steps, max(0.0, b_zero))
+            offset = -b_zero
+        else:
+            offset = _c_round(new_min / delta)
+
+        encoding_min = delta * offset
+        return _create_encoding(encoding_min, new_max - new_min + encoding_min, delta, offset, bitwidth)
+
+
+class TfEnhancedEncodingAnalyzer:
+    """
+    Computes TF enhanced encodings from a histogram of all tensors seen, like the TfEnhancedEncodingAnalyzer C++ class.
+    Bucket boundaries are computed in single precision, as in the C++ class, so the same values land in the same
+    buckets.
+
+    The histogram, its range and the decisions to initialize or grow the range are kept on the device of the tensors
+    and updated without branching on their values, so collecting stats never waits for the device. The histogram is
+    copied to the host once, when the encoding is computed.
+    """
+
+    def __init__(self):
+        # Bucket i is centered on x_left[i]
+        self._x_left = None
+        self._pdf = None
+        self._iterations = None
+        self._is_initialized = None
+
+    def update_stats(self, tensor: torch.Tensor):
+        """
+        Adds the histogram of the given tensor to the average histogram
+        :param tensor: Tensor
+        """
+        data = tensor.detach().reshape(-1).float()
+        if self._x_left is None:
+            self._x_left = torch.zeros(PDF_SIZE, dtype=torch.float64, device=data.device)
+            self._pdf = torch.zeros(PDF_SIZE, dtype=torch.float64, device=data.device)
+            self._iterations = torch.zeros((), dtype=torch.float64, device=data.device)
+            self._is_initialized = torch.zeros((), dtype=torch.bool, device=data.device)
+
+        # Non-finite values never land in a bucket, the range is set and grown to fit the finite ones
+        is_finite = torch.isfinite(data)
+        min_val = data.masked_fill(~is_finite, float('inf')).min()
+        max_val = data.masked_fill(~is_finite, float('-inf')).max()
+        has_non_finite = ~is_finite.all()
+
+        self._initialize_range(min_val, max_val)
+        self._grow_range(min_val, max_val, has_non_finite)
+
+        pdf_this_iter = (self._compute_histogram(data).float() / data.numel()).double()
+        pdf = (self._pdf * self._iterations + pdf_this_iter) / (self._iterations + 1)
+        self._pdf = torch.where(self._is_initialized, pdf, self._pdf)
+        self._iterations = self._iterations + self._is_initialized.double()
+
+    def _initialize_range(self, min_val: torch.Tensor, max_val: torch.Tensor):
+        """
+        Sets the range of the histogram from the first tensor, enlarged by a factor of 3, unless it is already set.
+        A tensor of all zeros can not be used to set the range.
+        """
+        initialize = ~self._is_initialized & (min_val <= max_val) & ~((min_val == 0) & (max_val == 0))
+
+        max_val = torch.where(min_val == max_val, torch.max(max_val, min_val + 0.01), max_val)
+        center = (max_val + min_val) / 2
+        min_val = center - 3 * (center - min_val)
+        max_val = center + 3 * (max_val - center)
+        bucket_size = (max_val - min_val) / PDF_SIZE
+        x_left = (min_val + torch.arange(PDF_SIZE, dtype=torch.float32, device=min_val.device) * bucket_size).double()
+
+        self._x_left = torch.where(initialize, x_left, self._x_left)
+        self._pdf = torch.where(initialize, torch.zeros_like(self._pdf), self._pdf)
+        self._iterations = torch.where(initialize, torch.zeros_like(self._iterations), self._iterations)
+        self._is_initialized = self._is_initialized | initialize
+
+    def _bucket_indices(self, data: torch.Tensor) -> torch.Tensor:
+        """
+        Computes the bucket of each data point, in single precision as the C++ class
+        """
+        min_val = self._x_left[0].float()
+        bucket_size = (self._x_left[1] - self._x_left[0]).float()
+        pdf_offset = min_val / bucket_size
+        return round_half_away_from_zero(data / bucket_size - pdf_offset)
+
+    def _compute_histogram(self, data: torch.Tensor) -> torch.Tensor:
+        """
+        Counts the data points in each bucket of the histogram. Data points outside of the histogram are counted in
+        an extra bucket which is dropped, so that the count does not depend on the number of data points in range.
+        """
+        indices = self._bucket_indices(data)
+        indices = indices.masked_fill((indices < 0) | (indices >= PDF_SIZE) | torch.isnan(indices), PDF_SIZE).long()
+        histogram = torch.zeros(PDF_SIZE + 1, dtype=torch.int64, device=data.device)
+        histogram.index_add_(0, indices, torch.ones_like(indices))
+        return histogram[:PDF_SIZE]
+
+    def _grow_range(self, min_val: torch.Tensor, max_val: torch.Tensor, has_non_finite: torch.Tensor):
+        """
+        Grows the range of the histogram by the smallest power of two which includes min_val and max_val, merging
+        buckets, as GrowPdfRange() in the C++ library. As there, the range is only grown if some data points of the
+        tensor are outside of the histogram.
+        """
+        # Bucket indices are monotonic in the data, so data points are outside of the histogram if the smallest or
+        # largest finite one is, or if there are non-finite ones
+        min_max_indices = self._bucket_indices(torch.stack([min_val, max_val]))
+        has_outside = has_non_finite | (min_max_indices[0] < 0) | (min_max_indices[1] >= PDF_SIZE)
+
+        min_val = min_val.double()
+        max_val = max_val.double()
+        bucket_size = self._x_left[1] - self._x_left[0]
+        range_start = self._x_left[0] - bucket_size / 2
+        range_end = range_start + PDF_SIZE * bucket_size
+
+        zero = torch.zeros_like(bucket_size)
+        grow_left = torch.where(min_val <= range_start, torch.floor((range_start - min_val) / bucket_size) + 1, zero)
+        grow_right = torch.where(max_val >= range_end, torch.floor((max_val - range_end) / bucket_size) + 1, zero)
+
+        # Smallest factor 2^k whose range, moved to the left by a whole number of merged buckets, fits the data
+        factors = 2.0 ** torch.arange(1, MAX_PDF_GROWTH_STEPS + 1, dtype=torch.float64, device=bucket_size.device)
+        shifts = torch.ceil(grow_left / factors) * factors
+        fits = shifts + PDF_SIZE + grow_right <= PDF_SIZE * factors
+        k = torch.argmax(fits.int())
+
+        grow = self._is_initialized & has_outside & ((grow_left > 0) | (grow_right > 0)) & fits.any()
+        factor = torch.where(grow, factors[k], torch.ones_like(zero))
+        shift = torch.where(grow, shifts[k], zero)
+
+        buckets = torch.arange(PDF_SIZE, dtype=torch.float64, device=bucket_size.device)
+        merged_pdf = torch.zeros_like(self._pdf).index_add_(0, ((buckets + shift) / factor).long(), self._pdf)
+        new_bucket_size = bucket_size * factor
+        new_range_start = range_start - shift * bucket_size
+        x_left = new_range_start + buckets * new_bucket_size + new_bucket_size / 2
+
+        self._pdf = torch.where(grow, merged_pdf, self._pdf)
+        self._x_left = torch.where(grow, x_left, self._x_left)
+
+    def compute_encoding(self, bitwidth: int, use_symmetric_encodings: bool) -> libpymo.TfEncoding:
+        """
+        Computes the encoding with the lowest quantization and saturation cost for the histogram collected so far
+        :param bitwidth: Bitwidth
+        :param use_symmetric_encodings: True for a symmetric encoding
+        :return: Encoding
+        """
+        if self._x_left is None or not self._is_initialized.item():
+            # Histogram has not been initialized yet
+            return _create_encoding(0, 0, 0, 0, 0)
+
+        x_left = self._x_left.cpu().numpy()
+        pdf = self._pdf.cpu().numpy()
+
+        min_val, max_val = self._find_range(x_left, pdf)
+        num_steps = np.float32(2 ** bitwidth - 1)
+
+        if use_symmetric_encodings:
+            deltas, offsets = self._pick_candidates_symmetric(min_val, max_val, num_steps)
+        else:
+            deltas, offsets = self._pick_candidates_asymmetric(min_val, max_val, num_steps)
+
+        costs = self._quant_and_sat_cost(x_left, pdf, deltas, offsets, num_steps)
+        best = int(np.argmin(costs))
+        best_delta, best_offset = deltas[best], offsets[best]
+
+        encoding_min = float(best_delta * np.float32(best_offset))
+        encoding_max = float(best_delta * num_steps) + encoding_min
+        return _create_encoding(encoding_min, encoding_max, float(best_delta), float(best_offset), bitwidth)
+
+    @staticmethod
+    def _find_range(x_left: np.ndarray, pdf: np.ndarray) -> Tuple[np.float32, np.float32]:
+        """ Returns the range of the buckets which hold any data, including zero """
+        x_left = x_left.astype(np.float32)
+        nonzero = np.nonzero(pdf > 0)[0]
+        min_val = x_left[nonzero[0]] if nonzero.size else x_left[0]
+        max_val = x_left[nonzero[-1]] if nonzero.size and nonzero[-1] > 0 else x_left[PDF_SIZE - 1]
+
+        min_val = min(min_val, np.float32(0))
+        max_val = max(max_val, np.float32(0))
+        max_val = max(max_val, min_val + np.float32(MIN_RANGE))
+        return min_val, max_val
+
+    @staticmethod
+    def _pick_candidates_asymmetric(observed_min: np.float32, observed_max: np.float32, num_steps: np.float32) \
+            -> Tuple[np.ndarray, np.ndarray]:
+        """ Picks the 17x21 grid of asymmetric (delta, offset) candidates of the C++ class """
+        deltas, offsets = [], []
+
+        observed_delta = (observed_max - observed_min) / num_steps
+        observed_offset = int(_c_round(observed_min / observed_delta))
+        observed_min = observed_delta * np.float32(observed_offset)
+        observed_max = observed_min + observed_delta * num_steps
+
+        f = np.float32(1.0 / 16)
+        while float(f) <= 1 + 1.0 / 16:
+            test_delta = f * observed_delta
+            for i in range(21):
+                test_offset = int(-float(num_steps) + float(num_steps) / 20.0 * i)
+
+                # Clamp the candidate to the observed range. The clamped delta carries over to the next offset
+                test_min = test_delta * np.float32(test_offset)
+                test_max = test_min + test_delta * num_steps
+                if test_min < observed_min and test_max > observed_max:
+                    continue
+                test_min = max(observed_min, test_min)
+                test_max = min(observed_max, test_max)
+                test_delta = (test_max - test_min) / num_steps
+                test_offset = int(_c_round(test_min / test_delta))
+
+                deltas.append(test_delta)
+                offsets.append(test_offset)
+            f = np.float32(float(f) + 1.0 / 16)
+
+        deltas.append(observed_delta)
+        offsets.append(observed_offset)
+        return np.array(deltas, dtype=np.float32), np.array(offsets, dtype=np.int64)
+
+    @staticmethod
+    def _pick_candidates_symmetric(min_val: np.float32, max_val: np.float32, num_steps: np.float32) \
+            -> Tuple[np.ndarray, np.ndarray]:
+        """ Picks the 101 symmetric delta candidates of the C++ class """
+        if min_val == 0.0:
+            # If all values are positive or 0, symmetric encodings are treated as unsigned
+            delta_max = max_val / num_steps
+            test_offset = 0
+        else:
+            absolute_max = max(abs(max_val), abs(min_val))
+            delta_max = (np.float32(2) * absolute_max) / num_steps
+            test_offset = int(-(num_steps / np.float32(2)))
+
+        deltas = []
+        f = np.float32(1.0 / 100)
+        while float(f) <= 1 + 1.0 / 100:
+            deltas.append(f * delta_max)
+            f = np.float32(float(f) + 1.0 / 100)
+
+        return np.array(deltas, dtype=np.float32), np.full(len(deltas), test_offset, dtype=np.int64)
+
+    @staticmethod
+    def _quant_and_sat_cost(x_left: np.ndarray, pdf: np.ndarray, deltas: np.ndarray, offsets: np.ndarray,
+                            num_steps: np.float32) -> np.ndarray:
+        """
+        Computes the quantization and saturation cost of all candidates at once. Bucket indices and quantized values
+        are computed in single precision, the costs in double precision
+        :return: Cost of each candidate
+        """
+        pdf_start = np.float32(x_left[0])
+        pdf_step = np.float32(x_left[1] - x_left[0])
+
+        deltas = deltas[:, None]
+        offsets_f = offsets.astype(np.float32)[:, None]
+        min_val = deltas * offsets_f
+        max_val = deltas * num_steps + min_val
+        min_ind = np.clip(np.floor((min_val - pdf_start) / pdf_step), 0, PDF_SIZE - 1).astype(np.int64)
+        max_ind = np.clip(np.floor((max_val - pdf_start) / pdf_step), 0, PDF_SIZE - 1).astype(np.int64)
+
+        buckets = np.arange(PDF_SIZE)
+        mid_vals = pdf_start + buckets.astype(np.float32) * pdf_step + pdf_step / np.float32(2)
+        min_val_middle_of_bucket = pdf_start + min_ind.astype(np.float32) * pdf_step + pdf_step / np.float32(2)
+        max_val_middle_of_bucket = pdf_start + max_ind.astype(np.float32) * pdf_step + pdf_step / np.float32(2)
+
+        # Saturated buckets are mapped to the smallest or largest representable value
+        mid_vals_64 = mid_vals.astype(np.float64)[None, :]
+        sat_cost_bottom = np.where(buckets[None, :] < min_ind,
+                                   pdf * (mid_vals_64 - min_val_middle_of_bucket) ** 2, 0).sum(axis=1)
+        sat_cost_top = np.where(buckets[None, :] >= max_ind,
+                                pdf * (mid_vals_64 - max_val_middle_of_bucket) ** 2, 0).sum(axis=1)
+
+        quantized = np.sign(mid_vals / deltas - offsets_f) * np.floor(np.abs(mid_vals / deltas - offsets_f) + 0.5)
+        dequantized = (deltas * (quantized + offsets_f)).astype(np.float64)
+        in_range = (buckets[None, :] >= min_ind) & (buckets[None, :] < max_ind)
+        quant_cost = np.where(in_range, pdf * (mid_vals_64 - dequantized) ** 2, 0).sum(axis=1)
+
+        return GAMMA * (sat_cost_bottom + sat_cost_top) + quant_cost
+
+
+class TorchTensorQuantizerOp:
+    """
+    Drop-in replacement for the AimetTensorQuantizer C++ op, implemented in PyTorch tensor ops. Stats are collected and
+    tensors are quantized on the device they live on.
+    """
+
+    def __init__(self, quant_scheme: libpymo.QuantizationMode):
+        """
+        :param quant_scheme: libpymo.QuantizationMode.QUANTIZATION_TF or QUANTIZATION_TF_ENHANCED
+        """
+        self._quant_scheme = quant_scheme
+        self._encoding_analyzer = None
+        self._per_channel_encoding_analyzers = []
+
+    def _create_encoding_analyzer(self):
+        if self._quant_scheme == libpymo.QuantizationMode.QUANTIZATION_TF:
+            return TfEncodingAnalyzer()
+        return TfEnhancedEncodingAnalyzer()
+
+    # pylint: disable=invalid-name, unused-argument
+    # Method names and arguments match the AimetTensorQuantizer C++ op
+
+    def resetEncodingStats(self):
+        """ Resets the collected stats """
+        self._encoding_analyzer = None
+        self._per_channel_encoding_analyzers = []
+
+    def updateStats(self, tensor: torch.Tensor, use_cuda: bool):
+        """
+        Updates the stats with the given tensor
+        :param tensor: Tensor
+        :param use_cuda: Unused, the stats are collected on the device of the tensor
+        """
+        if self._encoding_analyzer is None:
+            self._encoding_analyzer = self._create_encoding_analyzer()
+        self._encoding_analyzer.update_stats(tensor)
+
+    def getEncoding(self, bitwidth: int, use_symmetric_encodings: bool) -> Tuple[libpymo.TfEncoding, bool]:
+        """
+        Computes the encoding from the collected stats
+        :return: Tuple of the encoding and whether it is valid
+        """
+        if self._encoding_analyzer is None:
+            return libpymo.TfEncoding(), False
+        return self._encoding_analyzer.compute_encoding(bitwidth, use_symmetric_encodings), True
+
+    def quantizeDequantize(self, tensor: torch.Tensor, encoding: libpymo.TfEncoding, round_mode: libpymo.RoundingMode,
+                           use_cuda: bool) -> torch.Tensor:
+        """
+        Quantizes and dequantizes the tensor with the given encoding. The arithmetic is done in double precision and
+        rounded to single precision between steps, as in TensorQuantizationSim
+        """
+        # Retain zero in the range and make sure min and max differ
+        encoding_min = min(encoding.min, 0.0)
+        encoding_max = max(encoding.max, 0.0)
+        encoding_max = max(encoding_max, encoding_min + 1e-5)
+        delta = (encoding_max - encoding_min) / (2 ** encoding.bw - 1)
+        offset = _c_round(encoding_min / delta)
+
+        output = torch.clamp(tensor.double(), encoding_min, encoding_max).float()
+        output = (round_half_away_from_zero(output.double() / delta) - offset).float()
+        if round_mode == libpymo.RoundingMode.ROUND_STOCHASTIC:
+            output = torch.floor(output + torch.rand_like(output))
+        return (delta * (output.double() + offset)).float()
+
+    def updateStatsPerChannel(self, tensor: torch.Tensor, axis: int, use_cuda: bool):
+        """
+        Updates the stats of every channel along the given axis with the given tensor
+        """
+        channels = tensor.transpose(0, axis)
+        if not self._per_channel_encoding_analyzers:
+            self._per_channel_encoding_analyzers = [self._create_encoding_analyzer() for _ in range(channels.shape[0])]
+        elif len(self._per_channel_encoding_analyzers) != channels.shape[0]:
+            raise RuntimeError('Number of channels does not match the number of channels seen before')
+
+        for analyzer, channel in zip(self._per_channel_encoding_analyzers, channels):
+            analyzer.update_stats(channel)
+
+    def getEncodingPerChannel(self, bitwidth: int, use_symmetric_encodings: bool) \
+            -> Tuple[List[libpymo.TfEncoding], bool]:
+        """
+        Computes the encoding of every channel from the collected stats
+        :return: Tuple of the list of encodings and whether they are valid
+        """
+        encodings = [analyzer.compute_encoding(bitwidth, use_symmetric_encodings)
+                     for analyzer in self._per_channel_encoding_analyzers]
+        return encodings, bool(encodings)
+
+    def quantizeDequantizePerChannel(self, tensor: torch.Tensor, encoding_min: torch.Tensor,
+                                     encoding_max: torch.Tensor, bitwidth: int, axis: int,
+                                     round_mode: libpymo.RoundingMode) -> torch.Tensor:
+        """
+        Quantizes and dequantizes the tensor with per-channel encodings, broadcast along the given axis. Stochastic
+        rounding adds the random offset to the unrounded value, so that it rounds up with a probability of the
+        fractional part
+        """
+        shape = [1] * tensor.dim()
+        shape[axis] = tensor.shape[axis]
+
+        encoding_min = encoding_min.to(tensor).clamp(max=0.0).view(shape)
+        encoding_max = torch.max(encoding_max.to(tensor).clamp(min=0.0).view(shape), encoding_min + 1e-5)
+        delta = (encoding_max - encoding_min) / (2 ** bitwidth - 1)
+        offset = round_half_away_from_zero(encoding_min / delta)
+
+        scaled = torch.max(torch.min(tensor, encoding_max), encoding_min) / delta
+        if round_mode == libpymo.RoundingMode.ROUND_STOCHASTIC:
+            output = torch.floor(scaled + torch.rand_like(scaled)) - offset
+        else:
+            output = round_half_away_from_zero(scaled) - offset
+        return delta * (output + offset)
@@ -37,9 +37,11 @@
 # =============================================================================
 """ Utilities that are used for different AIMET PyTorch features """
 
-from typing import List, Tuple, Union, Dict
+from typing import List, Tuple, Union, Dict, Callable
+from concurrent.futures import ThreadPoolExecutor
 import os
 import pickle
+import struct
 import numpy as np
 import torch.nn
 import torch
@@ -148,20 +150,78 @@ class ModuleData:
         return inp_data, out_data
 
 
+class _CachedTensor:
+    """
+    Location of a tensor in the cache file of a CachedDataset
+    """
+    def __init__(self, offset: int, dtype: str, shape: Tuple, device: str):
+        """
+        :param offset: Offset of the tensor data in the cache file, in bytes
+        :param dtype: Numpy type string of the tensor data
+        :param shape: Shape of the tensor
+        :param device: Device the tensor was on when it was cached
+        """
+        self.offset = offset
+        self.dtype = dtype
+        self.shape = shape
+        self.device = device
+
+
+def _map_structure(data, leaf_type: type, func: Callable):
+    """
+    Apply a function to every leaf of a given type in a (nested) structure of tuples, lists and dicts
+
+    :param data: Structure to map
+    :param leaf_type: Type of the leaves to apply the function to, other leaves are kept as they are
+    :param func: Function to apply to the leaves
+    :return: Structure of the same layout, with the mapped leaves
+    """
+    if isinstance(data, leaf_type):
+        return func(data)
+
+    if isinstance(data, (tuple, list)):
+        items = [_map_structure(item, leaf_type, func) for item in data]
+        # named tuples are constructed from positional arguments
+        return type(data)(*items) if hasattr(data, '_fields') else type(data)(items)
+
+    if isinstance(data, dict):
+        return type(data)((key, _map_structure(value, leaf_type, func)) for key, value in data.items())
+
+    return data
+
+
 class CachedDataset(Dataset):
     """
     Cache number of batches from the data loader at given path location and
     provide interface to fetch single batch of model inputs.
+
+    The tensors of all batches are stored contiguously in a single file, followed by an index of where each tensor is
+    stored. The file is memory mapped for reading, and the batches following the one fetched last are read ahead in a
+    background thread.
     """
-    def __init__(self, data_loader: DataLoader, num_batches: int, path: str):
+
+    _cache_file_name = 'model_inputs.cache'
+
+    # alignment of every tensor in the cache file, in bytes
+    _alignment = 64
+
+    def __init__(self, data_loader: DataLoader, num_batches: int, path: str, num_prefetch_batches: int = 2):
         """
         :param data_loader: Data loader
         :param num_batches: Number of batches to fetch from data loader
         :param path: Path to save model inputs
+        :param num_prefetch_batches: Number of batches to read ahead in the background, 0 to disable prefetching
         """
         self._data_loader = data_loader
         self._num_batches = num_batches
         self._path = path
+        self._num_prefetch_batches = num_prefetch_batches
+
+        # opened lazily on first access, and again in every process the dataset is sent to
+        self._memory_map = None
+        self._index = None
+        self._executor = None
+        self._prefetched = {}
 
         self._cache_model_inputs()
 
@@ -169,39 +229,149 @@ class CachedDataset(Dataset):
         return self._num_batches
 
     def __getitem__(self, index: int):
-        path = os.path.join(self._path, 'model_inputs_' + str(index))
+        if not 0 <= index < self._num_batches:
+            raise IndexError('Batch index {} out of range for {} cached batches'.format(index, self._num_batches))
 
-        with open(path, 'rb') as file:
-            batch = pickle.load(file)
+        if self._memory_map is None:
+            self._open_cache_file()
+
+        future = self._prefetched.pop(index, None)
+        batch = future.result() if future is not None else self._read_batch(index)
+
+        self._prefetch_following_batches(index)
 
         return batch
 
+    def __del__(self):
+        # the last reference may be dropped by the prefetch thread itself, which can not wait for itself to finish
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def close(self):
+        """
+        Stop prefetching and release the prefetch thread and the memory map of the cache file. The dataset can still
+        be used after closing it, the cache file is opened again on the next access.
+        """
+        for future in self._prefetched.values():
+            future.cancel()
+        self._prefetched = {}
+
+        if self._executor is not None:
+            # wait for a batch being read, which still accesses the memory map
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        self._memory_map = None
+        self._index = None
+
+    def __getstate__(self):
+        # the memory map and the prefetch thread are not sent along, e.g. to data loader worker processes
+        state = self.__dict__.copy()
+        state.update(_memory_map=None, _index=None, _executor=None, _prefetched={})
+        return state
+
     def _cache_model_inputs(self):
         """
-        Function to cache number of batches individually in separate file at provided path location
+        Function to cache number of batches contiguously in a single file at provided path location, followed by the
+        index of the cached tensors and the offset of that index
         """
         if not os.path.exists(self._path):
             os.makedirs(self._path)
 
         iterator = iter(self._data_loader)
+        index = []
+
+        with open(os.path.join(self._path, self._cache_file_name), 'wb') as file:
+
+            def _write_tensor(tensor: torch.Tensor):
+                try:
+                    data = tensor.detach().cpu().contiguous().numpy()
+                except (TypeError, RuntimeError):
+                    # tensors without a numpy equivalent are kept in the index
+                    return tensor
+
+                file.write(b'\0' * (-file.tell() % self._alignment))
+                cached_tensor = _CachedTensor(file.tell(), data.dtype.str, data.shape, str(tensor.device))
+                file.write(data.tobytes())
 
-        for batch_index in range(self._num_batches):
-            try:
-                batch = next(iterator)
+                return cached_tensor
 
-                # batch is of shape (model_inputs, labels)
-                if isinstance(batch, (tuple, list)):
-                    batch, _ = batch
+            for _ in range(self._num_batches):
+                try:
+                    batch = next(iterator)
 
-                path = os.path.join(self._path, 'model_inputs_' + str(batch_index))
-                with open(path, 'wb') as file:
-                    pickle.dump(batch, file)
+                    # batch is of shape (model_inputs, labels)
+                    if isinstance(batch, (tuple, list)):
+                        batch, _ = batch
 
-            except StopIteration:
-                raise ValueError('Can not fetch {} batches from data loader.'.format(self._num_batches))
+                    index.append(_map_structure(batch, torch.Tensor, _write_tensor))
+
+                except StopIteration:
+                    raise ValueError('Can not fetch {} batches from data loader.'.format(self._num_batches))
+
+            index_offset = file.tell()
+            pickle.dump(index, file)
+            file.write(struct.pack('<Q', index_offset))
 
         logger.info('Caching %d batches from data loader at path location: %s', self._num_batches, self._path)
 
+    def _open_cache_file(self):
+        """
+        Memory map the cache file and read its index
+        """
+        path = os.path.join(self._path, self._cache_file_name)
+
+        with open(path, 'rb') as file:
+            file.seek(-8, os.SEEK_END)
+            index_offset, = struct.unpack('<Q', file.read(8))
+            file.seek(index_offset)
+            self._index = pickle.load(file)
+
+        self._memory_map = np.memmap(path, dtype=np.uint8, mode='r')
+
+    def _read_batch(self, index: int):
+        """
+        Read a batch from the memory mapped cache file
+
+        :param index: Index of the batch
+        :return: Batch of model inputs
+        """
+        def _read_tensor(cached_tensor: _CachedTensor) -> torch.Tensor:
+            dtype = np.dtype(cached_tensor.dtype)
+            num_bytes = dtype.itemsize * int(np.prod(cached_tensor.shape))
+            data = self._memory_map[cached_tensor.offset:cached_tensor.offset + num_bytes]
+
+            # copy out of the memory map, so that the returned tensor owns its (writable) data
+            tensor = torch.from_numpy(np.array(data.view(dtype).reshape(cached_tensor.shape)))
+
+            if cached_tensor.device != 'cpu':
+                tensor = tensor.to(cached_tensor.device)
+
+            return tensor
+
+        return _map_structure(self._index[index], _CachedTensor, _read_tensor)
+
+    def _prefetch_following_batches(self, index: int):
+        """
+        Read the batches following the given index ahead in a background thread, and drop any other prefetched batches
+
+        :param index: Index of the batch fetched last
+        """
+        following = range(index + 1, min(index + 1 + self._num_prefetch_batches, self._num_batches))
+
+        for stale_index in [i for i in self._prefetched if i not in following]:
+            self._prefetched.pop(stale_index).cancel()
+
+        if not following:
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+
+        for next_index in following:
+            if next_index not in self._prefetched:
+                self._prefetched[next_index] = self._executor.submit(self._read_batch, next_index)
+
 
 def run_hook_for_layers(model: torch.nn.Module, input_shapes: Union[Tuple, List[Tuple]], hook,
                         module_type_for_attaching_hook=None, leaf_node_only=True):
@@ -429,9 +599,9 @@ def get_ordered_list_of_modules(model: torch.nn.Module, dummy_input: Union[torch
         """
         hook to find name of module
         """
-        for name, module_ref in model.named_modules():
-            if module is module_ref:
-                list_modules.append([name, module])
+        if id(module) in module_to_name:
+            list_modules.append([module_to_name[id(module)], module])
+    module_to_name = {id(module_ref): name for name, module_ref in model.named_modules()}
     list_modules = []
     run_hook_for_layers_with_given_input(model, dummy_input, hook=_hook_to_collect_name_of_module)
 
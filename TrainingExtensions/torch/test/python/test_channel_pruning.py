@@ -413,6 +413,40 @@ class TestTrainingExtensionsChannelPruning(unittest.TestCase):
         # if data is increased, choose tolerance wisely
         self.assertTrue(np.allclose(to_numpy(outputs), to_numpy(new_outputs), atol=1e-5))
 
+    def test_reconstruct_from_accumulated_normal_equations(self):
+        """ Test reconstruction from normal equations accumulated over several batches """
+        model = TestNet()
+        layer = model.conv2
+
+        number_of_images = 500
+        inputs = torch.rand(number_of_images, layer.in_channels, layer.kernel_size[0], layer.kernel_size[1])
+
+        with torch.no_grad():
+            outputs = layer(inputs).reshape(number_of_images, layer.out_channels)
+
+        normal_equations = WeightReconstructor.get_normal_equations_for_conv2d(layer)
+        self.assertTrue(normal_equations.fit_intercept)
+
+        for inp_batch, out_batch in zip(torch.split(inputs, 100), torch.split(outputs, 100)):
+            normal_equations.update(to_numpy(inp_batch), to_numpy(out_batch))
+        self.assertEqual(number_of_images, normal_equations.num_samples)
+
+        # solving the batched normal equations gives the same solution as least squares over all centered data
+        new_w, new_b = normal_equations.solve()
+        x = to_numpy(inputs).reshape(number_of_images, -1).astype(np.float64)
+        y = to_numpy(outputs).astype(np.float64)
+        x_mean, y_mean = x.mean(axis=0), y.mean(axis=0)
+        expected_w = np.linalg.lstsq(x - x_mean, y - y_mean, rcond=None)[0]
+        expected_b = y_mean - np.matmul(x_mean, expected_w)
+        self.assertTrue(np.allclose(new_w, expected_w.T))
+        self.assertTrue(np.allclose(new_b, expected_b))
+
+        WeightReconstructor.reconstruct_params_for_conv2d_from_normal_equations(layer, normal_equations)
+        with torch.no_grad():
+            new_outputs = layer(inputs).reshape(number_of_images, layer.out_channels)
+
+        self.assertTrue(np.allclose(to_numpy(outputs), to_numpy(new_outputs), atol=1e-5))
+
     def test_data_sub_sampling_and_reconstruction(self):
         """Test end to end data sub sampling and reconstruction for MNIST conv2 layer"""
         orig_model = mnist_model()
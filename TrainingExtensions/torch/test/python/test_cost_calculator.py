@@ -194,6 +194,28 @@ class TestTrainingExtensionsSpatialSvdCostCalculator(unittest.TestCase):
         print(original_cost)
         print(compressed_cost)
 
+    def test_spatial_svd_cost_table(self):
+
+        conv = nn.Conv2d(32, 64, kernel_size=5, padding=(2, 2), stride=2)
+        layer = lad.Layer(conv, "conv",
+                          output_shape=[1, 64, 14, 14])
+
+        cost_table = cc.SpatialSvdCostCalculator.get_cost_table(layer)
+        self.assertEqual(32 * 5 + 1, len(cost_table.mac))
+        self.assertIs(cost_table, cc.SpatialSvdCostCalculator.get_cost_table(layer))
+
+        for rank in range(32 * 5 + 1):
+            compressed_cost = cc.SpatialSvdCostCalculator.calculate_cost_given_rank(layer, rank)
+            self.assertEqual(compressed_cost.memory, cost_table.memory[rank])
+            self.assertEqual(compressed_cost.mac, cost_table.mac[rank])
+
+        # The rank found is the largest rank whose cost is within the target cost
+        original_cost = cc.CostCalculator.compute_layer_cost(layer)
+        for comp_ratio in [Decimal('0.9'), Decimal('0.5'), Decimal('0.1'), Decimal('0.01')]:
+            rank = cc.SpatialSvdCostCalculator.calculate_rank_given_comp_ratio(layer, comp_ratio, CostMetric.mac)
+            self.assertLessEqual(cost_table.mac[rank], original_cost.mac * comp_ratio)
+            self.assertGreater(cost_table.mac[rank + 1], original_cost.mac * comp_ratio)
+
     def test_calculate_spatial_svd_cost_all_layers(self):
 
         model = mnist_model.Net().to("cpu")
@@ -123,6 +123,23 @@ class TestOnnxUtils(unittest.TestCase):
                     print("Checking " + in_tensor)
                     self.assertEqual(node.name, in_tensor[:-7])
 
+    def test_add_pytorch_node_names_to_in_memory_onnx_model(self):
+        """ test setting node names on an onnx model that was exported in memory """
+
+        model = OutOfOrderModel()
+        dummy_input = torch.randn(1, 16, 20, 20)
+
+        onnx_model = onnx_utils.OnnxSaver.create_onnx_model(model, dummy_input)
+        onnx_utils.OnnxSaver.set_node_names_in_onnx_model(onnx_model, model, dummy_input)
+
+        for node in onnx_model.graph.node:
+            if node.op_type in ('Conv', 'Gemm', 'MaxPool'):
+                self.assertTrue(node.name)
+
+            for in_tensor in node.input:
+                if in_tensor.endswith('weight'):
+                    self.assertEqual(node.name, in_tensor[:-7])
+
     def test_onnx_node_name_to_input_output_names_util(self):
         """ test onxx based utility to find mapping between onnx node names and io tensors"""
         model = models.resnet18(pretrained=False)
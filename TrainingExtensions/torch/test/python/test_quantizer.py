@@ -42,15 +42,17 @@ import torch
 import torch.nn as nn
 import json as json
 import os
+import onnx
 
 
 from torchvision import models
 from aimet_common.defs import QuantScheme
+from aimet_common.compact_encodings import CompactEncodingsReader
 from aimet_torch.examples.test_models import TwoLayerBidirectionalLstmModel, SingleLayerRNNModel
 
 from aimet_torch.meta.connectedgraph import ConnectedGraph
 from aimet_torch.qc_quantize_recurrent import QcQuantizeRecurrent
-from aimet_torch.quantsim import QuantizationSimModel
+from aimet_torch.quantsim import QuantizationSimModel, save_state_checkpoint, load_state_checkpoint
 from aimet_torch.quantsim_straight_through_grad import compute_dloss_by_dx
 from aimet_torch.defs import PassThroughOp
 
@@ -621,6 +623,155 @@ class TestQuantizationSim(unittest.TestCase):
         loaded_model = torch.load('./data/two_input_model.pth')
         loaded_model(torch.rand(1, 1, 28, 28), torch.rand(1, 1, 28, 28))
 
+    def test_export_does_not_copy_sim_model(self):
+        """ Exporting removes the quantization wrappers without modifying or copying the sim model """
+
+        def forward_pass(model, args):
+            model.eval()
+            with torch.no_grad():
+                model(torch.randn((32, 1, 28, 28)), torch.randn(32, 1, 28, 28))
+
+        model = ModelWithTwoInputs()
+        sim = QuantizationSimModel(model, dummy_input=(torch.rand(32, 1, 28, 28), torch.rand(32, 1, 28, 28)))
+        sim.compute_encodings(forward_pass, None)
+
+        model_to_export = sim._get_model_without_quantization_wrappers(sim.model)
+
+        # Sim model still has all the wrappers
+        self.assertTrue(isinstance(sim.model.conv1_a, QcQuantizeWrapper))
+        self.assertTrue(isinstance(sim.model.fc2, QcQuantizeWrapper))
+
+        # Exported model has none of the wrappers, and shares the parameters with the sim model
+        for module in model_to_export.modules():
+            self.assertFalse(isinstance(module, QcQuantizeWrapper))
+        self.assertTrue(model_to_export.conv1_a is sim.model.conv1_a._module_to_wrap)
+        self.assertTrue(model_to_export.conv1_a.weight is sim.model.conv1_a._module_to_wrap.weight)
+
+        sim.export('./data/', 'two_input_model', input_shape=[(1, 1, 28, 28), (1, 1, 28, 28)])
+        self.assertTrue(isinstance(sim.model.conv1_a, QcQuantizeWrapper))
+
+        onnx_model = onnx.load('./data/two_input_model.onnx')
+        node_names = [node.name for node in onnx_model.graph.node]
+        self.assertIn('conv1_a', node_names)
+
+    def test_quantizers_create_cpp_op_on_first_use(self):
+        """ Native quantizer state is only allocated for quantizers that collect stats """
+
+        def forward_pass(model, args):
+            model.eval()
+            with torch.no_grad():
+                model(torch.randn((32, 1, 28, 28)), torch.randn(32, 1, 28, 28))
+
+        model = ModelWithTwoInputs()
+        sim = QuantizationSimModel(model, dummy_input=(torch.rand(32, 1, 28, 28), torch.rand(32, 1, 28, 28)))
+
+        for _, quantizer in sim._get_named_tensor_quantizers():
+            self.assertIsNone(quantizer._cpp_op)
+
+        sim.compute_encodings(forward_pass, None)
+
+        self.assertIsNotNone(sim.model.conv1_a.output_quantizers[0]._cpp_op)
+        self.assertIsNotNone(sim.model.conv1_a.param_quantizers['weight']._cpp_op)
+        self.assertIsNone(sim.model.conv1_a.input_quantizer._cpp_op)
+        self.assertIsNone(sim.model.conv1_a.param_quantizers['bias']._cpp_op)
+
+    def test_reconfigure_bitwidths_without_forward_pass(self):
+        """ Reconfiguring bitwidths re-derives encodings from the stats of the last compute_encodings """
+
+        forward_pass_calls = []
+
+        def forward_pass(model, args):
+            forward_pass_calls.append(1)
+            model.eval()
+            with torch.no_grad():
+                model(torch.randn((32, 1, 28, 28)), torch.randn(32, 1, 28, 28))
+
+        model = ModelWithTwoInputs()
+        sim = QuantizationSimModel(model, dummy_input=(torch.rand(32, 1, 28, 28), torch.rand(32, 1, 28, 28)))
+        sim.compute_encodings(forward_pass, None)
+        self.assertEqual(8, sim.model.conv1_a.output_quantizers[0].encoding.bw)
+
+        self.assertTrue(sim.reconfigure(default_output_bw=4, quantizer_bitwidths={'conv1_a.param.weight': 16}))
+        self.assertEqual(1, len(forward_pass_calls))
+        self.assertEqual(4, sim.model.conv1_a.output_quantizers[0].bitwidth)
+        self.assertEqual(4, sim.model.conv1_a.output_quantizers[0].encoding.bw)
+        self.assertEqual(16, sim.model.conv1_a.param_quantizers['weight'].encoding.bw)
+        self.assertEqual(8, sim.model.conv1_b.param_quantizers['weight'].encoding.bw)
+        self.assertEqual(QcQuantizeOpMode.ACTIVE, sim.model.conv1_a._mode)
+
+        # The sim model runs with the new encodings
+        sim.model(torch.randn((1, 1, 28, 28)), torch.randn(1, 1, 28, 28))
+
+        with self.assertRaises(ValueError):
+            sim.reconfigure(quantizer_bitwidths={'conv1_a.param.not_a_param': 8})
+        with self.assertRaises(ValueError):
+            sim.reconfigure(default_param_bw=2)
+
+    def test_reconfigure_with_new_config_file(self):
+        """ Quantizers enabled by a new config have no stats, so reconfigure asks for compute_encodings """
+
+        def forward_pass(model, args):
+            model.eval()
+            with torch.no_grad():
+                model(torch.randn((32, 1, 28, 28)), torch.randn(32, 1, 28, 28))
+
+        quantsim_config = {
+            "defaults": {"ops": {"is_output_quantized": "True"}, "params": {"is_quantized": "True"}},
+            "params": {},
+            "op_type": {},
+            "supergroups": [],
+            "model_input": {"is_input_quantized": "True"},
+            "model_output": {}
+        }
+        with open('./data/quantsim_config.json', 'w') as f:
+            json.dump(quantsim_config, f)
+
+        model = ModelWithTwoInputs()
+        sim = QuantizationSimModel(model, dummy_input=(torch.rand(32, 1, 28, 28), torch.rand(32, 1, 28, 28)))
+        sim.compute_encodings(forward_pass, None)
+        self.assertFalse(sim.model.conv1_a.input_quantizer.enabled)
+
+        self.assertFalse(sim.reconfigure(config_file='./data/quantsim_config.json'))
+        self.assertTrue(sim.model.conv1_a.input_quantizer.enabled)
+        self.assertEqual(QcQuantizeOpMode.PASSTHROUGH, sim.model.conv1_a._mode)
+
+        sim.compute_encodings(forward_pass, None)
+        self.assertIsNotNone(sim.model.conv1_a.input_quantizer.encoding)
+        self.assertEqual(QcQuantizeOpMode.ACTIVE, sim.model.conv1_a._mode)
+
+        os.remove('./data/quantsim_config.json')
+
+    def test_export_compact_encodings_format(self):
+        """ Encodings exported in the compact format match the ones exported to JSON """
+
+        def forward_pass(model, args):
+            model.eval()
+            with torch.no_grad():
+                model(torch.randn((32, 1, 28, 28)), torch.randn(32, 1, 28, 28))
+
+        model = ModelWithTwoInputs()
+        sim = QuantizationSimModel(model, dummy_input=(torch.rand(32, 1, 28, 28), torch.rand(32, 1, 28, 28)))
+        sim.compute_encodings(forward_pass, None)
+
+        sim.export('./data/', 'two_input_model', input_shape=[(1, 1, 28, 28), (1, 1, 28, 28)])
+        sim.export('./data/', 'two_input_model', input_shape=[(1, 1, 28, 28), (1, 1, 28, 28)],
+                   use_compact_encodings_format=True)
+
+        with open('./data/two_input_model.encodings', 'r') as fp:
+            encodings = json.load(fp)
+        compact_encodings = CompactEncodingsReader('./data/two_input_model.encodings.bin')
+
+        self.assertEqual(len(encodings['activation_encodings']), len(compact_encodings.activation_encodings))
+        self.assertEqual(len(encodings['param_encodings']), len(compact_encodings.param_encodings))
+        for tensor_name, tensor_encodings in encodings['param_encodings'].items():
+            self.assertEqual(tensor_encodings, compact_encodings.param_encodings[tensor_name])
+
+        # Param encodings can be set and frozen from the compact file
+        sim.set_and_freeze_param_encodings('./data/two_input_model.encodings.bin')
+        self.assertTrue(sim.model.conv1_a.param_quantizers['weight'].is_encoding_frozen)
+        self.assertEqual(encodings['param_encodings']['conv1_a.weight'][0]['max'],
+                         sim.model.conv1_a.param_quantizers['weight'].encoding.max)
+
     # -------------------------------------------
     def test_no_fine_tuning_tf_enhanced(self):
         """"""
@@ -1065,6 +1216,129 @@ class TestQuantizationSim(unittest.TestCase):
         self.assertTrue(np.allclose(output_before_save.detach().numpy(),
                                     output_after_load.detach().numpy()))
 
+    def test_per_channel_param_quantization(self):
+        """ Weights quantized per channel get one encoding per output channel, through compute, export and reload """
+
+        def forward_pass(model, args):
+            model.eval()
+            with torch.no_grad():
+                model(torch.randn((32, 1, 28, 28)), torch.randn(32, 1, 28, 28))
+
+        model = ModelWithTwoInputs()
+        # Give the output channels of conv2 very different ranges
+        with torch.no_grad():
+            model.conv2.weight.mul_(torch.arange(1, 21, dtype=torch.float32).view(20, 1, 1, 1))
+
+        sim = QuantizationSimModel(model, dummy_input=(torch.rand(32, 1, 28, 28), torch.rand(32, 1, 28, 28)))
+        sim.enable_per_channel_quantization()
+        sim.compute_encodings(forward_pass, None)
+
+        weight_quantizer = sim.model.conv2.param_quantizers['weight']
+        self.assertEqual(0, weight_quantizer.channel_axis)
+        self.assertEqual(20, len(weight_quantizer.encoding))
+        self.assertEqual(50, len(sim.model.fc1.param_quantizers['weight'].encoding))
+        self.assertTrue(weight_quantizer.encoding[0].max < weight_quantizer.encoding[19].max)
+
+        # Per-channel quantize-dequantize keeps every channel within its own encoding range
+        weight = sim.model.conv2._module_to_wrap.weight.detach().clone()
+        quantized_weight = weight_quantizer.quantize_dequantize(weight, MAP_ROUND_MODE_TO_PYMO['nearest'])
+        for channel, encoding in enumerate(weight_quantizer.encoding):
+            delta = (encoding.max - encoding.min) / 255
+            self.assertTrue(torch.allclose(weight[channel], quantized_weight[channel], atol=delta))
+
+        output = sim.model(torch.randn((1, 1, 28, 28)), torch.randn(1, 1, 28, 28))
+        output.sum().backward()
+        self.assertIsNotNone(sim.model.conv2._module_to_wrap.weight.grad)
+
+        sim.export('./data/', 'per_channel_model', input_shape=[(1, 1, 28, 28), (1, 1, 28, 28)])
+        with open('./data/per_channel_model.encodings', 'r') as fp:
+            encodings = json.load(fp)
+        self.assertEqual(20, len(encodings['param_encodings']['conv2.weight']))
+
+        new_sim = QuantizationSimModel(ModelWithTwoInputs(),
+                                       dummy_input=(torch.rand(32, 1, 28, 28), torch.rand(32, 1, 28, 28)))
+        new_sim.set_and_freeze_param_encodings('./data/per_channel_model.encodings')
+        new_weight_quantizer = new_sim.model.conv2.param_quantizers['weight']
+        self.assertEqual(0, new_weight_quantizer.channel_axis)
+        self.assertEqual([encoding.max for encoding in weight_quantizer.encoding],
+                         [encoding.max for encoding in new_weight_quantizer.encoding])
+
+        save_state_checkpoint(sim, './data/per_channel_checkpoint.pth')
+        load_state_checkpoint(new_sim, './data/per_channel_checkpoint.pth')
+        self.assertEqual(20, len(new_sim.model.conv2.param_quantizers['weight'].encoding))
+        self.assertIsNone(new_sim.model.conv2.output_quantizers[0].channel_axis)
+        os.remove('./data/per_channel_checkpoint.pth')
+
+    def test_torch_quantizer_backend(self):
+        """ The PyTorch quantizer backend computes the same encodings, outputs and gradients as the C++ backend """
+
+        torch.manual_seed(0)
+        model = SmallMnistNoDropout()
+        inputs = torch.randn((32, 1, 28, 28))
+
+        def forward_pass(model, args):
+            model.eval()
+            with torch.no_grad():
+                model(inputs)
+
+        for quant_scheme in ('tf', 'tf_enhanced'):
+            cpp_sim = QuantizationSimModel(model, dummy_input=torch.rand(1, 1, 28, 28), quant_scheme=quant_scheme)
+            torch_sim = QuantizationSimModel(model, dummy_input=torch.rand(1, 1, 28, 28), quant_scheme=quant_scheme,
+                                             quantizer_backend='torch')
+            cpp_sim.compute_encodings(forward_pass, None)
+            torch_sim.compute_encodings(forward_pass, None)
+
+            cpp_quantizers = dict(cpp_sim._get_named_tensor_quantizers())
+            for name, quantizer in torch_sim._get_named_tensor_quantizers():
+                self.assertEqual('torch', quantizer.backend)
+                if quantizer.enabled:
+                    self.assertEqual(cpp_quantizers[name].encoding.min, quantizer.encoding.min, name)
+                    self.assertEqual(cpp_quantizers[name].encoding.max, quantizer.encoding.max, name)
+
+            cpp_sim.model.train()
+            torch_sim.model.train()
+            cpp_output = cpp_sim.model(inputs)
+            torch_output = torch_sim.model(inputs)
+            self.assertTrue(torch.equal(cpp_output, torch_output))
+
+            cpp_output.sum().backward()
+            torch_output.sum().backward()
+            self.assertTrue(torch.allclose(cpp_sim.model.conv1._module_to_wrap.weight.grad,
+                                           torch_sim.model.conv1._module_to_wrap.weight.grad))
+
+        with self.assertRaises(ValueError):
+            QuantizationSimModel(model, dummy_input=torch.rand(1, 1, 28, 28), quantizer_backend='cuda')
+
+    def test_save_and_load_state_checkpoint(self):
+        """ Restore a state checkpoint into a freshly created sim model """
+
+        model = ModelWithStandaloneOps()
+        sim = QuantizationSimModel(model, dummy_input=torch.rand(32, 1, 28, 28))
+        sim.compute_encodings(dummy_forward_pass, None)
+        sim.model.conv1.param_quantizers['weight'].freeze_encoding()
+        sim.model.fc2.output_quantizers[0].bitwidth = 4
+
+        sim.model.eval()
+        dummy_input = torch.randn((32, 1, 28, 28))
+        output_before_save = sim.model(dummy_input)
+
+        save_state_checkpoint(sim, './data/sim_state.pth')
+        save_state_checkpoint(sim, './data/sim_state_background.pth', in_background=True).result()
+
+        for checkpoint_path in ('./data/sim_state.pth', './data/sim_state_background.pth'):
+            new_sim = QuantizationSimModel(ModelWithStandaloneOps(), dummy_input=torch.rand(32, 1, 28, 28))
+            load_state_checkpoint(new_sim, checkpoint_path)
+
+            self.check_quant_params(sim.model.conv1, new_sim.model.conv1, True)
+            self.check_quant_params(sim.model.fc2, new_sim.model.fc2, True)
+            self.assertTrue(new_sim.model.conv1.param_quantizers['weight'].is_encoding_frozen)
+            self.assertEqual(4, new_sim.model.fc2.output_quantizers[0].bitwidth)
+            self.assertEqual(QcQuantizeOpMode.ACTIVE, new_sim.model.conv1._mode)
+
+            new_sim.model.eval()
+            output_after_load = new_sim.model(dummy_input)
+            self.assertTrue(np.allclose(output_before_save.detach().numpy(), output_after_load.detach().numpy()))
+
     def test_ste_gradient_math(self):
         """
         Unit test to validate custom gradient computation with auto grad computation.
@@ -37,6 +37,7 @@
 # =============================================================================
 
 import pytest
+import itertools
 import unittest.mock
 import numpy as np
 import shutil
@@ -380,6 +381,22 @@ class TestTrainingExtensionsUtils(unittest.TestCase):
         cached_dataset = utils.CachedDataset(data_loader, num_batches, path)
         self.assertEqual(len(cached_dataset), 6)
 
+        # cached batches match the model inputs of the data loader, also when read out of order
+        expected_batches = [inputs for inputs, _ in itertools.islice(data_loader, num_batches)]
+        for index in [0, 1, 2, 5, 3, 4]:
+            self.assertTrue(torch.equal(cached_dataset[index], expected_batches[index]))
+
+        self.assertEqual(len(list(cached_dataset)), num_batches)
+        with pytest.raises(IndexError):
+            _ = cached_dataset[num_batches]
+
+        # closing releases the prefetch thread and the memory map, the cache file is opened again on the next access
+        cached_dataset.close()
+        self.assertIsNone(cached_dataset._executor)
+        self.assertIsNone(cached_dataset._memory_map)
+        self.assertTrue(torch.equal(cached_dataset[2], expected_batches[2]))
+        cached_dataset.close()
+
         # Try creating cached data loader by more than possible batches from data loader and expect ValueError
         possible_batches = int(dataset_size / batch_size)
         with pytest.raises(ValueError):